@@ -0,0 +1,9 @@
+// Latency benchmarks - need a migrated Postgres at DATABASE_URL (see src/__benchmarks__)
+const base = require('./jest.config');
+
+module.exports = {
+  ...base,
+  testMatch: ['**/__benchmarks__/**/*.bench.ts'],
+  collectCoverageFrom: undefined,
+  testTimeout: 120000,
+};
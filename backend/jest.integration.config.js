@@ -0,0 +1,9 @@
+// Integration tests - need a migrated Postgres at DATABASE_URL (see src/__integration__)
+const base = require('./jest.config');
+
+module.exports = {
+  ...base,
+  testMatch: ['**/__integration__/**/*.int.ts'],
+  collectCoverageFrom: undefined,
+  testTimeout: 60000,
+};
@@ -0,0 +1,12 @@
+-- Contract step for migration 20261017150000_compact_partitioned_contact_history.
+-- Ship this in the first release after every task runs that migration's release. Copy it to
+-- prisma/migrations/<timestamp>_drop_legacy_contact_history/migration.sql and remove the
+-- LegacyContactHistory model (and Contact.legacyHistory) from schema.prisma in the same change.
+-- Nothing reads or writes "contact_history" by then; "contact_history_entries" holds every row.
+
+DROP TRIGGER "contact_history_copy_compact" ON "contact_history_entries";
+DROP TRIGGER "contact_history_copy_legacy" ON "contact_history";
+DROP FUNCTION "contact_history_copy_compact"();
+DROP FUNCTION "contact_history_copy_legacy"();
+
+DROP TABLE "contact_history";
@@ -0,0 +1,67 @@
+-- AlterTable
+ALTER TABLE "users" ADD COLUMN "contactCount" INTEGER NOT NULL DEFAULT 0;
+
+UPDATE "users" u
+SET "contactCount" = c."count"
+FROM (SELECT "ownerId", COUNT(*)::int AS "count" FROM "contacts" GROUP BY "ownerId") c
+WHERE c."ownerId" = u."id";
+
+-- CreateTable
+CREATE TABLE "counters" (
+    "name" TEXT NOT NULL,
+    "value" INTEGER NOT NULL DEFAULT 0,
+
+    CONSTRAINT "counters_pkey" PRIMARY KEY ("name")
+);
+
+INSERT INTO "counters" ("name", "value") SELECT 'users', COUNT(*)::int FROM "users";
+
+-- Keep "users"."contactCount" in step with every insert and delete on "contacts",
+-- one UPDATE per statement and owner however many rows the statement touched
+CREATE FUNCTION "contacts_count_inserted"() RETURNS trigger AS $$
+BEGIN
+  UPDATE "users" u
+  SET "contactCount" = u."contactCount" + n."count"
+  FROM (SELECT "ownerId", COUNT(*)::int AS "count" FROM inserted GROUP BY "ownerId") n
+  WHERE u."id" = n."ownerId";
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION "contacts_count_deleted"() RETURNS trigger AS $$
+BEGIN
+  UPDATE "users" u
+  SET "contactCount" = u."contactCount" - d."count"
+  FROM (SELECT "ownerId", COUNT(*)::int AS "count" FROM deleted GROUP BY "ownerId") d
+  WHERE u."id" = d."ownerId";
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER "contacts_count_inserted" AFTER INSERT ON "contacts"
+  REFERENCING NEW TABLE AS inserted
+  FOR EACH STATEMENT EXECUTE FUNCTION "contacts_count_inserted"();
+
+CREATE TRIGGER "contacts_count_deleted" AFTER DELETE ON "contacts"
+  REFERENCING OLD TABLE AS deleted
+  FOR EACH STATEMENT EXECUTE FUNCTION "contacts_count_deleted"();
+
+-- Same for the global user count
+CREATE FUNCTION "users_count_changed"() RETURNS trigger AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    UPDATE "counters" SET "value" = "value" + (SELECT COUNT(*) FROM inserted) WHERE "name" = 'users';
+  ELSE
+    UPDATE "counters" SET "value" = "value" - (SELECT COUNT(*) FROM deleted) WHERE "name" = 'users';
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER "users_count_inserted" AFTER INSERT ON "users"
+  REFERENCING NEW TABLE AS inserted
+  FOR EACH STATEMENT EXECUTE FUNCTION "users_count_changed"();
+
+CREATE TRIGGER "users_count_deleted" AFTER DELETE ON "users"
+  REFERENCING OLD TABLE AS deleted
+  FOR EACH STATEMENT EXECUTE FUNCTION "users_count_changed"();
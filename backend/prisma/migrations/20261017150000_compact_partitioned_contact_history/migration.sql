@@ -0,0 +1,177 @@
+-- Compact, month-partitioned contact history (expand step).
+-- Each row in the new "contact_history_entries" table stores a bitmask of the changed fields
+-- (firstName 1, lastName 2, email 4, phone 8) and one JSON array of [before, after] values for
+-- those fields in bit order, instead of four nullable {before, after} objects. Rows are
+-- range-partitioned by month on "createdAt" so retention drops whole partitions instead of
+-- deleting rows.
+--
+-- Migrations run before the service rolls, and tasks on the previous release keep reading and
+-- writing "contact_history" until the rollout finishes. That table is left in place, and
+-- triggers copy every insert from either table into the other in its own format. Both releases
+-- see all history. The contract step (prisma/contract/drop_legacy_contact_history.sql) drops the
+-- old table and the copy triggers in a later release.
+
+-- CreateTable
+CREATE TABLE "contact_history_entries" (
+    "id" TEXT NOT NULL,
+    "contactId" TEXT NOT NULL,
+    "changedFields" SMALLINT NOT NULL,
+    "diff" JSONB NOT NULL,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "contact_history_entries_pkey" PRIMARY KEY ("id", "createdAt")
+) PARTITION BY RANGE ("createdAt");
+
+-- There is deliberately no default partition: retention detaches expired partitions with
+-- DETACH PARTITION ... CONCURRENTLY, which Postgres refuses while one exists. Maintenance keeps
+-- partitions created months ahead (CONTACT_HISTORY_PARTITIONS_AHEAD).
+
+-- Create the monthly partition holding `month`. Creating the table first and attaching it takes
+-- only a SHARE UPDATE EXCLUSIVE lock on "contact_history_entries", so reads and writes carry on.
+CREATE FUNCTION "contact_history_create_partition"("month" timestamp) RETURNS boolean AS $$
+DECLARE
+  start_at timestamp := date_trunc('month', "month");
+  end_at timestamp := date_trunc('month', "month") + interval '1 month';
+  partition_name text := 'contact_history_entries_' || to_char(date_trunc('month', "month"), 'YYYY_MM');
+BEGIN
+  IF to_regclass(quote_ident(partition_name)) IS NOT NULL THEN
+    RETURN false;
+  END IF;
+
+  EXECUTE format('CREATE TABLE %I (LIKE "contact_history_entries" INCLUDING DEFAULTS)', partition_name);
+  EXECUTE format(
+    'ALTER TABLE "contact_history_entries" ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+    partition_name, start_at, end_at
+  );
+  RETURN true;
+END;
+$$ LANGUAGE plpgsql;
+
+-- One partition per month of existing history, plus the next three months
+SELECT "contact_history_create_partition"("month")
+-- ("createdAt" holds UTC without a time zone, as Prisma writes it)
+FROM generate_series(
+  date_trunc('month', COALESCE((SELECT MIN("createdAt") FROM "contact_history"), now() AT TIME ZONE 'UTC')),
+  date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months',
+  interval '1 month'
+) AS "month";
+
+-- CreateIndex
+CREATE INDEX "contact_history_entries_contactId_createdAt_idx" ON "contact_history_entries"("contactId", "createdAt");
+
+-- AddForeignKey
+ALTER TABLE "contact_history_entries" ADD CONSTRAINT "contact_history_entries_contactId_fkey" FOREIGN KEY ("contactId") REFERENCES "contacts"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- AlterTable
+ALTER TABLE "contacts" ADD COLUMN "historyCount" INTEGER NOT NULL DEFAULT 0;
+
+-- Keep "contacts"."historyCount" in step with inserts and deletes on "contact_history_entries",
+-- one UPDATE per statement and contact. Detaching and dropping a partition fires no trigger, so
+-- retention subtracts a partition's counts itself when it drops it.
+CREATE FUNCTION "contact_history_count_inserted"() RETURNS trigger AS $$
+BEGIN
+  UPDATE "contacts" c
+  SET "historyCount" = c."historyCount" + n."count"
+  FROM (SELECT "contactId", COUNT(*)::int AS "count" FROM inserted GROUP BY "contactId") n
+  WHERE c."id" = n."contactId";
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION "contact_history_count_deleted"() RETURNS trigger AS $$
+BEGIN
+  UPDATE "contacts" c
+  SET "historyCount" = c."historyCount" - d."count"
+  FROM (SELECT "contactId", COUNT(*)::int AS "count" FROM deleted GROUP BY "contactId") d
+  WHERE c."id" = d."contactId";
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER "contact_history_count_inserted" AFTER INSERT ON "contact_history_entries"
+  REFERENCING NEW TABLE AS inserted
+  FOR EACH STATEMENT EXECUTE FUNCTION "contact_history_count_inserted"();
+
+CREATE TRIGGER "contact_history_count_deleted" AFTER DELETE ON "contact_history_entries"
+  REFERENCING OLD TABLE AS deleted
+  FOR EACH STATEMENT EXECUTE FUNCTION "contact_history_count_deleted"();
+
+-- Convert existing rows. Until this migration commits, the SHARE lock holds back inserts from
+-- tasks still on the previous release, so none can land between this copy and the triggers
+-- below; their contact updates wait for the conversion rather than fail. The count trigger
+-- fills "historyCount" as the rows go in.
+LOCK TABLE "contact_history" IN SHARE MODE;
+INSERT INTO "contact_history_entries" ("id", "contactId", "changedFields", "diff", "createdAt")
+SELECT
+  "id",
+  "contactId",
+  (CASE WHEN "firstName" IS NOT NULL THEN 1 ELSE 0 END
+    | CASE WHEN "lastName" IS NOT NULL THEN 2 ELSE 0 END
+    | CASE WHEN "email" IS NOT NULL THEN 4 ELSE 0 END
+    | CASE WHEN "phone" IS NOT NULL THEN 8 ELSE 0 END)::smallint,
+  CASE WHEN "firstName" IS NOT NULL THEN jsonb_build_array("firstName"->'before', "firstName"->'after') ELSE '[]'::jsonb END
+    || CASE WHEN "lastName" IS NOT NULL THEN jsonb_build_array("lastName"->'before', "lastName"->'after') ELSE '[]'::jsonb END
+    || CASE WHEN "email" IS NOT NULL THEN jsonb_build_array("email"->'before', "email"->'after') ELSE '[]'::jsonb END
+    || CASE WHEN "phone" IS NOT NULL THEN jsonb_build_array("phone"->'before', "phone"->'after') ELSE '[]'::jsonb END,
+  "createdAt"
+FROM "contact_history";
+
+-- Copy inserts between the two formats while both releases run. A row copied by one trigger
+-- must not be copied back, so each returns early when fired by the other (trigger depth > 1).
+CREATE FUNCTION "contact_history_copy_legacy"() RETURNS trigger AS $$
+BEGIN
+  IF pg_trigger_depth() > 1 THEN
+    RETURN NULL;
+  END IF;
+
+  INSERT INTO "contact_history_entries" ("id", "contactId", "changedFields", "diff", "createdAt")
+  SELECT
+    "id",
+    "contactId",
+    (CASE WHEN "firstName" IS NOT NULL THEN 1 ELSE 0 END
+      | CASE WHEN "lastName" IS NOT NULL THEN 2 ELSE 0 END
+      | CASE WHEN "email" IS NOT NULL THEN 4 ELSE 0 END
+      | CASE WHEN "phone" IS NOT NULL THEN 8 ELSE 0 END)::smallint,
+    CASE WHEN "firstName" IS NOT NULL THEN jsonb_build_array("firstName"->'before', "firstName"->'after') ELSE '[]'::jsonb END
+      || CASE WHEN "lastName" IS NOT NULL THEN jsonb_build_array("lastName"->'before', "lastName"->'after') ELSE '[]'::jsonb END
+      || CASE WHEN "email" IS NOT NULL THEN jsonb_build_array("email"->'before', "email"->'after') ELSE '[]'::jsonb END
+      || CASE WHEN "phone" IS NOT NULL THEN jsonb_build_array("phone"->'before', "phone"->'after') ELSE '[]'::jsonb END,
+    "createdAt"
+  FROM inserted;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- A field's [before, after] pair starts after the pairs of the lower bits that are set
+CREATE FUNCTION "contact_history_copy_compact"() RETURNS trigger AS $$
+BEGIN
+  IF pg_trigger_depth() > 1 THEN
+    RETURN NULL;
+  END IF;
+
+  INSERT INTO "contact_history" ("id", "contactId", "firstName", "lastName", "email", "phone", "createdAt")
+  SELECT
+    i."id",
+    i."contactId",
+    CASE WHEN i."changedFields" & 1 <> 0 THEN jsonb_build_object('before', i."diff" -> 0, 'after', i."diff" -> 1) END,
+    CASE WHEN i."changedFields" & 2 <> 0 THEN jsonb_build_object('before', i."diff" -> o."lastName", 'after', i."diff" -> (o."lastName" + 1)) END,
+    CASE WHEN i."changedFields" & 4 <> 0 THEN jsonb_build_object('before', i."diff" -> o."email", 'after', i."diff" -> (o."email" + 1)) END,
+    CASE WHEN i."changedFields" & 8 <> 0 THEN jsonb_build_object('before', i."diff" -> o."phone", 'after', i."diff" -> (o."phone" + 1)) END,
+    i."createdAt"
+  FROM inserted i
+  CROSS JOIN LATERAL (
+    SELECT 2 * (i."changedFields" & 1) AS "lastName",
+      2 * ((i."changedFields" & 1) + (i."changedFields" >> 1 & 1)) AS "email",
+      2 * ((i."changedFields" & 1) + (i."changedFields" >> 1 & 1) + (i."changedFields" >> 2 & 1)) AS "phone"
+  ) AS o;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER "contact_history_copy_legacy" AFTER INSERT ON "contact_history"
+  REFERENCING NEW TABLE AS inserted
+  FOR EACH STATEMENT EXECUTE FUNCTION "contact_history_copy_legacy"();
+
+CREATE TRIGGER "contact_history_copy_compact" AFTER INSERT ON "contact_history_entries"
+  REFERENCING NEW TABLE AS inserted
+  FOR EACH STATEMENT EXECUTE FUNCTION "contact_history_copy_compact"();
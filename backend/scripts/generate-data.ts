@@ -0,0 +1,228 @@
+/**
+ * Production-scale data generator
+ * Bulk-loads users, contacts and contact history with multi-row inserts in chunks, so a local
+ * database can reproduce the behaviour of list, history and external-ID queries at scale.
+ *
+ * Contacts are spread over users with a Zipf distribution: a few owners hold most of the rows,
+ * as in production. A given GEN_SEED always yields the same names, owner sizes and history shape
+ * (only the UUIDs differ), so load-test runs compare across commits.
+ * Every generated user signs in with GEN_PASSWORD; emails are `<GEN_PREFIX>-<n>@example.com`,
+ * user 0 being the largest owner.
+ *
+ * Usage: DATABASE_URL=... npm run data:generate
+ * Options:
+ *   GEN_USERS (default 1000)            GEN_CONTACTS (default 1000000)
+ *   GEN_SKEW (Zipf exponent, 1.1)       GEN_HISTORY_PER_CONTACT (mean entries, 2)
+ *   GEN_EXTERNAL_RATIO (0.5)            GEN_CHUNK_SIZE (rows per INSERT, 5000)
+ *   GEN_SEED (42)                       GEN_PREFIX (loadtest)       GEN_PASSWORD (password123)
+ *
+ * The app's MAX_CONTACTS_PER_USER / MAX_USERS limits are not applied here; raise them on the
+ * server under test. Remove generated data with GEN_CLEAN=true (deletes users matching GEN_PREFIX).
+ */
+
+import { Prisma, PrismaClient } from '@prisma/client';
+import bcrypt from 'bcryptjs';
+import crypto from 'crypto';
+import { HISTORY_FIELDS, encodeHistoryChanges } from '../src/lib/contactHistoryCodec';
+import { ContactHistoryRetention } from '../src/services/contactHistoryRetention';
+
+const USERS = parseInt(process.env.GEN_USERS || '1000');
+const CONTACTS = parseInt(process.env.GEN_CONTACTS || '1000000');
+const SKEW = parseFloat(process.env.GEN_SKEW || '1.1');
+const HISTORY_PER_CONTACT = parseFloat(process.env.GEN_HISTORY_PER_CONTACT || '2');
+const EXTERNAL_RATIO = parseFloat(process.env.GEN_EXTERNAL_RATIO || '0.5');
+const CHUNK_SIZE = parseInt(process.env.GEN_CHUNK_SIZE || '5000');
+const SEED = parseInt(process.env.GEN_SEED || '42');
+const PREFIX = process.env.GEN_PREFIX || 'loadtest';
+const PASSWORD = process.env.GEN_PASSWORD || 'password123';
+
+const FIRST_NAMES = [
+  'James', 'Mary', 'Robert', 'Patricia', 'John', 'Jennifer', 'Michael', 'Linda', 'David', 'Elizabeth',
+  'William', 'Barbara', 'Richard', 'Susan', 'Joseph', 'Jessica', 'Thomas', 'Sarah', 'Charles', 'Karen',
+  'Wei', 'Priya', 'Mohammed', 'Sofia', 'Hiroshi', 'Olga', 'Kwame', 'Ana', 'Lars', 'Fatima',
+];
+const LAST_NAMES = [
+  'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez',
+  'Hernandez', 'Lopez', 'Gonzalez', 'Wilson', 'Anderson', 'Thomas', 'Taylor', 'Moore', 'Jackson', 'Martin',
+  'Lee', 'Perez', 'Thompson', 'White', 'Harris', 'Sanchez', 'Clark', 'Ramirez', 'Lewis', 'Robinson',
+  'Nguyen', 'Kim', 'Patel', 'Müller', "O'Brien", 'Kowalski', 'Okafor', 'Tanaka', 'Ivanova', 'Silva',
+];
+const DOMAINS = ['gmail.com', 'yahoo.com', 'outlook.com', 'icloud.com', 'example.com', 'acme.io', 'corp.example.org'];
+
+const prisma = new PrismaClient();
+
+// mulberry32: small, fast and seedable, so the same GEN_SEED always yields the same data
+const createRandom = (seed: number) => {
+  let state = seed >>> 0;
+  return () => {
+    state = (state + 0x6d2b79f5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+};
+
+const random = createRandom(SEED);
+const pick = <T>(values: readonly T[]): T => values[Math.floor(random() * values.length)];
+
+/**
+ * Contacts per user following a Zipf law: user n gets a share proportional to 1 / (n + 1)^skew
+ */
+const zipfAllocation = (users: number, total: number, skew: number): number[] => {
+  const weights = Array.from({ length: users }, (_, n) => 1 / Math.pow(n + 1, skew));
+  const weightSum = weights.reduce((sum, weight) => sum + weight, 0);
+  const counts = weights.map(weight => Math.floor((weight / weightSum) * total));
+
+  // Hand the rounding remainder to the smallest owners so every contact is placed
+  let remainder = total - counts.reduce((sum, count) => sum + count, 0);
+  for (let n = users - 1; remainder > 0; n = (n - 1 + users) % users, remainder--) {
+    counts[n]++;
+  }
+  return counts;
+};
+
+/**
+ * History entries for one contact: geometric with the configured mean, so most contacts have
+ * few changes and a long tail has many
+ */
+const historyCount = (): number => {
+  if (HISTORY_PER_CONTACT <= 0) {
+    return 0;
+  }
+  const continueProbability = HISTORY_PER_CONTACT / (HISTORY_PER_CONTACT + 1);
+  let count = 0;
+  while (random() < continueProbability) {
+    count++;
+  }
+  return count;
+};
+
+const phoneNumber = (): string => `+1${String(2000000000 + Math.floor(random() * 7999999999))}`;
+
+class ChunkedWriter<T> {
+  private rows: T[] = [];
+  written = 0;
+
+  constructor(private readonly insert: (rows: T[]) => Promise<unknown>) {}
+
+  async add(row: T): Promise<void> {
+    this.rows.push(row);
+    if (this.rows.length >= CHUNK_SIZE) {
+      await this.flush();
+    }
+  }
+
+  async flush(): Promise<void> {
+    if (this.rows.length === 0) {
+      return;
+    }
+    const rows = this.rows;
+    this.rows = [];
+    await this.insert(rows);
+    this.written += rows.length;
+  }
+}
+
+async function clean(): Promise<void> {
+  // Contacts, history and API keys cascade from users
+  const { count } = await prisma.user.deleteMany({ where: { email: { startsWith: `${PREFIX}-` } } });
+  console.log(`Deleted ${count} generated users and everything they own`);
+}
+
+async function generate(): Promise<void> {
+  const started = Date.now();
+  const passwordHash = await bcrypt.hash(PASSWORD, 10);
+  const allocation = zipfAllocation(USERS, CONTACTS, SKEW);
+  const now = Date.now();
+  const yearMs = 365 * 24 * 60 * 60 * 1000;
+
+  console.log(`Generating ${USERS} users, ${CONTACTS} contacts (Zipf ${SKEW}: largest owner ${allocation[0]}, median ${allocation[Math.floor(USERS / 2)]})`);
+
+  // History goes back a year; every month needs its partition before rows can be inserted
+  await new ContactHistoryRetention(prisma).ensurePartitions(new Date(now - yearMs), new Date(now));
+
+  const users = new ChunkedWriter<Prisma.UserCreateManyInput>(rows => prisma.user.createMany({ data: rows }));
+  const contacts = new ChunkedWriter<Prisma.ContactCreateManyInput>(rows => prisma.contact.createMany({ data: rows }));
+  // History rows reference contacts, so pending contacts are written first
+  const history = new ChunkedWriter<Prisma.ContactHistoryCreateManyInput>(async rows => {
+    await contacts.flush();
+    await prisma.contactHistory.createMany({ data: rows });
+  });
+
+  const userIds: string[] = [];
+  for (let n = 0; n < USERS; n++) {
+    const id = crypto.randomUUID();
+    userIds.push(id);
+    await users.add({
+      id,
+      email: `${PREFIX}-${n}@example.com`,
+      password: passwordHash,
+      firstName: pick(FIRST_NAMES),
+      lastName: pick(LAST_NAMES),
+    });
+  }
+  await users.flush();
+
+  let contactNumber = 0;
+  for (let n = 0; n < USERS; n++) {
+    for (let i = 0; i < allocation[n]; i++, contactNumber++) {
+      const id = crypto.randomUUID();
+      const firstName = pick(FIRST_NAMES);
+      const lastName = pick(LAST_NAMES);
+      const createdAt = new Date(now - Math.floor(random() * yearMs));
+      const contact = {
+        id,
+        ownerId: userIds[n],
+        firstName,
+        lastName,
+        // The contact number keeps (ownerId, email) unique without a lookup
+        email: `${firstName}.${lastName}.${contactNumber}@${pick(DOMAINS)}`.toLowerCase().replace(/[^a-z0-9.@-]/g, ''),
+        phone: phoneNumber(),
+        externalId: random() < EXTERNAL_RATIO ? `${PREFIX}-ext-${contactNumber}` : null,
+        createdAt,
+        updatedAt: createdAt,
+      };
+      await contacts.add(contact);
+
+      // Each change records before/after of one field, spread between creation and now
+      let previous: Record<string, string> = { firstName, lastName, email: contact.email, phone: contact.phone };
+      for (let h = historyCount(); h > 0; h--) {
+        const field = pick(HISTORY_FIELDS);
+        const after = field === 'phone' ? phoneNumber() : field === 'email' ? `${h}.${previous.email}` : pick(field === 'firstName' ? FIRST_NAMES : LAST_NAMES);
+        await history.add({
+          contactId: id,
+          ...encodeHistoryChanges({ [field]: { before: previous[field], after } }),
+          createdAt: new Date(createdAt.getTime() + Math.floor(random() * (now - createdAt.getTime()))),
+        });
+        previous = { ...previous, [field]: after };
+      }
+
+      if (contactNumber % 100000 === 0 && contactNumber > 0) {
+        console.log(`  ${contactNumber} contacts...`);
+      }
+    }
+  }
+  await contacts.flush();
+  await history.flush();
+
+  await prisma.$executeRaw`ANALYZE "users"`;
+  await prisma.$executeRaw`ANALYZE "contacts"`;
+  await prisma.$executeRaw`ANALYZE "contact_history_entries"`;
+
+  const seconds = (Date.now() - started) / 1000;
+  console.table({
+    users: users.written,
+    contacts: contacts.written,
+    history: history.written,
+    seconds,
+    rowsPerSecond: Math.round((users.written + contacts.written + history.written) / seconds),
+  });
+}
+
+(process.env.GEN_CLEAN === 'true' ? clean() : generate())
+  .catch(error => {
+    console.error(error);
+    process.exitCode = 1;
+  })
+  .finally(() => prisma.$disconnect());
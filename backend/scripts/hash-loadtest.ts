@@ -0,0 +1,81 @@
+/**
+ * Hashing load test
+ * Fires bursts of concurrent bcrypt verifications - the work a burst of logins or cold API keys
+ * causes - and records main event-loop delay while they run, first with bcryptjs on the main
+ * thread (the old behaviour) and then through the worker-thread HashPool.
+ *
+ * Event-loop delay is how long every other request and SSE write on the task waits.
+ *
+ * Usage: npx ts-node scripts/hash-loadtest.ts
+ * Options: HASH_LOADTEST_CONCURRENCY (default 32), HASH_LOADTEST_ROUNDS (bursts, default 10),
+ *          HASH_LOADTEST_COST (bcrypt cost, default 10), plus the HASH_POOL_* settings
+ */
+
+import bcrypt from 'bcryptjs';
+import { monitorEventLoopDelay } from 'perf_hooks';
+import { HashPool } from '../src/lib/hashPool';
+
+const CONCURRENCY = parseInt(process.env.HASH_LOADTEST_CONCURRENCY || '32');
+const ROUNDS = parseInt(process.env.HASH_LOADTEST_ROUNDS || '10');
+const COST = parseInt(process.env.HASH_LOADTEST_COST || '10');
+
+interface Scenario {
+  name: string;
+  compare: (data: string, hash: string) => Promise<boolean>;
+}
+
+async function runScenario(scenario: Scenario, hash: string) {
+  const histogram = monitorEventLoopDelay({ resolution: 5 });
+  let completed = 0;
+  let rejected = 0;
+
+  histogram.enable();
+  const started = process.hrtime.bigint();
+  for (let round = 0; round < ROUNDS; round++) {
+    const results = await Promise.allSettled(
+      Array.from({ length: CONCURRENCY }, () => scenario.compare('password123', hash))
+    );
+    completed += results.filter(result => result.status === 'fulfilled').length;
+    rejected += results.filter(result => result.status === 'rejected').length;
+  }
+  const elapsedMs = Number(process.hrtime.bigint() - started) / 1e6;
+  histogram.disable();
+
+  const toMs = (ns: number) => Number((ns / 1e6).toFixed(1));
+  return {
+    scenario: scenario.name,
+    completed,
+    rejected,
+    opsPerSec: Math.round(completed / (elapsedMs / 1000)),
+    lagP50Ms: toMs(histogram.percentile(50)),
+    lagP99Ms: toMs(histogram.percentile(99)),
+    lagMaxMs: toMs(histogram.max),
+  };
+}
+
+async function run(): Promise<void> {
+  const pool = HashPool.getInstance();
+  const hash = bcrypt.hashSync('password123', COST);
+
+  // Start the workers before measuring so thread start-up is not counted
+  await pool.compare('password123', hash);
+
+  const scenarios: Scenario[] = [
+    { name: 'main thread (bcryptjs)', compare: (data, digest) => bcrypt.compare(data, digest) },
+    { name: 'worker pool', compare: (data, digest) => pool.compare(data, digest) },
+  ];
+
+  const results = [];
+  for (const scenario of scenarios) {
+    results.push(await runScenario(scenario, hash));
+  }
+
+  console.log(`${ROUNDS} bursts of ${CONCURRENCY} verifications at cost ${COST}; pool ${JSON.stringify(pool.getMetrics())}`);
+  console.table(results);
+  await pool.destroy();
+}
+
+run().catch(error => {
+  console.error(error);
+  process.exitCode = 1;
+});
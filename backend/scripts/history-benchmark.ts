@@ -0,0 +1,149 @@
+/**
+ * Contact history benchmark
+ * Run against a database loaded with `npm run data:generate`; for the 100M-row case use e.g.
+ *   GEN_USERS=10000 GEN_CONTACTS=20000000 GEN_HISTORY_PER_CONTACT=5 npm run data:generate
+ *
+ * Reports:
+ *   - contact_history_entries size across all partitions (heap, indexes, bytes per row)
+ *   - average stored change payload in the compact format against the same changes rebuilt in
+ *     the previous four-column {before, after} format
+ *   - history read latency for sampled contacts and for the contact with the most history:
+ *     offset pages (first and last) with the maintained total, cursor pages, a recent-range
+ *     read that prunes old partitions, and the COUNT(*) every page used to run
+ *
+ * Usage: DATABASE_URL=... npm run bench:history
+ * Options: BENCH_CONTACTS (sampled contacts, default 50), BENCH_ITERATIONS (20), BENCH_PAGE_SIZE (20)
+ */
+
+import { measure } from '../src/__benchmarks__/latency';
+import { prisma } from '../src/lib/prisma';
+import { ContactHistoryRepository } from '../src/repositories/contactHistoryRepository';
+
+const CONTACTS = parseInt(process.env.BENCH_CONTACTS || '50');
+const ITERATIONS = parseInt(process.env.BENCH_ITERATIONS || '20');
+const PAGE_SIZE = parseInt(process.env.BENCH_PAGE_SIZE || '20');
+const RECENT_DAYS = 30;
+
+const contactHistoryRepository = new ContactHistoryRepository();
+
+interface BenchContact {
+  id: string;
+  ownerId: string;
+  historyCount: number;
+}
+
+const megabytes = (bytes: bigint | number) => Number((Number(bytes) / 1024 / 1024).toFixed(1));
+
+async function reportSize(): Promise<void> {
+  const [size] = await prisma.$queryRaw<{ partitions: number; rows: number; heap: bigint; indexes: bigint }[]>`
+    SELECT COUNT(*)::int AS "partitions",
+      SUM(GREATEST(c."reltuples", 0))::float8 AS "rows",
+      SUM(pg_table_size(t."relid"))::bigint AS "heap",
+      SUM(pg_indexes_size(t."relid"))::bigint AS "indexes"
+    FROM pg_partition_tree('"contact_history_entries"') t
+    JOIN pg_class c ON c."oid" = t."relid"
+    WHERE t."isleaf"
+  `;
+  const rows = size.rows ?? 0;
+
+  // Payload of the stored columns against the same changes as four {before, after} objects, on a
+  // ~1% block sample. A field's pair starts after the pairs of the lower bits that are set.
+  const [payload] = await prisma.$queryRaw<{ compact: number; legacy: number }[]>`
+    SELECT AVG(pg_column_size(h."changedFields") + pg_column_size(h."diff"))::float8 AS "compact",
+      AVG(
+        COALESCE(pg_column_size(CASE WHEN h."changedFields" & 1 <> 0 THEN jsonb_build_object('before', h."diff" -> 0, 'after', h."diff" -> 1) END), 0)
+        + COALESCE(pg_column_size(CASE WHEN h."changedFields" & 2 <> 0 THEN jsonb_build_object('before', h."diff" -> o."lastName", 'after', h."diff" -> (o."lastName" + 1)) END), 0)
+        + COALESCE(pg_column_size(CASE WHEN h."changedFields" & 4 <> 0 THEN jsonb_build_object('before', h."diff" -> o."email", 'after', h."diff" -> (o."email" + 1)) END), 0)
+        + COALESCE(pg_column_size(CASE WHEN h."changedFields" & 8 <> 0 THEN jsonb_build_object('before', h."diff" -> o."phone", 'after', h."diff" -> (o."phone" + 1)) END), 0)
+      )::float8 AS "legacy"
+    FROM "contact_history_entries" AS h TABLESAMPLE SYSTEM (1)
+    CROSS JOIN LATERAL (
+      SELECT 2 * (h."changedFields" & 1) AS "lastName",
+        2 * ((h."changedFields" & 1) + (h."changedFields" >> 1 & 1)) AS "email",
+        2 * ((h."changedFields" & 1) + (h."changedFields" >> 1 & 1) + (h."changedFields" >> 2 & 1)) AS "phone"
+    ) AS o
+  `;
+
+  console.table({
+    partitions: size.partitions,
+    rows: Math.round(rows),
+    heapMB: megabytes(size.heap),
+    indexesMB: megabytes(size.indexes),
+    bytesPerRow: rows > 0 ? Math.round(Number(size.heap + size.indexes) / rows) : 0,
+    compactPayloadBytes: Number((payload?.compact ?? 0).toFixed(1)),
+    legacyPayloadBytes: Number((payload?.legacy ?? 0).toFixed(1)),
+  });
+}
+
+async function pickContacts(): Promise<{ sampled: BenchContact[]; largest: BenchContact | null }> {
+  const sampled = await prisma.$queryRaw<BenchContact[]>`
+    SELECT "id", "ownerId", "historyCount" FROM "contacts" TABLESAMPLE SYSTEM (1)
+    WHERE "historyCount" > 0
+    LIMIT ${CONTACTS}
+  `;
+  const [largest] = await prisma.$queryRaw<BenchContact[]>`
+    SELECT "id", "ownerId", "historyCount" FROM "contacts" ORDER BY "historyCount" DESC LIMIT 1
+  `;
+  return { sampled, largest: largest ?? null };
+}
+
+async function benchmark(label: string, contacts: BenchContact[]) {
+  const pick = (i: number) => contacts[i % contacts.length];
+  const lastPage = (contact: BenchContact) => Math.max(1, Math.ceil(contact.historyCount / PAGE_SIZE));
+  const recentSince = new Date(Date.now() - RECENT_DAYS * 24 * 60 * 60 * 1000);
+
+  const scenarios: Record<string, (i: number) => Promise<unknown>> = {
+    'offset: first page + total': i => {
+      const contact = pick(i);
+      return contactHistoryRepository.findByContactId(contact.id, contact.ownerId, { page: 1, pageSize: PAGE_SIZE, skip: 0 });
+    },
+    'offset: last page + total': i => {
+      const contact = pick(i);
+      const page = lastPage(contact);
+      return contactHistoryRepository.findByContactId(contact.id, contact.ownerId, { page, pageSize: PAGE_SIZE, skip: (page - 1) * PAGE_SIZE });
+    },
+    'cursor: first page': i => {
+      const contact = pick(i);
+      return contactHistoryRepository.findByContactIdAfterCursor(contact.id, contact.ownerId, { pageSize: PAGE_SIZE, includeTotal: false });
+    },
+    [`range: last ${RECENT_DAYS} days`]: i => prisma.contactHistory.findMany({
+      where: { contactId: pick(i).id, createdAt: { gte: recentSince } },
+      orderBy: { createdAt: 'desc' },
+      take: PAGE_SIZE,
+    }),
+    'COUNT(*) of history (previous per-page total)': i => prisma.contactHistory.count({ where: { contactId: pick(i).id } }),
+  };
+
+  const results = [];
+  for (const [scenario, operation] of Object.entries(scenarios)) {
+    // Warm up the connection pool and buffer cache
+    await operation(0);
+    results.push({ contacts: label, scenario, ...(await measure(ITERATIONS, operation)) });
+  }
+  return results;
+}
+
+async function run(): Promise<void> {
+  await reportSize();
+
+  const { sampled, largest } = await pickContacts();
+  if (!largest || largest.historyCount === 0) {
+    console.log('No contact history found - load data with `npm run data:generate` first');
+    return;
+  }
+
+  const results = [
+    ...(sampled.length > 0 ? await benchmark(`${sampled.length} sampled`, sampled) : []),
+    ...(await benchmark(`largest (${largest.historyCount} entries)`, [largest])),
+  ];
+
+  console.log(`\nPage size ${PAGE_SIZE}, ${ITERATIONS} iterations per scenario`);
+  console.table(results);
+}
+
+run()
+  .catch(error => {
+    console.error(error);
+    process.exitCode = 1;
+  })
+  .finally(() => prisma.$disconnect());
@@ -0,0 +1,35 @@
+/**
+ * Contact history partition maintenance, once
+ * Creates the partitions for the current and next CONTACT_HISTORY_PARTITIONS_AHEAD months and,
+ * when CONTACT_HISTORY_RETENTION_MONTHS is set, drops partitions older than the retention period.
+ * The API runs the same maintenance every CONTACT_HISTORY_MAINTENANCE_MS; this script is for
+ * applying a new retention period straight away or for running from cron instead.
+ *
+ * Usage: DATABASE_URL=... CONTACT_HISTORY_RETENTION_MONTHS=24 npm run db:history-maintenance
+ */
+
+import { prisma } from '../src/lib/prisma';
+import { ContactHistoryRetention } from '../src/services/contactHistoryRetention';
+
+async function run(): Promise<void> {
+  const retention = ContactHistoryRetention.getInstance();
+  const cutoff = retention.getCutoff();
+  console.log(cutoff ? `Retaining history from ${cutoff.toISOString()}` : 'Retaining all history (CONTACT_HISTORY_RETENTION_MONTHS=0)');
+
+  const result = await retention.run();
+  if (result.skipped) {
+    console.log('Another task is running maintenance; nothing done');
+    return;
+  }
+  console.table({
+    partitionsCreated: result.partitionsCreated,
+    partitionsDropped: result.partitionsDropped.join(', ') || '-',
+  });
+}
+
+run()
+  .catch(error => {
+    console.error(error);
+    process.exitCode = 1;
+  })
+  .finally(() => prisma.$disconnect());
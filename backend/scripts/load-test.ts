@@ -0,0 +1,342 @@
+/**
+ * Contacts API load test
+ * Drives a running backend with concurrent closed-loop workers, one scenario at a time, and reports
+ * throughput and latency per scenario. Each report is written to LOADTEST_REPORT_DIR tagged with the
+ * current commit; pass an earlier report as LOADTEST_BASELINE to print the change against it.
+ *
+ * Scenarios: login (bcrypt), list (first and deep cursor pages), lastName filter, create, update,
+ * external API-key get and update, and SSE fan-out (one update delivered to many streams).
+ *
+ * Usage:
+ *   DATABASE_URL=... npm run data:generate        # users loadtest-0..N, password123
+ *   (start the backend with raised limits, e.g.
+ *    RATE_LIMIT_MAX=100000000 RATE_LIMIT_USER_MAX=100000000 RATE_LIMIT_API_KEY_MAX=100000000
+ *    MAX_CONTACTS_PER_USER=10000000 SSE_MAX_CONNECTIONS_PER_USER=1000 npm run dev)
+ *   npm run loadtest
+ * Options: LOADTEST_URL (http://localhost:3000), LOADTEST_DURATION_S (15 per scenario),
+ *   LOADTEST_CONCURRENCY (20), LOADTEST_USERS (users to sign in as, 20), LOADTEST_SSE_CLIENTS (50),
+ *   LOADTEST_SSE_EVENTS (100), LOADTEST_SCENARIOS (comma-separated subset), GEN_PREFIX, GEN_PASSWORD
+ */
+
+import { execSync } from 'child_process';
+import fs from 'fs';
+import path from 'path';
+import { LatencyStats, summarize } from '../src/__benchmarks__/latency';
+
+const BASE_URL = process.env.LOADTEST_URL || 'http://localhost:3000';
+const DURATION_MS = parseInt(process.env.LOADTEST_DURATION_S || '15') * 1000;
+const CONCURRENCY = parseInt(process.env.LOADTEST_CONCURRENCY || '20');
+const USERS = parseInt(process.env.LOADTEST_USERS || '20');
+const SSE_CLIENTS = parseInt(process.env.LOADTEST_SSE_CLIENTS || '50');
+const SSE_EVENTS = parseInt(process.env.LOADTEST_SSE_EVENTS || '100');
+const SCENARIOS = process.env.LOADTEST_SCENARIOS?.split(',');
+const REPORT_DIR = process.env.LOADTEST_REPORT_DIR || path.join(__dirname, '..', 'loadtest-results');
+const BASELINE = process.env.LOADTEST_BASELINE;
+const PREFIX = process.env.GEN_PREFIX || 'loadtest';
+const PASSWORD = process.env.GEN_PASSWORD || 'password123';
+const RUN_ID = Date.now().toString(36);
+
+interface ScenarioResult extends LatencyStats {
+  scenario: string;
+  requests: number;
+  errors: number;
+  rps: number;
+}
+
+interface Session {
+  cookie: string;
+  contactIds: string[];
+}
+
+type Operation = (worker: number, iteration: number) => Promise<Response>;
+
+const randomPhone = () => `+1555${String(Math.floor(Math.random() * 1e7)).padStart(7, '0')}`;
+
+async function login(email: string): Promise<string> {
+  const response = await fetch(`${BASE_URL}/login`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ email, password: PASSWORD }),
+  });
+  const cookie = response.headers.get('set-cookie');
+  if (!response.ok || !cookie) {
+    throw new Error(`Login as ${email} failed with status ${response.status} - run npm run data:generate first`);
+  }
+  return cookie.split(';')[0];
+}
+
+/**
+ * Run `operation` from `CONCURRENCY` workers back to back for `DURATION_MS`
+ */
+async function runScenario(scenario: string, operation: Operation): Promise<ScenarioResult> {
+  const samples: number[] = [];
+  let errors = 0;
+  const deadline = Date.now() + DURATION_MS;
+
+  const worker = async (index: number) => {
+    for (let iteration = 0; Date.now() < deadline; iteration++) {
+      const started = process.hrtime.bigint();
+      try {
+        const response = await operation(index, iteration);
+        // Read the body so the connection is reusable and the timing includes the transfer
+        await response.arrayBuffer();
+        if (!response.ok) {
+          errors++;
+        }
+      } catch {
+        errors++;
+      }
+      samples.push(Number(process.hrtime.bigint() - started) / 1e6);
+    }
+  };
+
+  const started = Date.now();
+  await Promise.all(Array.from({ length: CONCURRENCY }, (_, index) => worker(index)));
+  const seconds = (Date.now() - started) / 1000;
+
+  return {
+    scenario,
+    requests: samples.length,
+    errors,
+    rps: Math.round(samples.length / seconds),
+    ...summarize(samples),
+  };
+}
+
+/**
+ * Open `SSE_CLIENTS` streams for one user, then update a contact `SSE_EVENTS` times and time
+ * how long each update takes to reach every stream
+ */
+async function runSseFanOut(session: Session): Promise<ScenarioResult> {
+  const controller = new AbortController();
+  const sentAt = new Map<string, bigint>();
+  const samples: number[] = [];
+  let errors = 0;
+  let pending = 0;
+  let onDelivered: (() => void) | null = null;
+
+  const openStream = async () => {
+    const response = await fetch(`${BASE_URL}/api/events`, { headers: { Cookie: session.cookie }, signal: controller.signal });
+    if (!response.ok || !response.body) {
+      throw new Error(`SSE connection failed with status ${response.status} - raise SSE_MAX_CONNECTIONS_PER_USER`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    void (async () => {
+      try {
+        while (true) {
+          const { value, done } = await reader.read();
+          if (done) {
+            return;
+          }
+          buffer += decoder.decode(value, { stream: true });
+          let separator = buffer.indexOf('\n\n');
+          while (separator !== -1) {
+            const dataLine = buffer.slice(0, separator).split('\n').find(line => line.startsWith('data: '));
+            buffer = buffer.slice(separator + 2);
+            separator = buffer.indexOf('\n\n');
+
+            const message = dataLine ? JSON.parse(dataLine.slice('data: '.length)) : null;
+            const started = message?.type === 'contact:updated' ? sentAt.get(message.data.phone) : undefined;
+            if (started !== undefined) {
+              samples.push(Number(process.hrtime.bigint() - started) / 1e6);
+              if (--pending === 0) {
+                onDelivered?.();
+              }
+            }
+          }
+        }
+      } catch {
+        // Aborted at the end of the scenario
+      }
+    })();
+  };
+
+  await Promise.all(Array.from({ length: SSE_CLIENTS }, openStream));
+  // Let every stream register before the first event
+  await new Promise(resolve => setTimeout(resolve, 500));
+
+  const contactId = session.contactIds[0];
+  const started = Date.now();
+  for (let i = 0; i < SSE_EVENTS; i++) {
+    const phone = `+1444${String(i).padStart(7, '0')}`;
+    pending = SSE_CLIENTS;
+    const delivered = new Promise<void>(resolve => {
+      onDelivered = resolve;
+    });
+    sentAt.set(phone, process.hrtime.bigint());
+
+    const response = await fetch(`${BASE_URL}/contact/${contactId}`, {
+      method: 'PATCH',
+      headers: { 'Content-Type': 'application/json', Cookie: session.cookie },
+      body: JSON.stringify({ phone }),
+    });
+    await response.arrayBuffer();
+    if (!response.ok) {
+      errors++;
+      continue;
+    }
+
+    // An event that never arrives counts as an error rather than stalling the run
+    const timedOut = await Promise.race([
+      delivered.then(() => false),
+      new Promise<boolean>(resolve => setTimeout(() => resolve(true), 5000)),
+    ]);
+    if (timedOut) {
+      errors += pending;
+    }
+  }
+  const seconds = (Date.now() - started) / 1000;
+  controller.abort();
+
+  return {
+    scenario: `sse fan-out (${SSE_CLIENTS} streams)`,
+    requests: samples.length,
+    errors,
+    rps: Math.round(samples.length / seconds),
+    ...summarize(samples),
+  };
+}
+
+async function setUp(): Promise<{ sessions: Session[]; apiKey: string; externalIds: string[] }> {
+  console.log(`Signing in as ${USERS} generated users...`);
+  const sessions: Session[] = [];
+  for (let n = 0; n < USERS; n++) {
+    const cookie = await login(`${PREFIX}-${n}@example.com`);
+    const page = await fetch(`${BASE_URL}/contacts?cursor=&pageSize=50&fields=id`, { headers: { Cookie: cookie } }).then(res => res.json());
+    sessions.push({ cookie, contactIds: page.data.items.map((contact: { id: string }) => contact.id) });
+  }
+
+  const keyResponse = await fetch(`${BASE_URL}/api/keys`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', Cookie: sessions[0].cookie },
+    body: JSON.stringify({ name: `loadtest-${RUN_ID}` }),
+  }).then(res => res.json());
+  const apiKey: string = keyResponse.data.apiKey;
+
+  const externalIds: string[] = [];
+  for (let i = 0; i < CONCURRENCY * 5; i++) {
+    const externalId = `loadtest-${RUN_ID}-${i}`;
+    const response = await fetch(`${BASE_URL}/api/external/contact`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', 'X-API-Key': apiKey },
+      body: JSON.stringify({ firstName: 'Load', lastName: 'Test', email: `${externalId}@example.com`, phone: randomPhone(), externalId }),
+    });
+    await response.arrayBuffer();
+    if (response.ok) {
+      externalIds.push(externalId);
+    }
+  }
+
+  return { sessions, apiKey, externalIds };
+}
+
+const currentCommit = (): string => {
+  try {
+    return execSync('git rev-parse --short HEAD', { stdio: ['ignore', 'pipe', 'ignore'] }).toString().trim();
+  } catch {
+    return 'unknown';
+  }
+};
+
+const printComparison = (results: ScenarioResult[], baselinePath: string) => {
+  const baseline = JSON.parse(fs.readFileSync(baselinePath, 'utf8'));
+  const before = new Map<string, ScenarioResult>(baseline.results.map((result: ScenarioResult) => [result.scenario, result]));
+  const change = (now: number, then?: number) => (then ? `${(((now - then) / then) * 100).toFixed(1)}%` : 'n/a');
+
+  console.log(`\nCompared with ${baseline.commit} (${baseline.startedAt})`);
+  console.table(results.map(result => ({
+    scenario: result.scenario,
+    rps: result.rps,
+    'rps change': change(result.rps, before.get(result.scenario)?.rps),
+    p99: result.p99,
+    'p99 change': change(result.p99, before.get(result.scenario)?.p99),
+  })));
+};
+
+async function main() {
+  const startedAt = new Date().toISOString();
+  const { sessions, apiKey, externalIds } = await setUp();
+  const session = (worker: number) => sessions[worker % sessions.length];
+  const deepCursors: Array<string | undefined> = [];
+
+  const scenarios: Record<string, Operation> = {
+    'login': worker => fetch(`${BASE_URL}/login`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ email: `${PREFIX}-${worker % USERS}@example.com`, password: PASSWORD }),
+    }),
+    'list: first page': worker => fetch(`${BASE_URL}/contacts?cursor=&pageSize=20`, { headers: { Cookie: session(worker).cookie } }),
+    'list: deep pages': async worker => {
+      // Each worker walks its owner's list page by page, starting over at the end
+      const response = await fetch(`${BASE_URL}/contacts?cursor=${encodeURIComponent(deepCursors[worker] ?? '')}&pageSize=100`, {
+        headers: { Cookie: session(worker).cookie },
+      });
+      const body = await response.clone().json().catch(() => undefined);
+      deepCursors[worker] = body?.data?.pagination?.nextCursor ?? undefined;
+      return response;
+    },
+    'filter: lastName prefix': (worker, iteration) => fetch(`${BASE_URL}/contacts?cursor=&pageSize=20&filter=${['Sm', 'Jo', 'Ga', 'Le', 'Ng'][iteration % 5]}`, {
+      headers: { Cookie: session(worker).cookie },
+    }),
+    'create': (worker, iteration) => fetch(`${BASE_URL}/contact`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', Cookie: session(worker).cookie },
+      body: JSON.stringify({ firstName: 'Load', lastName: 'Test', email: `lt-${RUN_ID}-${worker}-${iteration}@example.com`, phone: randomPhone() }),
+    }),
+    'update': (worker, iteration) => {
+      const { cookie, contactIds } = session(worker);
+      return fetch(`${BASE_URL}/contact/${contactIds[iteration % contactIds.length]}`, {
+        method: 'PATCH',
+        headers: { 'Content-Type': 'application/json', Cookie: cookie },
+        body: JSON.stringify({ phone: randomPhone() }),
+      });
+    },
+    'external: get by externalId': (worker, iteration) => fetch(`${BASE_URL}/api/external/contact/${externalIds[(worker + iteration) % externalIds.length]}`, {
+      headers: { 'X-API-Key': apiKey },
+    }),
+    'external: update by externalId': (worker, iteration) => fetch(`${BASE_URL}/api/external/contact/${externalIds[(worker * 5 + iteration) % externalIds.length]}`, {
+      method: 'PATCH',
+      headers: { 'Content-Type': 'application/json', 'X-API-Key': apiKey },
+      body: JSON.stringify({ phone: randomPhone() }),
+    }),
+  };
+
+  const results: ScenarioResult[] = [];
+  for (const [scenario, operation] of Object.entries(scenarios)) {
+    if (SCENARIOS && !SCENARIOS.includes(scenario)) {
+      continue;
+    }
+    console.log(`Running ${scenario}...`);
+    results.push(await runScenario(scenario, operation));
+  }
+  if (!SCENARIOS || SCENARIOS.includes('sse')) {
+    console.log('Running SSE fan-out...');
+    results.push(await runSseFanOut(sessions[0]));
+  }
+
+  console.log(`\n${CONCURRENCY} workers, ${DURATION_MS / 1000}s per scenario against ${BASE_URL}`);
+  console.table(results);
+
+  const commit = currentCommit();
+  fs.mkdirSync(REPORT_DIR, { recursive: true });
+  const reportPath = path.join(REPORT_DIR, `${startedAt.replace(/[:.]/g, '-')}-${commit}.json`);
+  fs.writeFileSync(reportPath, JSON.stringify({
+    commit,
+    startedAt,
+    config: { baseUrl: BASE_URL, durationMs: DURATION_MS, concurrency: CONCURRENCY, users: USERS, sseClients: SSE_CLIENTS, sseEvents: SSE_EVENTS },
+    results,
+  }, null, 2));
+  console.log(`Report written to ${reportPath}`);
+
+  if (BASELINE) {
+    printComparison(results, BASELINE);
+  }
+}
+
+main().catch(error => {
+  console.error('❌ Load test failed:', error);
+  process.exit(1);
+});
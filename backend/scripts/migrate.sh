@@ -0,0 +1,17 @@
+#!/bin/sh
+
+# One-off release step: apply migrations and seed an empty database.
+# Runs as its own ECS task before the service rolls (see BackendStack), so web tasks boot
+# without waiting on the migration lock or the Prisma CLI.
+
+# Exit on any error
+set -e
+
+# Construct DATABASE_URL from individual environment variables
+export DATABASE_URL="postgresql://${PGUSER}:${PGPASSWORD}@${PGHOST}:${PGPORT}/${PGDATABASE}"
+
+echo "Running database migrations..."
+node node_modules/prisma/build/index.js migrate deploy
+
+echo "Seeding database if empty..."
+node dist/init-db.js
@@ -0,0 +1,157 @@
+/**
+ * Contact projection benchmark
+ * Compares one page of GET /contacts fetched the old way (owner joined, password hash included)
+ * against the slim default row and a sparse ?fields= selection.
+ *
+ * Reports, per page: bytes Postgres returned (sum of pg_column_size over the selected columns),
+ * bytes Prisma materialized, bytes of the serialized API payload and mean query latency.
+ *
+ * Usage: DATABASE_URL=... npx ts-node scripts/projection-benchmark.ts
+ * Options: BENCH_OWNER_EMAIL (defaults to the user with the most contacts), BENCH_PAGE_SIZE, BENCH_ITERATIONS
+ */
+
+import { Prisma, PrismaClient } from '@prisma/client';
+import { ContactField } from '../src/dtos/external/contact.dto';
+import { ContactMapper } from '../src/dtos/mappers/contact.mapper';
+
+const PAGE_SIZE = parseInt(process.env.BENCH_PAGE_SIZE || '20');
+const ITERATIONS = parseInt(process.env.BENCH_ITERATIONS || '200');
+const SPARSE_FIELDS: ContactField[] = ['id', 'firstName', 'lastName'];
+
+const prisma = new PrismaClient();
+
+const ORDER_BY: Prisma.ContactOrderByWithRelationInput[] = [
+  { lastName: 'asc' },
+  { firstName: 'asc' },
+  { createdAt: 'asc' }
+];
+
+interface Scenario {
+  name: string;
+  fetchPage: (ownerId: string) => Promise<any[]>;
+  serialize: (rows: any[]) => unknown[];
+  // Columns read from Postgres, used to measure row width server-side
+  contactColumns: string[];
+  joinsOwner: boolean;
+}
+
+const ALL_COLUMNS = ['id', 'ownerId', 'externalId', 'firstName', 'lastName', 'email', 'phone', 'createdAt', 'updatedAt'];
+
+const scenarios: Scenario[] = [
+  {
+    name: 'before: include owner (with password)',
+    fetchPage: ownerId => prisma.contact.findMany({
+      where: { ownerId },
+      orderBy: ORDER_BY,
+      take: PAGE_SIZE,
+      include: {
+        owner: {
+          select: { id: true, firstName: true, lastName: true, email: true, password: true, createdAt: true, updatedAt: true }
+        }
+      }
+    }),
+    // The old mapper emitted the owner without its password
+    serialize: rows => rows.map(row => ({
+      ...ContactMapper.toContactDto(row),
+      owner: { id: row.owner.id, firstName: row.owner.firstName, lastName: row.owner.lastName, email: row.owner.email }
+    })),
+    contactColumns: ALL_COLUMNS,
+    joinsOwner: true
+  },
+  {
+    name: 'after: contact row only (default)',
+    fetchPage: ownerId => prisma.contact.findMany({ where: { ownerId }, orderBy: ORDER_BY, take: PAGE_SIZE }),
+    serialize: rows => rows.map(row => ContactMapper.toContactProjectionDto(row)),
+    contactColumns: ALL_COLUMNS,
+    joinsOwner: false
+  },
+  {
+    name: `after: ?fields=${SPARSE_FIELDS.join(',')}`,
+    fetchPage: ownerId => prisma.contact.findMany({
+      where: { ownerId },
+      orderBy: ORDER_BY,
+      take: PAGE_SIZE,
+      select: { id: true, firstName: true, lastName: true }
+    }),
+    serialize: rows => rows.map(row => ContactMapper.toContactProjectionDto(row, SPARSE_FIELDS)),
+    contactColumns: SPARSE_FIELDS,
+    joinsOwner: false
+  }
+];
+
+async function resolveOwnerId(): Promise<string> {
+  if (process.env.BENCH_OWNER_EMAIL) {
+    const user = await prisma.user.findUnique({ where: { email: process.env.BENCH_OWNER_EMAIL } });
+    if (!user) {
+      throw new Error(`No user with email ${process.env.BENCH_OWNER_EMAIL}`);
+    }
+    return user.id;
+  }
+
+  const [top] = await prisma.contact.groupBy({
+    by: ['ownerId'],
+    _count: { id: true },
+    orderBy: { _count: { id: 'desc' } },
+    take: 1
+  });
+  if (!top) {
+    throw new Error('No contacts found - seed the database first');
+  }
+  return top.ownerId;
+}
+
+// Bytes Postgres hands back for one page of the given columns (plus the owner row per contact when joined)
+async function postgresBytes(ownerId: string, scenario: Scenario): Promise<number> {
+  const columns = Prisma.join(scenario.contactColumns.map(column => Prisma.sql`pg_column_size(c.${Prisma.raw(`"${column}"`)})`), ' + ');
+  const ownerWidth = scenario.joinsOwner
+    ? Prisma.sql` + (SELECT pg_column_size(u."id") + pg_column_size(u."firstName") + pg_column_size(u."lastName")
+        + pg_column_size(u."email") + pg_column_size(u."password") + pg_column_size(u."createdAt") + pg_column_size(u."updatedAt")
+        FROM "users" u WHERE u."id" = c."ownerId")`
+    : Prisma.empty;
+
+  const [result] = await prisma.$queryRaw<{ bytes: bigint | null }[]>`
+    SELECT SUM(width)::bigint AS bytes FROM (
+      SELECT (${columns})${ownerWidth} AS width
+      FROM "contacts" c
+      WHERE c."ownerId" = ${ownerId}
+      ORDER BY c."lastName", c."firstName", c."createdAt"
+      LIMIT ${PAGE_SIZE}
+    ) page
+  `;
+  return Number(result?.bytes ?? 0);
+}
+
+async function run(): Promise<void> {
+  const ownerId = await resolveOwnerId();
+  console.log(`Owner ${ownerId}, page size ${PAGE_SIZE}, ${ITERATIONS} iterations per scenario\n`);
+
+  const results = [];
+  for (const scenario of scenarios) {
+    // Warm up the connection pool and plan cache
+    const rows = await scenario.fetchPage(ownerId);
+
+    const started = process.hrtime.bigint();
+    for (let i = 0; i < ITERATIONS; i++) {
+      await scenario.fetchPage(ownerId);
+    }
+    const meanMs = Number(process.hrtime.bigint() - started) / 1e6 / ITERATIONS;
+
+    results.push({
+      scenario: scenario.name,
+      rows: rows.length,
+      postgresBytes: await postgresBytes(ownerId, scenario),
+      materializedBytes: Buffer.byteLength(JSON.stringify(rows)),
+      responseBytes: Buffer.byteLength(JSON.stringify(scenario.serialize(rows))),
+      meanQueryMs: Number(meanMs.toFixed(2))
+    });
+  }
+
+  console.table(results);
+}
+
+run()
+  .catch(error => {
+    console.error(error);
+    process.exitCode = 1;
+  })
+  .finally(() => prisma.$disconnect());
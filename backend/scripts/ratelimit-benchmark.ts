@@ -0,0 +1,69 @@
+/**
+ * Rate limiter overhead benchmark
+ * Times RateLimiter.consume() - the work the rate-limit middleware adds to every request - with
+ * the in-process store and, when REDIS_URL is set, with the shared Redis store. Calls run at the
+ * given concurrency so Redis round trips overlap as they would under load.
+ *
+ * Usage: REDIS_URL=redis://localhost:6379 npm run bench:ratelimit
+ * Options: RATELIMIT_BENCH_REQUESTS (default 20000), RATELIMIT_BENCH_CONCURRENCY (default 50),
+ *          RATELIMIT_BENCH_KEYS (distinct callers, default 1000)
+ */
+
+import { createRedisClient } from '../src/lib/redis';
+import { RateLimiter } from '../src/services/rateLimiter';
+
+const REQUESTS = parseInt(process.env.RATELIMIT_BENCH_REQUESTS || '20000');
+const CONCURRENCY = parseInt(process.env.RATELIMIT_BENCH_CONCURRENCY || '50');
+const KEYS = parseInt(process.env.RATELIMIT_BENCH_KEYS || '1000');
+
+const percentile = (sorted: number[], p: number) => sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * p))];
+
+async function runScenario(name: string, limiter: RateLimiter) {
+  const latencies: number[] = [];
+  let next = 0;
+
+  const started = process.hrtime.bigint();
+  await Promise.all(Array.from({ length: CONCURRENCY }, async () => {
+    while (next < REQUESTS) {
+      const caller = next++ % KEYS;
+      const callStarted = process.hrtime.bigint();
+      await limiter.consume('ip', `bench-${caller}`);
+      latencies.push(Number(process.hrtime.bigint() - callStarted) / 1e3);
+    }
+  }));
+  const seconds = Number(process.hrtime.bigint() - started) / 1e9;
+
+  latencies.sort((a, b) => a - b);
+  return {
+    scenario: name,
+    'calls/s': Math.round(REQUESTS / seconds),
+    'p50 (µs)': Math.round(percentile(latencies, 0.5)),
+    'p99 (µs)': Math.round(percentile(latencies, 0.99)),
+    'max (µs)': Math.round(latencies[latencies.length - 1]),
+  };
+}
+
+async function main() {
+  // Limits high enough that every call is allowed and counted
+  const limits = { ip: Number.MAX_SAFE_INTEGER, user: Number.MAX_SAFE_INTEGER, apiKey: Number.MAX_SAFE_INTEGER };
+  const results = [await runScenario('in-process', new RateLimiter({ windowMs: 60000, limits }))];
+
+  const redis = createRedisClient();
+  if (redis) {
+    await redis.connect();
+    const limiter = new RateLimiter({ windowMs: 60000, limits });
+    limiter.attachRedis(redis);
+    results.push(await runScenario('redis', limiter));
+    await redis.disconnect();
+  } else {
+    console.log('REDIS_URL not set - skipping the Redis store');
+  }
+
+  console.log(`\n${REQUESTS} calls, concurrency ${CONCURRENCY}, ${KEYS} keys`);
+  console.table(results);
+}
+
+main().catch(error => {
+  console.error(error);
+  process.exitCode = 1;
+});
@@ -0,0 +1,110 @@
+/**
+ * Contact search benchmark
+ * Seeds one owner at each size and times one page of results for:
+ *   - the existing list filter (lastName prefix, ILIKE 'x%')
+ *   - the same substring match over name, email and phone without the trigram index
+ *   - GET /contacts/search (pg_trgm GIN index, ranked)
+ *
+ * The second scenario is what the old filter would cost if it matched the same fields as search.
+ * Seeded owners are deleted afterwards (contacts cascade).
+ *
+ * Usage: DATABASE_URL=... npx ts-node scripts/search-benchmark.ts
+ * Options: BENCH_SIZES (default 10000,100000,1000000), BENCH_ITERATIONS, BENCH_QUERY, BENCH_PAGE_SIZE
+ */
+
+import { Prisma, PrismaClient } from '@prisma/client';
+import { summarize } from '../src/__benchmarks__/latency';
+import { prisma as appPrisma } from '../src/lib/prisma';
+import { ContactRepository } from '../src/repositories/contactRepository';
+
+const SIZES = (process.env.BENCH_SIZES || '10000,100000,1000000').split(',').map(size => parseInt(size));
+const ITERATIONS = parseInt(process.env.BENCH_ITERATIONS || '30');
+const QUERY = process.env.BENCH_QUERY || 'smi';
+const PAGE_SIZE = parseInt(process.env.BENCH_PAGE_SIZE || '20');
+const RUN_ID = Date.now().toString(36);
+
+const prisma = new PrismaClient();
+const contactRepository = new ContactRepository();
+
+const LAST_NAMES = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez'];
+const FIRST_NAMES = ['James', 'Mary', 'Robert', 'Patricia', 'John', 'Jennifer', 'Michael', 'Linda', 'David', 'Elizabeth'];
+
+async function seedOwner(size: number): Promise<string> {
+  const owner = await prisma.user.create({
+    data: {
+      email: `search-bench-${size}-${RUN_ID}@example.com`,
+      password: 'not-a-real-hash',
+      firstName: 'Search',
+      lastName: 'Bench',
+    },
+  });
+
+  // Names cycle through common values with a numeric suffix so the data has realistic repetition
+  await prisma.$executeRaw`
+    INSERT INTO "contacts" ("id", "ownerId", "firstName", "lastName", "email", "phone", "createdAt", "updatedAt")
+    SELECT gen_random_uuid()::text, ${owner.id},
+      (${FIRST_NAMES}::text[])[1 + i % 10],
+      (${LAST_NAMES}::text[])[1 + (i / 10) % 10] || (i / 100)::text,
+      'contact' || i || '@' || md5(i::text) || '.example.com',
+      '+1' || lpad(i::text, 10, '0'),
+      now(), now()
+    FROM generate_series(0, ${size - 1}) AS i
+  `;
+  await prisma.$executeRaw`ANALYZE "contacts"`;
+  return owner.id;
+}
+
+async function run(): Promise<void> {
+  const pattern = `%${QUERY}%`;
+  const results = [];
+
+  for (const size of SIZES) {
+    console.log(`Seeding ${size} contacts...`);
+    const ownerId = await seedOwner(size);
+
+    const scenarios: Record<string, () => Promise<unknown>> = {
+      'filter: lastName prefix': () => prisma.contact.findMany({
+        where: { ownerId, lastName: { startsWith: QUERY, mode: 'insensitive' } },
+        orderBy: [{ lastName: 'asc' }, { firstName: 'asc' }, { createdAt: 'asc' }],
+        take: PAGE_SIZE,
+      }),
+      'filter: substring, 4 fields, no index': () => prisma.$transaction(async tx => {
+        // Index scans off: what the ILIKE '%x%' OR chain costs without pg_trgm
+        await tx.$executeRaw`SET LOCAL enable_bitmapscan = off`;
+        return tx.$queryRaw(Prisma.sql`
+          SELECT * FROM "contacts"
+          WHERE "ownerId" = ${ownerId}
+            AND ("firstName" ILIKE ${pattern} OR "lastName" ILIKE ${pattern} OR "email" ILIKE ${pattern} OR "phone" ILIKE ${pattern})
+          ORDER BY "lastName", "firstName", "createdAt"
+          LIMIT ${PAGE_SIZE}
+        `);
+      }),
+      'search: pg_trgm, ranked': () => contactRepository.searchByOwnerId(ownerId, QUERY, { pageSize: PAGE_SIZE, includeTotal: false }),
+    };
+
+    for (const [scenario, fetchPage] of Object.entries(scenarios)) {
+      // Warm up the connection pool and buffer cache
+      await fetchPage();
+
+      const samples: number[] = [];
+      for (let i = 0; i < ITERATIONS; i++) {
+        const started = process.hrtime.bigint();
+        await fetchPage();
+        samples.push(Number(process.hrtime.bigint() - started) / 1e6);
+      }
+      results.push({ contacts: size, scenario, ...summarize(samples) });
+    }
+
+    await prisma.user.delete({ where: { id: ownerId } });
+  }
+
+  console.log(`\nQuery "${QUERY}", page size ${PAGE_SIZE}, ${ITERATIONS} iterations per scenario`);
+  console.table(results);
+}
+
+run()
+  .catch(error => {
+    console.error(error);
+    process.exitCode = 1;
+  })
+  .finally(() => Promise.all([prisma.$disconnect(), appPrisma.$disconnect()]));
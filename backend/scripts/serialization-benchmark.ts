@@ -0,0 +1,126 @@
+/**
+ * Response serialization and request validation microbenchmark
+ * In-process, no database. For a page of BENCH_PAGE_SIZE contacts (and of history entries) it
+ * compares the previous path - ContactMapper to DTOs, ResponseFormatter, JSON.stringify - with
+ * the precompiled ContactSerializer writing the internal rows directly. Both must produce the
+ * same bytes before anything is timed. It also times Joi validation of a create-contact body
+ * with per-call options against the schema prepared once by validateRequest.
+ *
+ * Reports operations per second and, for serializers, MB/s of JSON written.
+ *
+ * Usage: npm run bench:serialization
+ * Options: BENCH_PAGE_SIZE (default 100), BENCH_DURATION_MS (per scenario, 2000)
+ */
+
+import crypto from 'crypto';
+import { ContactMapper } from '../src/dtos/mappers/contact.mapper';
+import { ContactSerializer } from '../src/dtos/serializers/contact.serializer';
+import { encodeHistoryChanges } from '../src/lib/contactHistoryCodec';
+import { ResponseFormatter } from '../src/utils/responseFormatter';
+import { contactSchemas } from '../src/validation/contact.schemas';
+
+const PAGE_SIZE = parseInt(process.env.BENCH_PAGE_SIZE || '100');
+const DURATION_MS = parseInt(process.env.BENCH_DURATION_MS || '2000');
+
+const FIRST_NAMES = ['James', 'Mary', 'Zoë', 'Hiroshi', 'Fatima', 'Lars'];
+const LAST_NAMES = ['Smith', "O'Brien", 'Müller', 'Nguyen', 'Okafor', 'Silva'];
+
+const now = Date.now();
+const contacts = Array.from({ length: PAGE_SIZE }, (_, i) => ({
+  id: crypto.randomUUID(),
+  ownerId: crypto.randomUUID(),
+  externalId: i % 2 === 0 ? `ext-${i}` : null,
+  historyCount: i % 5,
+  firstName: FIRST_NAMES[i % FIRST_NAMES.length],
+  lastName: LAST_NAMES[i % LAST_NAMES.length],
+  email: `contact.${i}@example.com`,
+  phone: `+1555${String(i).padStart(7, '0')}`,
+  createdAt: new Date(now - i * 60000),
+  updatedAt: new Date(now - i * 30000),
+}));
+const history = contacts.map((contact, i) => ({
+  id: crypto.randomUUID(),
+  contactId: contact.id,
+  ...encodeHistoryChanges(i % 2 === 0
+    ? { email: { before: `old.${contact.email}`, after: contact.email } }
+    : { firstName: { before: 'Jon', after: contact.firstName }, phone: { before: '+15550000000', after: contact.phone } }),
+  createdAt: contact.updatedAt,
+}));
+const pagination = { page: 1, pageSize: PAGE_SIZE, total: 10000, totalPages: Math.ceil(10000 / PAGE_SIZE) };
+
+const createBody = { firstName: 'Ada', lastName: 'Lovelace', email: 'ada@example.com', phone: '+15550100' };
+const createSchema = contactSchemas.createContact.body;
+const preparedCreateSchema = createSchema.prefs({ abortEarly: false });
+const VALIDATION_OPTIONS = { abortEarly: false };
+
+interface Scenario {
+  name: string;
+  run: () => unknown;
+}
+
+const scenarios: Scenario[] = [
+  {
+    name: `contacts: mapper + JSON.stringify`,
+    run: () => JSON.stringify(ResponseFormatter.paginated(contacts.map(contact => ContactMapper.toContactProjectionDto(contact)), pagination)),
+  },
+  {
+    name: `contacts: ContactSerializer.page`,
+    run: () => ContactSerializer.page()(ResponseFormatter.paginated(contacts, pagination)),
+  },
+  {
+    name: `history: mapper + JSON.stringify`,
+    run: () => JSON.stringify(ResponseFormatter.paginated(history.map(entry => ContactMapper.toContactHistoryDto(entry)), pagination)),
+  },
+  {
+    name: `history: ContactSerializer.historyPage`,
+    run: () => ContactSerializer.historyPage(ResponseFormatter.paginated(history, pagination)),
+  },
+  {
+    name: 'validate create body: options per call',
+    run: () => createSchema.validate(createBody, VALIDATION_OPTIONS),
+  },
+  {
+    name: 'validate create body: prepared schema',
+    run: () => preparedCreateSchema.validate(createBody),
+  },
+];
+
+const throughput = (scenario: Scenario) => {
+  // Warm up so both paths are optimized before timing
+  for (let i = 0; i < 1000; i++) {
+    scenario.run();
+  }
+
+  let operations = 0;
+  let bytes = 0;
+  const started = process.hrtime.bigint();
+  const deadline = started + BigInt(DURATION_MS) * 1000000n;
+  while (process.hrtime.bigint() < deadline) {
+    const result = scenario.run();
+    if (typeof result === 'string') {
+      bytes += result.length;
+    }
+    operations++;
+  }
+  const seconds = Number(process.hrtime.bigint() - started) / 1e9;
+
+  return {
+    scenario: scenario.name,
+    opsPerSecond: Math.round(operations / seconds),
+    ...(bytes > 0 && { mbPerSecond: Number((bytes / seconds / 1024 / 1024).toFixed(1)) }),
+  };
+};
+
+const run = () => {
+  // The compiled path is only worth timing if it writes exactly what the mapper path did
+  for (const [mapped, compiled] of [[scenarios[0], scenarios[1]], [scenarios[2], scenarios[3]]]) {
+    if (mapped.run() !== compiled.run()) {
+      throw new Error(`${compiled.name} output differs from ${mapped.name}`);
+    }
+  }
+
+  console.log(`Page of ${PAGE_SIZE} items, ${DURATION_MS}ms per scenario`);
+  console.table(scenarios.map(throughput));
+};
+
+run();
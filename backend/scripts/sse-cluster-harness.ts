@@ -0,0 +1,105 @@
+/**
+ * SSE cluster harness
+ * Verifies that an event emitted by one backend process reaches an SSE client held by another.
+ *
+ * Usage: TASK_A_URL=http://localhost:4000 TASK_B_URL=http://localhost:4001 npx ts-node scripts/sse-cluster-harness.ts
+ * (scripts/sse-cluster-test.sh starts both processes and runs this for you)
+ */
+
+const TASK_A_URL = process.env.TASK_A_URL || 'http://localhost:4000';
+const TASK_B_URL = process.env.TASK_B_URL || 'http://localhost:4001';
+const EMAIL = process.env.HARNESS_EMAIL || 'admin@example.com';
+const PASSWORD = process.env.HARNESS_PASSWORD || 'password123';
+const TIMEOUT_MS = parseInt(process.env.HARNESS_TIMEOUT_MS || '60000');
+
+async function login(baseUrl: string): Promise<string> {
+  const response = await fetch(`${baseUrl}/login`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ email: EMAIL, password: PASSWORD }),
+  });
+  const cookie = response.headers.get('set-cookie');
+  if (!response.ok || !cookie) {
+    throw new Error(`Login against ${baseUrl} failed with status ${response.status}`);
+  }
+  return cookie.split(';')[0];
+}
+
+// Resolve with the first SSE message whose type matches, read from `baseUrl`
+async function waitForEvent(baseUrl: string, cookie: string, eventType: string, signal: AbortSignal): Promise<any> {
+  const response = await fetch(`${baseUrl}/api/events`, { headers: { Cookie: cookie }, signal });
+  if (!response.ok || !response.body) {
+    throw new Error(`SSE connection to ${baseUrl} failed with status ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) {
+      throw new Error('SSE stream closed before the expected event arrived');
+    }
+    buffer += decoder.decode(value, { stream: true });
+
+    let separator = buffer.indexOf('\n\n');
+    while (separator !== -1) {
+      const frame = buffer.slice(0, separator);
+      buffer = buffer.slice(separator + 2);
+      const dataLine = frame.split('\n').find(line => line.startsWith('data: '));
+      if (dataLine) {
+        const message = JSON.parse(dataLine.slice('data: '.length));
+        if (message.type === eventType) {
+          return message;
+        }
+      }
+      separator = buffer.indexOf('\n\n');
+    }
+  }
+}
+
+async function main() {
+  // Sessions live in the shared Redis store, so one cookie is valid on both tasks
+  const cookie = await login(TASK_A_URL);
+  const controller = new AbortController();
+  const timeout = setTimeout(() => controller.abort(), TIMEOUT_MS);
+
+  const received = waitForEvent(TASK_B_URL, cookie, 'contact:created', controller.signal);
+  // Give task B a moment to register the stream before emitting on task A
+  await new Promise(resolve => setTimeout(resolve, 500));
+
+  const suffix = Date.now();
+  const createResponse = await fetch(`${TASK_A_URL}/contact`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', Cookie: cookie },
+    body: JSON.stringify({
+      firstName: 'Cluster',
+      lastName: 'Harness',
+      email: `cluster.harness.${suffix}@example.com`,
+      phone: '+1-555-0199',
+    }),
+  });
+  if (!createResponse.ok) {
+    throw new Error(`Create on ${TASK_A_URL} failed with status ${createResponse.status}`);
+  }
+  const created = await createResponse.json();
+
+  const event = await received;
+  clearTimeout(timeout);
+  controller.abort();
+
+  if (event.data.id !== created.data.id) {
+    throw new Error(`Task B received contact ${event.data.id}, expected ${created.data.id}`);
+  }
+
+  // Clean up the harness contact
+  await fetch(`${TASK_A_URL}/contact/${created.data.id}`, { method: 'DELETE', headers: { Cookie: cookie } });
+
+  console.log(`✅ contact:created emitted on ${TASK_A_URL} was delivered to an SSE client on ${TASK_B_URL}`);
+}
+
+main().catch(error => {
+  console.error('❌ SSE cluster harness failed:', error);
+  process.exit(1);
+});
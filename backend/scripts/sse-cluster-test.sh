@@ -0,0 +1,43 @@
+#!/bin/bash
+
+# Run two backend processes against one local Redis and check that SSE events cross between them.
+# Requires DATABASE_URL to point at a migrated database and a Redis reachable at REDIS_URL.
+set -e
+
+export REDIS_URL="${REDIS_URL:-redis://localhost:6379}"
+export SESSION_SECRET="${SESSION_SECRET:-sse-cluster-test-secret}"
+export CORS_ORIGIN="${CORS_ORIGIN:-http://localhost:3001}"
+PORT_A="${PORT_A:-4000}"
+PORT_B="${PORT_B:-4001}"
+
+cd "$(dirname "$0")/.."
+
+cleanup() {
+    echo "🛑 Stopping backend processes..."
+    kill $TASK_A_PID $TASK_B_PID 2>/dev/null || true
+}
+trap cleanup EXIT
+
+wait_for_health() {
+    for _ in $(seq 1 60); do
+        if curl -sf "http://localhost:$1/health" > /dev/null; then
+            return 0
+        fi
+        sleep 1
+    done
+    echo "❌ Backend on port $1 did not become healthy"
+    exit 1
+}
+
+echo "🔧 Starting task A on port $PORT_A and task B on port $PORT_B (Redis: $REDIS_URL)..."
+PORT=$PORT_A npx ts-node --transpile-only src/index.ts &
+TASK_A_PID=$!
+PORT=$PORT_B npx ts-node --transpile-only src/index.ts &
+TASK_B_PID=$!
+
+wait_for_health "$PORT_A"
+wait_for_health "$PORT_B"
+
+echo "🧪 Running SSE cluster harness..."
+TASK_A_URL="http://localhost:$PORT_A" TASK_B_URL="http://localhost:$PORT_B" \
+    npx ts-node --transpile-only scripts/sse-cluster-harness.ts
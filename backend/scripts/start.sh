@@ -5,12 +5,21 @@ set -e
 
 echo "Starting application..."
 
-# Construct DATABASE_URL from individual environment variables
-export DATABASE_URL="postgresql://${PGUSER}:${PGPASSWORD}@${PGHOST}:${PGPORT}/${PGDATABASE}"
+# Construct DATABASE_URL from individual environment variables. Behind a pooler (RDS Proxy or the
+# PgBouncer sidecar) queries go to PGPROXYHOST; migrations always connect to PGHOST directly.
+# Pool size and pgbouncer mode are appended by src/lib/prisma.ts (DB_CONNECTION_LIMIT, DB_POOL_TIMEOUT, DB_PGBOUNCER).
+export DATABASE_URL="postgresql://${PGUSER}:${PGPASSWORD}@${PGPROXYHOST:-${PGHOST}}:${PGPROXYPORT:-${PGPORT}}/${PGDATABASE}"
 
-# Run database migrations
-echo "Running database migrations..."
-npx prisma migrate deploy
+# Optional Aurora reader endpoint for list/history reads
+if [ -n "${PGREADHOST}" ]; then
+  export DATABASE_READ_URL="postgresql://${PGUSER}:${PGPASSWORD}@${PGREADHOST}:${PGPORT}/${PGDATABASE}"
+fi
+
+# Migrations normally run once per deploy as a separate task (scripts/migrate.sh).
+# RUN_MIGRATIONS=true restores migrate-on-boot for single-container setups.
+if [ "${RUN_MIGRATIONS}" = "true" ]; then
+  ./scripts/migrate.sh
+fi
 
 # Start the application
 echo "Starting the application..."
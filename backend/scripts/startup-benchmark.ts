@@ -0,0 +1,117 @@
+/**
+ * Cold-start benchmark
+ * Boots the built server (dist/index.js) repeatedly and measures time from spawn to the port
+ * accepting connections and to the first 200 from /health - the point the load balancer starts
+ * routing to a new task. The server's own timings (measured from process start) are read from the
+ * startup_seconds gauge on /metrics, which the benchmark enables on the spawned server.
+ *
+ * Usage: npm run build && DATABASE_URL=... npm run bench:startup
+ * Options: STARTUP_BENCH_RUNS (default 5), STARTUP_BENCH_PORT (default 3900),
+ *          STARTUP_BENCH_TIMEOUT_MS (default 60000); the server's own env (REDIS_URL, ...) passes through
+ */
+
+import { ChildProcess, spawn } from 'child_process';
+import path from 'path';
+
+const RUNS = parseInt(process.env.STARTUP_BENCH_RUNS || '5');
+const PORT = parseInt(process.env.STARTUP_BENCH_PORT || '3900');
+const TIMEOUT_MS = parseInt(process.env.STARTUP_BENCH_TIMEOUT_MS || '60000');
+const POLL_MS = 20;
+
+interface RunResult {
+  listeningMs: number;
+  readyMs: number;
+  serverListeningMs: number | null;
+  serverReadyMs: number | null;
+}
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
+const stop = (child: ChildProcess) => new Promise<void>(resolve => {
+  if (child.exitCode !== null) {
+    return resolve();
+  }
+  child.once('exit', () => resolve());
+  child.kill('SIGTERM');
+});
+
+/**
+ * Startup phases from the server's startup_seconds gauge, in milliseconds
+ */
+async function serverTimings(): Promise<Record<string, number>> {
+  const headers: Record<string, string> = process.env.METRICS_TOKEN ? { Authorization: `Bearer ${process.env.METRICS_TOKEN}` } : {};
+  const response = await fetch(`http://localhost:${PORT}/metrics`, { headers });
+  const text = await response.text();
+  const timings: Record<string, number> = {};
+  for (const match of text.matchAll(/^startup_seconds\{phase="(\w+)"\} (\S+)$/gm)) {
+    timings[match[1]] = Number(match[2]) * 1000;
+  }
+  return timings;
+}
+
+async function run(): Promise<RunResult> {
+  const started = process.hrtime.bigint();
+  const elapsed = () => Number(process.hrtime.bigint() - started) / 1e6;
+  const child = spawn('node', [path.join(__dirname, '..', 'dist', 'index.js')], {
+    env: { ...process.env, PORT: String(PORT), METRICS_ENABLED: 'true' },
+    stdio: 'ignore',
+  });
+
+  let listeningMs: number | null = null;
+  try {
+    while (elapsed() < TIMEOUT_MS) {
+      if (child.exitCode !== null) {
+        throw new Error(`Server exited with code ${child.exitCode}`);
+      }
+      try {
+        const response = await fetch(`http://localhost:${PORT}/health`);
+        listeningMs ??= elapsed();
+        if (response.status === 200) {
+          const readyMs = elapsed();
+          await response.arrayBuffer();
+          const timings = await serverTimings();
+          return {
+            listeningMs,
+            readyMs,
+            serverListeningMs: timings.listening ?? null,
+            serverReadyMs: timings.ready ?? null,
+          };
+        }
+        await response.arrayBuffer();
+      } catch (error) {
+        if (error instanceof Error && error.message.startsWith('Server exited')) {
+          throw error;
+        }
+        // Not accepting connections yet
+      }
+      await sleep(POLL_MS);
+    }
+    throw new Error(`Server not healthy after ${TIMEOUT_MS}ms`);
+  } finally {
+    await stop(child);
+  }
+}
+
+async function main() {
+  const results: RunResult[] = [];
+  for (let i = 0; i < RUNS; i++) {
+    results.push(await run());
+    console.log(`  run ${i + 1}/${RUNS}: ready after ${Math.round(results[i].readyMs)}ms`);
+  }
+
+  const median = (values: number[]) => {
+    const sorted = [...values].sort((a, b) => a - b);
+    return Math.round(sorted[Math.floor(sorted.length / 2)]);
+  };
+  console.table({
+    'spawn → listening (ms)': median(results.map(result => result.listeningMs)),
+    'spawn → healthy (ms)': median(results.map(result => result.readyMs)),
+    'server: listening (ms)': median(results.map(result => result.serverListeningMs ?? NaN)),
+    'server: ready (ms)': median(results.map(result => result.serverReadyMs ?? NaN)),
+  });
+}
+
+main().catch(error => {
+  console.error(error);
+  process.exitCode = 1;
+});
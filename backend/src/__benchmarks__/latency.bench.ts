@@ -0,0 +1,150 @@
+/**
+ * Request latency benchmarks against a real Postgres.
+ * Drives the contact routes through the full middleware/controller/service/repository stack
+ * with supertest and fails when p50/p99 exceed the budgets in latency-budgets.json.
+ * With LATENCY_BUDGET_ENFORCE=false budget violations are only reported, for shared CI runners
+ * whose timings vary too much for absolute budgets.
+ *
+ * Run: DATABASE_URL=postgresql://... npm run test:bench
+ * Options: BENCH_ITERATIONS (default 50), LATENCY_BUDGET_SCALE (multiplies every budget, default 1),
+ *          LATENCY_BUDGET_ENFORCE (default true)
+ */
+
+import express from 'express';
+import session from 'express-session';
+import request from 'supertest';
+import { prisma } from '../lib/prisma';
+import { responseInterceptor } from '../middleware/responseInterceptor';
+import authRoutes from '../routes/auth';
+import contactRoutes from '../routes/contacts';
+import externalContactRoutes from '../routes/externalContacts';
+import { ApiKeyService } from '../services/apiKeyService';
+import budgets from './latency-budgets.json';
+import { checkBudget, LatencyBudget, LatencyStats, measure } from './latency';
+
+const ITERATIONS = parseInt(process.env.BENCH_ITERATIONS || '50');
+const BUDGET_SCALE = parseFloat(process.env.LATENCY_BUDGET_SCALE || '1');
+const ENFORCE_BUDGETS = process.env.LATENCY_BUDGET_ENFORCE !== 'false';
+const RUN_ID = Date.now().toString(36);
+const EMAIL = `latency-bench-${RUN_ID}@example.com`;
+const PASSWORD = 'bench-password-123';
+
+// Same middleware order as src/index.ts minus rate limiting, compression and Redis
+const buildApp = () => {
+  const app = express();
+  app.use(express.json({ limit: '10mb' }));
+  app.use(responseInterceptor);
+  app.use(session({ secret: 'latency-bench', resave: false, saveUninitialized: false }));
+  app.use('/', authRoutes);
+  app.use('/contact', contactRoutes);
+  app.use('/contacts', contactRoutes);
+  app.use('/api/external/contact', externalContactRoutes);
+  return app;
+};
+
+const contactBody = (prefix: string, i: number) => ({
+  firstName: `Bench${i}`,
+  lastName: `${prefix}-${String(i).padStart(5, '0')}`,
+  email: `${prefix}-${i}-${RUN_ID}@example.com`,
+  phone: '+15555550100',
+});
+
+describe('Contact route latency', () => {
+  const results: Record<string, LatencyStats> = {};
+  let agent: ReturnType<typeof request.agent>;
+  let apiKey: string;
+
+  beforeAll(async () => {
+    // Every iteration creates contacts; keep the per-user limit out of the way
+    process.env.MAX_CONTACTS_PER_USER = String(ITERATIONS * 4 + 100);
+    process.env.MAX_USERS = process.env.MAX_USERS || '100000';
+
+    agent = request.agent(buildApp());
+    const registered = await agent.post('/register').send({
+      email: EMAIL,
+      password: PASSWORD,
+      firstName: 'Latency',
+      lastName: 'Bench',
+    });
+    expect(registered.status).toBe(201);
+
+    const user = await prisma.user.findUniqueOrThrow({ where: { email: EMAIL } });
+    ({ apiKey } = await new ApiKeyService().createApiKey(user.id, { name: `latency-bench-${RUN_ID}` }));
+  });
+
+  afterAll(async () => {
+    // Contacts, history and API keys cascade with the user
+    await prisma.user.deleteMany({ where: { email: EMAIL } });
+    await prisma.$disconnect();
+
+    console.table(results);
+  });
+
+  it('session routes: create, list, update, delete', async () => {
+    const ids: string[] = [];
+
+    results['session:create'] = await measure(ITERATIONS, async i => {
+      const response = await agent.post('/contact').send(contactBody('session', i));
+      expect(response.status).toBe(201);
+      ids.push(response.body.data.id);
+    });
+
+    results['session:list'] = await measure(ITERATIONS, async () => {
+      const response = await agent.get('/contacts').query({ cursor: '', pageSize: 20 });
+      expect(response.status).toBe(200);
+    });
+
+    results['session:update'] = await measure(ITERATIONS, async i => {
+      const response = await agent.patch(`/contact/${ids[i]}`).send({ phone: `+1555556${String(i).padStart(4, '0')}` });
+      expect(response.status).toBe(200);
+    });
+
+    results['session:delete'] = await measure(ITERATIONS, async i => {
+      const response = await agent.delete(`/contact/${ids[i]}`);
+      expect(response.status).toBe(200);
+    });
+  });
+
+  it('external routes: create, get, update, delete', async () => {
+    const externalId = (i: number) => `latency-bench-${RUN_ID}-${i}`;
+
+    results['external:create'] = await measure(ITERATIONS, async i => {
+      const response = await agent
+        .post('/api/external/contact')
+        .set('X-API-Key', apiKey)
+        .send({ ...contactBody('external', i), externalId: externalId(i) });
+      expect(response.status).toBe(201);
+    });
+
+    // The external API has no list endpoint; single reads stand in for it
+    results['external:get'] = await measure(ITERATIONS, async i => {
+      const response = await agent.get(`/api/external/contact/${externalId(i)}`).set('X-API-Key', apiKey);
+      expect(response.status).toBe(200);
+    });
+
+    results['external:update'] = await measure(ITERATIONS, async i => {
+      const response = await agent
+        .patch(`/api/external/contact/${externalId(i)}`)
+        .set('X-API-Key', apiKey)
+        .send({ phone: `+1555557${String(i).padStart(4, '0')}` });
+      expect(response.status).toBe(200);
+    });
+
+    results['external:delete'] = await measure(ITERATIONS, async i => {
+      const response = await agent.delete(`/api/external/contact/${externalId(i)}`).set('X-API-Key', apiKey);
+      expect(response.status).toBe(200);
+    });
+  });
+
+  it('stays within the latency budgets', () => {
+    const violations = Object.entries(budgets as Record<string, LatencyBudget>).flatMap(([name, budget]) =>
+      results[name] ? checkBudget(name, results[name], budget, BUDGET_SCALE) : [`${name}: not measured`]
+    );
+
+    if (!ENFORCE_BUDGETS) {
+      violations.forEach(violation => console.warn(`Latency budget exceeded (not enforced): ${violation}`));
+      return;
+    }
+    expect(violations).toEqual([]);
+  });
+});
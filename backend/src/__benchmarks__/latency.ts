@@ -0,0 +1,62 @@
+// Latency sampling helpers for the benchmark suite
+
+export interface LatencyStats {
+  samples: number;
+  p50: number;
+  p99: number;
+  max: number;
+}
+
+export interface LatencyBudget {
+  p50: number;
+  p99: number;
+}
+
+/**
+ * Nearest-rank percentile of already sorted samples
+ */
+export const percentile = (sorted: number[], p: number): number => {
+  if (sorted.length === 0) {
+    return 0;
+  }
+  const rank = Math.ceil((p / 100) * sorted.length);
+  return sorted[Math.min(sorted.length, Math.max(1, rank)) - 1];
+};
+
+export const summarize = (samplesMs: number[]): LatencyStats => {
+  const sorted = [...samplesMs].sort((a, b) => a - b);
+  return {
+    samples: sorted.length,
+    p50: Number(percentile(sorted, 50).toFixed(2)),
+    p99: Number(percentile(sorted, 99).toFixed(2)),
+    max: Number((sorted[sorted.length - 1] ?? 0).toFixed(2)),
+  };
+};
+
+/**
+ * Run `operation` sequentially `iterations` times and record each duration in ms.
+ * `operation` receives the iteration number so it can address a fresh row each time.
+ */
+export const measure = async (iterations: number, operation: (i: number) => Promise<unknown>): Promise<LatencyStats> => {
+  const samples: number[] = [];
+  for (let i = 0; i < iterations; i++) {
+    const started = process.hrtime.bigint();
+    await operation(i);
+    samples.push(Number(process.hrtime.bigint() - started) / 1e6);
+  }
+  return summarize(samples);
+};
+
+/**
+ * Budget violations for one operation, empty when within budget
+ */
+export const checkBudget = (name: string, stats: LatencyStats, budget: LatencyBudget, scale = 1): string[] => {
+  const violations: string[] = [];
+  if (stats.p50 > budget.p50 * scale) {
+    violations.push(`${name}: p50 ${stats.p50}ms exceeds budget ${budget.p50 * scale}ms`);
+  }
+  if (stats.p99 > budget.p99 * scale) {
+    violations.push(`${name}: p99 ${stats.p99}ms exceeds budget ${budget.p99 * scale}ms`);
+  }
+  return violations;
+};
@@ -0,0 +1,106 @@
+/**
+ * Streaming contact export on a real Postgres: every row exactly once under a fixed heap ceiling.
+ * Seeds EXPORT_TEST_ROWS contacts (default 1M) with a single INSERT ... SELECT.
+ * Run: DATABASE_URL=postgresql://... npm run test:integration -- contactExport
+ */
+
+import { Readable, Transform, Writable } from 'stream';
+import { pipeline } from 'stream/promises';
+import zlib from 'zlib';
+import { encodeHistoryChanges } from '../lib/contactHistoryCodec';
+import { prisma } from '../lib/prisma';
+import { ContactService } from '../services/contactService';
+import { createExportFormatter } from '../utils/contactExport';
+
+const RUN_ID = Date.now().toString(36);
+const ROWS = parseInt(process.env.EXPORT_TEST_ROWS || '1000000');
+const HEAP_CEILING_BYTES = parseInt(process.env.EXPORT_TEST_HEAP_CEILING_MB || '64') * 1024 * 1024;
+
+jest.setTimeout(10 * 60 * 1000);
+
+describe('ContactService.exportContacts', () => {
+  const contactService = new ContactService();
+  let ownerId: string;
+
+  beforeAll(async () => {
+    const owner = await prisma.user.create({
+      data: {
+        email: `export-${RUN_ID}@example.com`,
+        password: 'not-a-real-hash',
+        firstName: 'Export',
+        lastName: 'Test',
+      },
+    });
+    ownerId = owner.id;
+
+    await prisma.$executeRaw`
+      INSERT INTO contacts (id, "ownerId", "firstName", "lastName", email, phone, "createdAt", "updatedAt")
+      SELECT gen_random_uuid()::text, ${ownerId}, 'First' || n, 'Last' || (n % 1000), 'c' || n || '@export.example.com',
+             '+1555' || lpad(n::text, 7, '0'), NOW(), NOW()
+      FROM generate_series(1, ${ROWS}::int) AS n
+    `;
+  });
+
+  afterAll(async () => {
+    await prisma.user.delete({ where: { id: ownerId } });
+    await prisma.$disconnect();
+  });
+
+  it('should stream every contact as gzip CSV within the heap ceiling', async () => {
+    // Arrange
+    let lines = 0;
+    let peakHeap = 0;
+    const baselineHeap = process.memoryUsage().heapUsed;
+    const sampler = setInterval(() => {
+      peakHeap = Math.max(peakHeap, process.memoryUsage().heapUsed - baselineHeap);
+    }, 50);
+    const lineCounter = new Transform({
+      transform(chunk: Buffer, _encoding, callback) {
+        for (let i = chunk.indexOf(10); i !== -1; i = chunk.indexOf(10, i + 1)) {
+          lines++;
+        }
+        callback(null, chunk);
+      },
+    });
+    const sink = new Writable({ write: (_chunk, _encoding, callback) => callback() });
+
+    // Act
+    try {
+      await pipeline(
+        Readable.from(contactService.exportContacts(ownerId, { includeHistory: false, batchSize: 1000 })),
+        createExportFormatter('csv', false),
+        lineCounter,
+        zlib.createGzip(),
+        sink
+      );
+    } finally {
+      clearInterval(sampler);
+    }
+
+    // Assert
+    expect(lines).toBe(ROWS + 1); // header + one line per contact
+    expect(peakHeap).toBeLessThan(HEAP_CEILING_BYTES);
+  });
+
+  it('should include each contact\'s history when asked', async () => {
+    // Arrange
+    const [contact] = await prisma.contact.findMany({ where: { ownerId }, orderBy: { id: 'asc' }, take: 1 });
+    await prisma.contactHistory.create({
+      data: { contactId: contact.id, ...encodeHistoryChanges({ phone: { before: contact.phone, after: '+15550000000' } }) },
+    });
+
+    // Act
+    let exported;
+    for await (const row of contactService.exportContacts(ownerId, { includeHistory: true, batchSize: 1000 })) {
+      if (row.id === contact.id) {
+        exported = row;
+        break;
+      }
+    }
+
+    // Assert
+    expect(exported?.history).toEqual([
+      expect.objectContaining({ phone: { before: contact.phone, after: '+15550000000' } })
+    ]);
+  });
+});
@@ -0,0 +1,111 @@
+/**
+ * Contact and user limits under parallel inserts on a real Postgres.
+ * Run: DATABASE_URL=postgresql://... npm run test:integration
+ */
+
+import { prisma } from '../lib/prisma';
+import { AuthService } from '../services/authService';
+import { ContactService } from '../services/contactService';
+import { ErrorType } from '../types';
+
+const PARALLEL_CREATES = 20;
+const LIMIT = 5;
+const RUN_ID = Date.now().toString(36);
+
+describe('Contact and user limits under concurrency', () => {
+  const contactService = new ContactService();
+  const authService = new AuthService();
+  const originalMaxContacts = process.env.MAX_CONTACTS_PER_USER;
+  const originalMaxUsers = process.env.MAX_USERS;
+  let ownerId: string;
+
+  beforeAll(async () => {
+    process.env.MAX_CONTACTS_PER_USER = String(LIMIT);
+    const owner = await prisma.user.create({
+      data: {
+        email: `limit-${RUN_ID}@example.com`,
+        password: 'not-a-real-hash',
+        firstName: 'Limit',
+        lastName: 'Test',
+      },
+    });
+    ownerId = owner.id;
+  });
+
+  afterAll(async () => {
+    process.env.MAX_CONTACTS_PER_USER = originalMaxContacts;
+    process.env.MAX_USERS = originalMaxUsers;
+    await prisma.user.deleteMany({ where: { email: { contains: RUN_ID } } });
+    await prisma.$disconnect();
+  });
+
+  const contactCountColumn = async () =>
+    (await prisma.user.findUniqueOrThrow({ where: { id: ownerId }, select: { contactCount: true } })).contactCount;
+
+  it('should never let parallel creates exceed MAX_CONTACTS_PER_USER', async () => {
+    // Act
+    const results = await Promise.allSettled(
+      Array.from({ length: PARALLEL_CREATES }, (_, i) => contactService.createContact({
+        firstName: 'Race',
+        lastName: `Contact${i}`,
+        email: `race-${i}-${RUN_ID}@example.com`,
+        phone: '+15555550000',
+      }, ownerId))
+    );
+
+    // Assert
+    const rejected = results.filter((result): result is PromiseRejectedResult => result.status === 'rejected');
+    expect(results.length - rejected.length).toBe(LIMIT);
+    rejected.forEach(result => expect(result.reason.type).toBe(ErrorType.CONTACT_LIMIT_REACHED));
+    expect(await prisma.contact.count({ where: { ownerId } })).toBe(LIMIT);
+    expect(await contactCountColumn()).toBe(LIMIT);
+  });
+
+  it('should keep the counter in step with deletes and bulk imports', async () => {
+    // Arrange
+    const [contact] = await prisma.contact.findMany({ where: { ownerId }, take: 1 });
+
+    // Act
+    await contactService.deleteContact(contact.id, ownerId);
+    const bulk = await contactService.bulkUpsertContactsByExternalId(
+      [0, 1, 2].map(i => ({
+        index: i,
+        contact: {
+          externalId: `limit-bulk-${i}-${RUN_ID}`,
+          firstName: 'Bulk',
+          lastName: `Contact${i}`,
+          email: `bulk-${i}-${RUN_ID}@example.com`,
+          phone: '+15555550001',
+        },
+      })),
+      ownerId
+    );
+
+    // Assert: one slot was freed, so exactly one row fits
+    expect(bulk.map(result => result.status)).toEqual(['created', 'error', 'error']);
+    expect(await prisma.contact.count({ where: { ownerId } })).toBe(LIMIT);
+    expect(await contactCountColumn()).toBe(LIMIT);
+  });
+
+  it('should never let parallel registrations exceed MAX_USERS', async () => {
+    // Arrange: leave room for exactly three more users
+    const counter = await prisma.counter.findUniqueOrThrow({ where: { name: 'users' } });
+    expect(counter.value).toBe(await prisma.user.count());
+    process.env.MAX_USERS = String(counter.value + 3);
+
+    // Act
+    const results = await Promise.allSettled(
+      Array.from({ length: 10 }, (_, i) => authService.createUser({
+        email: `limit-user-${i}-${RUN_ID}@example.com`,
+        password: 'password123',
+        firstName: 'Race',
+        lastName: `User${i}`,
+      }))
+    );
+
+    // Assert
+    const rejected = results.filter((result): result is PromiseRejectedResult => result.status === 'rejected');
+    expect(results.length - rejected.length).toBe(3);
+    rejected.forEach(result => expect(result.reason.type).toBe(ErrorType.USER_LIMIT_REACHED));
+  });
+});
@@ -0,0 +1,74 @@
+/**
+ * Trigram contact search on a real Postgres (requires the pg_trgm migration).
+ * Run: DATABASE_URL=postgresql://... npm run test:integration
+ */
+
+import { prisma } from '../lib/prisma';
+import { ContactService } from '../services/contactService';
+
+const RUN_ID = Date.now().toString(36);
+
+describe('ContactService.searchContacts', () => {
+  const contactService = new ContactService();
+  let ownerId: string;
+
+  beforeAll(async () => {
+    const owner = await prisma.user.create({
+      data: {
+        email: `search-${RUN_ID}@example.com`,
+        password: 'not-a-real-hash',
+        firstName: 'Search',
+        lastName: 'Test',
+      },
+    });
+    ownerId = owner.id;
+
+    await prisma.contact.createMany({
+      data: [
+        { ownerId, firstName: 'Ada', lastName: 'Lovelace', email: 'ada@engine.example.com', phone: '+15555550101' },
+        { ownerId, firstName: 'Adam', lastName: 'Smith', email: 'adam@market.example.com', phone: '+15555550102' },
+        { ownerId, firstName: 'Grace', lastName: 'Hopper', email: 'grace@navy.example.com', phone: '+15555550103' },
+        { ownerId, firstName: 'Percy', lastName: 'Shelley', email: 'percy_100%@poet.example.com', phone: '+15555550104' },
+      ],
+    });
+  });
+
+  afterAll(async () => {
+    await prisma.user.delete({ where: { id: ownerId } });
+    await prisma.$disconnect();
+  });
+
+  it('should match any of name, email and phone and rank the closest match first', async () => {
+    // Act
+    const byName = await contactService.searchContacts(ownerId, 'ada', { pageSize: 10, includeTotal: true });
+    const byPhone = await contactService.searchContacts(ownerId, '0103', { pageSize: 10, includeTotal: false });
+
+    // Assert
+    expect(byName.data.map(contact => contact.firstName)).toEqual(['Ada', 'Adam']);
+    expect(byName.pagination.total).toBe(2);
+    expect(byPhone.data.map(contact => contact.firstName)).toEqual(['Grace']);
+  });
+
+  it('should page through every match exactly once', async () => {
+    // Act
+    const seen: string[] = [];
+    let cursor: string | undefined;
+    do {
+      const page = await contactService.searchContacts(ownerId, 'example', { cursor, pageSize: 1, includeTotal: false });
+      seen.push(...page.data.map(contact => contact.id!));
+      cursor = page.pagination.nextCursor ?? undefined;
+    } while (cursor);
+
+    // Assert
+    expect(seen).toHaveLength(4);
+    expect(new Set(seen).size).toBe(4);
+  });
+
+  it('should treat LIKE wildcards in the query literally', async () => {
+    // Act
+    const result = await contactService.searchContacts(ownerId, '_100%', { pageSize: 10, includeTotal: false });
+
+    // Assert
+    expect(result.data.map(contact => contact.firstName)).toEqual(['Percy']);
+  });
+});
@@ -0,0 +1,89 @@
+/**
+ * Concurrent updates against one contact on a real Postgres.
+ * Run: DATABASE_URL=postgresql://... npm run test:integration
+ */
+
+import { ErrorType } from '../types';
+import { decodeHistoryChanges } from '../lib/contactHistoryCodec';
+import { prisma } from '../lib/prisma';
+import { ContactService } from '../services/contactService';
+
+const PARALLEL_UPDATES = 20;
+const RUN_ID = Date.now().toString(36);
+
+describe('ContactService.updateContact under concurrency', () => {
+  const contactService = new ContactService();
+  let ownerId: string;
+
+  beforeAll(async () => {
+    const owner = await prisma.user.create({
+      data: {
+        email: `concurrency-${RUN_ID}@example.com`,
+        password: 'not-a-real-hash',
+        firstName: 'Concurrency',
+        lastName: 'Test',
+      },
+    });
+    ownerId = owner.id;
+  });
+
+  afterAll(async () => {
+    // Contacts and history cascade with the user
+    await prisma.user.delete({ where: { id: ownerId } });
+    await prisma.$disconnect();
+  });
+
+  const createContact = (email: string) => prisma.contact.create({
+    data: { ownerId, firstName: 'Jane', lastName: 'Doe', email, phone: '+15555550000' },
+  });
+
+  it('should serialize parallel updates so every change has exactly one consistent history row', async () => {
+    // Arrange
+    const contact = await createContact(`parallel-${RUN_ID}@example.com`);
+    const phones = Array.from({ length: PARALLEL_UPDATES }, (_, i) => `+1555555${String(i).padStart(4, '0')}`);
+
+    // Act
+    const results = await Promise.allSettled(
+      phones.map(phone => contactService.updateContact(contact.id, ownerId, { phone }))
+    );
+
+    // Assert
+    expect(results.filter(result => result.status === 'rejected')).toEqual([]);
+
+    const history = await prisma.contactHistory.findMany({ where: { contactId: contact.id } });
+    expect(history).toHaveLength(PARALLEL_UPDATES);
+
+    // The changes must form one chain: each `before` is the value some earlier update wrote
+    const changes = history.map(entry => decodeHistoryChanges(entry.changedFields, entry.diff));
+    expect(changes.every(change => Object.keys(change).join() === 'phone')).toBe(true);
+    const befores = changes.map(change => change.phone!.before);
+    const afters = changes.map(change => change.phone!.after);
+    const final = await prisma.contact.findUniqueOrThrow({ where: { id: contact.id } });
+    expect(new Set(afters)).toEqual(new Set(phones));
+    expect(new Set(befores)).toEqual(new Set(['+15555550000', ...afters.filter(after => after !== final.phone)]));
+    // The trigger-maintained count used for history pagination totals agrees with the rows
+    expect(final.historyCount).toBe(PARALLEL_UPDATES);
+  });
+
+  it('should let only one of two racing updates claim the same email', async () => {
+    // Arrange
+    const first = await createContact(`race-a-${RUN_ID}@example.com`);
+    const second = await createContact(`race-b-${RUN_ID}@example.com`);
+    const contested = `contested-${RUN_ID}@example.com`;
+
+    // Act
+    const results = await Promise.allSettled([
+      contactService.updateContact(first.id, ownerId, { email: contested }),
+      contactService.updateContact(second.id, ownerId, { email: contested }),
+    ]);
+
+    // Assert
+    const rejected = results.filter((result): result is PromiseRejectedResult => result.status === 'rejected');
+    expect(rejected).toHaveLength(1);
+    expect(rejected[0].reason.type).toBe(ErrorType.DUPLICATE_EMAIL);
+
+    // The losing update must not leave an audit row behind
+    const historyCount = await prisma.contactHistory.count({ where: { contactId: { in: [first.id, second.id] } } });
+    expect(historyCount).toBe(1);
+  });
+});
@@ -41,10 +41,28 @@ describe('ExternalContactController', () => {
       await controller.getContactByExternalId(req, res as any);
 
       // Assert
-      expect(mockContactService.getContactByExternalId).toHaveBeenCalledWith('test-external-id', 'test-user-id');
+      expect(mockContactService.getContactByExternalId).toHaveBeenCalledWith('test-external-id', 'test-user-id', undefined);
       expect(res.success).toHaveBeenCalledWith(mockContact);
     });
 
+    it('should pass the requested sparse fieldset to the service', async () => {
+      // Arrange
+      const req = createMockApiKeyRequest({
+        params: { externalId: 'test-external-id' },
+        query: { fields: 'id,email,email' },
+        apiKeyUserId: 'test-user-id',
+      });
+      const res = createMockResponse();
+
+      mockContactService.getContactByExternalId.mockResolvedValue({ id: 'test-contact-id', email: 'john.doe@example.com' });
+
+      // Act
+      await controller.getContactByExternalId(req, res as any);
+
+      // Assert
+      expect(mockContactService.getContactByExternalId).toHaveBeenCalledWith('test-external-id', 'test-user-id', ['id', 'email']);
+    });
+
     it('should return 404 when contact not found', async () => {
       // Arrange
       const req = createMockApiKeyRequest({
@@ -59,7 +77,7 @@ describe('ExternalContactController', () => {
       await controller.getContactByExternalId(req, res as any);
 
       // Assert
-      expect(mockContactService.getContactByExternalId).toHaveBeenCalledWith('non-existent-id', 'test-user-id');
+      expect(mockContactService.getContactByExternalId).toHaveBeenCalledWith('non-existent-id', 'test-user-id', undefined);
       expect(res.notFound).toHaveBeenCalledWith('Contact not found');
     });
 
@@ -159,4 +177,51 @@ describe('ExternalContactController', () => {
       expect(res.unauthorized).toHaveBeenCalledWith('API key authentication required');
     });
   });
+
+  describe('bulkUpsertContacts', () => {
+    const row = (externalId: string) => ({
+      firstName: 'John',
+      lastName: 'Doe',
+      email: `${externalId}@example.com`,
+      phone: '+1234567890',
+      externalId,
+    });
+
+    it('should import valid NDJSON rows and report invalid ones per row', async () => {
+      // Arrange
+      const body = [JSON.stringify(row('crm-1')), '{not json', JSON.stringify({ externalId: 'crm-3' })].join('\n');
+      const req = createMockApiKeyRequest({ body });
+      const res = createMockResponse();
+
+      mockContactService.bulkUpsertContactsByExternalId.mockResolvedValue([
+        { index: 0, externalId: 'crm-1', status: 'created', id: 'contact-1' },
+      ]);
+
+      // Act
+      await controller.bulkUpsertContacts(req, res as any);
+
+      // Assert
+      expect(mockContactService.bulkUpsertContactsByExternalId).toHaveBeenCalledWith(
+        [{ index: 0, contact: row('crm-1') }],
+        'test-user-id'
+      );
+      const result = (res.success as jest.Mock).mock.calls[0][0];
+      expect(result.summary).toEqual({ received: 3, created: 1, updated: 0, unchanged: 0, failed: 2 });
+      expect(result.results.map((r: any) => r.index)).toEqual([0, 1, 2]);
+      expect(result.results[2]).toEqual(expect.objectContaining({ externalId: 'crm-3', status: 'error' }));
+    });
+
+    it('should reject a body that is neither an array nor NDJSON', async () => {
+      // Arrange
+      const req = createMockApiKeyRequest({ body: row('crm-1') });
+      const res = createMockResponse();
+
+      // Act
+      await controller.bulkUpsertContacts(req, res as any);
+
+      // Assert
+      expect(mockContactService.bulkUpsertContactsByExternalId).not.toHaveBeenCalled();
+      expect(res.validationError).toHaveBeenCalledWith([{ message: 'Body must be a JSON array or NDJSON', field: 'body' }]);
+    });
+  });
 });
@@ -0,0 +1,50 @@
+import { ContactMapper } from '../../dtos/mappers/contact.mapper';
+import { decodeHistoryChanges, encodeHistoryChanges } from '../../lib/contactHistoryCodec';
+
+describe('contact history codec', () => {
+  it('should store one bit per changed field and their values in bit order', () => {
+    // Act
+    const encoded = encodeHistoryChanges({
+      phone: { before: '+15550100', after: '+15550199' },
+      firstName: { before: 'John', after: 'Jonathan' },
+    });
+
+    // Assert
+    expect(encoded).toEqual({
+      changedFields: 0b1001,
+      diff: ['John', 'Jonathan', '+15550100', '+15550199'],
+    });
+  });
+
+  it('should decode exactly the changes that were encoded', () => {
+    // Arrange
+    const changes = {
+      lastName: { before: 'Doe', after: 'Smith' },
+      email: { before: 'john@example.com', after: 'john.smith@example.com' },
+    };
+
+    // Act
+    const encoded = encodeHistoryChanges(changes);
+    const decoded = decodeHistoryChanges(encoded.changedFields, encoded.diff);
+
+    // Assert
+    expect(decoded).toEqual(changes);
+  });
+
+  it('should expose stored rows in the API shape', () => {
+    // Arrange
+    const createdAt = new Date('2025-01-01T00:00:00.000Z');
+    const row = { id: 'history-1', contactId: 'contact-1', changedFields: 0b0100, diff: ['a@example.com', 'b@example.com'], createdAt };
+
+    // Act
+    const dto = ContactMapper.toContactHistoryDto(row);
+
+    // Assert
+    expect(dto).toEqual({
+      id: 'history-1',
+      email: { before: 'a@example.com', after: 'b@example.com' },
+      createdAt: '2025-01-01T00:00:00.000Z',
+      updatedAt: '2025-01-01T00:00:00.000Z',
+    });
+  });
+});
@@ -0,0 +1,53 @@
+import { ContactMapper } from '../../dtos/mappers/contact.mapper';
+
+describe('ContactMapper.toContactProjectionDto', () => {
+  const row = {
+    id: 'contact-1',
+    ownerId: 'user-1',
+    externalId: null,
+    firstName: 'John',
+    lastName: 'Doe',
+    email: 'john.doe@example.com',
+    phone: '+1234567890',
+    createdAt: new Date('2025-01-01T00:00:00.000Z'),
+    updatedAt: new Date('2025-01-02T00:00:00.000Z'),
+  };
+
+  it('should return the full contact without owner when no fields are requested', () => {
+    // Act
+    const dto = ContactMapper.toContactProjectionDto(row);
+
+    // Assert
+    expect(dto).toEqual({
+      id: 'contact-1',
+      firstName: 'John',
+      lastName: 'Doe',
+      email: 'john.doe@example.com',
+      phone: '+1234567890',
+      createdAt: '2025-01-01T00:00:00.000Z',
+      updatedAt: '2025-01-02T00:00:00.000Z',
+    });
+  });
+
+  it('should return only the requested fields', () => {
+    // Act
+    const dto = ContactMapper.toContactProjectionDto(row, ['id', 'lastName', 'createdAt']);
+
+    // Assert
+    expect(dto).toEqual({ id: 'contact-1', lastName: 'Doe', createdAt: '2025-01-01T00:00:00.000Z' });
+  });
+
+  it('should expose only safe owner columns', () => {
+    // Arrange
+    const withOwner = {
+      ...row,
+      owner: { id: 'user-1', firstName: 'Test', lastName: 'User', email: 'test@example.com', password: 'hash' },
+    };
+
+    // Act
+    const dto = ContactMapper.toContactProjectionDto(withOwner, ['id', 'owner']);
+
+    // Assert
+    expect(dto.owner).toEqual({ id: 'user-1', firstName: 'Test', lastName: 'User', email: 'test@example.com' });
+  });
+});
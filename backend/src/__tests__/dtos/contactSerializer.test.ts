@@ -0,0 +1,69 @@
+import { ContactMapper } from '../../dtos/mappers/contact.mapper';
+import { ContactSerializer } from '../../dtos/serializers/contact.serializer';
+import { encodeHistoryChanges } from '../../lib/contactHistoryCodec';
+import { ResponseFormatter } from '../../utils/responseFormatter';
+
+describe('ContactSerializer', () => {
+  const rows = [
+    {
+      id: 'contact-1',
+      ownerId: 'user-1',
+      externalId: 'ext-1',
+      historyCount: 3,
+      firstName: 'Zoë',
+      lastName: "O'Brien \"Bob\"",
+      email: 'zoe@example.com',
+      phone: '+1234567890',
+      createdAt: new Date('2025-01-01T00:00:00.000Z'),
+      updatedAt: new Date('2025-01-02T00:00:00.000Z'),
+      owner: { id: 'user-1', firstName: 'Ada', lastName: 'Lovelace', email: 'ada@example.com' },
+    },
+  ];
+  const pagination = { page: 1, pageSize: 20, total: 1, totalPages: 1 };
+
+  it('should write the same JSON as the mapper and JSON.stringify, without internal fields', () => {
+    // Act
+    const json = ContactSerializer.page()(ResponseFormatter.paginated(rows, pagination));
+
+    // Assert
+    const expected = ResponseFormatter.paginated(rows.map(row => ContactMapper.toContactProjectionDto(row)), pagination);
+    expect(json).toBe(JSON.stringify(expected));
+    expect(json).not.toContain('ownerId');
+    expect(json).not.toContain('historyCount');
+  });
+
+  it('should write only the requested fields, in schema order whatever order they were listed in', () => {
+    // Arrange
+    const cursorPagination = { pageSize: 20, nextCursor: null, hasMore: false };
+    const page = ResponseFormatter.cursorPaginated(rows, cursorPagination);
+
+    // Act
+    const json = ContactSerializer.cursorPage(['owner', 'lastName', 'createdAt'])(page);
+    const reordered = ContactSerializer.cursorPage(['createdAt', 'owner', 'lastName'])(page);
+
+    // Assert
+    const expected = ResponseFormatter.cursorPaginated(rows.map(row => ContactMapper.toContactProjectionDto(row, ['lastName', 'createdAt', 'owner'])), cursorPagination);
+    expect(json).toBe(JSON.stringify(expected));
+    expect(reordered).toBe(json);
+  });
+
+  it('should decode compact history rows straight into the API shape', () => {
+    // Arrange
+    const history = [{
+      id: 'history-1',
+      contactId: 'contact-1',
+      ...encodeHistoryChanges({
+        firstName: { before: 'John', after: 'Jonathan' },
+        phone: { before: '+15550100', after: '+15550199' },
+      }),
+      createdAt: new Date('2025-01-03T00:00:00.000Z'),
+    }];
+
+    // Act
+    const json = ContactSerializer.historyPage(ResponseFormatter.paginated(history, pagination));
+
+    // Assert
+    const expected = ResponseFormatter.paginated(history.map(entry => ContactMapper.toContactHistoryDto(entry)), pagination);
+    expect(json).toBe(JSON.stringify(expected));
+  });
+});
@@ -0,0 +1,31 @@
+import {
+  INVALID_CURSOR_MESSAGE,
+  decodeCursor,
+  encodeCursor,
+  parseCursorDate
+} from '../../dtos/shared/pagination.dto';
+
+describe('Cursor pagination helpers', () => {
+  it('should round-trip cursor values through an opaque token', () => {
+    // Arrange
+    const values = { lastName: "O'Brien", firstName: 'Zoë', createdAt: '2025-01-01T00:00:00.000Z', id: 'abc' };
+
+    // Act
+    const cursor = encodeCursor(values);
+    const decoded = decodeCursor(cursor, ['lastName', 'firstName', 'createdAt', 'id'] as const);
+
+    // Assert
+    expect(cursor).not.toContain('Brien');
+    expect(decoded).toEqual(values);
+  });
+
+  it('should reject tokens that are not cursors', () => {
+    expect(() => decodeCursor('not-a-cursor', ['id'] as const)).toThrow(INVALID_CURSOR_MESSAGE);
+    expect(() => decodeCursor(encodeCursor({ createdAt: 'x' }), ['createdAt', 'id'] as const)).toThrow(INVALID_CURSOR_MESSAGE);
+  });
+
+  it('should reject cursor dates that do not parse', () => {
+    expect(() => parseCursorDate('yesterday-ish')).toThrow(INVALID_CURSOR_MESSAGE);
+    expect(parseCursorDate('2025-01-01T00:00:00.000Z').toISOString()).toBe('2025-01-01T00:00:00.000Z');
+  });
+});
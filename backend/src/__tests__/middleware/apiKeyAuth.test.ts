@@ -0,0 +1,63 @@
+import express from 'express';
+import request from 'supertest';
+import { requireApiKey } from '../../middleware/apiKeyAuth';
+import { responseInterceptor } from '../../middleware/responseInterceptor';
+import { ApiKeyService } from '../../services/apiKeyService';
+import { RateLimiter } from '../../services/rateLimiter';
+
+jest.mock('../../services/apiKeyService');
+const MockedApiKeyService = ApiKeyService as jest.MockedClass<typeof ApiKeyService>;
+
+describe('requireApiKey', () => {
+  const consume = jest.spyOn(RateLimiter.getInstance(), 'consume');
+  const verifyKey = jest.fn();
+  let mockApiKeyService: jest.Mocked<ApiKeyService>;
+
+  const buildApp = () => {
+    const app = express();
+    app.use(responseInterceptor);
+    app.get('/external', requireApiKey, (req, res) => res.success({ ok: true }));
+    return app;
+  };
+
+  beforeEach(() => {
+    consume.mockReset();
+    verifyKey.mockReset();
+    mockApiKeyService = MockedApiKeyService.mock.instances[0] as jest.Mocked<ApiKeyService>;
+    // Stands in for the database lookup and bcrypt compare that follow `beforeVerify`
+    mockApiKeyService.validateApiKey.mockImplementation(async (apiKey, beforeVerify) => {
+      await beforeVerify?.();
+      return verifyKey(apiKey);
+    });
+  });
+
+  afterAll(() => {
+    consume.mockRestore();
+  });
+
+  it('should reject an uncached key over the IP quota before verifying it', async () => {
+    // Arrange
+    consume.mockResolvedValue({ allowed: false, limit: 1, remaining: 0, resetMs: 5000 });
+
+    // Act
+    const response = await request(buildApp()).get('/external').set('X-API-Key', 'guessed-key');
+
+    // Assert
+    expect(response.status).toBe(429);
+    expect(consume).toHaveBeenCalledWith('ip', expect.any(String));
+    expect(verifyKey).not.toHaveBeenCalled();
+  });
+
+  it('should accept a verified key within the IP quota', async () => {
+    // Arrange
+    consume.mockResolvedValue({ allowed: true, limit: 10, remaining: 9, resetMs: 5000 });
+    verifyKey.mockResolvedValue({ apiKeyId: 'key-1', userId: 'user-1' });
+
+    // Act
+    const response = await request(buildApp()).get('/external').set('X-API-Key', 'valid-key');
+
+    // Assert
+    expect(response.status).toBe(200);
+    expect(verifyKey).toHaveBeenCalledWith('valid-key');
+  });
+});
@@ -0,0 +1,49 @@
+import express from 'express';
+import request from 'supertest';
+import { rateLimitByIp } from '../../middleware/rateLimit';
+import { responseInterceptor } from '../../middleware/responseInterceptor';
+import { RateLimiter } from '../../services/rateLimiter';
+
+describe('rateLimitByIp', () => {
+  const consume = jest.spyOn(RateLimiter.getInstance(), 'consume');
+
+  const buildApp = () => {
+    const app = express();
+    app.use(responseInterceptor);
+    app.use(rateLimitByIp);
+    app.post('/login', (req, res) => res.success({ ok: true }));
+    return app;
+  };
+
+  beforeEach(() => {
+    consume.mockReset();
+  });
+
+  afterAll(() => {
+    consume.mockRestore();
+  });
+
+  it('should count requests presenting an unchecked X-API-Key header against the IP', async () => {
+    // Arrange
+    consume.mockResolvedValue({ allowed: false, limit: 1, remaining: 0, resetMs: 5000 });
+    const app = buildApp();
+
+    // Act
+    const response = await request(app).post('/login').set('X-API-Key', 'x');
+
+    // Assert
+    expect(consume).toHaveBeenCalledWith('ip', expect.any(String));
+    expect(response.status).toBe(429);
+  });
+
+  it('should not count CORS preflight requests', async () => {
+    // Arrange
+    const app = buildApp();
+
+    // Act
+    await request(app).options('/login');
+
+    // Assert
+    expect(consume).not.toHaveBeenCalled();
+  });
+});
@@ -0,0 +1,74 @@
+import express from 'express';
+import request from 'supertest';
+import { cacheOwnerResponse } from '../../middleware/responseCache';
+import { responseInterceptor } from '../../middleware/responseInterceptor';
+import { ContactListCache } from '../../services/contactListCache';
+import { AuthenticatedRequest } from '../../types';
+
+describe('cacheOwnerResponse', () => {
+  const handler = jest.fn((req: AuthenticatedRequest, res: express.Response) => {
+    res.success({ items: ['a', 'b'], page: req.query.page });
+  });
+
+  const buildApp = () => {
+    const app = express();
+    app.use(responseInterceptor);
+    app.use((req: AuthenticatedRequest, res, next) => {
+      req.userId = 'owner-1';
+      next();
+    });
+    app.get('/contacts', cacheOwnerResponse('contacts'), handler);
+    return app;
+  };
+
+  beforeEach(() => {
+    ContactListCache.getInstance().clear();
+    handler.mockClear();
+  });
+
+  it('should serve repeat requests from the cache and answer 304 when the ETag matches', async () => {
+    // Arrange
+    const app = buildApp();
+
+    // Act
+    const first = await request(app).get('/contacts?page=1');
+    const second = await request(app).get('/contacts?page=1');
+    const revalidated = await request(app).get('/contacts?page=1').set('If-None-Match', first.headers.etag);
+
+    // Assert
+    expect(first.status).toBe(200);
+    expect(first.headers['x-cache']).toBe('MISS');
+    expect(first.headers.etag).toMatch(/^W\//);
+    expect(second.headers['x-cache']).toBe('HIT');
+    expect(second.body).toEqual(first.body);
+    expect(revalidated.status).toBe(304);
+    expect(handler).toHaveBeenCalledTimes(1);
+  });
+
+  it('should run the handler again after the owner version is bumped', async () => {
+    // Arrange
+    const app = buildApp();
+    await request(app).get('/contacts?page=1');
+
+    // Act
+    ContactListCache.getInstance().bumpVersion('owner-1');
+    const response = await request(app).get('/contacts?page=1');
+
+    // Assert
+    expect(response.headers['x-cache']).toBe('MISS');
+    expect(handler).toHaveBeenCalledTimes(2);
+  });
+
+  it('should keep different queries in separate entries', async () => {
+    // Arrange
+    const app = buildApp();
+
+    // Act
+    const pageOne = await request(app).get('/contacts?page=1');
+    const pageTwo = await request(app).get('/contacts?page=2');
+
+    // Assert
+    expect(pageTwo.headers['x-cache']).toBe('MISS');
+    expect(pageTwo.headers.etag).not.toBe(pageOne.headers.etag);
+  });
+});
@@ -1,7 +1,16 @@
 import { Request, Response, NextFunction } from 'express';
+import Joi from 'joi';
 import { validateRequest } from '../../middleware/validation';
 import { createMockRequest, createMockResponse } from '../utils/testUtils';
 
+// Stand-in Joi schema returning a fixed result; prefs() returns the same schema
+const fakeSchema = (result: { error: unknown }) => ({
+  validate: jest.fn().mockReturnValue(result),
+  prefs() {
+    return this;
+  },
+});
+
 describe('Validation Middleware', () => {
   let mockRequest: Partial<Request>;
   let mockResponse: Partial<Response>;
@@ -17,9 +26,7 @@ describe('Validation Middleware', () => {
     it('should call next() when validation passes', () => {
       // Arrange
       const schema = {
-        body: {
-          validate: jest.fn().mockReturnValue({ error: null }),
-        },
+        body: fakeSchema({ error: null }),
       };
 
       // Act
@@ -39,9 +46,7 @@ describe('Validation Middleware', () => {
       };
 
       const schema = {
-        body: {
-          validate: jest.fn().mockReturnValue({ error: validationError }),
-        },
+        body: fakeSchema({ error: validationError }),
       };
 
       // Act
@@ -64,9 +69,7 @@ describe('Validation Middleware', () => {
       };
 
       const schema = {
-        query: {
-          validate: jest.fn().mockReturnValue({ error: validationError }),
-        },
+        query: fakeSchema({ error: validationError }),
       };
 
       mockRequest.query = { page: 'invalid' };
@@ -90,9 +93,7 @@ describe('Validation Middleware', () => {
       };
 
       const schema = {
-        params: {
-          validate: jest.fn().mockReturnValue({ error: validationError }),
-        },
+        params: fakeSchema({ error: validationError }),
       };
 
       mockRequest.params = { id: 'invalid-uuid' };
@@ -122,12 +123,8 @@ describe('Validation Middleware', () => {
       };
 
       const schema = {
-        body: {
-          validate: jest.fn().mockReturnValue({ error: bodyError }),
-        },
-        query: {
-          validate: jest.fn().mockReturnValue({ error: queryError }),
-        },
+        body: fakeSchema({ error: bodyError }),
+        query: fakeSchema({ error: queryError }),
       };
 
       mockRequest.body = { email: '' };
@@ -144,6 +141,28 @@ describe('Validation Middleware', () => {
       expect(mockNext).not.toHaveBeenCalled();
     });
 
+    it('should report every failing field of a real schema, prepared once per route', () => {
+      // Arrange
+      const schema = {
+        body: Joi.object({
+          email: Joi.string().email().required(),
+          password: Joi.string().min(8).required(),
+        }),
+      };
+      const middleware = validateRequest(schema);
+      mockRequest.body = { email: 'not-an-email', password: 'short' };
+
+      // Act
+      middleware(mockRequest as Request, mockResponse as Response, mockNext);
+
+      // Assert
+      expect(mockResponse.validationError).toHaveBeenCalledWith([
+        expect.objectContaining({ field: 'email' }),
+        expect.objectContaining({ field: 'password' }),
+      ]);
+      expect(mockNext).not.toHaveBeenCalled();
+    });
+
     it('should call next() when no validation schemas provided', () => {
       // Arrange
       const schema = {};
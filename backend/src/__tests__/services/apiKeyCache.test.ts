@@ -0,0 +1,76 @@
+import { ApiKeyCache } from '../../services/apiKeyCache';
+
+describe('ApiKeyCache', () => {
+  let cache: ApiKeyCache;
+
+  beforeEach(() => {
+    cache = new ApiKeyCache({ maxEntries: 2, ttlMs: 60000 });
+  });
+
+  it('should key entries by a digest rather than the raw API key', () => {
+    // Act
+    const digest = cache.digest('raw-api-key');
+
+    // Assert
+    expect(digest).not.toContain('raw-api-key');
+    expect(digest).toBe(cache.digest('raw-api-key'));
+    expect(digest).not.toBe(cache.digest('other-api-key'));
+  });
+
+  it('should return cached user until the key is invalidated by id', async () => {
+    // Arrange
+    const digest = cache.digest('raw-api-key');
+    cache.set(digest, 'key-1', 'user-1', null, cache.getEpoch());
+
+    // Act
+    const hit = cache.get(digest);
+    await cache.invalidate('key-1');
+
+    // Assert
+    expect(hit).toEqual(expect.objectContaining({ apiKeyId: 'key-1', userId: 'user-1' }));
+    expect(cache.get(digest)).toBeNull();
+  });
+
+  it('should not cache a verification that raced an invalidation', () => {
+    // Arrange
+    const digest = cache.digest('raw-api-key');
+    const epochBeforeLookup = cache.getEpoch();
+
+    // Act
+    cache.invalidateLocal('key-1');
+    cache.set(digest, 'key-1', 'user-1', null, epochBeforeLookup);
+
+    // Assert
+    expect(cache.get(digest)).toBeNull();
+  });
+
+  it('should evict the least recently used entry when full', () => {
+    // Arrange
+    const first = cache.digest('first');
+    const second = cache.digest('second');
+    const third = cache.digest('third');
+    cache.set(first, 'key-1', 'user-1', null, cache.getEpoch());
+    cache.set(second, 'key-2', 'user-1', null, cache.getEpoch());
+
+    // Act
+    cache.get(first); // first is now most recently used
+    cache.set(third, 'key-3', 'user-1', null, cache.getEpoch());
+
+    // Assert
+    expect(cache.size()).toBe(2);
+    expect(cache.get(second)).toBeNull();
+    expect(cache.get(first)).not.toBeNull();
+    expect(cache.get(third)).not.toBeNull();
+  });
+
+  it('should not outlive the API key expiry', () => {
+    // Arrange
+    const digest = cache.digest('raw-api-key');
+
+    // Act
+    cache.set(digest, 'key-1', 'user-1', new Date(Date.now() - 1), cache.getEpoch());
+
+    // Assert
+    expect(cache.get(digest)).toBeNull();
+  });
+});
@@ -0,0 +1,92 @@
+import { prisma } from '../../lib/prisma';
+import { ApiKeyUsageTracker } from '../../services/apiKeyUsageTracker';
+
+jest.mock('../../lib/prisma', () => ({
+  prisma: {
+    $executeRaw: jest.fn(),
+  },
+}));
+
+const mockedExecuteRaw = prisma.$executeRaw as unknown as jest.Mock;
+
+describe('ApiKeyUsageTracker', () => {
+  let tracker: ApiKeyUsageTracker;
+
+  beforeEach(() => {
+    jest.clearAllMocks();
+    tracker = new ApiKeyUsageTracker();
+  });
+
+  it('should coalesce repeated usage into one pending entry per key', () => {
+    // Arrange
+    const earlier = new Date('2025-01-01T00:00:00.000Z');
+    const later = new Date('2025-01-01T00:00:05.000Z');
+
+    // Act
+    tracker.record('key-1', later);
+    tracker.record('key-1', earlier);
+    tracker.record('key-2', earlier);
+
+    // Assert
+    expect(tracker.getMetrics().pending).toBe(2);
+    expect(tracker.getPendingUsage('key-1')).toEqual(later);
+  });
+
+  it('should write all pending keys in a single statement', async () => {
+    // Arrange
+    mockedExecuteRaw.mockResolvedValue(2);
+    tracker.record('key-1');
+    tracker.record('key-2');
+
+    // Act
+    await tracker.flush();
+
+    // Assert
+    expect(mockedExecuteRaw).toHaveBeenCalledTimes(1);
+    expect(tracker.getMetrics()).toEqual(expect.objectContaining({ pending: 0, flushed: 2, flushes: 1 }));
+  });
+
+  it('should skip the database when nothing is pending', async () => {
+    // Act
+    await tracker.flush();
+
+    // Assert
+    expect(mockedExecuteRaw).not.toHaveBeenCalled();
+  });
+
+  it('should keep usage pending when the write fails', async () => {
+    // Arrange
+    jest.spyOn(console, 'error').mockImplementation(() => undefined);
+    mockedExecuteRaw.mockRejectedValue(new Error('connection lost'));
+    tracker.record('key-1');
+
+    // Act
+    await tracker.flush();
+
+    // Assert
+    expect(tracker.getMetrics()).toEqual(expect.objectContaining({ pending: 1, flushed: 0, failedFlushes: 1 }));
+  });
+
+  it('should never run two writes at once when several callers wait on the same flush', async () => {
+    // Arrange
+    let inFlight = 0;
+    let maxInFlight = 0;
+    mockedExecuteRaw.mockImplementation(async () => {
+      maxInFlight = Math.max(maxInFlight, ++inFlight);
+      await new Promise(resolve => setTimeout(resolve, 10));
+      inFlight--;
+      return 1;
+    });
+    tracker.record('key-1');
+    const first = tracker.flush();
+    tracker.record('key-2');
+
+    // Act: both callers wait on the first flush and then race to start the next one
+    await Promise.all([first, tracker.flush(), tracker.flush()]);
+
+    // Assert
+    expect(maxInFlight).toBe(1);
+    expect(mockedExecuteRaw).toHaveBeenCalledTimes(2);
+    expect(tracker.getMetrics()).toEqual(expect.objectContaining({ pending: 0, flushed: 2, flushes: 2 }));
+  });
+});
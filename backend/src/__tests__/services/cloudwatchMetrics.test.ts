@@ -0,0 +1,34 @@
+import { CloudWatchMetrics } from '../../lib/cloudwatchMetrics';
+
+describe('CloudWatchMetrics', () => {
+  it('should render gauges as an EMF document dimensioned by service', () => {
+    // Arrange
+    const metrics = new CloudWatchMetrics({ namespace: 'Contacts/Backend', service: 'Contacts', intervalMs: 60000 });
+    metrics.defineGauge('SSEConnections', () => 42);
+
+    // Act
+    const document = JSON.parse(metrics.render(1700000000000));
+
+    // Assert
+    expect(document).toEqual({
+      _aws: {
+        Timestamp: 1700000000000,
+        CloudWatchMetrics: [{
+          Namespace: 'Contacts/Backend',
+          Dimensions: [['Service']],
+          Metrics: [{ Name: 'SSEConnections', Unit: 'Count' }],
+        }],
+      },
+      Service: 'Contacts',
+      SSEConnections: 42,
+    });
+  });
+
+  it('should stay disabled without a namespace', () => {
+    // Arrange
+    const metrics = new CloudWatchMetrics({ namespace: '' });
+
+    // Act & Assert
+    expect(metrics.isEnabled()).toBe(false);
+  });
+});
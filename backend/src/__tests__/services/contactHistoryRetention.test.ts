@@ -0,0 +1,129 @@
+import { PrismaClient } from '@prisma/client';
+import { ContactHistoryRetention } from '../../services/contactHistoryRetention';
+
+jest.mock('../../lib/prisma', () => ({ prisma: {} }));
+
+const sqlOf = (strings: TemplateStringsArray | string) => (typeof strings === 'string' ? strings : strings.join('?'));
+
+interface FakeTable {
+  name: string;
+  attached: boolean;
+  detachPending?: boolean;
+}
+
+// A database whose queries answer from the given state and record every statement run, noting
+// which ran inside a transaction
+const createFakeDb = (state: { locked: boolean; tables: FakeTable[] }) => {
+  const statements: { sql: string; inTransaction: boolean }[] = [];
+  const tables = new Map(state.tables.map(table => [table.name, { detachPending: false, ...table }]));
+
+  const client = (inTransaction: boolean) => ({
+    $queryRaw: jest.fn(async (strings: TemplateStringsArray, ...values: unknown[]) => {
+      const sql = sqlOf(strings);
+      statements.push({ sql, inTransaction });
+      if (sql.includes('pg_try_advisory_xact_lock')) return [{ locked: state.locked }];
+      if (sql.includes('contact_history_create_partition')) return [{ created: true }];
+      if (sql.includes('pg_class')) return [...tables.values()];
+      if (sql.includes('"detached"')) {
+        const table = tables.get(values[0] as string);
+        return [{ detached: Boolean(table && !table.attached) }];
+      }
+      return [];
+    }),
+    $executeRaw: jest.fn(async (strings: TemplateStringsArray) => {
+      statements.push({ sql: sqlOf(strings), inTransaction });
+      return 0;
+    }),
+    $executeRawUnsafe: jest.fn(async (sql: string) => {
+      statements.push({ sql, inTransaction });
+      const detached = /DETACH PARTITION "(\w+)"/.exec(sql);
+      if (detached) {
+        tables.get(detached[1])!.attached = false;
+      }
+      return 0;
+    }),
+  });
+
+  const db = {
+    ...client(false),
+    $transaction: jest.fn(async (fn: (tx: ReturnType<typeof client>) => unknown) => fn(client(true))),
+  };
+  return { db: db as unknown as PrismaClient, statements };
+};
+
+describe('ContactHistoryRetention', () => {
+  const now = new Date('2026-10-17T12:00:00.000Z');
+  const tables: FakeTable[] = [
+    { name: 'contact_history_entries_2024_09', attached: true },
+    { name: 'contact_history_entries_2024_10', attached: true },
+    { name: 'contact_history_entries_2024_11', attached: true },
+  ];
+
+  it('should create the current and upcoming monthly partitions', async () => {
+    // Arrange
+    const { db, statements } = createFakeDb({ locked: true, tables });
+    const retention = new ContactHistoryRetention(db, { retentionMonths: 0, partitionsAhead: 3 });
+
+    // Act
+    const result = await retention.run(now);
+
+    // Assert
+    expect(result).toEqual({ skipped: false, partitionsCreated: 4, partitionsDropped: [] });
+    expect(statements.some(({ sql }) => sql.includes('DETACH') || sql.includes('DROP TABLE'))).toBe(false);
+  });
+
+  it('should detach expired partitions concurrently, then reduce history counts and drop them', async () => {
+    // Arrange
+    const { db, statements } = createFakeDb({ locked: true, tables });
+    const retention = new ContactHistoryRetention(db, { retentionMonths: 24, partitionsAhead: 0 });
+
+    // Act
+    const result = await retention.run(now);
+
+    // Assert - history from 2024-10 onwards is kept
+    expect(retention.getCutoff(now)).toEqual(new Date('2024-10-01T00:00:00.000Z'));
+    expect(result.partitionsDropped).toEqual(['contact_history_entries_2024_09']);
+    const detach = statements.findIndex(({ sql }) => sql === 'ALTER TABLE "contact_history_entries" DETACH PARTITION "contact_history_entries_2024_09" CONCURRENTLY');
+    const countUpdate = statements.findIndex(({ sql }) => sql.includes('"historyCount" - h."count"') && sql.includes('"contact_history_entries_2024_09"'));
+    const drop = statements.findIndex(({ sql }) => sql === 'DROP TABLE "contact_history_entries_2024_09"');
+    expect(detach).toBeGreaterThanOrEqual(0);
+    expect(statements[detach].inTransaction).toBe(false);
+    expect(countUpdate).toBeGreaterThan(detach);
+    expect(drop).toBeGreaterThan(countUpdate);
+    expect(statements[drop].inTransaction).toBe(true);
+  });
+
+  it('should finish partitions an earlier run left detaching or detached', async () => {
+    // Arrange
+    const { db, statements } = createFakeDb({
+      locked: true,
+      tables: [
+        { name: 'contact_history_entries_2024_07', attached: false },
+        { name: 'contact_history_entries_2024_08', attached: true, detachPending: true },
+        ...tables,
+      ],
+    });
+    const retention = new ContactHistoryRetention(db, { retentionMonths: 24, partitionsAhead: 0 });
+
+    // Act
+    const result = await retention.run(now);
+
+    // Assert
+    expect(result.partitionsDropped).toEqual(['contact_history_entries_2024_07', 'contact_history_entries_2024_08', 'contact_history_entries_2024_09']);
+    expect(statements.some(({ sql }) => sql.includes('DETACH PARTITION "contact_history_entries_2024_07"'))).toBe(false);
+    expect(statements.some(({ sql }) => sql === 'ALTER TABLE "contact_history_entries" DETACH PARTITION "contact_history_entries_2024_08" FINALIZE')).toBe(true);
+  });
+
+  it('should do nothing while another task holds the maintenance lock', async () => {
+    // Arrange
+    const { db, statements } = createFakeDb({ locked: false, tables });
+    const retention = new ContactHistoryRetention(db, { retentionMonths: 1, partitionsAhead: 3 });
+
+    // Act
+    const result = await retention.run(now);
+
+    // Assert
+    expect(result.skipped).toBe(true);
+    expect(statements).toHaveLength(1);
+  });
+});
@@ -0,0 +1,76 @@
+import { ContactListCache } from '../../services/contactListCache';
+
+describe('ContactListCache', () => {
+  it('should keep owner versions bounded by maxEntries', () => {
+    // Arrange
+    const cache = new ContactListCache({ maxEntries: 3 });
+
+    // Act
+    for (let n = 0; n < 100; n++) {
+      cache.bumpVersion(`owner-${n}`);
+    }
+
+    // Assert
+    expect(cache.getMetrics().versions).toBe(3);
+  });
+
+  it('should not accept a response read before a bump whose version was since evicted', () => {
+    // Arrange
+    const cache = new ContactListCache({ maxEntries: 1 });
+    const version = cache.getVersion('owner-1');
+
+    // Act: the owner's contacts change while the list is queried, then their version is evicted
+    cache.bumpVersion('owner-1');
+    cache.bumpVersion('owner-2');
+    cache.set('owner-1', 'page=1', version, '{"stale":true}');
+
+    // Assert
+    expect(cache.getVersion('owner-1')).not.toBe(version);
+    expect(cache.get('owner-1', 'page=1')).toBeNull();
+  });
+
+  it('should serve a response stored under the current version', () => {
+    // Arrange
+    const cache = new ContactListCache({ maxEntries: 10 });
+    cache.bumpVersion('owner-1');
+    const version = cache.getVersion('owner-1');
+
+    // Act
+    cache.set('owner-1', 'page=1', version, '{"items":[]}');
+    const entry = cache.get('owner-1', 'page=1');
+
+    // Assert
+    expect(entry?.body).toBe('{"items":[]}');
+  });
+
+  it('should evict least recently used responses to stay within maxBytes', () => {
+    // Arrange
+    const cache = new ContactListCache({ maxEntries: 100, maxBytes: 25 });
+    const version = cache.getVersion('owner-1');
+    const body = 'x'.repeat(10);
+
+    // Act
+    cache.set('owner-1', 'page=1', version, body);
+    cache.set('owner-1', 'page=2', version, body);
+    cache.get('owner-1', 'page=1');
+    cache.set('owner-1', 'page=3', version, body);
+
+    // Assert
+    expect(cache.getMetrics()).toMatchObject({ entries: 2, bytes: 20 });
+    expect(cache.get('owner-1', 'page=2')).toBeNull();
+    expect(cache.get('owner-1', 'page=1')?.body).toBe(body);
+  });
+
+  it('should not cache a response larger than maxBytes', () => {
+    // Arrange
+    const cache = new ContactListCache({ maxEntries: 100, maxBytes: 5 });
+    const version = cache.getVersion('owner-1');
+
+    // Act
+    const entry = cache.set('owner-1', 'page=1', version, '{"items":[]}');
+
+    // Assert
+    expect(entry.etag).toBe(ContactListCache.etag('{"items":[]}'));
+    expect(cache.getMetrics()).toMatchObject({ entries: 0, bytes: 0 });
+  });
+});
@@ -0,0 +1,62 @@
+import { Prisma } from '@prisma/client';
+import { ContactRepository } from '../../repositories/contactRepository';
+import { ContactService } from '../../services/contactService';
+import { ErrorType } from '../../types';
+
+jest.mock('../../repositories/contactRepository');
+jest.mock('../../repositories/contactHistoryRepository');
+jest.mock('../../services/sseEventManager');
+
+// Raw inserts report a unique violation as P2010 wrapping Postgres 23505
+const uniqueViolation = () => new Prisma.PrismaClientKnownRequestError('duplicate key value violates unique constraint', {
+  code: 'P2010',
+  clientVersion: Prisma.prismaVersion.client,
+  meta: { code: '23505' },
+});
+
+describe('ContactService', () => {
+  let service: ContactService;
+  let mockContactRepository: jest.Mocked<ContactRepository>;
+
+  const contact = {
+    firstName: 'Ada',
+    lastName: 'Lovelace',
+    email: 'ada@example.com',
+    phone: '+15550100',
+    externalId: 'ext-1',
+  };
+
+  beforeEach(() => {
+    jest.clearAllMocks();
+    service = new ContactService();
+    mockContactRepository = (service as any).contactRepository;
+  });
+
+  describe('createContactWithExternalId', () => {
+    it('should report a duplicate email when a concurrent create wins the race past the pre-check', async () => {
+      // Arrange
+      mockContactRepository.existsByExternalId.mockResolvedValue(false);
+      mockContactRepository.existsByEmailAndOwner.mockResolvedValue(false);
+      mockContactRepository.createWithinLimit.mockRejectedValue(uniqueViolation());
+
+      // Act
+      const result = service.createContactWithExternalId(contact, 'owner-1');
+
+      // Assert
+      await expect(result).rejects.toMatchObject({ type: ErrorType.DUPLICATE_EMAIL, field: 'email' });
+    });
+
+    it('should report a duplicate external ID when the concurrent create claimed it', async () => {
+      // Arrange
+      mockContactRepository.existsByExternalId.mockResolvedValueOnce(false).mockResolvedValueOnce(true);
+      mockContactRepository.existsByEmailAndOwner.mockResolvedValue(false);
+      mockContactRepository.createWithinLimit.mockRejectedValue(uniqueViolation());
+
+      // Act
+      const result = service.createContactWithExternalId(contact, 'owner-1');
+
+      // Assert
+      await expect(result).rejects.toMatchObject({ type: ErrorType.VALIDATION_ERROR, field: 'externalId' });
+    });
+  });
+});
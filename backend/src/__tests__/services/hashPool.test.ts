@@ -0,0 +1,81 @@
+import bcrypt from 'bcryptjs';
+import os from 'os';
+import { availableCpus, HashPool } from '../../lib/hashPool';
+import { ErrorType } from '../../types';
+
+// Real worker threads; cost 4 keeps each hash to a few milliseconds
+const SALT_ROUNDS = 4;
+
+describe('HashPool', () => {
+  let pool: HashPool;
+
+  afterEach(async () => {
+    await pool.destroy();
+  });
+
+  it('should produce bcrypt hashes that verify in and out of the pool', async () => {
+    // Arrange
+    pool = new HashPool({ size: 2, maxQueue: 10 });
+
+    // Act
+    const hash = await pool.hash('correct horse', SALT_ROUNDS);
+    const matches = await pool.compare('correct horse', hash);
+    const mismatches = await pool.compare('wrong horse', hash);
+
+    // Assert
+    expect(bcrypt.compareSync('correct horse', hash)).toBe(true);
+    expect(matches).toBe(true);
+    expect(mismatches).toBe(false);
+    expect(pool.getMetrics()).toEqual(expect.objectContaining({ size: 2, busy: 0, queued: 0, completed: 3 }));
+  });
+
+  it('should reject work beyond the queue limit with a retryable 503 error', async () => {
+    // Arrange
+    pool = new HashPool({ size: 1, maxQueue: 1, retryAfterSeconds: 2 });
+
+    // Act: one task runs, one waits, the third is shed
+    const results = await Promise.allSettled([
+      pool.hash('a', SALT_ROUNDS),
+      pool.hash('b', SALT_ROUNDS),
+      pool.hash('c', SALT_ROUNDS),
+    ]);
+
+    // Assert
+    expect(results.map(result => result.status)).toEqual(['fulfilled', 'fulfilled', 'rejected']);
+    expect((results[2] as PromiseRejectedResult).reason).toMatchObject({
+      type: ErrorType.SERVICE_UNAVAILABLE,
+      retryAfter: 2,
+    });
+    expect(pool.getMetrics().rejected).toBe(1);
+  });
+});
+
+describe('availableCpus', () => {
+  const files = (contents: Record<string, string>) => (file: string) => {
+    if (!(file in contents)) {
+      throw new Error(`ENOENT: ${file}`);
+    }
+    return contents[file];
+  };
+
+  it('should use the cgroup v2 CPU quota instead of the host CPU count', () => {
+    // Act
+    const cpus = availableCpus(files({ '/sys/fs/cgroup/cpu.max': '25000 100000\n' }));
+
+    // Assert
+    expect(cpus).toBe(0.25);
+  });
+
+  it('should use the cgroup v1 quota and fall back to the host when unlimited', () => {
+    // Act
+    const limited = availableCpus(files({
+      '/sys/fs/cgroup/cpu/cpu.cfs_quota_us': '50000',
+      '/sys/fs/cgroup/cpu/cpu.cfs_period_us': '100000',
+    }));
+    const unlimited = availableCpus(files({ '/sys/fs/cgroup/cpu.max': 'max 100000' }));
+
+    // Assert
+    expect(limited).toBe(Math.min(0.5, os.cpus().length));
+    expect(unlimited).toBe(os.cpus().length);
+  });
+});
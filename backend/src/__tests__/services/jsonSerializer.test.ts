@@ -0,0 +1,41 @@
+import { compileSerializer } from '../../lib/jsonSerializer';
+
+describe('compileSerializer', () => {
+  const serialize = compileSerializer({
+    type: 'object',
+    properties: {
+      name: { type: 'string' },
+      count: { type: 'integer' },
+      active: { type: 'boolean' },
+      seenAt: { type: 'string', format: 'date-time' },
+      tags: { type: 'array', items: { type: 'string' } },
+      parent: { type: 'object', properties: { id: { type: 'string' } } },
+    },
+  });
+
+  it('should match JSON.stringify, escaping strings that need it', () => {
+    // Arrange
+    const value = {
+      name: 'line\nbreak "quoted" \\   😀',
+      count: 3,
+      active: false,
+      seenAt: '2025-01-01T00:00:00.000Z',
+      tags: ['a', 'b'.repeat(100)],
+      parent: null,
+    };
+
+    // Act & Assert
+    expect(serialize(value)).toBe(JSON.stringify(value));
+  });
+
+  it('should skip undefined and unknown properties and write Dates as ISO strings', () => {
+    // Arrange
+    const value = { name: 'n', count: Number.NaN, seenAt: new Date('2025-01-01T00:00:00.000Z'), password: 'secret' };
+
+    // Act
+    const json = serialize(value);
+
+    // Assert
+    expect(json).toBe('{"name":"n","count":null,"seenAt":"2025-01-01T00:00:00.000Z"}');
+  });
+});
@@ -0,0 +1,60 @@
+import { Metrics } from '../../lib/metrics';
+import { resolveTraceId } from '../../lib/requestContext';
+
+describe('Metrics', () => {
+  it('should render cumulative histogram buckets in Prometheus text format', () => {
+    // Arrange
+    const metrics = new Metrics({ enabled: true });
+    metrics.defineHistogram('http_request_duration_seconds', 'HTTP request latency', [0.01, 0.1]);
+
+    // Act
+    metrics.observe('http_request_duration_seconds', { route: '/contacts' }, 0.005);
+    metrics.observe('http_request_duration_seconds', { route: '/contacts' }, 0.05);
+    metrics.observe('http_request_duration_seconds', { route: '/contacts' }, 2);
+    const output = metrics.render();
+
+    // Assert
+    expect(output).toContain('# TYPE http_request_duration_seconds histogram');
+    expect(output).toContain('http_request_duration_seconds_bucket{route="/contacts",le="0.01"} 1');
+    expect(output).toContain('http_request_duration_seconds_bucket{route="/contacts",le="0.1"} 2');
+    expect(output).toContain('http_request_duration_seconds_bucket{route="/contacts",le="+Inf"} 3');
+    expect(output).toContain('http_request_duration_seconds_count{route="/contacts"} 3');
+  });
+
+  it('should read gauges and counters only at scrape time', () => {
+    // Arrange
+    const metrics = new Metrics({ enabled: true });
+    let queued = 1;
+    metrics.defineGauge('hash_pool_queued', 'Queued hash tasks', () => queued);
+    metrics.defineCounter('cache_requests_total', 'Cache lookups', () => [{ labels: { result: 'hit' }, value: 7 }]);
+
+    // Act
+    queued = 4;
+    const output = metrics.render();
+
+    // Assert
+    expect(output).toContain('# TYPE hash_pool_queued gauge\nhash_pool_queued 4');
+    expect(output).toContain('# TYPE cache_requests_total counter\ncache_requests_total{result="hit"} 7');
+  });
+
+  it('should record nothing while disabled', () => {
+    // Arrange
+    const metrics = new Metrics({ enabled: false });
+    metrics.defineHistogram('prisma_query_duration_seconds', 'Query latency');
+
+    // Act
+    metrics.observe('prisma_query_duration_seconds', { model: 'Contact' }, 0.01);
+
+    // Assert
+    expect(metrics.render()).not.toContain('prisma_query_duration_seconds_count');
+  });
+});
+
+describe('resolveTraceId', () => {
+  it('should prefer X-Request-Id, then the ALB trace root', () => {
+    // Act & Assert
+    expect(resolveTraceId('abc-123', 'Root=1-5759e988-bd862e3fe1be46a994272793')).toBe('abc-123');
+    expect(resolveTraceId(undefined, 'Self=1-abc;Root=1-5759e988-bd862e3fe1be46a994272793')).toBe('1-5759e988-bd862e3fe1be46a994272793');
+    expect(resolveTraceId('bad id with spaces')).toMatch(/^[0-9a-f-]{36}$/);
+  });
+});
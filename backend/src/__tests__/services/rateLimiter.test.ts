@@ -0,0 +1,106 @@
+import { RedisClient } from '../../lib/redis';
+import { MemoryRateLimitStore, RateLimiter, slidingWindow } from '../../services/rateLimiter';
+
+describe('slidingWindow', () => {
+  it('should weight the previous window by how much of it still overlaps', () => {
+    // Arrange: 10 requests last window, 2 so far, a quarter of the way into the current window
+    const windowMs = 1000;
+    const now = 5 * windowMs + 250;
+
+    // Act
+    const result = slidingWindow(10, 2, 10, windowMs, now);
+
+    // Assert: 10 * 0.75 + 2 = 9.5, so one more fits
+    expect(result.allowed).toBe(true);
+    expect(result.remaining).toBe(0);
+    expect(result.resetMs).toBe(750);
+  });
+});
+
+describe('MemoryRateLimitStore', () => {
+  it('should reject once the quota is used and allow again after two windows', async () => {
+    // Arrange
+    const store = new MemoryRateLimitStore();
+    const start = 10000;
+
+    // Act
+    const first = await store.consume('ip:1', 2, 1000, start);
+    const second = await store.consume('ip:1', 2, 1000, start + 1);
+    const third = await store.consume('ip:1', 2, 1000, start + 2);
+    const otherKey = await store.consume('ip:2', 2, 1000, start + 2);
+    const later = await store.consume('ip:1', 2, 1000, start + 2000);
+
+    // Assert
+    expect([first.allowed, second.allowed, third.allowed]).toEqual([true, true, false]);
+    expect(first.remaining).toBe(1);
+    expect(otherKey.allowed).toBe(true);
+    expect(later.allowed).toBe(true);
+  });
+});
+
+describe('RateLimiter', () => {
+  const createFakeRedis = (overrides: Partial<{ isReady: boolean; eval: jest.Mock }> = {}) => ({
+    isReady: true,
+    eval: jest.fn().mockResolvedValue([1, 4, 500]),
+    ...overrides,
+  }) as unknown as RedisClient;
+
+  const createLimiter = () => new RateLimiter({ windowMs: 1000, limits: { ip: 1, user: 5, apiKey: 10 } });
+
+  beforeEach(() => {
+    jest.spyOn(console, 'warn').mockImplementation(() => undefined);
+    jest.spyOn(console, 'error').mockImplementation(() => undefined);
+    jest.spyOn(console, 'log').mockImplementation(() => undefined);
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  it('should count in Redis under a per-scope key with the scope limit', async () => {
+    // Arrange
+    const redis = createFakeRedis();
+    const limiter = createLimiter();
+    limiter.attachRedis(redis);
+
+    // Act
+    const result = await limiter.consume('user', 'user-1');
+
+    // Assert
+    expect(result).toEqual({ allowed: true, limit: 5, remaining: 4, resetMs: 500 });
+    expect(redis.eval).toHaveBeenCalledWith(expect.any(String), {
+      keys: ['ratelimit:{user:user-1}'],
+      arguments: ['5', '1000'],
+    });
+  });
+
+  it('should fall back to per-task counters while Redis is unavailable', async () => {
+    // Arrange
+    const redis = createFakeRedis({ eval: jest.fn().mockRejectedValue(new Error('ECONNRESET')) });
+    const limiter = createLimiter();
+    limiter.attachRedis(redis);
+
+    // Act
+    const first = await limiter.consume('ip', '10.0.0.1');
+    const second = await limiter.consume('ip', '10.0.0.1');
+
+    // Assert
+    expect(first.allowed).toBe(true);
+    expect(second.allowed).toBe(false);
+    expect(limiter.getMetrics()).toEqual({ allowed: 1, limited: 1, fallbacks: 2, usingFallback: true });
+  });
+
+  it('should not call Redis before it reports ready', async () => {
+    // Arrange
+    const redis = createFakeRedis({ isReady: false });
+    const limiter = createLimiter();
+    limiter.attachRedis(redis);
+
+    // Act
+    await limiter.consume('apiKey', 'key-1');
+
+    // Assert
+    expect(redis.eval).not.toHaveBeenCalled();
+    expect(limiter.getMetrics().usingFallback).toBe(true);
+  });
+});
@@ -0,0 +1,64 @@
+import { PrismaClient } from '@prisma/client';
+import { ReadReplicaRouter } from '../../lib/readReplicaRouter';
+
+describe('ReadReplicaRouter', () => {
+  const writer = { name: 'writer' } as unknown as PrismaClient;
+  const reader = { name: 'reader' } as unknown as PrismaClient;
+
+  afterEach(() => {
+    jest.useRealTimers();
+  });
+
+  it('should use the writer for everything when no reader is configured', () => {
+    // Arrange
+    const router = new ReadReplicaRouter(writer);
+
+    // Act
+    router.markWrite('user-1');
+
+    // Assert
+    expect(router.clientFor('user-1')).toBe(writer);
+    expect(router.getMetrics().enabled).toBe(false);
+  });
+
+  it('should keep an owner on the writer after a write until the sticky window passes', () => {
+    // Arrange
+    jest.useFakeTimers();
+    const router = new ReadReplicaRouter(writer, reader, { stickyMs: 1000 });
+
+    // Act
+    const before = router.clientFor('user-1');
+    router.markWrite('user-1');
+    const justAfter = router.clientFor('user-1');
+    const otherOwner = router.clientFor('user-2');
+    jest.advanceTimersByTime(1001);
+    const later = router.clientFor('user-1');
+
+    // Assert
+    expect(before).toBe(reader);
+    expect(justAfter).toBe(writer);
+    expect(otherOwner).toBe(reader);
+    expect(later).toBe(reader);
+    expect(router.getMetrics()).toEqual(expect.objectContaining({ readerReads: 3, writerReads: 1 }));
+  });
+
+  it('should honour write marks published by other tasks', async () => {
+    // Arrange
+    const router = new ReadReplicaRouter(writer, reader, { stickyMs: 1000 });
+    let onMessage: (ownerId: string) => void = () => undefined;
+    const subscriber = {
+      subscribe: jest.fn(async (_channel: string, listener: (message: string) => void) => {
+        onMessage = listener;
+      }),
+    };
+    const publisher = { publish: jest.fn().mockResolvedValue(1) };
+    await router.attachRedis(publisher as any, subscriber as any);
+
+    // Act
+    onMessage('user-1');
+
+    // Assert
+    expect(subscriber.subscribe).toHaveBeenCalledWith(ReadReplicaRouter.WRITE_CHANNEL, expect.any(Function));
+    expect(router.clientFor('user-1')).toBe(writer);
+  });
+});
@@ -0,0 +1,70 @@
+import { SSEEventBus } from '../../services/sseEventBus';
+
+// Minimal in-memory stand-in for a pair of Redis connections sharing one pub/sub channel
+const createFakeRedis = () => {
+  const listeners: Array<(message: string) => void> = [];
+  const publisher = {
+    publish: jest.fn(async (_channel: string, message: string) => {
+      listeners.forEach(listener => listener(message));
+      return listeners.length;
+    }),
+  };
+  const createSubscriber = () => ({
+    subscribe: jest.fn(async (_channel: string, listener: (message: string) => void) => {
+      listeners.push(listener);
+    }),
+    unsubscribe: jest.fn(async () => undefined),
+  });
+  return { publisher, createSubscriber };
+};
+
+describe('SSEEventBus', () => {
+  it('should batch queued events into a single publish', async () => {
+    // Arrange
+    const redis = createFakeRedis();
+    const bus = new SSEEventBus(redis.publisher as any, redis.createSubscriber() as any, { batchWindowMs: 1000, maxBatchSize: 100 });
+
+    // Act
+    bus.publish({ userId: 'user-1', payload: '{"type":"contact:created"}' });
+    bus.publish({ userId: 'user-2', payload: '{"type":"contact:deleted"}' });
+    await bus.flush();
+
+    // Assert
+    expect(redis.publisher.publish).toHaveBeenCalledTimes(1);
+    const message = JSON.parse(redis.publisher.publish.mock.calls[0][1]);
+    expect(message.events).toHaveLength(2);
+    expect(bus.getPendingCount()).toBe(0);
+  });
+
+  it('should flush immediately when the batch is full', () => {
+    // Arrange
+    const redis = createFakeRedis();
+    const bus = new SSEEventBus(redis.publisher as any, redis.createSubscriber() as any, { batchWindowMs: 1000, maxBatchSize: 2 });
+
+    // Act
+    bus.publish({ userId: 'user-1', payload: '{}' });
+    bus.publish({ userId: 'user-1', payload: '{}' });
+
+    // Assert
+    expect(redis.publisher.publish).toHaveBeenCalledTimes(1);
+  });
+
+  it('should deliver batches from other tasks and ignore its own', async () => {
+    // Arrange
+    const redis = createFakeRedis();
+    const taskA = new SSEEventBus(redis.publisher as any, redis.createSubscriber() as any, { batchWindowMs: 1000 });
+    const taskB = new SSEEventBus(redis.publisher as any, redis.createSubscriber() as any, { batchWindowMs: 1000 });
+    const receivedByA = jest.fn();
+    const receivedByB = jest.fn();
+    await taskA.start(receivedByA);
+    await taskB.start(receivedByB);
+
+    // Act
+    taskA.publish({ userId: 'user-1', payload: '{"type":"contact:updated"}' });
+    await taskA.flush();
+
+    // Assert
+    expect(receivedByA).not.toHaveBeenCalled();
+    expect(receivedByB).toHaveBeenCalledWith([{ userId: 'user-1', payload: '{"type":"contact:updated"}' }]);
+  });
+});
@@ -0,0 +1,76 @@
+import { MemorySSEEventLog, planReplay } from '../../services/sseEventLog';
+
+describe('MemorySSEEventLog', () => {
+  it('should assign increasing IDs per user', async () => {
+    // Arrange
+    const log = new MemorySSEEventLog({ bufferSize: 10 });
+
+    // Act
+    const first = await log.append('user-1', '{"n":1}');
+    const second = await log.append('user-1', '{"n":2}');
+    const other = await log.append('user-2', '{"n":1}');
+
+    // Assert
+    expect([first, second, other]).toEqual([1, 2, 1]);
+  });
+
+  it('should replay only the events after the last seen ID', async () => {
+    // Arrange
+    const log = new MemorySSEEventLog({ bufferSize: 10 });
+    for (let n = 1; n <= 4; n++) {
+      await log.append('user-1', `{"n":${n}}`);
+    }
+
+    // Act
+    const replay = await log.since('user-1', 2);
+
+    // Assert
+    expect(replay).toEqual({
+      resync: false,
+      events: [{ id: 3, payload: '{"n":3}' }, { id: 4, payload: '{"n":4}' }],
+    });
+  });
+
+  it('should ask for a resync once missed events have been evicted', async () => {
+    // Arrange
+    const log = new MemorySSEEventLog({ bufferSize: 2 });
+    for (let n = 1; n <= 5; n++) {
+      await log.append('user-1', `{"n":${n}}`);
+    }
+
+    // Act
+    const replay = await log.since('user-1', 1);
+
+    // Assert
+    expect(replay).toEqual({ resync: true, latestId: 5 });
+  });
+
+  it('should ask for a resync when the client is ahead of the log', async () => {
+    // Arrange
+    const log = new MemorySSEEventLog();
+
+    // Act
+    const replay = await log.since('user-1', 7);
+
+    // Assert
+    expect(replay).toEqual({ resync: true, latestId: 0 });
+  });
+});
+
+describe('planReplay', () => {
+  it('should ask for a resync when the retained history expired but the sequence was kept', () => {
+    // Act
+    const replay = planReplay([], 12, 9);
+
+    // Assert
+    expect(replay).toEqual({ resync: true, latestId: 12 });
+  });
+
+  it('should replay nothing to a client that is up to date', () => {
+    // Act
+    const replay = planReplay([], 12, 12);
+
+    // Assert
+    expect(replay).toEqual({ resync: false, events: [] });
+  });
+});
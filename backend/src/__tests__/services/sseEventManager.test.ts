@@ -0,0 +1,174 @@
+import { EventEmitter } from 'events';
+import { SSEEventManager } from '../../services/sseEventManager';
+import { MemorySSEEventLog } from '../../services/sseEventLog';
+
+// Records everything written to an SSE response
+const createFakeResponse = () => {
+  const response = new EventEmitter() as any;
+  response.frames = [] as string[];
+  response.writableLength = 0;
+  response.writeHead = jest.fn();
+  response.appError = jest.fn();
+  response.destroy = jest.fn(() => response.emit('close'));
+  response.write = jest.fn((chunk: string) => {
+    response.frames.push(chunk);
+    return true;
+  });
+  return response;
+};
+
+const flushPromises = () => new Promise(resolve => setImmediate(resolve));
+
+describe('SSEEventManager', () => {
+  it('should tag live events with IDs', async () => {
+    // Arrange
+    const manager = new SSEEventManager({ heartbeatMs: 0 });
+    const response = createFakeResponse();
+    manager.addClient('user-1', response);
+
+    // Act
+    manager.emitContactDeleted('user-1', 'contact-1');
+    await flushPromises();
+
+    // Assert
+    expect(response.frames[1]).toBe('id: 1\ndata: {"type":"contact:deleted","data":{"id":"contact-1"}}\n\n');
+  });
+
+  it('should replay missed events to a reconnecting client without duplicates', async () => {
+    // Arrange
+    const manager = new SSEEventManager({ heartbeatMs: 0 });
+    manager.useEventLog(new MemorySSEEventLog({ bufferSize: 10 }));
+    manager.emitContactDeleted('user-1', 'a');
+    manager.emitContactDeleted('user-1', 'b');
+    manager.emitContactDeleted('user-1', 'c');
+    await flushPromises();
+    const response = createFakeResponse();
+
+    // Act
+    manager.addClient('user-1', response, 1);
+    manager.emitContactDeleted('user-1', 'd');
+    await flushPromises();
+
+    // Assert
+    const ids = response.frames.slice(1).map((frame: string) => frame.match(/^id: (\d+)/)![1]);
+    expect(ids).toEqual(['2', '3', '4']);
+  });
+
+  it('should send a resync event when the gap is no longer retained', async () => {
+    // Arrange
+    const manager = new SSEEventManager({ heartbeatMs: 0 });
+    manager.useEventLog(new MemorySSEEventLog({ bufferSize: 1 }));
+    manager.emitContactDeleted('user-1', 'a');
+    manager.emitContactDeleted('user-1', 'b');
+    manager.emitContactDeleted('user-1', 'c');
+    await flushPromises();
+    const response = createFakeResponse();
+
+    // Act
+    manager.addClient('user-1', response, 0);
+    await flushPromises();
+
+    // Assert
+    expect(response.frames.slice(1)).toEqual(['id: 3\ndata: {"type":"resync","data":{"latestId":3}}\n\n']);
+  });
+
+  it('should deliver live events that arrive out of ID order from other tasks', async () => {
+    // Arrange
+    const manager = new SSEEventManager({ heartbeatMs: 0 });
+    let deliver: (events: any[]) => void = () => undefined;
+    await manager.attachBus({ start: async (handler: (events: any[]) => void) => { deliver = handler; } } as any);
+    const response = createFakeResponse();
+    manager.addClient('user-1', response);
+
+    // Act: another task's batch carries an ID lower than one already written
+    deliver([{ userId: 'user-1', id: 7, payload: '{"type":"contact:deleted","data":{"id":"a"}}' }]);
+    deliver([{ userId: 'user-1', id: 6, payload: '{"type":"contact:deleted","data":{"id":"b"}}' }]);
+
+    // Assert
+    expect(response.frames.slice(1)).toEqual([
+      'id: 7\ndata: {"type":"contact:deleted","data":{"id":"a"}}\n\n',
+      'id: 6\ndata: {"type":"contact:deleted","data":{"id":"b"}}\n\n',
+    ]);
+  });
+
+  it('should write heartbeat comments to idle clients', () => {
+    // Arrange
+    jest.useFakeTimers();
+    const manager = new SSEEventManager({ heartbeatMs: 1000 });
+    const response = createFakeResponse();
+    manager.addClient('user-1', response);
+
+    // Act
+    jest.advanceTimersByTime(1000);
+
+    // Assert
+    expect(response.frames).toContain(': heartbeat\n\n');
+    response.emit('close');
+    jest.useRealTimers();
+  });
+
+  it('should hold frames after backpressure and coalesce updates to the same contact', async () => {
+    // Arrange
+    const manager = new SSEEventManager({ heartbeatMs: 0 });
+    const response = createFakeResponse();
+    manager.addClient('user-1', response);
+    response.write.mockReturnValueOnce(false);
+
+    // Act
+    manager.emitContactUpdated('user-1', { id: 'a', firstName: 'v1' });
+    manager.emitContactUpdated('user-1', { id: 'a', firstName: 'v2' });
+    manager.emitContactDeleted('user-1', 'b');
+    manager.emitContactUpdated('user-1', { id: 'a', firstName: 'v3' });
+    await flushPromises();
+    const heldWhileBlocked = response.frames.length;
+    response.emit('drain');
+
+    // Assert
+    expect(heldWhileBlocked).toBe(2);
+    expect(response.frames.slice(2)).toEqual([
+      'id: 3\ndata: {"type":"contact:deleted","data":{"id":"b"}}\n\n',
+      'id: 4\ndata: {"type":"contact:updated","data":{"id":"a","firstName":"v3"}}\n\n',
+    ]);
+    expect(manager.getMetrics().coalesced).toBe(1);
+  });
+
+  it('should evict a client whose buffer passes the limit', async () => {
+    // Arrange
+    const manager = new SSEEventManager({ heartbeatMs: 0, maxBufferedBytes: 100 });
+    const response = createFakeResponse();
+    manager.addClient('user-1', response);
+    response.write.mockReturnValue(false);
+
+    // Act
+    for (let n = 0; n < 5; n++) {
+      manager.emitContactDeleted('user-1', `contact-${n}`);
+    }
+    await flushPromises();
+
+    // Assert
+    expect(response.destroy).toHaveBeenCalled();
+    expect(manager.getClientCount('user-1')).toBe(0);
+    expect(manager.getMetrics()).toMatchObject({ clients: 0, bufferedBytes: 0, evicted: 1 });
+  });
+
+  it('should enforce per-user and per-task connection caps', () => {
+    // Arrange
+    const manager = new SSEEventManager({ heartbeatMs: 0, maxConnectionsPerUser: 2, maxConnections: 3 });
+    const first = createFakeResponse();
+
+    // Act
+    manager.addClient('user-1', first);
+    manager.addClient('user-1', createFakeResponse());
+    manager.addClient('user-1', createFakeResponse());
+    manager.addClient('user-2', createFakeResponse());
+    const overflow = createFakeResponse();
+    const accepted = manager.addClient('user-3', overflow);
+
+    // Assert
+    expect(first.destroy).toHaveBeenCalled();
+    expect(manager.getClientCount('user-1')).toBe(2);
+    expect(accepted).toBe(false);
+    expect(overflow.appError).toHaveBeenCalled();
+    expect(manager.getMetrics()).toMatchObject({ clients: 3, displaced: 1, rejected: 1 });
+  });
+});
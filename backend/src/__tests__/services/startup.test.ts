@@ -0,0 +1,54 @@
+import { HashPool } from '../../lib/hashPool';
+import { prisma } from '../../lib/prisma';
+import { Startup } from '../../lib/startup';
+
+jest.mock('../../lib/prisma', () => ({
+  prisma: {
+    $connect: jest.fn(),
+    $queryRaw: jest.fn(),
+  },
+  prismaReader: undefined,
+}));
+
+jest.mock('../../lib/hashPool', () => {
+  const pool = { warm: jest.fn() };
+  return { HashPool: { getInstance: () => pool } };
+});
+
+const mockedConnect = prisma.$connect as unknown as jest.Mock;
+const mockedQueryRaw = prisma.$queryRaw as unknown as jest.Mock;
+
+describe('Startup', () => {
+  beforeEach(() => {
+    jest.clearAllMocks();
+  });
+
+  it('should open the requested connections and start hash workers before reporting ready', async () => {
+    // Arrange
+    mockedConnect.mockResolvedValue(undefined);
+    mockedQueryRaw.mockResolvedValue([{ '?column?': 1 }]);
+    const startup = new Startup({ warmConnections: 3 });
+
+    // Act
+    const readyBefore = startup.isReady();
+    await startup.warmUp();
+
+    // Assert
+    expect(readyBefore).toBe(false);
+    expect(startup.isReady()).toBe(true);
+    expect(mockedConnect).toHaveBeenCalledTimes(1);
+    expect(mockedQueryRaw).toHaveBeenCalledTimes(3);
+    expect(HashPool.getInstance().warm).toHaveBeenCalled();
+    expect(startup.getTimings().readyMs).toEqual(expect.any(Number));
+  });
+
+  it('should stay not ready when the database cannot be reached', async () => {
+    // Arrange
+    mockedConnect.mockRejectedValue(new Error('connection refused'));
+    const startup = new Startup();
+
+    // Act & Assert
+    await expect(startup.warmUp()).rejects.toThrow('connection refused');
+    expect(startup.isReady()).toBe(false);
+  });
+});
@@ -1,4 +1,5 @@
 import { Response } from 'express';
+import { ApiKeySerializer } from '../dtos/serializers/apiKey.serializer';
 import { ApiKeyService, CreateApiKeyDto } from '../services/apiKeyService';
 import { AuthenticatedRequest, CustomSession } from '../types';
 
@@ -18,7 +19,7 @@ export class ApiKeyController {
       const userId = session.userId!;
 
       const apiKeys = await this.apiKeyService.getUserApiKeys(userId);
-      res.success(apiKeys);
+      res.success(apiKeys, 200, ApiKeySerializer.list);
     } catch (error: any) {
       console.error('Error fetching API keys:', error);
       res.appError(error);
@@ -1,6 +1,6 @@
 import { Request, Response } from 'express';
 import { AuthService } from '../services/authService';
-import { AuthenticatedRequest, CustomSession } from '../types';
+import { AuthenticatedRequest, CustomSession, ErrorType } from '../types';
 
 export class AuthController {
   private authService: AuthService;
@@ -89,7 +89,11 @@ export class AuthController {
         message: 'Login successful',
         user: userSession
       });
-    } catch (error) {
+    } catch (error: any) {
+      if (error?.type === ErrorType.SERVICE_UNAVAILABLE) {
+        return res.appError(error);
+      }
+
       console.error('Login error:', error);
       res.error('Internal server error');
     }
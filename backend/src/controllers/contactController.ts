@@ -1,7 +1,11 @@
 import { Response } from 'express';
 import { ContactService } from '../services/contactService';
 import { AuthenticatedRequest } from '../types';
-import { PaginationQueryDto, validatePaginationParams } from '../dtos/shared/pagination.dto';
+import { INVALID_CURSOR_MESSAGE, PaginationQueryDto, validatePaginationParams } from '../dtos/shared/pagination.dto';
+import { CONTACT_FIELDS, ContactExportFormat } from '../dtos/external/contact.dto';
+import { parseFieldList } from '../dtos/shared/fields.dto';
+import { ContactSerializer } from '../dtos/serializers/contact.serializer';
+import { streamContactExport } from '../utils/contactExport';
 
 export class ContactController {
   private contactService: ContactService;
@@ -15,14 +19,27 @@ export class ContactController {
    */
   getContacts = async (req: AuthenticatedRequest, res: Response) => {
     try {
-      const { page, pageSize, filter } = req.query as PaginationQueryDto & { filter?: string };
+      const { page, pageSize, filter, cursor, includeTotal } = req.query as PaginationQueryDto & { filter?: string };
+      const fields = parseFieldList(req.query.fields as string | undefined, CONTACT_FIELDS);
+
+      // Keyset pagination when a cursor is supplied (empty cursor = first page)
+      if (cursor !== undefined) {
+        const { pageSize: pageSizeNum } = validatePaginationParams(undefined, pageSize);
+        const result = await this.contactService.getContactsByCursor(req.userId!, {
+          cursor: cursor || undefined,
+          pageSize: pageSizeNum,
+          includeTotal: includeTotal === 'true'
+        }, filter, fields);
+
+        return res.cursorPaginated(result.data, result.pagination, 200, ContactSerializer.cursorPage(fields));
+      }
       
       // Validate pagination parameters
       const { page: pageNum, pageSize: pageSizeNum } = validatePaginationParams(page, pageSize);
 
-      const result = await this.contactService.getContacts(req.userId!, pageNum, pageSizeNum, filter);
+      const result = await this.contactService.getContacts(req.userId!, pageNum, pageSizeNum, filter, fields);
       
-      res.paginated(result.data, result.pagination);
+      res.paginated(result.data, result.pagination, 200, ContactSerializer.page(fields));
     } catch (error: any) {
       console.error('Error fetching contacts:', error);
       
@@ -30,18 +47,88 @@ export class ContactController {
       if (error.message.includes('Page must be between') || error.message.includes('Page size must be between')) {
         return res.validationError([{ message: error.message, field: 'pagination' }]);
       }
+
+      if (error.message === INVALID_CURSOR_MESSAGE) {
+        return res.validationError([{ message: error.message, field: 'cursor' }]);
+      }
       
       res.error('Internal server error');
     }
   };
 
+  /**
+   * Get the number of contacts the user owns
+   */
+  getContactCount = async (req: AuthenticatedRequest, res: Response) => {
+    try {
+      const count = await this.contactService.getContactCount(req.userId!);
+      res.success({ count });
+    } catch (error) {
+      console.error('Error counting contacts:', error);
+      res.error('Internal server error');
+    }
+  };
+
+  /**
+   * Search contacts by name, email or phone - ranked, cursor paginated
+   */
+  searchContacts = async (req: AuthenticatedRequest, res: Response) => {
+    try {
+      const { q, pageSize, cursor, includeTotal } = req.query as PaginationQueryDto & { q: string };
+      const fields = parseFieldList(req.query.fields as string | undefined, CONTACT_FIELDS);
+      const { pageSize: pageSizeNum } = validatePaginationParams(undefined, pageSize);
+
+      const result = await this.contactService.searchContacts(req.userId!, q.trim(), {
+        cursor: cursor || undefined,
+        pageSize: pageSizeNum,
+        includeTotal: includeTotal === 'true'
+      });
+
+      res.cursorPaginated(result.data, result.pagination, 200, ContactSerializer.cursorPage(fields));
+    } catch (error: any) {
+      console.error('Error searching contacts:', error);
+
+      if (error.message.includes('Page size must be between')) {
+        return res.validationError([{ message: error.message, field: 'pagination' }]);
+      }
+
+      if (error.message === INVALID_CURSOR_MESSAGE) {
+        return res.validationError([{ message: error.message, field: 'cursor' }]);
+      }
+
+      res.error('Internal server error');
+    }
+  };
+
+  /**
+   * Stream every contact as gzip-compressed CSV or NDJSON, optionally with change history
+   */
+  exportContacts = async (req: AuthenticatedRequest, res: Response) => {
+    const format = (req.query.format as ContactExportFormat | undefined) ?? 'csv';
+    const includeHistory = req.query.includeHistory === 'true';
+
+    try {
+      const rows = this.contactService.exportContacts(req.userId!, {
+        includeHistory,
+        batchSize: parseInt(process.env.CONTACT_EXPORT_BATCH_SIZE || '1000')
+      });
+      await streamContactExport(req, res, rows, format, includeHistory);
+    } catch (error: any) {
+      // Headers are already out once streaming starts; the truncated body tells the client it failed
+      if (error.code !== 'ERR_STREAM_PREMATURE_CLOSE') {
+        console.error('Error exporting contacts:', error);
+      }
+    }
+  };
+
   /**
    * Get a specific contact by ID - maintains exact same response structure
    */
   getContact = async (req: AuthenticatedRequest, res: Response) => {
     try {
       const { id } = req.params;
-      const contact = await this.contactService.getContact(id, req.userId!);
+      const fields = parseFieldList(req.query.fields as string | undefined, CONTACT_FIELDS);
+      const contact = await this.contactService.getContact(id, req.userId!, fields);
 
       if (!contact) {
         return res.notFound('Contact not found');
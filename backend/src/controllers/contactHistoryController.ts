@@ -1,7 +1,8 @@
 import { Response } from 'express';
+import { ContactSerializer } from '../dtos/serializers/contact.serializer';
 import { ContactHistoryService } from '../services/contactHistoryService';
 import { AuthenticatedRequest } from '../types';
-import { PaginationQueryDto, validatePaginationParams } from '../dtos/shared/pagination.dto';
+import { INVALID_CURSOR_MESSAGE, PaginationQueryDto, validatePaginationParams } from '../dtos/shared/pagination.dto';
 
 export class ContactHistoryController {
   private contactHistoryService: ContactHistoryService;
@@ -16,7 +17,24 @@ export class ContactHistoryController {
   getContactHistory = async (req: AuthenticatedRequest, res: Response) => {
     try {
       const { id } = req.params;
-      const { page, pageSize, order = 'desc' } = req.query as PaginationQueryDto;
+      const { page, pageSize, order = 'desc', cursor, includeTotal } = req.query as PaginationQueryDto;
+
+      // Keyset pagination when a cursor is supplied (empty cursor = first page)
+      if (cursor !== undefined) {
+        const { pageSize: pageSizeNum } = validatePaginationParams(undefined, pageSize);
+        const result = await this.contactHistoryService.getContactHistoryByCursor(
+          id,
+          req.userId!,
+          {
+            cursor: cursor || undefined,
+            pageSize: pageSizeNum,
+            includeTotal: includeTotal === 'true'
+          },
+          order as 'asc' | 'desc'
+        );
+
+        return res.cursorPaginated(result.data, result.pagination, 200, ContactSerializer.historyCursorPage);
+      }
       
       // Validate pagination parameters
       const { page: pageNum, pageSize: pageSizeNum } = validatePaginationParams(page, pageSize);
@@ -29,7 +47,7 @@ export class ContactHistoryController {
         order as 'asc' | 'desc'
       );
 
-      res.paginated(result.data, result.pagination);
+      res.paginated(result.data, result.pagination, 200, ContactSerializer.historyPage);
     } catch (error: any) {
       console.error('Error fetching contact history:', error);
       
@@ -37,6 +55,10 @@ export class ContactHistoryController {
       if (error.message.includes('Page must be between') || error.message.includes('Page size must be between')) {
         return res.validationError([{ message: error.message, field: 'pagination' }]);
       }
+
+      if (error.message === INVALID_CURSOR_MESSAGE) {
+        return res.validationError([{ message: error.message, field: 'cursor' }]);
+      }
       
       if (error.message === 'Contact not found') {
         return res.notFound('Contact not found');
@@ -1,7 +1,18 @@
 import { Response } from 'express';
-import { ContactService } from '../services/contactService';
+import { ContactService, IndexedBulkContactRow } from '../services/contactService';
 import { ApiKeyRequest } from '../middleware/apiKeyAuth';
-import { CreateContactDto, UpdateContactDto } from '../dtos/external/contact.dto';
+import {
+  BulkContactImportResultDto,
+  BulkContactRowResultDto,
+  CONTACT_FIELDS,
+  ContactExportFormat,
+  CreateContactDto,
+  UpdateContactDto
+} from '../dtos/external/contact.dto';
+import { parseFieldList } from '../dtos/shared/fields.dto';
+import { streamContactExport } from '../utils/contactExport';
+import { NdjsonLineError, parseNdjson } from '../utils/ndjson';
+import { externalContactSchemas } from '../validation/externalContact.schemas';
 
 export class ExternalContactController {
   private contactService: ContactService;
@@ -22,7 +33,8 @@ export class ExternalContactController {
         return res.unauthorized('API key authentication required');
       }
 
-      const contact = await this.contactService.getContactByExternalId(externalId, userId);
+      const fields = parseFieldList(req.query.fields as string | undefined, CONTACT_FIELDS);
+      const contact = await this.contactService.getContactByExternalId(externalId, userId, fields);
 
       if (!contact) {
         return res.notFound('Contact not found');
@@ -35,6 +47,32 @@ export class ExternalContactController {
     }
   };
 
+  /**
+   * Stream every contact as gzip-compressed CSV or NDJSON, optionally with change history
+   */
+  exportContacts = async (req: ApiKeyRequest, res: Response) => {
+    const userId = req.apiKeyUserId;
+    if (!userId) {
+      return res.unauthorized('API key authentication required');
+    }
+
+    const format = (req.query.format as ContactExportFormat | undefined) ?? 'ndjson';
+    const includeHistory = req.query.includeHistory === 'true';
+
+    try {
+      const rows = this.contactService.exportContacts(userId, {
+        includeHistory,
+        batchSize: parseInt(process.env.CONTACT_EXPORT_BATCH_SIZE || '1000')
+      });
+      await streamContactExport(req, res, rows, format, includeHistory);
+    } catch (error: any) {
+      // Headers are already out once streaming starts; the truncated body tells the client it failed
+      if (error.code !== 'ERR_STREAM_PREMATURE_CLOSE') {
+        console.error('Error exporting external contacts:', error);
+      }
+    }
+  };
+
   /**
    * Update contact by external ID - maintains exact same response structure
    */
@@ -95,6 +133,65 @@ export class ExternalContactController {
     }
   };
 
+  /**
+   * Create or update many contacts by external ID from a JSON array or NDJSON body.
+   * Always answers 200 with a per-row result unless the request as a whole is malformed.
+   */
+  bulkUpsertContacts = async (req: ApiKeyRequest, res: Response) => {
+    try {
+      const userId = req.apiKeyUserId;
+
+      if (!userId) {
+        return res.unauthorized('API key authentication required');
+      }
+
+      const rows: unknown[] | null = Array.isArray(req.body)
+        ? req.body
+        : typeof req.body === 'string' ? parseNdjson(req.body) : null;
+
+      if (!rows) {
+        return res.validationError([{ message: 'Body must be a JSON array or NDJSON', field: 'body' }]);
+      }
+
+      const maxRows = parseInt(process.env.BULK_IMPORT_MAX_ROWS || '1000');
+      if (rows.length === 0 || rows.length > maxRows) {
+        return res.validationError([{ message: `Bulk import accepts between 1 and ${maxRows} contacts`, field: 'body' }]);
+      }
+
+      // Validate every row in one pass; invalid rows are reported, the rest are imported
+      const rejected: BulkContactRowResultDto[] = [];
+      const accepted: IndexedBulkContactRow[] = [];
+      rows.forEach((row, index) => {
+        if (row instanceof NdjsonLineError) {
+          rejected.push({ index, status: 'error', errors: [{ message: row.message, field: 'body' }] });
+          return;
+        }
+
+        const { error, value } = externalContactSchemas.createContactWithExternalId.body.validate(row, { abortEarly: false });
+        if (error) {
+          rejected.push({
+            index,
+            externalId: typeof value?.externalId === 'string' ? value.externalId : undefined,
+            status: 'error',
+            errors: error.details.map(detail => ({ message: detail.message, field: detail.path.join('.') }))
+          });
+          return;
+        }
+
+        accepted.push({ index, contact: value });
+      });
+
+      const imported = accepted.length > 0
+        ? await this.contactService.bulkUpsertContactsByExternalId(accepted, userId)
+        : [];
+
+      res.success(this.summarizeBulkResults(rows.length, [...rejected, ...imported]));
+    } catch (error: any) {
+      console.error('Error bulk importing external contacts:', error);
+      res.appError(error);
+    }
+  };
+
   /**
    * Delete contact by external ID - maintains exact same response structure
    */
@@ -115,4 +212,19 @@ export class ExternalContactController {
       res.appError(error);
     }
   };
+
+  private summarizeBulkResults(received: number, results: BulkContactRowResultDto[]): BulkContactImportResultDto {
+    const count = (status: BulkContactRowResultDto['status']) => results.filter(result => result.status === status).length;
+
+    return {
+      summary: {
+        received,
+        created: count('created'),
+        updated: count('updated'),
+        unchanged: count('unchanged'),
+        failed: count('error')
+      },
+      results: results.sort((a, b) => a.index - b.index)
+    };
+  }
 }
@@ -1,4 +1,4 @@
-import { BaseEntityDto, ContactHistoryChangeDto } from '../shared/common.dto';
+import { BaseEntityDto, ContactHistoryChangeDto, ValidationErrorDto } from '../shared/common.dto';
 
 // External DTOs - Used between Service and API layers
 // These exclude sensitive data and are safe for external consumption
@@ -11,15 +11,25 @@ export interface ContactDto extends BaseEntityDto {
   phone: string;
   createdAt: string; // ISO string for API
   updatedAt: string; // ISO string for API
-  owner: {
-    id: string;
-    firstName: string;
-    lastName: string;
-    email: string;
-    // NO password field - security!
-  };
+  owner?: ContactOwnerDto; // Only present when requested with ?fields=owner
+}
+
+export interface ContactOwnerDto {
+  id: string;
+  firstName: string;
+  lastName: string;
+  email: string;
+  // NO password field - security!
 }
 
+// Fields a client may request with ?fields= (sparse fieldset)
+export const CONTACT_FIELDS = ['id', 'firstName', 'lastName', 'email', 'phone', 'createdAt', 'updatedAt', 'owner'] as const;
+
+export type ContactField = typeof CONTACT_FIELDS[number];
+
+// A contact trimmed to the requested fields
+export type ContactProjectionDto = Partial<ContactDto>;
+
 export interface CreateContactDto {
   firstName: string;
   lastName: string;
@@ -34,6 +44,32 @@ export interface UpdateContactDto {
   phone?: string;
 }
 
+// One row of POST /api/external/contact/bulk
+export interface BulkContactRowDto extends CreateContactDto {
+  externalId: string;
+}
+
+export type BulkContactRowStatus = 'created' | 'updated' | 'unchanged' | 'error';
+
+export interface BulkContactRowResultDto {
+  index: number; // Position of the row in the request
+  externalId?: string;
+  status: BulkContactRowStatus;
+  id?: string;
+  errors?: ValidationErrorDto[];
+}
+
+export interface BulkContactImportResultDto {
+  summary: {
+    received: number;
+    created: number;
+    updated: number;
+    unchanged: number;
+    failed: number;
+  };
+  results: BulkContactRowResultDto[];
+}
+
 export interface ContactHistoryDto extends BaseEntityDto {
   id: string;
   firstName?: ContactHistoryChangeDto;
@@ -43,4 +79,12 @@ export interface ContactHistoryDto extends BaseEntityDto {
   createdAt: string; // ISO string for API
 }
 
+export const CONTACT_EXPORT_FORMATS = ['csv', 'ndjson'] as const;
 
+export type ContactExportFormat = typeof CONTACT_EXPORT_FORMATS[number];
+
+// One row of GET /contacts/export and GET /api/external/contact/export
+export interface ContactExportDto extends Omit<ContactDto, 'owner'> {
+  externalId: string | null;
+  history?: Omit<ContactHistoryDto, 'updatedAt'>[]; // Only present with ?includeHistory=true
+}
@@ -3,6 +3,7 @@
 // Shared DTOs
 export * from './shared/common.dto';
 export * from './shared/pagination.dto';
+export * from './shared/fields.dto';
 
 // Internal DTOs
 export * from './internal/user.dto';
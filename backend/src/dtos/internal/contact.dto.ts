@@ -16,18 +16,19 @@ export interface InternalContactDto extends Contact, BaseEntityInternalDto {
   updatedAt: Date;
 }
 
-export interface InternalContactWithOwnerDto extends InternalContactDto {
-  owner: {
-    id: string;
-    firstName: string;
-    lastName: string;
-    email: string;
-    password: string; // Internal - includes sensitive data
-    createdAt: Date;
-    updatedAt: Date;
-  };
+export interface InternalContactOwnerDto {
+  id: string;
+  firstName: string;
+  lastName: string;
+  email: string;
 }
 
+// Contact row fetched with a sparse select - only `id` is guaranteed
+export type InternalContactProjectionDto = Pick<InternalContactDto, 'id'> &
+  Partial<Omit<InternalContactDto, 'id'>> & {
+    owner?: InternalContactOwnerDto;
+  };
+
 export interface InternalCreateContactDto {
   ownerId: string;
   firstName: string;
@@ -44,13 +45,22 @@ export interface InternalUpdateContactDto {
   phone?: string;
 }
 
+export interface InternalContactUpdateResultDto {
+  status: 'updated' | 'unchanged' | 'not_found';
+  contact?: InternalContactDto; // Set when status is 'updated'
+}
+
+export interface InternalBulkContactUpdateDto {
+  id: string;
+  data: Required<InternalUpdateContactDto>; // Full replacement of the mutable columns
+  history: InternalCreateContactHistoryDto;
+}
+
 export interface InternalContactHistoryDto {
   id: string;
   contactId: string;
-  firstName?: any; // JsonValue from Prisma
-  lastName?: any; // JsonValue from Prisma
-  email?: any; // JsonValue from Prisma
-  phone?: any; // JsonValue from Prisma
+  changedFields: number; // Bitmask over HISTORY_FIELDS (see lib/contactHistoryCodec)
+  diff: any; // JsonValue from Prisma: [before, after] per changed field, in bit order
   createdAt: Date;
   // Note: ContactHistory doesn't have updatedAt in the schema
 }
@@ -1,16 +1,20 @@
 import {
   ContactDto,
+  ContactExportDto,
+  ContactField,
   ContactHistoryDto,
+  ContactProjectionDto,
   CreateContactDto,
   UpdateContactDto
 } from '../external/contact.dto';
 import {
   InternalContactDto,
   InternalContactHistoryDto,
-  InternalContactWithOwnerDto,
+  InternalContactProjectionDto,
   InternalCreateContactDto,
   InternalUpdateContactDto
 } from '../internal/contact.dto';
+import { decodeHistoryChanges } from '../../lib/contactHistoryCodec';
 
 // Mapper functions to transform between internal and external DTOs
 
@@ -28,24 +32,47 @@ export class ContactMapper {
     };
   }
 
-  // Transform internal contact with owner to external contact with owner
-  static toContactWithOwnerDto(internal: InternalContactWithOwnerDto): ContactDto {
-    return {
-      id: internal.id,
-      firstName: internal.firstName,
-      lastName: internal.lastName,
-      email: internal.email,
-      phone: internal.phone,
-      createdAt: internal.createdAt.toISOString(),
-      updatedAt: internal.updatedAt.toISOString(),
-      owner: {
-        id: internal.owner.id,
-        firstName: internal.owner.firstName,
-        lastName: internal.owner.lastName,
-        email: internal.owner.email,
-        // NO password field - security!
+  // Transform a sparse internal contact to an external contact holding only the requested fields
+  static toContactProjectionDto(internal: InternalContactProjectionDto, fields?: ContactField[]): ContactProjectionDto {
+    if (!fields) {
+      return ContactMapper.toContactDto(internal as InternalContactDto);
+    }
+
+    const projection: ContactProjectionDto = {};
+    for (const field of fields) {
+      switch (field) {
+        case 'createdAt':
+        case 'updatedAt':
+          projection[field] = internal[field]?.toISOString();
+          break;
+        case 'owner':
+          projection.owner = internal.owner && {
+            id: internal.owner.id,
+            firstName: internal.owner.firstName,
+            lastName: internal.owner.lastName,
+            email: internal.owner.email,
+          };
+          break;
+        default:
+          projection[field] = internal[field];
       }
+    }
+    return projection;
+  }
+
+  // Transform internal contact (and optionally its history) to an export row
+  static toContactExportDto(internal: InternalContactDto, history?: InternalContactHistoryDto[]): ContactExportDto {
+    const row: ContactExportDto = {
+      ...ContactMapper.toContactDto(internal),
+      externalId: internal.externalId,
     };
+    if (history) {
+      row.history = history.map(entry => {
+        const { updatedAt, ...change } = ContactMapper.toContactHistoryDto(entry);
+        return change;
+      });
+    }
+    return row;
   }
 
   // Transform external create contact to internal create contact
@@ -75,10 +102,7 @@ export class ContactMapper {
   static toContactHistoryDto(internal: InternalContactHistoryDto): ContactHistoryDto {
     return {
       id: internal.id,
-      firstName: internal.firstName as { before: string; after: string } | undefined,
-      lastName: internal.lastName as { before: string; after: string } | undefined,
-      email: internal.email as { before: string; after: string } | undefined,
-      phone: internal.phone as { before: string; after: string } | undefined,
+      ...decodeHistoryChanges(internal.changedFields, internal.diff),
       createdAt: internal.createdAt.toISOString(),
       updatedAt: internal.createdAt.toISOString(), // ContactHistory doesn't have updatedAt, use createdAt
     };
@@ -0,0 +1,20 @@
+import { ResponseFormatter } from '../../utils/responseFormatter';
+
+// Precompiled response serializers for API key listings (ApiKeyInfo, dates written as ISO strings)
+
+export class ApiKeySerializer {
+  static readonly list = ResponseFormatter.compileSerializer({
+    type: 'array',
+    items: {
+      type: 'object',
+      properties: {
+        id: { type: 'string' },
+        name: { type: 'string' },
+        isActive: { type: 'boolean' },
+        lastUsedAt: { type: 'string', format: 'date-time' },
+        expiresAt: { type: 'string', format: 'date-time' },
+        createdAt: { type: 'string', format: 'date-time' },
+      },
+    },
+  });
+}
@@ -0,0 +1,97 @@
+import { JsonSchema, serializeDateTime, serializeString } from '../../lib/jsonSerializer';
+import { HISTORY_FIELDS } from '../../lib/contactHistoryCodec';
+import { ResponseFormatter, ResponseSerializer } from '../../utils/responseFormatter';
+import { ContactField } from '../external/contact.dto';
+import { InternalContactHistoryDto } from '../internal/contact.dto';
+
+// Precompiled response serializers for contact and history pages.
+// They take internal rows and write the external DTO shape directly - the same JSON as
+// ContactMapper followed by JSON.stringify, in one pass and without the intermediate DTOs.
+
+const CONTACT_PROPERTIES: Record<ContactField, JsonSchema> = {
+  id: { type: 'string' },
+  firstName: { type: 'string' },
+  lastName: { type: 'string' },
+  email: { type: 'string' },
+  phone: { type: 'string' },
+  createdAt: { type: 'string', format: 'date-time' },
+  updatedAt: { type: 'string', format: 'date-time' },
+  // Owner columns safe to expose, as in ContactMapper.toContactProjectionDto
+  owner: {
+    type: 'object',
+    properties: {
+      id: { type: 'string' },
+      firstName: { type: 'string' },
+      lastName: { type: 'string' },
+      email: { type: 'string' },
+    },
+  },
+};
+
+// Without ?fields= a contact is written as ContactMapper.toContactDto would (no owner)
+const DEFAULT_FIELDS: ContactField[] = ['id', 'firstName', 'lastName', 'email', 'phone', 'createdAt', 'updatedAt'];
+
+interface ContactPageSerializers {
+  page: ResponseSerializer;
+  cursorPage: ResponseSerializer;
+}
+
+const contactSchema = (fields: ContactField[]): JsonSchema => ({
+  type: 'object',
+  properties: Object.fromEntries(fields.map(field => [field, CONTACT_PROPERTIES[field]])),
+});
+
+/**
+ * One history row as ContactMapper.toContactHistoryDto would write it, decoding the changed-field
+ * bitmask straight into JSON
+ */
+const serializeHistoryEntry = (entry: InternalContactHistoryDto): string => {
+  const diff = entry.diff as string[];
+  let json = `{"id":${serializeString(entry.id)}`;
+  let offset = 0;
+  for (let bit = 0; bit < HISTORY_FIELDS.length; bit++) {
+    if (entry.changedFields & (1 << bit)) {
+      json += `,"${HISTORY_FIELDS[bit]}":{"before":${serializeString(diff[offset])},"after":${serializeString(diff[offset + 1])}}`;
+      offset += 2;
+    }
+  }
+  // History rows have no updatedAt; the API repeats createdAt
+  const createdAt = serializeDateTime(entry.createdAt);
+  return `${json},"createdAt":${createdAt},"updatedAt":${createdAt}}`;
+};
+
+const HISTORY_ENTRY_SCHEMA: JsonSchema = { type: 'raw', serialize: serializeHistoryEntry };
+
+export class ContactSerializer {
+  private static fieldsets: Map<string, ContactPageSerializers> = new Map();
+
+  static readonly historyPage = ResponseFormatter.compilePaginatedSerializer(HISTORY_ENTRY_SCHEMA);
+  static readonly historyCursorPage = ResponseFormatter.compileCursorPaginatedSerializer(HISTORY_ENTRY_SCHEMA);
+
+  // Offset-paginated contact rows trimmed to `fields` (all but owner when not given)
+  static page(fields?: ContactField[]): ResponseSerializer {
+    return ContactSerializer.forFields(fields).page;
+  }
+
+  // Cursor-paginated contact rows trimmed to `fields` (all but owner when not given)
+  static cursorPage(fields?: ContactField[]): ResponseSerializer {
+    return ContactSerializer.forFields(fields).cursorPage;
+  }
+
+  // Compiled once per subset of CONTACT_PROPERTIES, written in that order, so the cache holds at
+  // most 2^8 fieldsets whatever order clients list the fields in
+  private static forFields(fields: ContactField[] = DEFAULT_FIELDS): ContactPageSerializers {
+    const normalized = (Object.keys(CONTACT_PROPERTIES) as ContactField[]).filter(field => fields.includes(field));
+    const key = normalized.join(',');
+    let serializers = ContactSerializer.fieldsets.get(key);
+    if (!serializers) {
+      const item = contactSchema(normalized);
+      serializers = {
+        page: ResponseFormatter.compilePaginatedSerializer(item),
+        cursorPage: ResponseFormatter.compileCursorPaginatedSerializer(item),
+      };
+      ContactSerializer.fieldsets.set(key, serializers);
+    }
+    return serializers;
+  }
+}
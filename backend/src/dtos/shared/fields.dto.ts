@@ -0,0 +1,22 @@
+// Sparse fieldset helpers (?fields=a,b,c)
+
+/**
+ * Regex accepting a comma-separated list drawn from `allowed`, for Joi query validation
+ */
+export const fieldListPattern = (allowed: readonly string[]): RegExp => {
+  const names = allowed.join('|');
+  return new RegExp(`^(${names})(,(${names}))*$`);
+};
+
+/**
+ * Parse a validated ?fields= value. Returns undefined when no fieldset was requested.
+ * Fields come back once each in `allowed` order, whatever order the client listed them in.
+ */
+export const parseFieldList = <T extends string>(value: string | undefined, allowed: readonly T[]): T[] | undefined => {
+  if (!value) {
+    return undefined;
+  }
+
+  const requested = new Set(value.split(','));
+  return allowed.filter(field => requested.has(field));
+};
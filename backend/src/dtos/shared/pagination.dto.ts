@@ -29,6 +29,63 @@ export interface PaginationQueryDto {
   page?: string;
   pageSize?: string;
   order?: 'asc' | 'desc';
+  cursor?: string; // Present (even empty) to request keyset pagination
+  includeTotal?: string;
+}
+
+// Keyset (cursor) pagination - the cursor encodes the sort key of the last row returned
+export interface CursorPaginationOptionsDto {
+  cursor?: string; // Opaque cursor from the previous page, omitted for the first page
+  pageSize: number;
+  includeTotal: boolean;
+}
+
+export interface CursorPaginationDto {
+  pageSize: number;
+  nextCursor: string | null;
+  hasMore: boolean;
+  total?: number; // Only when explicitly requested
+}
+
+export interface CursorPaginationResultDto<T> {
+  data: T[];
+  pagination: CursorPaginationDto;
+}
+
+export const INVALID_CURSOR_MESSAGE = 'Invalid pagination cursor';
+
+// Cursors are base64url JSON so clients treat them as opaque tokens
+export function encodeCursor(values: Record<string, string>): string {
+  return Buffer.from(JSON.stringify(values)).toString('base64url');
+}
+
+export function decodeCursor<K extends string>(cursor: string, keys: readonly K[]): Record<K, string> {
+  let parsed: any;
+  try {
+    parsed = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'));
+  } catch {
+    throw new Error(INVALID_CURSOR_MESSAGE);
+  }
+
+  if (!parsed || typeof parsed !== 'object') {
+    throw new Error(INVALID_CURSOR_MESSAGE);
+  }
+
+  for (const key of keys) {
+    if (typeof parsed[key] !== 'string') {
+      throw new Error(INVALID_CURSOR_MESSAGE);
+    }
+  }
+
+  return parsed as Record<K, string>;
+}
+
+export function parseCursorDate(value: string): Date {
+  const date = new Date(value);
+  if (isNaN(date.getTime())) {
+    throw new Error(INVALID_CURSOR_MESSAGE);
+  }
+  return date;
 }
 
 // Validation functions
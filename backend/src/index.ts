@@ -2,12 +2,18 @@ import compression from 'compression';
 import RedisStore from 'connect-redis';
 import cors from 'cors';
 import express from 'express';
-import rateLimit from 'express-rate-limit';
 import session from 'express-session';
 import helmet from 'helmet';
-import { createClient } from 'redis';
-import { initializeDatabase } from './init-db';
-import { prisma } from './lib/prisma';
+import { CloudWatchMetrics } from './lib/cloudwatchMetrics';
+import { HashPool } from './lib/hashPool';
+import { Metrics } from './lib/metrics';
+import { prisma, prismaReader } from './lib/prisma';
+import { ReadReplicaRouter } from './lib/readReplicaRouter';
+import { createRedisClient, RedisClient } from './lib/redis';
+import { installTraceLogging } from './lib/requestContext';
+import { Startup } from './lib/startup';
+import { rateLimitByIp, rateLimitBySessionUser } from './middleware/rateLimit';
+import { instrumentRequest } from './middleware/requestInstrumentation';
 import { responseInterceptor } from './middleware/responseInterceptor';
 
 // Routes
@@ -19,13 +25,24 @@ import externalContactRoutes from './routes/externalContacts';
 
 // SSE Event Manager
 import { requireAuth } from './middleware/auth';
+import { ApiKeyCache } from './services/apiKeyCache';
+import { ApiKeyUsageTracker } from './services/apiKeyUsageTracker';
+import { ContactHistoryRetention } from './services/contactHistoryRetention';
+import { ContactListCache } from './services/contactListCache';
+import { RateLimiter } from './services/rateLimiter';
+import { SSEEventBus } from './services/sseEventBus';
 import { SSEEventManager } from './services/sseEventManager';
+import { RedisSSEEventLog } from './services/sseEventLog';
 import { AuthenticatedRequest } from './types';
 
 const app = express();
 const PORT = process.env.PORT || 3000;
 const NODE_ENV = process.env.NODE_ENV;
 
+// 0) Trace IDs on every request and its log lines; per-route latency when METRICS_ENABLED=true
+installTraceLogging();
+app.use(instrumentRequest);
+
 // 1) Security headers
 app.use(helmet());
 
@@ -73,28 +90,20 @@ app.use(compression({
   }
 }));
 
-// 6) Rate limiting
-app.use(
-  rateLimit({
-    windowMs: 10 * 60 * 1000, // 10 minutes
-    max: 1000, // 1000 requests per 10 minutes
-    message: 'Too many requests from this IP, please try again later.',
-    skip: (req) => req.method === 'OPTIONS'
-  })
-);
+// 6) Response interceptor (adds custom response methods for response formatting/standardization)
+app.use(responseInterceptor);
 
 // 7) Body parsers
 app.use(express.json({ limit: '10mb' }));
 app.use(express.urlencoded({ extended: true }));
 
-// 8) Response interceptor (adds custom response methods for response formatting/standardization)
-app.use(responseInterceptor);
+// 8) Rate limits are mounted after the session middleware (below) so signed-in users get a per-user quota
 
 // 9) Start the server with proper session configuration, then mount routes
 async function startServer() {
   try {
-    // Initialize database
-    await initializeDatabase();
+    // Migrations and seeding run as a one-off task before deploys (scripts/migrate.sh), not here
+    const startup = Startup.getInstance();
 
     // Build session options
     const baseSessionOptions: session.SessionOptions = {
@@ -110,21 +119,31 @@ async function startServer() {
       },
     };
 
-    let redisClient: ReturnType<typeof createClient> | undefined;
-    // Prefer Redis store in all environments if REDIS_URL provided
-    if (process.env.REDIS_URL) {
-      redisClient = createClient({
-        url: process.env.REDIS_URL,
-        socket: {
-          // Use TLS in prod since our ElastiCache has transit encryption enabled
-          tls: NODE_ENV === 'production',
-          rejectUnauthorized: false,
-        },
-      });
+    const sseEventManager = SSEEventManager.getInstance();
+
+    if (ReadReplicaRouter.getInstance().isEnabled()) {
+      console.log('DATABASE_READ_URL set — list and history reads use the read replica');
+    }
 
+    // Prefer Redis store in all environments if REDIS_URL provided
+    const redisClient: RedisClient | undefined = createRedisClient();
+    let redisSubscriber: RedisClient | undefined;
+    if (redisClient) {
       await redisClient.connect();
       console.log('Connected to Redis for session storage');
 
+      // Cluster-wide SSE fan-out: the shared client publishes, a dedicated connection subscribes
+      redisSubscriber = redisClient.duplicate();
+      await redisSubscriber.connect();
+      await sseEventManager.attachBus(new SSEEventBus(redisClient, redisSubscriber));
+      console.log('SSE events fan out across tasks via Redis pub/sub');
+      // Event IDs and replay history must be shared so a reconnect can land on any task
+      sseEventManager.useEventLog(new RedisSSEEventLog(redisClient));
+      await ApiKeyCache.getInstance().attachRedis(redisClient, redisSubscriber);
+      await ReadReplicaRouter.getInstance().attachRedis(redisClient, redisSubscriber);
+      // Quotas are counted in Redis so they hold across tasks; per-task counters if it goes away
+      RateLimiter.getInstance().attachRedis(redisClient);
+
       const redisStore = new RedisStore({
         client: redisClient,
         prefix: 'sess:',
@@ -141,21 +160,116 @@ async function startServer() {
       app.use(session(baseSessionOptions));
     }
 
-    // 10) Mount API routes AFTER session middleware so req.session is available
+    // Quotas per signed-in user (RATE_LIMIT_USER_MAX) or else per IP (RATE_LIMIT_MAX), per RATE_LIMIT_WINDOW_MS
+    app.use(rateLimitBySessionUser);
+
+    // 10) Mount API routes AFTER session middleware so req.session is available.
+    // The external routes come before the per-IP quota: they are limited per key once requireApiKey
+    // accepts it, and count missing and uncached keys against the IP themselves.
+    app.use('/api/external/contact', externalContactRoutes);
+    app.use(rateLimitByIp);
     app.use('/', authRoutes);
     app.use('/contact', contactRoutes);
     app.use('/contacts', contactRoutes);
     app.use('/contact-history', contactHistoryRoutes);
     app.use('/api/keys', apiKeyRoutes);
-    app.use('/api/external/contact', externalContactRoutes);
-    // Health check
-    app.get('/health', (req, res) => res.success({ status: 'OK', timestamp: new Date().toISOString() }));
+    // Background flush of API key lastUsedAt timestamps
+    const apiKeyUsageTracker = ApiKeyUsageTracker.getInstance();
+    apiKeyUsageTracker.start();
+
+    // Health check for the load balancer; 503 until the database pool and hash workers are warm.
+    // Unauthenticated, so it reports readiness only - internal state is on the gated /metrics
+    app.get('/health', (req, res) => {
+      if (!startup.isReady()) {
+        return res.error('Server is starting', 503);
+      }
+      return res.success({ status: 'OK', timestamp: new Date().toISOString() });
+    });
+
+    // Prometheus scrape target; 404 unless METRICS_ENABLED=true, bearer METRICS_TOKEN when set
+    const metrics = Metrics.getInstance();
+    if (metrics.isEnabled()) {
+      metrics.startEventLoopMonitor();
+      metrics.defineGauge('sse_clients', 'Open SSE streams on this task', () => sseEventManager.getMetrics().clients);
+      metrics.defineGauge('sse_blocked_clients', 'SSE streams waiting for drain', () => sseEventManager.getMetrics().blockedClients);
+      metrics.defineGauge('sse_buffered_bytes', 'Bytes buffered for SSE streams', () => sseEventManager.getMetrics().bufferedBytes);
+      metrics.defineCounter('sse_evictions_total', 'Slow SSE streams closed', () => sseEventManager.getMetrics().evicted);
+      metrics.defineGauge('hash_pool_busy', 'Hash workers running a task', () => HashPool.getInstance().getMetrics().busy);
+      metrics.defineGauge('hash_pool_queued', 'Hash tasks waiting for a worker', () => HashPool.getInstance().getMetrics().queued);
+      metrics.defineCounter('hash_pool_rejected_total', 'Hash tasks shed with 503', () => HashPool.getInstance().getMetrics().rejected);
+      metrics.defineCounter('rate_limit_decisions_total', 'Rate limit checks by outcome', () => {
+        const { allowed, limited } = RateLimiter.getInstance().getMetrics();
+        return [{ labels: { result: 'allowed' }, value: allowed }, { labels: { result: 'limited' }, value: limited }];
+      });
+      metrics.defineGauge('contact_list_cache_entries', 'Cached contact list responses', () => ContactListCache.getInstance().getMetrics().entries);
+      metrics.defineCounter('contact_list_cache_requests_total', 'Contact list cache lookups', () => {
+        const { hits, misses } = ContactListCache.getInstance().getMetrics();
+        return [{ labels: { result: 'hit' }, value: hits }, { labels: { result: 'miss' }, value: misses }];
+      });
+      metrics.defineGauge('contact_list_cache_bytes', 'Total length of cached contact list bodies', () => ContactListCache.getInstance().getMetrics().bytes);
+      metrics.defineGauge('contact_list_cache_versions', 'Owners with a tracked contact list version', () => ContactListCache.getInstance().getMetrics().versions);
+      metrics.defineGauge('sse_users', 'Users with an open SSE stream on this task', () => sseEventManager.getMetrics().users);
+      metrics.defineCounter('sse_coalesced_total', 'SSE events merged into a pending write', () => sseEventManager.getMetrics().coalesced);
+      metrics.defineCounter('sse_displaced_total', 'SSE streams closed for a newer stream of the same user', () => sseEventManager.getMetrics().displaced);
+      metrics.defineCounter('sse_rejected_total', 'SSE streams refused at the connection limit', () => sseEventManager.getMetrics().rejected);
+      metrics.defineGauge('hash_pool_size', 'Hash worker threads', () => HashPool.getInstance().getMetrics().size);
+      metrics.defineCounter('hash_pool_completed_total', 'Hash tasks completed', () => HashPool.getInstance().getMetrics().completed);
+      metrics.defineCounter('rate_limit_fallbacks_total', 'Rate limit checks served by the in-memory fallback', () => RateLimiter.getInstance().getMetrics().fallbacks);
+      metrics.defineGauge('rate_limit_using_fallback', '1 while Redis is unavailable and limits are per task', () => (RateLimiter.getInstance().getMetrics().usingFallback ? 1 : 0));
+      metrics.defineGauge('api_key_usage_pending', 'API key lastUsedAt updates waiting for a flush', () => apiKeyUsageTracker.getMetrics().pending);
+      metrics.defineCounter('api_key_usage_flushed_total', 'API key lastUsedAt updates written', () => apiKeyUsageTracker.getMetrics().flushed);
+      metrics.defineCounter('api_key_usage_flushes_total', 'API key usage flushes by outcome', () => {
+        const { flushes, failedFlushes } = apiKeyUsageTracker.getMetrics();
+        return [{ labels: { result: 'ok' }, value: flushes }, { labels: { result: 'failed' }, value: failedFlushes }];
+      });
+      metrics.defineCounter('read_replica_reads_total', 'List reads by database', () => {
+        const { readerReads, writerReads } = ReadReplicaRouter.getInstance().getMetrics();
+        return [{ labels: { db: 'reader' }, value: readerReads }, { labels: { db: 'writer' }, value: writerReads }];
+      });
+      metrics.defineGauge('read_replica_sticky_owners', 'Owners pinned to the writer after a write', () => ReadReplicaRouter.getInstance().getMetrics().stickyOwners);
+      metrics.defineCounter('contact_history_maintenance_runs_total', 'History partition maintenance runs by outcome', () => {
+        const { runs, failedRuns } = ContactHistoryRetention.getInstance().getMetrics();
+        return [{ labels: { result: 'ok' }, value: runs }, { labels: { result: 'failed' }, value: failedRuns }];
+      });
+      metrics.defineCounter('contact_history_partitions_created_total', 'History partitions created', () => ContactHistoryRetention.getInstance().getMetrics().partitionsCreated);
+      metrics.defineCounter('contact_history_partitions_dropped_total', 'History partitions dropped by retention', () => ContactHistoryRetention.getInstance().getMetrics().partitionsDropped);
+      metrics.defineGauge('startup_seconds', 'Time from process start to each startup phase', () => {
+        const { listeningMs, readyMs } = startup.getTimings();
+        return [
+          ...(listeningMs === null ? [] : [{ labels: { phase: 'listening' }, value: listeningMs / 1000 }]),
+          ...(readyMs === null ? [] : [{ labels: { phase: 'ready' }, value: readyMs / 1000 }]),
+        ];
+      });
+    }
+
+    // Open SSE streams to CloudWatch for the SSE-based scaling policy (when the profile enables it)
+    const cloudWatchMetrics = CloudWatchMetrics.getInstance();
+    if (cloudWatchMetrics.isEnabled()) {
+      cloudWatchMetrics.defineGauge('SSEConnections', () => sseEventManager.getMetrics().clients);
+      cloudWatchMetrics.start();
+    }
+
+    app.get('/metrics', async (req, res) => {
+      if (!metrics.isEnabled()) {
+        return res.notFound('Route not found');
+      }
+      if (process.env.METRICS_TOKEN && req.header('Authorization') !== `Bearer ${process.env.METRICS_TOKEN}`) {
+        return res.unauthorized('Invalid metrics token');
+      }
+
+      // Prisma's own pool metrics: connections open/busy/idle and time spent waiting for one
+      const poolMetrics = await Promise.all([
+        prisma.$metrics.prometheus({ globalLabels: { db: 'writer' } }),
+        prismaReader ? prismaReader.$metrics.prometheus({ globalLabels: { db: 'reader' } }) : Promise.resolve(''),
+      ]);
+      res.type('text/plain; version=0.0.4').send(metrics.render() + poolMetrics.join('\n'));
+    });
 
     // 11) SSE endpoint for real-time updates
-    const sseEventManager = SSEEventManager.getInstance();
-    
     app.get('/api/events', requireAuth, (req: AuthenticatedRequest, res) => {
-      sseEventManager.addClient(req.userId!, res);
+      // Browsers resend Last-Event-ID on automatic reconnects; manual reconnects pass it as a query param
+      const lastEventId = Number(req.header('Last-Event-ID') ?? req.query.lastEventId ?? NaN);
+      sseEventManager.addClient(req.userId!, res, Number.isSafeInteger(lastEventId) && lastEventId >= 0 ? lastEventId : undefined);
       return; // Explicit return for TypeScript
     });
 
@@ -170,8 +284,34 @@ async function startServer() {
       res.error('Internal server error');
     });
 
+    // Graceful shutdown, registered before warm-up so a task stopped while warming still closes its pools
+    const shutdown = async () => {
+      await apiKeyUsageTracker.stop();
+      ContactHistoryRetention.getInstance().stop();
+      await sseEventManager.detachBus();
+      await HashPool.getInstance().destroy();
+      Metrics.getInstance().stopEventLoopMonitor();
+      CloudWatchMetrics.getInstance().stop();
+      await prisma.$disconnect();
+      if (prismaReader) await prismaReader.$disconnect();
+      if (redisSubscriber) await redisSubscriber.disconnect();
+      if (redisClient) await redisClient.disconnect();
+      process.exit(0);
+    };
+
+    process.on('SIGTERM', async () => {
+      console.log('SIGTERM received, shutting down gracefully');
+      await shutdown();
+    });
+
+    process.on('SIGINT', async () => {
+      console.log('SIGINT received, shutting down gracefully');
+      await shutdown();
+    });
+
     // 14) Start server
     app.listen(PORT, () => {
+      startup.markListening();
       console.log(`Server running on port ${PORT}`);
       console.log(`Environment: ${NODE_ENV}`);
       if (process.env.CORS_ORIGIN) {
@@ -181,20 +321,12 @@ async function startServer() {
       }
     });
 
-    // Graceful shutdown
-    process.on('SIGTERM', async () => {
-      console.log('SIGTERM received, shutting down gracefully');
-      await prisma.$disconnect();
-      if (redisClient) await redisClient.disconnect();
-      process.exit(0);
-    });
+    // Open database connections and hash workers while the load balancer waits on /health
+    await startup.warmUp();
+    console.log(`Ready ${startup.getTimings().readyMs}ms after process start`);
 
-    process.on('SIGINT', async () => {
-      console.log('SIGINT received, shutting down gracefully');
-      await prisma.$disconnect();
-      if (redisClient) await redisClient.disconnect();
-      process.exit(0);
-    });
+    // Create upcoming contact history partitions and drop expired ones
+    ContactHistoryRetention.getInstance().start();
   } catch (error) {
     console.error('Failed to start server:', error);
     process.exit(1);
@@ -1,8 +1,10 @@
-import { PrismaClient } from '@prisma/client';
-import bcrypt from 'bcryptjs';
-
-const prisma = new PrismaClient();
+import { HashPool } from './lib/hashPool';
+import { prisma } from './lib/prisma';
 
+/**
+ * Seed an empty database. Runs once per deploy from scripts/migrate.sh after migrations,
+ * never on server boot.
+ */
 async function initializeDatabase() {
   try {
     console.log('Initializing database...');
@@ -18,7 +20,7 @@ async function initializeDatabase() {
       console.log('Seeding database with initial data...');
       
       // Create a default user
-      const hashedPassword = await bcrypt.hash('password123', 10);
+      const hashedPassword = await HashPool.getInstance().hash('password123', 10);
       
       const user = await prisma.user.create({
         data: {
@@ -63,6 +65,7 @@ async function initializeDatabase() {
     console.error('Error initializing database:', error);
     throw error;
   } finally {
+    await HashPool.getInstance().destroy();
     await prisma.$disconnect();
   }
 }
@@ -0,0 +1,82 @@
+export interface CloudWatchMetricsOptions {
+  namespace: string;
+  service: string;
+  intervalMs: number;
+}
+
+/**
+ * Periodic gauges published to CloudWatch as Embedded Metric Format (EMF) log lines. The task's
+ * awslogs driver ships stdout to CloudWatch Logs, which turns the lines into metrics the
+ * autoscaling policies can track - no agent or PutMetricData calls needed.
+ * Off unless CLOUDWATCH_METRICS_NAMESPACE is set (the CDK sets it when a profile scales on them).
+ */
+export class CloudWatchMetrics {
+  private static instance: CloudWatchMetrics;
+
+  private readonly options: CloudWatchMetricsOptions;
+  private gauges: Map<string, () => number> = new Map();
+  private timer: NodeJS.Timeout | null = null;
+
+  constructor(options: Partial<CloudWatchMetricsOptions> = {}) {
+    this.options = {
+      namespace: options.namespace ?? (process.env.CLOUDWATCH_METRICS_NAMESPACE || ''),
+      service: options.service ?? (process.env.CLOUDWATCH_METRICS_SERVICE || 'backend'),
+      intervalMs: options.intervalMs ?? parseInt(process.env.CLOUDWATCH_METRICS_INTERVAL_MS || '60000'),
+    };
+  }
+
+  static getInstance(): CloudWatchMetrics {
+    if (!CloudWatchMetrics.instance) {
+      CloudWatchMetrics.instance = new CloudWatchMetrics();
+    }
+    return CloudWatchMetrics.instance;
+  }
+
+  isEnabled(): boolean {
+    return this.options.namespace !== '';
+  }
+
+  defineGauge(name: string, collect: () => number): void {
+    this.gauges.set(name, collect);
+  }
+
+  /**
+   * One EMF document with every gauge's current value, dimensioned by service so the
+   * scaling policy can average it across tasks
+   */
+  render(now: number = Date.now()): string {
+    const values: Record<string, number> = {};
+    this.gauges.forEach((collect, name) => {
+      values[name] = collect();
+    });
+
+    return JSON.stringify({
+      _aws: {
+        Timestamp: now,
+        CloudWatchMetrics: [{
+          Namespace: this.options.namespace,
+          Dimensions: [['Service']],
+          Metrics: Object.keys(values).map(name => ({ Name: name, Unit: 'Count' })),
+        }],
+      },
+      Service: this.options.service,
+      ...values,
+    });
+  }
+
+  start(): void {
+    if (!this.isEnabled() || this.timer || this.gauges.size === 0) {
+      return;
+    }
+    // One raw JSON line per interval; CloudWatch Logs only extracts lines that parse as EMF
+    this.timer = setInterval(() => process.stdout.write(`${this.render()}\n`), this.options.intervalMs);
+    this.timer.unref();
+  }
+
+  stop(): void {
+    if (this.timer) {
+      clearInterval(this.timer);
+      this.timer = null;
+    }
+  }
+}
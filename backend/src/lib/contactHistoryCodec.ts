@@ -0,0 +1,46 @@
+// Compact storage format for contact history rows: `changedFields` is a bitmask of the fields an
+// update changed and `diff` lists [before, after] for each of them, flattened, in bit order.
+// For example a first name and phone change is stored as
+//   changedFields = 0b1001, diff = ['John', 'Jonathan', '+15550100', '+15550199']
+
+export const HISTORY_FIELDS = ['firstName', 'lastName', 'email', 'phone'] as const;
+
+export type HistoryField = typeof HISTORY_FIELDS[number];
+
+export interface HistoryChange {
+  before: string;
+  after: string;
+}
+
+export type HistoryChanges = Partial<Record<HistoryField, HistoryChange>>;
+
+export interface EncodedHistoryChanges {
+  changedFields: number;
+  diff: string[];
+}
+
+export const encodeHistoryChanges = (changes: HistoryChanges): EncodedHistoryChanges => {
+  let changedFields = 0;
+  const diff: string[] = [];
+  HISTORY_FIELDS.forEach((field, bit) => {
+    const change = changes[field];
+    if (change) {
+      changedFields |= 1 << bit;
+      diff.push(change.before, change.after);
+    }
+  });
+  return { changedFields, diff };
+};
+
+export const decodeHistoryChanges = (changedFields: number, diff: unknown): HistoryChanges => {
+  const values = diff as string[];
+  const changes: HistoryChanges = {};
+  let offset = 0;
+  HISTORY_FIELDS.forEach((field, bit) => {
+    if (changedFields & (1 << bit)) {
+      changes[field] = { before: values[offset], after: values[offset + 1] };
+      offset += 2;
+    }
+  });
+  return changes;
+};
@@ -0,0 +1,230 @@
+import fs from 'fs';
+import os from 'os';
+import path from 'path';
+import { Worker } from 'worker_threads';
+import { AppErrorClass } from '../utils/errors';
+
+type HashTaskInput =
+  | { op: 'hash'; data: string; saltRounds: number }
+  | { op: 'compare'; data: string; hash: string };
+
+export type HashTask = HashTaskInput & { id: number };
+
+export interface HashTaskResult {
+  id: number;
+  result?: string | boolean;
+  error?: string;
+}
+
+export interface HashPoolOptions {
+  size: number;
+  maxQueue: number;
+  retryAfterSeconds: number;
+}
+
+export interface HashPoolMetrics {
+  size: number;
+  busy: number;
+  queued: number;
+  completed: number;
+  rejected: number;
+}
+
+interface PendingTask {
+  task: HashTask;
+  resolve: (value: any) => void;
+  reject: (error: Error) => void;
+}
+
+interface PoolWorker {
+  worker: Worker;
+  current: PendingTask | null;
+}
+
+// The worker entry sits next to this module: .js once built, .ts under ts-node and ts-jest
+const WORKER_EXTENSION = path.extname(__filename);
+const WORKER_FILE = path.join(__dirname, `hashWorker${WORKER_EXTENSION}`);
+const WORKER_EXEC_ARGV = WORKER_EXTENSION === '.ts' ? ['--require', 'ts-node/register/transpile-only'] : undefined;
+
+/**
+ * CPUs this process may use. os.cpus() reports the host, which in a CPU-limited container
+ * (Fargate, Kubernetes) is far more than the task's share, so the cgroup quota wins when set.
+ */
+export const availableCpus = (readFile: (file: string) => string = file => fs.readFileSync(file, 'utf8')): number => {
+  const host = os.cpus().length;
+  const limit = (quota: number, period: number) => (quota > 0 && period > 0 ? Math.min(host, quota / period) : host);
+
+  try {
+    // cgroup v2: "<quota> <period>", or "max <period>" when unlimited
+    const [quota, period] = readFile('/sys/fs/cgroup/cpu.max').trim().split(/\s+/);
+    return quota === 'max' ? host : limit(Number(quota), Number(period));
+  } catch {
+    // Not cgroup v2
+  }
+  try {
+    // cgroup v1: a quota of -1 means unlimited
+    return limit(
+      Number(readFile('/sys/fs/cgroup/cpu/cpu.cfs_quota_us')),
+      Number(readFile('/sys/fs/cgroup/cpu/cpu.cfs_period_us'))
+    );
+  } catch {
+    return host;
+  }
+};
+
+/**
+ * Fixed pool of worker threads for bcrypt hashing and verification.
+ * Each bcrypt call costs tens of milliseconds of CPU; running it here keeps the main event loop
+ * free for SSE streams and other requests. Waiting work is capped at `maxQueue` tasks - beyond
+ * that callers get a 503 with Retry-After instead of an ever-growing backlog.
+ */
+export class HashPool {
+  private static instance: HashPool;
+
+  private readonly options: HashPoolOptions;
+  private workers: PoolWorker[] = [];
+  private queue: PendingTask[] = [];
+  private nextTaskId = 0;
+  private destroyed = false;
+  private metrics = {
+    completed: 0,
+    rejected: 0,
+  };
+
+  constructor(options: Partial<HashPoolOptions> = {}) {
+    this.options = {
+      size: options.size ?? parseInt(process.env.HASH_POOL_SIZE || String(Math.max(1, Math.ceil(availableCpus()) - 1))),
+      maxQueue: options.maxQueue ?? parseInt(process.env.HASH_POOL_MAX_QUEUE || '64'),
+      retryAfterSeconds: options.retryAfterSeconds ?? parseInt(process.env.HASH_POOL_RETRY_AFTER_SECONDS || '1'),
+    };
+  }
+
+  static getInstance(): HashPool {
+    if (!HashPool.instance) {
+      HashPool.instance = new HashPool();
+    }
+    return HashPool.instance;
+  }
+
+  hash(data: string, saltRounds: number): Promise<string> {
+    return this.submit({ op: 'hash', data, saltRounds });
+  }
+
+  compare(data: string, hash: string): Promise<boolean> {
+    return this.submit({ op: 'compare', data, hash });
+  }
+
+  /**
+   * Start the workers ahead of the first hash so a login does not wait on thread startup
+   */
+  warm(): void {
+    if (this.destroyed) {
+      return;
+    }
+    while (this.workers.length < this.options.size) {
+      this.workers.push(this.spawn());
+    }
+  }
+
+  getMetrics(): HashPoolMetrics {
+    return {
+      size: this.workers.length,
+      busy: this.workers.filter(poolWorker => poolWorker.current).length,
+      queued: this.queue.length,
+      completed: this.metrics.completed,
+      rejected: this.metrics.rejected,
+    };
+  }
+
+  /**
+   * Terminate the workers and fail any queued work (graceful shutdown)
+   */
+  async destroy(): Promise<void> {
+    this.destroyed = true;
+    this.queue.splice(0).forEach(pending => pending.reject(new Error('Hash pool shut down')));
+    await Promise.all(this.workers.map(poolWorker => poolWorker.worker.terminate()));
+    this.workers = [];
+  }
+
+  private submit<T>(input: HashTaskInput): Promise<T> {
+    if (this.destroyed) {
+      return Promise.reject(new Error('Hash pool shut down'));
+    }
+
+    // Workers start on first use (or warm()) so processes that never hash never pay for them
+    this.warm();
+
+    const idle = this.workers.find(poolWorker => !poolWorker.current);
+    if (!idle && this.queue.length >= this.options.maxQueue) {
+      this.metrics.rejected++;
+      return Promise.reject(AppErrorClass.overloaded(this.options.retryAfterSeconds));
+    }
+
+    return new Promise<T>((resolve, reject) => {
+      const pending: PendingTask = { task: { ...input, id: ++this.nextTaskId }, resolve, reject };
+      if (idle) {
+        this.dispatch(idle, pending);
+      } else {
+        this.queue.push(pending);
+      }
+    });
+  }
+
+  private spawn(): PoolWorker {
+    const poolWorker: PoolWorker = {
+      worker: new Worker(WORKER_FILE, { execArgv: WORKER_EXEC_ARGV }),
+      current: null,
+    };
+    // Idle workers must not keep the process alive; dispatch re-refs while a task runs
+    poolWorker.worker.unref();
+
+    poolWorker.worker.on('message', (reply: HashTaskResult) => {
+      const pending = poolWorker.current;
+      poolWorker.current = null;
+      poolWorker.worker.unref();
+      if (pending) {
+        this.metrics.completed++;
+        if (reply.error !== undefined) {
+          pending.reject(new Error(reply.error));
+        } else {
+          pending.resolve(reply.result);
+        }
+      }
+      this.drain(poolWorker);
+    });
+
+    poolWorker.worker.on('error', error => {
+      console.error('Hash worker failed:', error);
+    });
+
+    poolWorker.worker.on('exit', () => {
+      this.workers = this.workers.filter(other => other !== poolWorker);
+      if (poolWorker.current) {
+        poolWorker.current.reject(new Error('Hash worker exited'));
+        poolWorker.current = null;
+      }
+
+      // Replace the worker now only if work is waiting; otherwise the next submit does
+      if (!this.destroyed && this.queue.length > 0) {
+        const replacement = this.spawn();
+        this.workers.push(replacement);
+        this.drain(replacement);
+      }
+    });
+
+    return poolWorker;
+  }
+
+  private drain(poolWorker: PoolWorker): void {
+    const next = this.queue.shift();
+    if (next) {
+      this.dispatch(poolWorker, next);
+    }
+  }
+
+  private dispatch(poolWorker: PoolWorker, pending: PendingTask): void {
+    poolWorker.current = pending;
+    poolWorker.worker.ref();
+    poolWorker.worker.postMessage(pending.task);
+  }
+}
@@ -0,0 +1,17 @@
+import bcrypt from 'bcrypt';
+import { parentPort } from 'worker_threads';
+import type { HashTask, HashTaskResult } from './hashPool';
+
+// Runs inside a HashPool worker: one task at a time, synchronously with native bcrypt, off the main event loop
+parentPort!.on('message', (task: HashTask) => {
+  let reply: HashTaskResult;
+  try {
+    const result = task.op === 'hash'
+      ? bcrypt.hashSync(task.data, task.saltRounds)
+      : bcrypt.compareSync(task.data, task.hash);
+    reply = { id: task.id, result };
+  } catch (error: any) {
+    reply = { id: task.id, error: error?.message || 'Hashing failed' };
+  }
+  parentPort!.postMessage(reply);
+});
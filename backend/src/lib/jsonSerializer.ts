@@ -0,0 +1,94 @@
+// Schema-compiled JSON serializers for response hot paths.
+// A serializer is generated once per response shape: each property is read and written by
+// straight-line code instead of JSON.stringify walking and type-checking every value at runtime.
+// Output is identical to JSON.stringify of the same value restricted to the schema's properties,
+// with two additions: `date-time` strings also accept Date values (written as toISOString()),
+// so internal rows can be written without first mapping them to DTOs, and properties missing
+// from the schema are never written, so internal fields cannot leak.
+
+export type JsonSchema =
+  | { type: 'string'; format?: 'date-time' }
+  | { type: 'integer' | 'number' }
+  | { type: 'boolean' }
+  | { type: 'object'; properties: Record<string, JsonSchema> }
+  | { type: 'array'; items: JsonSchema }
+  // Escape hatch for values whose JSON is produced by hand-written code; must return valid JSON
+  | { type: 'raw'; serialize: (value: any) => string };
+
+export type Serializer<T = any> = (value: T) => string;
+
+// Characters JSON.stringify escapes (control, quote, backslash, and surrogates when unpaired)
+const NEEDS_ESCAPE = /[\u0000-\u001f"\\\ud800-\udfff]/;
+
+export const serializeString = (value: unknown): string => {
+  if (typeof value !== 'string') {
+    return JSON.stringify(value) ?? 'null';
+  }
+  // Short plain strings are the common case; quoting them directly skips the escape scan
+  return value.length < 64 && !NEEDS_ESCAPE.test(value) ? `"${value}"` : JSON.stringify(value);
+};
+
+export const serializeDateTime = (value: unknown): string =>
+  value instanceof Date ? `"${value.toISOString()}"` : serializeString(value);
+
+/**
+ * Generate a serializer for values of the given shape
+ */
+export const compileSerializer = <T = any>(schema: JsonSchema): Serializer<T> => {
+  const functions: string[] = [];
+  const raws: Array<(value: any) => string> = [];
+
+  // Expression writing `value` (a variable name) for `node`; nested shapes get their own function
+  const expression = (node: JsonSchema, value: string): string => {
+    switch (node.type) {
+      case 'string':
+        return node.format === 'date-time' ? `$date(${value})` : `$str(${value})`;
+      case 'integer':
+      case 'number':
+        return `(Number.isFinite(${value}) ? '' + ${value} : 'null')`;
+      case 'boolean':
+        return `(${value} ? 'true' : 'false')`;
+      case 'raw':
+        raws.push(node.serialize);
+        return `$raw[${raws.length - 1}](${value})`;
+      default:
+        return `f${compile(node)}(${value})`;
+    }
+  };
+
+  const compile = (node: JsonSchema): number => {
+    const id = functions.length;
+    functions.push('');
+    const lines: string[] = [];
+
+    if (node.type === 'object') {
+      lines.push(`if (o === null) return 'null';`, `let j = '{', s = '', v;`);
+      for (const [key, property] of Object.entries(node.properties)) {
+        lines.push(
+          `v = o[${JSON.stringify(key)}];`,
+          `if (v !== undefined) { j += s + ${JSON.stringify(JSON.stringify(key) + ':')} + (v === null ? 'null' : ${expression(property, 'v')}); s = ','; }`
+        );
+      }
+      lines.push(`return j + '}';`);
+    } else if (node.type === 'array') {
+      lines.push(
+        `if (o === null) return 'null';`,
+        `let j = '[';`,
+        `for (let i = 0; i < o.length; i++) {`,
+        `  const v = o[i];`,
+        `  j += (i === 0 ? '' : ',') + (v === undefined || v === null ? 'null' : ${expression(node.items, 'v')});`,
+        `}`,
+        `return j + ']';`
+      );
+    } else {
+      lines.push(`return o === null || o === undefined ? 'null' : ${expression(node, 'o')};`);
+    }
+
+    functions[id] = `function f${id}(o) {\n${lines.join('\n')}\n}`;
+    return id;
+  };
+
+  compile(schema);
+  const factory = new Function('$str', '$date', '$raw', `${functions.join('\n')}\nreturn f0;`);
+  return factory(serializeString, serializeDateTime, raws);
+};
@@ -0,0 +1,182 @@
+import { monitorEventLoopDelay, IntervalHistogram } from 'perf_hooks';
+
+export interface MetricsOptions {
+  enabled: boolean;
+}
+
+type Labels = Record<string, string>;
+
+interface HistogramSeries {
+  labels: Labels;
+  buckets: number[];
+  sum: number;
+  count: number;
+}
+
+interface Histogram {
+  help: string;
+  buckets: number[];
+  series: Map<string, HistogramSeries>;
+}
+
+interface GaugeSample {
+  labels?: Labels;
+  value: number;
+}
+
+interface Gauge {
+  help: string;
+  type: 'gauge' | 'counter';
+  collect: () => GaugeSample[];
+}
+
+// Seconds; spans a cached hit (~1ms) to a slow bulk import or bcrypt backlog
+export const DEFAULT_BUCKETS = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10];
+
+const escapeLabel = (value: string) => value.replace(/\\/g, '\\\\').replace(/\n/g, '\\n').replace(/"/g, '\\"');
+
+const formatLabels = (labels: Labels = {}, extra?: Labels): string => {
+  const entries = Object.entries({ ...labels, ...extra });
+  return entries.length ? `{${entries.map(([key, value]) => `${key}="${escapeLabel(value)}"`).join(',')}}` : '';
+};
+
+/**
+ * In-process metrics rendered in the Prometheus text format for GET /metrics.
+ * Disabled unless METRICS_ENABLED=true: recording calls then return immediately, so the
+ * hot paths pay one boolean check. Gauges are callbacks read only at scrape time.
+ */
+export class Metrics {
+  private static instance: Metrics;
+
+  private readonly options: MetricsOptions;
+  private histograms: Map<string, Histogram> = new Map();
+  private gauges: Map<string, Gauge> = new Map();
+  private eventLoopDelay: IntervalHistogram | null = null;
+
+  constructor(options: Partial<MetricsOptions> = {}) {
+    this.options = {
+      enabled: options.enabled ?? process.env.METRICS_ENABLED === 'true',
+    };
+  }
+
+  static getInstance(): Metrics {
+    if (!Metrics.instance) {
+      Metrics.instance = new Metrics();
+    }
+    return Metrics.instance;
+  }
+
+  isEnabled(): boolean {
+    return this.options.enabled;
+  }
+
+  defineHistogram(name: string, help: string, buckets: number[] = DEFAULT_BUCKETS): void {
+    if (!this.histograms.has(name)) {
+      this.histograms.set(name, { help, buckets, series: new Map() });
+    }
+  }
+
+  /**
+   * Record one observation (in seconds) for the label set
+   */
+  observe(name: string, labels: Labels, value: number): void {
+    if (!this.options.enabled) {
+      return;
+    }
+
+    const histogram = this.histograms.get(name);
+    if (!histogram) {
+      return;
+    }
+
+    const key = JSON.stringify(labels);
+    let series = histogram.series.get(key);
+    if (!series) {
+      series = { labels, buckets: new Array(histogram.buckets.length).fill(0), sum: 0, count: 0 };
+      histogram.series.set(key, series);
+    }
+
+    // Counts are stored per bucket and made cumulative when rendered
+    const index = histogram.buckets.findIndex(bound => value <= bound);
+    if (index !== -1) {
+      series.buckets[index]++;
+    }
+    series.sum += value;
+    series.count++;
+  }
+
+  defineGauge(name: string, help: string, collect: () => GaugeSample[] | number): void {
+    this.defineCollected(name, help, 'gauge', collect);
+  }
+
+  /**
+   * A running total kept elsewhere (e.g. a service's getMetrics()), read at scrape time
+   */
+  defineCounter(name: string, help: string, collect: () => GaugeSample[] | number): void {
+    this.defineCollected(name, help, 'counter', collect);
+  }
+
+  private defineCollected(name: string, help: string, type: Gauge['type'], collect: () => GaugeSample[] | number): void {
+    this.gauges.set(name, {
+      help,
+      type,
+      collect: () => {
+        const value = collect();
+        return typeof value === 'number' ? [{ value }] : value;
+      },
+    });
+  }
+
+  /**
+   * Sample event-loop delay in the background (only while metrics are enabled)
+   */
+  startEventLoopMonitor(): void {
+    if (!this.options.enabled || this.eventLoopDelay) {
+      return;
+    }
+
+    const delay = monitorEventLoopDelay({ resolution: 20 });
+    delay.enable();
+    this.eventLoopDelay = delay;
+
+    // Reported in seconds over the interval since the previous scrape
+    this.defineGauge('nodejs_eventloop_lag_seconds', 'Event-loop delay since the last scrape', () => [
+      { labels: { quantile: '0.5' }, value: delay.percentile(50) / 1e9 },
+      { labels: { quantile: '0.99' }, value: delay.percentile(99) / 1e9 },
+      { labels: { quantile: '1' }, value: delay.max / 1e9 },
+    ]);
+  }
+
+  stopEventLoopMonitor(): void {
+    this.eventLoopDelay?.disable();
+    this.eventLoopDelay = null;
+  }
+
+  render(): string {
+    const lines: string[] = [];
+
+    this.histograms.forEach((histogram, name) => {
+      lines.push(`# HELP ${name} ${histogram.help}`, `# TYPE ${name} histogram`);
+      histogram.series.forEach(series => {
+        let cumulative = 0;
+        histogram.buckets.forEach((bound, i) => {
+          cumulative += series.buckets[i];
+          lines.push(`${name}_bucket${formatLabels(series.labels, { le: String(bound) })} ${cumulative}`);
+        });
+        lines.push(`${name}_bucket${formatLabels(series.labels, { le: '+Inf' })} ${series.count}`);
+        lines.push(`${name}_sum${formatLabels(series.labels)} ${series.sum}`);
+        lines.push(`${name}_count${formatLabels(series.labels)} ${series.count}`);
+      });
+    });
+
+    this.gauges.forEach((gauge, name) => {
+      lines.push(`# HELP ${name} ${gauge.help}`, `# TYPE ${name} ${gauge.type}`);
+      gauge.collect().forEach(sample => lines.push(`${name}${formatLabels(sample.labels)} ${sample.value}`));
+    });
+
+    // Windowed event-loop figures start over after every scrape
+    this.eventLoopDelay?.reset();
+
+    return `${lines.join('\n')}\n`;
+  }
+}
@@ -1,11 +1,95 @@
-import { PrismaClient } from '@prisma/client';
+import { Prisma, PrismaClient } from '@prisma/client';
+import { Metrics } from './metrics';
 
 declare global {
   var __prisma: PrismaClient | undefined;
+  var __prismaReader: PrismaClient | undefined;
 }
 
-export const prisma = globalThis.__prisma || new PrismaClient();
+export interface PoolOptions {
+  connectionLimit: number;
+  poolTimeoutSeconds: number;
+  pgbouncer: boolean;
+}
+
+/**
+ * Pool settings for one client. Each task opens up to connectionLimit connections per client
+ * (writer and reader), so tasks x limit must stay under the database's max_connections.
+ */
+export const getPoolOptions = (options: Partial<PoolOptions> = {}): PoolOptions => ({
+  connectionLimit: options.connectionLimit ?? parseInt(process.env.DB_CONNECTION_LIMIT || '5'),
+  poolTimeoutSeconds: options.poolTimeoutSeconds ?? parseInt(process.env.DB_POOL_TIMEOUT || '10'),
+  pgbouncer: options.pgbouncer ?? process.env.DB_PGBOUNCER === 'true',
+});
+
+/**
+ * Add Prisma's pool parameters to a connection string. Parameters already in the URL win, so a
+ * hand-tuned DATABASE_URL is left alone. pgbouncer=true is needed behind a transaction-mode
+ * pooler (PgBouncer or RDS Proxy), where prepared statements cannot outlive a transaction.
+ */
+export const withPoolParams = (url: string, options: PoolOptions = getPoolOptions()): string => {
+  const parsed = new URL(url);
+  const defaults: Record<string, string> = {
+    connection_limit: String(options.connectionLimit),
+    pool_timeout: String(options.poolTimeoutSeconds),
+  };
+  if (options.pgbouncer) {
+    defaults.pgbouncer = 'true';
+  }
+
+  Object.entries(defaults).forEach(([key, value]) => {
+    if (!parsed.searchParams.has(key)) {
+      parsed.searchParams.set(key, value);
+    }
+  });
+  return parsed.toString();
+};
+
+const metrics = Metrics.getInstance();
+metrics.defineHistogram('prisma_query_duration_seconds', 'Prisma query latency by model and action, including pool wait');
+
+/**
+ * Client sized by DB_CONNECTION_LIMIT / DB_POOL_TIMEOUT, whose queries are timed into
+ * prisma_query_duration_seconds when metrics are enabled. With metrics off no middleware is registered at all.
+ */
+const createPrismaClient = (db: 'writer' | 'reader', url?: string): PrismaClient => {
+  const client = new PrismaClient(url ? { datasources: { db: { url: withPoolParams(url) } } } : undefined);
+  if (metrics.isEnabled()) {
+    client.$use(async (params, next) => {
+      const started = process.hrtime.bigint();
+      try {
+        return await next(params);
+      } finally {
+        metrics.observe('prisma_query_duration_seconds', {
+          db,
+          model: params.model ?? 'raw',
+          action: params.action,
+        }, Number(process.hrtime.bigint() - started) / 1e9);
+      }
+    });
+  }
+  return client;
+};
+
+export const prisma = globalThis.__prisma || createPrismaClient('writer', process.env.DATABASE_URL);
+
+// Client for the Aurora reader endpoint; undefined when DATABASE_READ_URL is unset so every query uses the writer
+export const prismaReader: PrismaClient | undefined = process.env.DATABASE_READ_URL
+  ? globalThis.__prismaReader || createPrismaClient('reader', process.env.DATABASE_READ_URL)
+  : undefined;
 
 if (process.env.NODE_ENV !== 'production') {
   globalThis.__prisma = prisma;
+  globalThis.__prismaReader = prismaReader;
 }
+
+/**
+ * True when a query failed on a unique constraint, for both model queries (P2002)
+ * and raw queries (P2010 wrapping Postgres 23505)
+ */
+export const isUniqueViolation = (error: unknown): boolean => {
+  if (!(error instanceof Prisma.PrismaClientKnownRequestError)) {
+    return false;
+  }
+  return error.code === 'P2002' || (error.code === 'P2010' && (error.meta as { code?: string } | undefined)?.code === '23505');
+};
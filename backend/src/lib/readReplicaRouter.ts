@@ -0,0 +1,130 @@
+import { PrismaClient } from '@prisma/client';
+import { prisma, prismaReader } from './prisma';
+import { RedisClient } from './redis';
+
+export interface ReadReplicaRouterOptions {
+  stickyMs: number;
+}
+
+export interface ReadReplicaMetrics {
+  enabled: boolean;
+  readerReads: number;
+  writerReads: number;
+  stickyOwners: number;
+}
+
+/**
+ * Routes owner-scoped read queries to the Aurora reader.
+ * After an owner writes, their reads stay on the writer for `stickyMs` so they always see
+ * their own changes despite replica lag. Write marks are shared across tasks through Redis.
+ */
+export class ReadReplicaRouter {
+  static readonly WRITE_CHANNEL = 'db:write';
+
+  private static instance: ReadReplicaRouter;
+  private static readonly SWEEP_THRESHOLD = 10000;
+
+  private readonly options: ReadReplicaRouterOptions;
+  // ownerId -> epoch ms until which reads must use the writer
+  private stickyUntil: Map<string, number> = new Map();
+  private publisher: RedisClient | null = null;
+  private metrics = {
+    readerReads: 0,
+    writerReads: 0,
+  };
+
+  constructor(
+    private readonly writer: PrismaClient,
+    private readonly reader?: PrismaClient,
+    options: Partial<ReadReplicaRouterOptions> = {}
+  ) {
+    this.options = {
+      stickyMs: options.stickyMs ?? parseInt(process.env.DATABASE_READ_STICKY_MS || '5000'),
+    };
+  }
+
+  static getInstance(): ReadReplicaRouter {
+    if (!ReadReplicaRouter.instance) {
+      ReadReplicaRouter.instance = new ReadReplicaRouter(prisma, prismaReader);
+    }
+    return ReadReplicaRouter.instance;
+  }
+
+  /**
+   * Share write marks with every task so stickiness holds whichever task serves the next read
+   */
+  async attachRedis(publisher: RedisClient, subscriber: RedisClient): Promise<void> {
+    if (!this.reader) {
+      return;
+    }
+
+    await subscriber.subscribe(ReadReplicaRouter.WRITE_CHANNEL, (ownerId: string) => {
+      this.markWriteLocal(ownerId);
+    });
+    this.publisher = publisher;
+  }
+
+  isEnabled(): boolean {
+    return this.reader !== undefined;
+  }
+
+  /**
+   * Client to use for a read scoped to `ownerId`
+   */
+  clientFor(ownerId: string): PrismaClient {
+    if (!this.reader) {
+      return this.writer;
+    }
+
+    const until = this.stickyUntil.get(ownerId);
+    if (until !== undefined) {
+      if (until > Date.now()) {
+        this.metrics.writerReads++;
+        return this.writer;
+      }
+      this.stickyUntil.delete(ownerId);
+    }
+
+    this.metrics.readerReads++;
+    return this.reader;
+  }
+
+  /**
+   * Record that `ownerId` just wrote; call after the write commits
+   */
+  markWrite(ownerId: string): void {
+    if (!this.reader) {
+      return;
+    }
+
+    this.markWriteLocal(ownerId);
+    if (this.publisher) {
+      this.publisher.publish(ReadReplicaRouter.WRITE_CHANNEL, ownerId).catch(error => {
+        // Other tasks may serve a slightly stale read until the replica catches up
+        console.error('Failed to publish write mark:', error);
+      });
+    }
+  }
+
+  markWriteLocal(ownerId: string): void {
+    const now = Date.now();
+    this.stickyUntil.set(ownerId, now + this.options.stickyMs);
+
+    if (this.stickyUntil.size > ReadReplicaRouter.SWEEP_THRESHOLD) {
+      this.stickyUntil.forEach((until, id) => {
+        if (until <= now) {
+          this.stickyUntil.delete(id);
+        }
+      });
+    }
+  }
+
+  getMetrics(): ReadReplicaMetrics {
+    return {
+      enabled: this.isEnabled(),
+      readerReads: this.metrics.readerReads,
+      writerReads: this.metrics.writerReads,
+      stickyOwners: this.stickyUntil.size,
+    };
+  }
+}
@@ -0,0 +1,22 @@
+import { createClient } from 'redis';
+
+export type RedisClient = ReturnType<typeof createClient>;
+
+/**
+ * Create (but do not connect) a Redis client for REDIS_URL.
+ * Returns undefined when REDIS_URL is not set so callers can fall back to in-process behaviour.
+ */
+export function createRedisClient(): RedisClient | undefined {
+  if (!process.env.REDIS_URL) {
+    return undefined;
+  }
+
+  return createClient({
+    url: process.env.REDIS_URL,
+    socket: {
+      // Use TLS in prod since our ElastiCache has transit encryption enabled
+      tls: process.env.NODE_ENV === 'production',
+      rejectUnauthorized: false,
+    },
+  });
+}
@@ -0,0 +1,42 @@
+import { AsyncLocalStorage } from 'async_hooks';
+import crypto from 'crypto';
+
+export interface RequestContext {
+  traceId: string;
+}
+
+const storage = new AsyncLocalStorage<RequestContext>();
+
+/**
+ * Trace ID for a request: the caller's X-Request-Id, else the ALB's X-Amzn-Trace-Id root
+ * (so logs line up with ALB access logs), else a fresh UUID
+ */
+export const resolveTraceId = (requestId?: string, amznTraceId?: string): string => {
+  if (requestId && /^[\w.:-]{1,128}$/.test(requestId)) {
+    return requestId;
+  }
+  const root = amznTraceId?.match(/Root=([\w-]+)/)?.[1];
+  return root || crypto.randomUUID();
+};
+
+export const runWithRequestContext = <T>(context: RequestContext, callback: () => T): T => storage.run(context, callback);
+
+export const getTraceId = (): string | undefined => storage.getStore()?.traceId;
+
+/**
+ * Prefix console output written while handling a request with its trace ID, so the existing
+ * console.error calls in controllers and services can be correlated without touching them
+ */
+export const installTraceLogging = (): void => {
+  (['log', 'info', 'warn', 'error'] as const).forEach(method => {
+    const original = console[method].bind(console);
+    console[method] = (...args: unknown[]) => {
+      const traceId = getTraceId();
+      if (traceId) {
+        original(`[trace=${traceId}]`, ...args);
+      } else {
+        original(...args);
+      }
+    };
+  });
+};
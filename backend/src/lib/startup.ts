@@ -0,0 +1,65 @@
+import { performance } from 'perf_hooks';
+import { HashPool } from './hashPool';
+import { prisma, prismaReader } from './prisma';
+
+export interface StartupOptions {
+  warmConnections: number;
+}
+
+export interface StartupTimings {
+  listeningMs: number | null;
+  readyMs: number | null;
+}
+
+/**
+ * Boot-time readiness. The server listens as soon as routes are mounted, but /health reports
+ * ready (200) only once the database pool and hash workers are warm, so the load balancer does
+ * not send traffic to a task that would make its first requests wait on connection setup.
+ * Timings are measured from process start, module loading included.
+ */
+export class Startup {
+  private static instance: Startup;
+
+  private readonly options: StartupOptions;
+  private timings: StartupTimings = { listeningMs: null, readyMs: null };
+
+  constructor(options: Partial<StartupOptions> = {}) {
+    this.options = {
+      warmConnections: options.warmConnections ?? parseInt(process.env.DB_WARM_CONNECTIONS || '2'),
+    };
+  }
+
+  static getInstance(): Startup {
+    if (!Startup.instance) {
+      Startup.instance = new Startup();
+    }
+    return Startup.instance;
+  }
+
+  markListening(): void {
+    this.timings.listeningMs = Math.round(performance.now());
+  }
+
+  isReady(): boolean {
+    return this.timings.readyMs !== null;
+  }
+
+  getTimings(): StartupTimings {
+    return { ...this.timings };
+  }
+
+  /**
+   * Open pooled connections on the shared clients and start the hash workers, then mark ready.
+   * Concurrent probes make Prisma open several connections instead of one.
+   */
+  async warmUp(): Promise<void> {
+    const clients = prismaReader ? [prisma, prismaReader] : [prisma];
+    await Promise.all(clients.map(async client => {
+      await client.$connect();
+      await Promise.all(Array.from({ length: this.options.warmConnections }, () => client.$queryRaw`SELECT 1`));
+    }));
+    HashPool.getInstance().warm();
+
+    this.timings.readyMs = Math.round(performance.now());
+  }
+}
@@ -1,9 +1,11 @@
 import { NextFunction, Response } from 'express';
 import { ApiKeyService } from '../services/apiKeyService';
-import { AuthenticatedRequest } from '../types';
+import { AuthenticatedRequest, ErrorType } from '../types';
+import { consumeRateLimit, rejectIfRateLimited } from './rateLimit';
 
 export interface ApiKeyRequest extends AuthenticatedRequest {
   apiKeyUserId?: string; // User ID from API key authentication
+  apiKeyId?: string; // Key that authenticated the request, for per-key quotas
 }
 
 const apiKeyService = new ApiKeyService();
@@ -17,18 +19,34 @@ export const requireApiKey = async (req: ApiKeyRequest, res: Response, next: Nex
     // Extract API key from X-API-Key header
     const apiKey = req.headers['x-api-key'] as string;
 
+    // The external routes skip the global per-IP quota, so requests without a verified key count
+    // against the caller's IP here: missing keys at once, uncached keys before the lookup and
+    // bcrypt compare, so a caller over its quota cannot keep the hash pool busy
     if (!apiKey) {
+      if (req.ip && await rejectIfRateLimited('ip', req.ip, res)) {
+        return;
+      }
       return res.unauthorized('X-API-Key header required');
     }
 
     // Validate API key and get user ID
-    const userId = await apiKeyService.validateApiKey(apiKey);
+    const { apiKeyId, userId } = await apiKeyService.validateApiKey(apiKey, async () => {
+      if (req.ip) {
+        await consumeRateLimit('ip', req.ip, res);
+      }
+    });
     
     // Add user ID to request for use in route handlers
     req.apiKeyUserId = userId;
+    req.apiKeyId = apiKeyId;
     
     next();
   } catch (error: any) {
+    // Shed load or report the rate limit rather than report a valid key as invalid
+    if (error?.type === ErrorType.SERVICE_UNAVAILABLE || error?.type === ErrorType.RATE_LIMITED) {
+      return res.appError(error);
+    }
+
     console.error('API key authentication error:', error);
     return res.unauthorized('Invalid API key');
   }
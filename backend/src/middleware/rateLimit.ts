@@ -0,0 +1,77 @@
+import { NextFunction, Request, Response } from 'express';
+import { RateLimiter, RateLimitResult, RateLimitScope } from '../services/rateLimiter';
+import { CustomSession } from '../types';
+import { AppErrorClass } from '../utils/errors';
+import { ApiKeyRequest } from './apiKeyAuth';
+
+const rateLimiter = RateLimiter.getInstance();
+
+/**
+ * IETF RateLimit header fields, so clients can pace themselves before hitting 429
+ */
+const setRateLimitHeaders = (res: Response, result: RateLimitResult) => {
+  res.set('RateLimit-Policy', `${result.limit};w=${Math.ceil(rateLimiter.getWindowMs() / 1000)}`);
+  res.set('RateLimit-Limit', String(result.limit));
+  res.set('RateLimit-Remaining', String(result.remaining));
+  res.set('RateLimit-Reset', String(Math.ceil(result.resetMs / 1000)));
+};
+
+/**
+ * Count the request against `scope`/`id`, throwing a 429 AppError with Retry-After when the
+ * quota is exhausted
+ */
+export const consumeRateLimit = async (scope: RateLimitScope, id: string, res: Response): Promise<void> => {
+  const result = await rateLimiter.consume(scope, id);
+  setRateLimitHeaders(res, result);
+  if (!result.allowed) {
+    throw AppErrorClass.rateLimited(Math.max(1, Math.ceil(result.resetMs / 1000)));
+  }
+};
+
+/**
+ * Count the request against `scope`/`id`. Responds 429 with Retry-After and returns true when
+ * the quota is exhausted.
+ */
+export const rejectIfRateLimited = async (scope: RateLimitScope, id: string, res: Response): Promise<boolean> => {
+  try {
+    await consumeRateLimit(scope, id, res);
+    return false;
+  } catch (error) {
+    if (!(error instanceof AppErrorClass)) {
+      throw error;
+    }
+    res.appError(error);
+    return true;
+  }
+};
+
+const limitBy = <T extends Request>(scope: RateLimitScope, identify: (req: T) => string | undefined) =>
+  async (req: T, res: Response, next: NextFunction) => {
+    const id = identify(req);
+    if (id && await rejectIfRateLimited(scope, id, res)) {
+      return;
+    }
+    next();
+  };
+
+const sessionUserId = (req: Request) => (req.session as CustomSession | undefined)?.userId;
+
+/**
+ * Per-user quota for requests with a signed-in session; anonymous requests pass through
+ */
+export const rateLimitBySessionUser = limitBy<Request>('user', sessionUserId);
+
+/**
+ * Per-IP quota for requests without a session. Signed-in users are counted per user instead,
+ * so clients sharing a NAT address do not share one bucket. The X-API-Key header alone never
+ * exempts a request; the external routes are mounted ahead of this limiter and requireApiKey
+ * counts the IP itself before verifying a key that is not cached.
+ */
+export const rateLimitByIp = limitBy<Request>('ip', req =>
+  req.method === 'OPTIONS' || sessionUserId(req) ? undefined : req.ip
+);
+
+/**
+ * Per-key quota; mount after requireApiKey
+ */
+export const rateLimitByApiKey = limitBy<ApiKeyRequest>('apiKey', req => req.apiKeyId);
@@ -0,0 +1,36 @@
+import { NextFunction, Request, Response } from 'express';
+import { Metrics } from '../lib/metrics';
+import { resolveTraceId, runWithRequestContext } from '../lib/requestContext';
+
+const metrics = Metrics.getInstance();
+metrics.defineHistogram('http_request_duration_seconds', 'HTTP request latency by route');
+
+// Streams stay open for their whole lifetime; their latency would swamp the histogram
+const UNTIMED_PATHS = new Set(['/api/events', '/metrics']);
+
+/**
+ * Route template (e.g. /contact/:id) rather than the raw path, to keep label cardinality bounded
+ */
+const routeLabel = (req: Request): string => (req.route ? `${req.baseUrl}${req.route.path}` : 'unmatched');
+
+/**
+ * Assign every request a trace ID (echoed as X-Request-Id and prefixed to its log lines) and,
+ * when metrics are enabled, record its latency per method, route and status class
+ */
+export const instrumentRequest = (req: Request, res: Response, next: NextFunction) => {
+  const traceId = resolveTraceId(req.header('X-Request-Id'), req.header('X-Amzn-Trace-Id'));
+  res.setHeader('X-Request-Id', traceId);
+
+  if (metrics.isEnabled() && !UNTIMED_PATHS.has(req.path)) {
+    const started = process.hrtime.bigint();
+    res.on('finish', () => {
+      metrics.observe('http_request_duration_seconds', {
+        method: req.method,
+        route: routeLabel(req),
+        status: `${Math.floor(res.statusCode / 100)}xx`,
+      }, Number(process.hrtime.bigint() - started) / 1e9);
+    });
+  }
+
+  runWithRequestContext({ traceId }, next);
+};
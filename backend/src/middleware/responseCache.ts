@@ -0,0 +1,46 @@
+import { NextFunction, Response } from 'express';
+import { ContactListCache } from '../services/contactListCache';
+import { AuthenticatedRequest } from '../types';
+
+/**
+ * Serve an owner's GET responses from ContactListCache, with weak ETags.
+ * A cached page is returned, or answered with 304 when the client's If-None-Match still
+ * matches, without running the controller or touching the database. Misses run the handler
+ * and cache its 200 response. Must run after authentication.
+ */
+export const cacheOwnerResponse = (scope: string) => {
+  return (req: AuthenticatedRequest, res: Response, next: NextFunction) => {
+    const cache = ContactListCache.getInstance();
+    const ownerId = req.userId!;
+    // Sorted so equivalent query strings share an entry
+    const query = Object.keys(req.query).sort().map(name => `${name}=${String(req.query[name])}`).join('&');
+    const key = `${scope}?${query}`;
+
+    // Browsers may keep the page but must revalidate it with If-None-Match
+    res.set('Cache-Control', 'private, no-cache');
+
+    const cached = cache.get(ownerId, key);
+    if (cached) {
+      res.set('ETag', cached.etag);
+      res.set('X-Cache', 'HIT');
+      // Express answers 304 itself when If-None-Match matches the ETag
+      return res.type('json').send(cached.body);
+    }
+
+    const version = cache.getVersion(ownerId);
+    const store = (body: string) => {
+      const entry = cache.set(ownerId, key, version, body);
+      res.set('ETag', entry.etag);
+      res.set('X-Cache', 'MISS');
+      return res.type('json').send(entry.body);
+    };
+
+    const json = res.json.bind(res);
+    res.json = (body: any) => (res.statusCode === 200 ? store(JSON.stringify(body)) : json(body));
+    // Bodies from precompiled serializers arrive already stringified
+    const sendJson = res.sendJson.bind(res);
+    res.sendJson = (body: string) => (res.statusCode === 200 ? store(body) : sendJson(body));
+
+    next();
+  };
+};
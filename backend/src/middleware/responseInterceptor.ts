@@ -1,28 +1,44 @@
 import { Request, Response, NextFunction } from 'express';
-import { ResponseFormatter } from '../utils/responseFormatter';
+import { ApiResponse, ResponseFormatter, ResponseSerializer } from '../utils/responseFormatter';
 
 // Extend Response interface to add custom methods
 declare global {
   namespace Express {
     interface Response {
-      success: (data: any, status?: number) => void;
+      success: (data: any, status?: number, serialize?: ResponseSerializer) => void;
       error: (message: string, status?: number, field?: string, code?: string) => void;
       validationError: (errors: Array<{ message: string; field?: string; code?: string }>) => void;
       notFound: (message?: string) => void;
       unauthorized: (message?: string) => void;
       forbidden: (message?: string) => void;
       conflict: (message: string, field?: string) => void;
-      paginated: (items: any[], pagination: any, status?: number) => void;
+      paginated: (items: any[], pagination: any, status?: number, serialize?: ResponseSerializer) => void;
+      cursorPaginated: (items: any[], pagination: any, status?: number, serialize?: ResponseSerializer) => void;
       appError: (error: any) => void;
+      sendJson: (body: string) => void;
     }
   }
 }
 
 export const responseInterceptor = (req: Request, res: Response, next: NextFunction) => {
+  // Write an already serialized JSON body (overridden by the response cache to keep a copy)
+  res.sendJson = (body: string) => {
+    res.type('json').send(body);
+  };
+
+  // Routes with a precompiled serializer skip JSON.stringify; the output is the same
+  const send = (response: ApiResponse<any>, serialize?: ResponseSerializer) => {
+    res.status(response.status);
+    if (serialize) {
+      res.sendJson(serialize(response));
+    } else {
+      res.json(response);
+    }
+  };
+
   // Custom response methods
-  res.success = (data: any, status: number = 200) => {
-    const response = ResponseFormatter.success(data, status);
-    res.status(response.status).json(response);
+  res.success = (data: any, status: number = 200, serialize?: ResponseSerializer) => {
+    send(ResponseFormatter.success(data, status), serialize);
   };
 
   res.error = (message: string, status: number = 500, field?: string, code?: string) => {
@@ -57,12 +73,18 @@ export const responseInterceptor = (req: Request, res: Response, next: NextFunct
 
   res.appError = (error: any) => {
     const response = ResponseFormatter.appError(error);
+    if (error?.retryAfter) {
+      res.set('Retry-After', String(error.retryAfter));
+    }
     res.status(response.status).json(response);
   };
 
-  res.paginated = (items: any[], pagination: any, status: number = 200) => {
-    const response = ResponseFormatter.paginated(items, pagination, status);
-    res.status(response.status).json(response);
+  res.paginated = (items: any[], pagination: any, status: number = 200, serialize?: ResponseSerializer) => {
+    send(ResponseFormatter.paginated(items, pagination, status), serialize);
+  };
+
+  res.cursorPaginated = (items: any[], pagination: any, status: number = 200, serialize?: ResponseSerializer) => {
+    send(ResponseFormatter.cursorPaginated(items, pagination, status), serialize);
   };
 
   next();
@@ -1,18 +1,38 @@
+import { PrismaClient } from '@prisma/client';
 import {
   InternalContactHistoryDto,
   InternalCreateContactHistoryDto
 } from '../dtos/internal/contact.dto';
-import { PaginationOptionsDto, PaginationResultDto } from '../dtos/shared/pagination.dto';
+import {
+  CursorPaginationOptionsDto,
+  CursorPaginationResultDto,
+  PaginationOptionsDto,
+  PaginationResultDto,
+  decodeCursor,
+  encodeCursor,
+  parseCursorDate
+} from '../dtos/shared/pagination.dto';
+import { encodeHistoryChanges } from '../lib/contactHistoryCodec';
 import { prisma } from '../lib/prisma';
+import { ReadReplicaRouter } from '../lib/readReplicaRouter';
 
 export class ContactHistoryRepository {
+  private readRouter: ReadReplicaRouter;
+
+  constructor() {
+    this.readRouter = ReadReplicaRouter.getInstance();
+  }
+
   async findByContactId(
     contactId: string,
+    ownerId: string,
     options: PaginationOptionsDto,
     order: 'asc' | 'desc' = 'desc'
   ): Promise<PaginationResultDto<InternalContactHistoryDto>> {
+    // History reads go to the reader unless the contact's owner wrote recently
+    const db = this.readRouter.clientFor(ownerId);
     const [history, total] = await Promise.all([
-      prisma.contactHistory.findMany({
+      db.contactHistory.findMany({
         where: { contactId },
         orderBy: {
           createdAt: order
@@ -20,9 +40,7 @@ export class ContactHistoryRepository {
         skip: options.skip,
         take: options.pageSize
       }),
-      prisma.contactHistory.count({
-        where: { contactId }
-      })
+      this.countHistory(db, contactId)
     ]);
 
     return {
@@ -37,9 +55,88 @@ export class ContactHistoryRepository {
     };
   }
 
-  async create(data: InternalCreateContactHistoryDto): Promise<InternalContactHistoryDto> {
+  /**
+   * Keyset pagination ordered by (createdAt, id) in the requested direction,
+   * served by the (contactId, createdAt) index.
+   */
+  async findByContactIdAfterCursor(
+    contactId: string,
+    ownerId: string,
+    options: CursorPaginationOptionsDto,
+    order: 'asc' | 'desc' = 'desc'
+  ): Promise<CursorPaginationResultDto<InternalContactHistoryDto>> {
+    const where: any = { contactId };
+
+    if (options.cursor) {
+      const cursor = decodeCursor(options.cursor, ['createdAt', 'id'] as const);
+      const createdAt = parseCursorDate(cursor.createdAt);
+      const op = order === 'asc' ? 'gt' : 'lt';
+      where.OR = [
+        { createdAt: { [op]: createdAt } },
+        { createdAt, id: { [op]: cursor.id } }
+      ];
+    }
+
+    const db = this.readRouter.clientFor(ownerId);
+    const [rows, total] = await Promise.all([
+      db.contactHistory.findMany({
+        where,
+        orderBy: [
+          { createdAt: order },
+          { id: order }
+        ],
+        // Fetch one extra row to learn whether another page exists
+        take: options.pageSize + 1
+      }),
+      options.includeTotal ? this.countHistory(db, contactId) : Promise.resolve(undefined)
+    ]);
+
+    const hasMore = rows.length > options.pageSize;
+    const history = hasMore ? rows.slice(0, options.pageSize) : rows;
+    const last = history[history.length - 1];
+
+    return {
+      data: history,
+      pagination: {
+        pageSize: options.pageSize,
+        nextCursor: hasMore && last
+          ? encodeCursor({ createdAt: last.createdAt.toISOString(), id: last.id })
+          : null,
+        hasMore,
+        ...(total !== undefined && { total })
+      }
+    };
+  }
+
+  /**
+   * All history for a batch of contacts, oldest first per contact, in one query (used by exports)
+   */
+  async findByContactIds(contactIds: string[], ownerId: string): Promise<InternalContactHistoryDto[]> {
+    if (contactIds.length === 0) {
+      return [];
+    }
+
+    const db = this.readRouter.clientFor(ownerId);
+    return db.contactHistory.findMany({
+      where: { contactId: { in: contactIds } },
+      orderBy: [{ contactId: 'asc' }, { createdAt: 'asc' }]
+    });
+  }
+
+  async create({ contactId, ...changes }: InternalCreateContactHistoryDto): Promise<InternalContactHistoryDto> {
     return prisma.contactHistory.create({
-      data
+      data: { contactId, ...encodeHistoryChanges(changes) }
+    });
+  }
+
+  /**
+   * The contact's maintained history count - a primary-key read instead of COUNT(*) over its history
+   */
+  private async countHistory(db: PrismaClient, contactId: string): Promise<number> {
+    const contact = await db.contact.findUnique({
+      where: { id: contactId },
+      select: { historyCount: true }
     });
+    return contact?.historyCount ?? 0;
   }
 }
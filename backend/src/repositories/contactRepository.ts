@@ -1,56 +1,84 @@
+import { Prisma, PrismaClient } from '@prisma/client';
+import crypto from 'crypto';
+import { ContactField } from '../dtos/external/contact.dto';
 import {
+  InternalBulkContactUpdateDto,
   InternalContactDto,
-  InternalContactWithOwnerDto,
+  InternalContactProjectionDto,
+  InternalContactUpdateResultDto,
   InternalCreateContactDto,
   InternalUpdateContactDto
 } from '../dtos/internal/contact.dto';
-import { PaginationOptionsDto, PaginationResultDto } from '../dtos/shared/pagination.dto';
+import {
+  CursorPaginationOptionsDto,
+  CursorPaginationResultDto,
+  INVALID_CURSOR_MESSAGE,
+  PaginationOptionsDto,
+  PaginationResultDto,
+  decodeCursor,
+  encodeCursor,
+  parseCursorDate
+} from '../dtos/shared/pagination.dto';
+import { encodeHistoryChanges } from '../lib/contactHistoryCodec';
 import { prisma } from '../lib/prisma';
+import { ReadReplicaRouter } from '../lib/readReplicaRouter';
+
+// Owner columns safe to expose - never the password hash
+const OWNER_SELECT = {
+  id: true,
+  firstName: true,
+  lastName: true,
+  email: true
+} as const;
+
+type ContactColumn = Exclude<ContactField, 'owner'>;
 
 export class ContactRepository {
-  async findById(id: string, ownerId: string): Promise<InternalContactWithOwnerDto | null> {
+  private readRouter: ReadReplicaRouter;
+
+  constructor() {
+    this.readRouter = ReadReplicaRouter.getInstance();
+  }
+
+  /**
+   * Prisma select for a sparse fieldset. Without `fields` Prisma returns the plain
+   * contact row (no owner join). `required` columns are fetched regardless, e.g. cursor keys.
+   */
+  private buildSelect(fields?: ContactField[], required: ContactColumn[] = []): Prisma.ContactSelect | undefined {
+    if (!fields) {
+      return undefined;
+    }
+
+    const select: Prisma.ContactSelect = { id: true };
+    [...fields, ...required].forEach(field => {
+      if (field === 'owner') {
+        select.owner = { select: OWNER_SELECT };
+      } else {
+        select[field] = true;
+      }
+    });
+    return select;
+  }
+
+  async findById(id: string, ownerId: string, fields?: ContactField[]): Promise<InternalContactProjectionDto | null> {
     return prisma.contact.findFirst({
       where: {
         id,
         ownerId
       },
-      include: {
-        owner: {
-          select: {
-            id: true,
-            firstName: true,
-            lastName: true,
-            email: true,
-            password: true, // Include password for internal use
-            createdAt: true,
-            updatedAt: true
-          }
-        }
-      }
+      select: this.buildSelect(fields)
     });
   }
 
-  async findByExternalId(externalId: string, ownerId: string): Promise<InternalContactWithOwnerDto | null> {
-    return prisma.contact.findUnique({
+  async findByExternalId(externalId: string, ownerId: string, fields?: ContactField[]): Promise<InternalContactProjectionDto | null> {
+    return prisma.contact.findFirst({
       where: {
-        externalId
+        externalId,
+        ownerId
       },
-      include: {
-        owner: {
-          select: {
-            id: true,
-            firstName: true,
-            lastName: true,
-            email: true,
-            password: true, // Include password for internal use
-            createdAt: true,
-            updatedAt: true
-          }
-        }
-      }
+      select: this.buildSelect(fields)
     });
   }
-
   async existsByExternalIdAndOwner(externalId: string, ownerId: string): Promise<boolean> {
     const contact = await prisma.contact.findUnique({
       where: {
@@ -77,7 +105,12 @@ export class ContactRepository {
     return contact !== null;
   }
 
-  async findByOwnerId(ownerId: string, options: PaginationOptionsDto, filter?: string): Promise<PaginationResultDto<InternalContactWithOwnerDto>> {
+  async findByOwnerId(
+    ownerId: string,
+    options: PaginationOptionsDto,
+    filter?: string,
+    fields?: ContactField[]
+  ): Promise<PaginationResultDto<InternalContactProjectionDto>> {
     // Build where clause with optional filter
     const whereClause: any = { ownerId };
     
@@ -88,8 +121,10 @@ export class ContactRepository {
       };
     }
 
+    // List reads go to the reader unless this owner wrote recently
+    const db = this.readRouter.clientFor(ownerId);
     const [contacts, total] = await Promise.all([
-      prisma.contact.findMany({
+      db.contact.findMany({
         where: whereClause,
         orderBy: [
           { lastName: 'asc' },
@@ -98,23 +133,9 @@ export class ContactRepository {
         ],
         skip: options.skip,
         take: options.pageSize,
-        include: {
-          owner: {
-            select: {
-              id: true,
-              firstName: true,
-              lastName: true,
-              email: true,
-              password: true, // Include password for internal use
-              createdAt: true,
-              updatedAt: true
-            }
-          }
-        }
+        select: this.buildSelect(fields)
       }),
-      prisma.contact.count({
-        where: whereClause
-      })
+      this.countContacts(db, ownerId, whereClause)
     ]);
 
     return {
@@ -129,107 +150,279 @@ export class ContactRepository {
     };
   }
 
-  async create(data: InternalCreateContactDto): Promise<InternalContactWithOwnerDto> {
-    return prisma.contact.create({
-      data,
-      include: {
-        owner: {
-          select: {
-            id: true,
-            firstName: true,
-            lastName: true,
-            email: true,
-            password: true, // Include password for internal use
-            createdAt: true,
-            updatedAt: true
-          }
+  /**
+   * Keyset pagination ordered by (lastName, firstName, createdAt, id).
+   * Seeks past the previous page instead of using OFFSET, so every page costs the same.
+   */
+  async findByOwnerIdAfterCursor(
+    ownerId: string,
+    options: CursorPaginationOptionsDto,
+    filter?: string,
+    fields?: ContactField[]
+  ): Promise<CursorPaginationResultDto<InternalContactProjectionDto>> {
+    const baseWhere: any = { ownerId };
+
+    if (filter && filter !== 'all') {
+      baseWhere.lastName = {
+        startsWith: filter,
+        mode: 'insensitive' // Case-insensitive search
+      };
+    }
+
+    const conditions: any[] = [baseWhere];
+    if (options.cursor) {
+      const cursor = decodeCursor(options.cursor, ['lastName', 'firstName', 'createdAt', 'id'] as const);
+      const createdAt = parseCursorDate(cursor.createdAt);
+      conditions.push(
+        // Range bound on the leading sort column lets Postgres seek the (ownerId, lastName) index
+        { lastName: { gte: cursor.lastName } },
+        {
+          OR: [
+            { lastName: { gt: cursor.lastName } },
+            { lastName: cursor.lastName, firstName: { gt: cursor.firstName } },
+            { lastName: cursor.lastName, firstName: cursor.firstName, createdAt: { gt: createdAt } },
+            { lastName: cursor.lastName, firstName: cursor.firstName, createdAt, id: { gt: cursor.id } }
+          ]
         }
+      );
+    }
+
+    const db = this.readRouter.clientFor(ownerId);
+    const [rows, total] = await Promise.all([
+      db.contact.findMany({
+        where: { AND: conditions },
+        orderBy: [
+          { lastName: 'asc' },
+          { firstName: 'asc' },
+          { createdAt: 'asc' },
+          { id: 'asc' }
+        ],
+        // Fetch one extra row to learn whether another page exists
+        take: options.pageSize + 1,
+        // Sort keys are always fetched so the next cursor can be built
+        select: this.buildSelect(fields, ['lastName', 'firstName', 'createdAt'])
+      }),
+      options.includeTotal ? this.countContacts(db, ownerId, baseWhere) : Promise.resolve(undefined)
+    ]);
+
+    const hasMore = rows.length > options.pageSize;
+    const contacts: InternalContactProjectionDto[] = hasMore ? rows.slice(0, options.pageSize) : rows;
+    const last = contacts[contacts.length - 1];
+
+    return {
+      data: contacts,
+      pagination: {
+        pageSize: options.pageSize,
+        nextCursor: hasMore && last
+          ? encodeCursor({
+            lastName: last.lastName!,
+            firstName: last.firstName!,
+            createdAt: last.createdAt!.toISOString(),
+            id: last.id
+          })
+          : null,
+        hasMore,
+        ...(total !== undefined && { total })
       }
-    });
+    };
   }
 
-  async update(id: string, data: InternalUpdateContactDto): Promise<InternalContactWithOwnerDto> {
-    return prisma.contact.update({
-      where: { id },
-      data,
-      include: {
-        owner: {
-          select: {
-            id: true,
-            firstName: true,
-            lastName: true,
-            email: true,
-            password: true, // Include password for internal use
-            createdAt: true,
-            updatedAt: true
-          }
-        }
+  /**
+   * Substring search over first name, last name, email and phone, served by the pg_trgm GIN index.
+   * Matches are ranked by trigram word similarity to the query, then ordered like the contact list;
+   * the cursor carries the rank so later pages seek past the previous one.
+   */
+  async searchByOwnerId(
+    ownerId: string,
+    query: string,
+    options: CursorPaginationOptionsDto
+  ): Promise<CursorPaginationResultDto<InternalContactDto>> {
+    // Match the query literally: escape ILIKE wildcards
+    const pattern = `%${query.replace(/[\\%_]/g, '\\$&')}%`;
+    const matches = Prisma.sql`
+      c."ownerId" = ${ownerId}
+      AND (c."firstName" ILIKE ${pattern} OR c."lastName" ILIKE ${pattern} OR c."email" ILIKE ${pattern} OR c."phone" ILIKE ${pattern})
+    `;
+
+    let after = Prisma.empty;
+    if (options.cursor) {
+      const cursor = decodeCursor(options.cursor, ['rank', 'lastName', 'firstName', 'id'] as const);
+      if (isNaN(Number(cursor.rank))) {
+        throw new Error(INVALID_CURSOR_MESSAGE);
       }
-    });
-  }
+      after = Prisma.sql`
+        WHERE s."rank" < ${cursor.rank}::numeric
+          OR (s."rank" = ${cursor.rank}::numeric AND (s."lastName", s."firstName", s."id") > (${cursor.lastName}, ${cursor.firstName}, ${cursor.id}))
+      `;
+    }
 
-  async updateByExternalId(externalId: string, ownerId: string, data: InternalUpdateContactDto): Promise<InternalContactWithOwnerDto> {
-    return prisma.contact.update({
-      where: {
-        externalId,
-        ownerId
-      },
-      data,
-      include: {
-        owner: {
-          select: {
-            id: true,
-            firstName: true,
-            lastName: true,
-            email: true,
-            password: true, // Include password for internal use
-            createdAt: true,
-            updatedAt: true
-          }
-        }
+    const db = this.readRouter.clientFor(ownerId);
+    const [rows, total] = await Promise.all([
+      // Rounded so the rank survives the round trip through the cursor exactly
+      db.$queryRaw<(InternalContactDto & { rank: Prisma.Decimal })[]>`
+        SELECT * FROM (
+          SELECT c.*, ROUND(GREATEST(
+            word_similarity(${query}, c."firstName"),
+            word_similarity(${query}, c."lastName"),
+            word_similarity(${query}, c."email"),
+            word_similarity(${query}, c."phone")
+          )::numeric, 6) AS "rank"
+          FROM "contacts" c
+          WHERE ${matches}
+        ) s
+        ${after}
+        ORDER BY s."rank" DESC, s."lastName", s."firstName", s."id"
+        LIMIT ${options.pageSize + 1}
+      `,
+      options.includeTotal
+        ? db.$queryRaw<{ count: bigint }[]>`SELECT COUNT(*) AS "count" FROM "contacts" c WHERE ${matches}`
+          .then(([result]) => Number(result.count))
+        : Promise.resolve(undefined)
+    ]);
+
+    const hasMore = rows.length > options.pageSize;
+    const page = hasMore ? rows.slice(0, options.pageSize) : rows;
+    const last = page[page.length - 1];
+
+    return {
+      data: page.map(({ rank, ...contact }) => contact),
+      pagination: {
+        pageSize: options.pageSize,
+        nextCursor: hasMore && last
+          ? encodeCursor({
+            rank: last.rank.toString(),
+            lastName: last.lastName,
+            firstName: last.firstName,
+            id: last.id
+          })
+          : null,
+        hasMore,
+        ...(total !== undefined && { total })
       }
-    });
+    };
   }
 
-  async delete(id: string): Promise<InternalContactWithOwnerDto> {
-    return prisma.contact.delete({
-      where: { id },
-      include: {
-        owner: {
-          select: {
-            id: true,
-            firstName: true,
-            lastName: true,
-            email: true,
-            password: true, // Include password for internal use
-            createdAt: true,
-            updatedAt: true
-          }
-        }
-      }
+  /**
+   * Insert a contact unless the owner already has `maxContacts`, in one statement.
+   * Locking the owner row makes concurrent creates for the same owner queue up and re-check
+   * "contactCount" after the previous one commits (its trigger has incremented it by then).
+   * Returns null when the limit is reached.
+   */
+  async createWithinLimit(data: InternalCreateContactDto, maxContacts: number): Promise<InternalContactDto | null> {
+    const now = new Date().toISOString();
+    const [contact] = await prisma.$queryRaw<InternalContactDto[]>`
+      WITH owner AS (
+        SELECT "id" FROM "users"
+        WHERE "id" = ${data.ownerId} AND "contactCount" < ${maxContacts}
+        FOR UPDATE
+      )
+      INSERT INTO "contacts" ("id", "ownerId", "firstName", "lastName", "email", "phone", "externalId", "createdAt", "updatedAt")
+      SELECT ${crypto.randomUUID()}, owner."id", ${data.firstName}, ${data.lastName}, ${data.email}, ${data.phone},
+        ${data.externalId ?? null}::text, CAST(${now} AS timestamp(3)), CAST(${now} AS timestamp(3))
+      FROM owner
+      RETURNING *
+    `;
+
+    if (!contact) {
+      return null;
+    }
+    this.readRouter.markWrite(data.ownerId);
+    return contact;
+  }
+
+  /**
+   * Apply an update and record its history in a single statement.
+   * The target row is locked first, so concurrent updates serialize and every history
+   * row's `before` is the value the update actually replaced. Email uniqueness is left to
+   * the (ownerId, email) constraint; callers translate the unique violation.
+   */
+  async updateWithHistory(
+    target: { id: string } | { externalId: string },
+    ownerId: string,
+    data: InternalUpdateContactDto
+  ): Promise<InternalContactUpdateResultDto> {
+    const match = 'id' in target
+      ? Prisma.sql`"id" = ${target.id}`
+      : Prisma.sql`"externalId" = ${target.externalId}`;
+    // Empty strings are treated as "not provided", as in the single-row update rules
+    const firstName = data.firstName || null;
+    const lastName = data.lastName || null;
+    const email = data.email || null;
+    const phone = data.phone || null;
+    const now = new Date().toISOString();
+
+    // One row when the contact exists; its columns are null unless something changed
+    const rows = await prisma.$queryRaw<(InternalContactDto & { changed: boolean })[]>`
+      WITH target AS (
+        SELECT "id", "firstName", "lastName", "email", "phone"
+        FROM "contacts"
+        WHERE ${match} AND "ownerId" = ${ownerId}
+        FOR UPDATE
+      ),
+      updated AS (
+        UPDATE "contacts" AS c
+        SET "firstName" = COALESCE(${firstName}::text, c."firstName"),
+            "lastName" = COALESCE(${lastName}::text, c."lastName"),
+            "email" = COALESCE(${email}::text, c."email"),
+            "phone" = COALESCE(${phone}::text, c."phone"),
+            "updatedAt" = CAST(${now} AS timestamp(3))
+        FROM target AS t
+        WHERE c."id" = t."id"
+          AND (
+            COALESCE(${firstName}::text <> t."firstName", false)
+            OR COALESCE(${lastName}::text <> t."lastName", false)
+            OR COALESCE(${email}::text <> t."email", false)
+            OR COALESCE(${phone}::text <> t."phone", false)
+          )
+        RETURNING c.*
+      ),
+      history AS (
+        INSERT INTO "contact_history_entries" ("id", "contactId", "changedFields", "diff", "createdAt")
+        SELECT ${crypto.randomUUID()}, u."id",
+          -- Same encoding as encodeHistoryChanges: bit per changed field, [before, after] pairs in bit order
+          (CASE WHEN u."firstName" <> t."firstName" THEN 1 ELSE 0 END
+            | CASE WHEN u."lastName" <> t."lastName" THEN 2 ELSE 0 END
+            | CASE WHEN u."email" <> t."email" THEN 4 ELSE 0 END
+            | CASE WHEN u."phone" <> t."phone" THEN 8 ELSE 0 END)::smallint,
+          CASE WHEN u."firstName" <> t."firstName" THEN jsonb_build_array(t."firstName", u."firstName") ELSE '[]'::jsonb END
+            || CASE WHEN u."lastName" <> t."lastName" THEN jsonb_build_array(t."lastName", u."lastName") ELSE '[]'::jsonb END
+            || CASE WHEN u."email" <> t."email" THEN jsonb_build_array(t."email", u."email") ELSE '[]'::jsonb END
+            || CASE WHEN u."phone" <> t."phone" THEN jsonb_build_array(t."phone", u."phone") ELSE '[]'::jsonb END,
+          CAST(${now} AS timestamp(3))
+        FROM updated AS u
+        JOIN target AS t ON t."id" = u."id"
+      )
+      SELECT (u."id" IS NOT NULL) AS "changed", u.*
+      FROM target AS t
+      LEFT JOIN updated AS u ON u."id" = t."id"
+    `;
+
+    this.readRouter.markWrite(ownerId);
+
+    if (rows.length === 0) {
+      return { status: 'not_found' };
+    }
+    const { changed, ...contact } = rows[0];
+    return changed ? { status: 'updated', contact } : { status: 'unchanged' };
+  }
+
+  async delete(id: string): Promise<InternalContactDto> {
+    const contact = await prisma.contact.delete({
+      where: { id }
     });
+    this.readRouter.markWrite(contact.ownerId);
+    return contact;
   }
 
-  async deleteByExternalId(externalId: string, ownerId: string): Promise<InternalContactWithOwnerDto> {
-    return prisma.contact.delete({
+  async deleteByExternalId(externalId: string, ownerId: string): Promise<InternalContactDto> {
+    const contact = await prisma.contact.delete({
       where: {
         externalId,
         ownerId
-      },
-      include: {
-        owner: {
-          select: {
-            id: true,
-            firstName: true,
-            lastName: true,
-            email: true,
-            password: true, // Include password for internal use
-            createdAt: true,
-            updatedAt: true
-          }
-        }
       }
     });
+    this.readRouter.markWrite(ownerId);
+    return contact;
   }
 
   async existsByEmailAndOwner(email: string, ownerId: string, excludeId?: string): Promise<boolean> {
@@ -249,27 +442,142 @@ export class ContactRepository {
     return count > 0;
   }
 
-  async findByIdForUpdate(id: string, ownerId: string): Promise<InternalContactDto | null> {
-    return prisma.contact.findFirst({
+  /**
+   * All contacts holding any of the given external IDs, regardless of owner (external IDs are globally unique)
+   */
+  async findByExternalIds(externalIds: string[]): Promise<InternalContactDto[]> {
+    if (externalIds.length === 0) {
+      return [];
+    }
+
+    return prisma.contact.findMany({
       where: {
-        id,
-        ownerId
+        externalId: { in: externalIds }
       }
     });
   }
 
-  async findByExternalIdForUpdate(externalId: string, ownerId: string): Promise<InternalContactDto | null> {
-    return prisma.contact.findFirst({
+  async findIdsByOwnerAndEmails(ownerId: string, emails: string[]): Promise<{ id: string; email: string }[]> {
+    if (emails.length === 0) {
+      return [];
+    }
+
+    return prisma.contact.findMany({
       where: {
-        externalId,
-        ownerId
+        ownerId,
+        email: { in: emails }
+      },
+      select: {
+        id: true,
+        email: true
       }
     });
   }
 
+  /**
+   * Insert contacts for one owner in one statement, up to the owner's remaining capacity under
+   * `maxContacts`. The owner row stays locked until commit so concurrent imports and creates
+   * cannot spend the same capacity. Only the first `capacity` rows are attempted; of those, rows
+   * that hit a unique constraint (externalId or owner+email) are skipped rather than failing the batch.
+   */
+  async createManyWithinLimit(
+    ownerId: string,
+    rows: (InternalCreateContactDto & { externalId: string })[],
+    maxContacts: number
+  ): Promise<{ contacts: InternalContactDto[]; capacity: number }> {
+    if (rows.length === 0) {
+      return { contacts: [], capacity: 0 };
+    }
+
+    // Contact timestamps are timestamp(3) without time zone holding UTC
+    const now = new Date().toISOString();
+
+    const result = await prisma.$transaction(async tx => {
+      const [owner] = await tx.$queryRaw<{ contactCount: number }[]>`
+        SELECT "contactCount" FROM "users" WHERE "id" = ${ownerId} FOR UPDATE
+      `;
+      const capacity = owner ? Math.max(0, maxContacts - owner.contactCount) : 0;
+      const allowed = rows.slice(0, capacity);
+      if (allowed.length === 0) {
+        return { contacts: [], capacity };
+      }
+
+      const values = allowed.map(row => Prisma.sql`(
+        ${crypto.randomUUID()}, ${ownerId}, ${row.firstName}, ${row.lastName}, ${row.email}, ${row.phone}, ${row.externalId},
+        CAST(${now} AS timestamp(3)), CAST(${now} AS timestamp(3))
+      )`);
+      const contacts = await tx.$queryRaw<InternalContactDto[]>`
+        INSERT INTO "contacts" ("id", "ownerId", "firstName", "lastName", "email", "phone", "externalId", "createdAt", "updatedAt")
+        VALUES ${Prisma.join(values)}
+        ON CONFLICT DO NOTHING
+        RETURNING *
+      `;
+      return { contacts, capacity };
+    });
+
+    if (result.contacts.length > 0) {
+      this.readRouter.markWrite(ownerId);
+    }
+    return result;
+  }
+
+  /**
+   * Update many contacts with one statement and record their history in the same transaction
+   */
+  async updateManyWithHistory(ownerId: string, updates: InternalBulkContactUpdateDto[]): Promise<InternalContactDto[]> {
+    if (updates.length === 0) {
+      return [];
+    }
+
+    const now = new Date().toISOString();
+    const values = updates.map(({ id, data }) => Prisma.sql`(${id}, ${data.firstName}, ${data.lastName}, ${data.email}, ${data.phone})`);
+
+    const contacts = await prisma.$transaction(async tx => {
+      const updated = await tx.$queryRaw<InternalContactDto[]>`
+        UPDATE "contacts" AS c
+        SET "firstName" = v."firstName",
+            "lastName" = v."lastName",
+            "email" = v."email",
+            "phone" = v."phone",
+            "updatedAt" = CAST(${now} AS timestamp(3))
+        FROM (VALUES ${Prisma.join(values)}) AS v("id", "firstName", "lastName", "email", "phone")
+        WHERE c."id" = v."id"
+          AND c."ownerId" = ${ownerId}
+        RETURNING c.*
+      `;
+
+      const updatedIds = new Set(updated.map(contact => contact.id));
+      await tx.contactHistory.createMany({
+        data: updates
+          .filter(update => updatedIds.has(update.id))
+          .map(({ history: { contactId, ...changes } }) => ({ contactId, ...encodeHistoryChanges(changes) }))
+      });
+
+      return updated;
+    });
+    this.readRouter.markWrite(ownerId);
+    return contacts;
+  }
+
+  /**
+   * The owner's maintained contact count - a primary-key read instead of COUNT(*)
+   */
   async getContactCount(ownerId: string): Promise<number> {
-    return prisma.contact.count({
-      where: { ownerId }
+    return this.countContacts(this.readRouter.clientFor(ownerId), ownerId);
+  }
+
+  /**
+   * Total for a list query: the maintained counter when unfiltered, COUNT(*) otherwise
+   */
+  private async countContacts(db: PrismaClient, ownerId: string, where?: Prisma.ContactWhereInput): Promise<number> {
+    if (where?.lastName) {
+      return db.contact.count({ where });
+    }
+
+    const owner = await db.user.findUnique({
+      where: { id: ownerId },
+      select: { contactCount: true }
     });
+    return owner?.contactCount ?? 0;
   }
 }
@@ -1,3 +1,4 @@
+import crypto from 'crypto';
 import {
   InternalCreateUserDto,
   InternalUserDto
@@ -23,6 +24,28 @@ export class UserRepository {
     });
   }
 
+  /**
+   * Insert a user unless `maxUsers` already exist, in one statement.
+   * The "users" counter row is locked, so concurrent registrations queue up and re-check
+   * the count after the previous one commits. Returns null when the limit is reached.
+   */
+  async createWithinLimit(data: InternalCreateUserDto, maxUsers: number): Promise<InternalUserDto | null> {
+    const now = new Date().toISOString();
+    const [user] = await prisma.$queryRaw<InternalUserDto[]>`
+      WITH slot AS (
+        SELECT "name" FROM "counters"
+        WHERE "name" = 'users' AND "value" < ${maxUsers}
+        FOR UPDATE
+      )
+      INSERT INTO "users" ("id", "email", "firstName", "lastName", "password", "createdAt", "updatedAt")
+      SELECT ${crypto.randomUUID()}, ${data.email}, ${data.firstName}, ${data.lastName}, ${data.password},
+        CAST(${now} AS timestamp(3)), CAST(${now} AS timestamp(3))
+      FROM slot
+      RETURNING *
+    `;
+    return user ?? null;
+  }
+
 
 
   async delete(id: string): Promise<InternalUserDto> {
@@ -31,7 +54,13 @@ export class UserRepository {
     });
   }
 
+  /**
+   * Maintained user count - a primary-key read instead of COUNT(*)
+   */
   async getUserCount(): Promise<number> {
-    return prisma.user.count();
+    const counter = await prisma.counter.findUnique({
+      where: { name: 'users' }
+    });
+    return counter?.value ?? 0;
   }
 }
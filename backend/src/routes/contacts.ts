@@ -1,5 +1,6 @@
 import { Router } from 'express';
 import { requireAuth } from '../middleware/auth';
+import { cacheOwnerResponse } from '../middleware/responseCache';
 import { validateRequest } from '../middleware/validation';
 import { contactSchemas } from '../validation/contact.schemas';
 import { ContactController } from '../controllers/contactController';
@@ -7,8 +8,17 @@ import { ContactController } from '../controllers/contactController';
 const router = Router();
 const contactController = new ContactController();
 
-// GET /contacts - Get paginated contacts
-router.get('/', requireAuth, validateRequest(contactSchemas.getContacts), contactController.getContacts);
+// GET /contacts - Get paginated contacts (cached per owner until their contacts change)
+router.get('/', requireAuth, validateRequest(contactSchemas.getContacts), cacheOwnerResponse('contacts'), contactController.getContacts);
+
+// GET /contacts/count - Number of contacts the user owns
+router.get('/count', requireAuth, cacheOwnerResponse('contacts:count'), contactController.getContactCount);
+
+// GET /contacts/export - Stream all contacts as CSV or NDJSON (before /:id so it is not read as an ID)
+router.get('/export', requireAuth, validateRequest(contactSchemas.exportContacts), contactController.exportContacts);
+
+// GET /contacts/search - Search contacts by name, email or phone (before /:id so it is not read as an ID)
+router.get('/search', requireAuth, validateRequest(contactSchemas.searchContacts), contactController.searchContacts);
 
 // GET /contact/:id - Get specific contact
 router.get('/:id', requireAuth, validateRequest(contactSchemas.getContact), contactController.getContact);
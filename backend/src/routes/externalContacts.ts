@@ -1,14 +1,19 @@
-import { Router } from 'express';
+import express, { Router } from 'express';
 import { requireApiKey } from '../middleware/apiKeyAuth';
+import { rateLimitByApiKey } from '../middleware/rateLimit';
 import { validateRequest } from '../middleware/validation';
 import { externalContactSchemas } from '../validation/externalContact.schemas';
 import { ExternalContactController } from '../controllers/externalContactController';
+import { NDJSON_CONTENT_TYPES } from '../utils/ndjson';
 
 const router = Router();
 const externalContactController = new ExternalContactController();
 
-// Apply API key authentication to all external contact routes
-router.use(requireApiKey);
+// Apply API key authentication and the per-key quota to all external contact routes
+router.use(requireApiKey, rateLimitByApiKey);
+
+// GET /api/external/contact/export - Stream all contacts as NDJSON or CSV (before /:externalId)
+router.get('/export', validateRequest(externalContactSchemas.exportContacts), externalContactController.exportContacts);
 
 // GET /api/external/contact/:externalId - Get contact by external ID
 router.get('/:externalId', validateRequest(externalContactSchemas.getContactByExternalId), externalContactController.getContactByExternalId);
@@ -16,6 +21,9 @@ router.get('/:externalId', validateRequest(externalContactSchemas.getContactByEx
 // PATCH /api/external/contact/:externalId - Update contact by external ID
 router.patch('/:externalId', validateRequest(externalContactSchemas.updateContactByExternalId), externalContactController.updateContactByExternalId);
 
+// POST /api/external/contact/bulk - Create or update many contacts (JSON array or NDJSON)
+router.post('/bulk', express.text({ type: NDJSON_CONTENT_TYPES, limit: '10mb' }), externalContactController.bulkUpsertContacts);
+
 // POST /api/external/contact - Create contact with external ID
 router.post('/', validateRequest(externalContactSchemas.createContactWithExternalId), externalContactController.createContactWithExternalId);
 
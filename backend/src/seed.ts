@@ -1,5 +1,6 @@
 import { PrismaClient } from '@prisma/client';
 import bcrypt from 'bcryptjs';
+import { encodeHistoryChanges } from './lib/contactHistoryCodec';
 
 const prisma = new PrismaClient();
 
@@ -80,8 +81,10 @@ async function main() {
   const contactHistory = await prisma.contactHistory.create({
     data: {
       contactId: contacts[0].id,
-      firstName: { before: 'John', after: 'Jonathan' },
-      email: { before: 'john.smith@example.com', after: 'jonathan.smith@example.com' },
+      ...encodeHistoryChanges({
+        firstName: { before: 'John', after: 'Jonathan' },
+        email: { before: 'john.smith@example.com', after: 'jonathan.smith@example.com' },
+      }),
     },
   });
 
@@ -0,0 +1,162 @@
+import crypto from 'crypto';
+import { RedisClient } from '../lib/redis';
+
+export interface CachedApiKey {
+  apiKeyId: string;
+  userId: string;
+  expiresAt: number; // epoch ms after which the entry must be re-verified
+}
+
+export interface ApiKeyCacheOptions {
+  maxEntries: number;
+  ttlMs: number;
+}
+
+/**
+ * Bounded LRU of API keys that already passed bcrypt verification.
+ * Entries are keyed by an HMAC of the presented key (never the key itself) and
+ * can be dropped by API key id when a key is revoked, restored or deleted.
+ */
+export class ApiKeyCache {
+  static readonly INVALIDATION_CHANNEL = 'apikey:invalidate';
+
+  private static instance: ApiKeyCache;
+
+  // Per-process secret: the cache is in-process, so digests never need to match across tasks
+  private readonly hmacSecret = crypto.randomBytes(32);
+  private readonly options: ApiKeyCacheOptions;
+  private entries: Map<string, CachedApiKey> = new Map();
+  private digestsByKeyId: Map<string, Set<string>> = new Map();
+  // Bumped on every invalidation so in-flight verifications cannot re-cache a revoked key
+  private epoch = 0;
+  private publisher: RedisClient | null = null;
+
+  constructor(options: Partial<ApiKeyCacheOptions> = {}) {
+    this.options = {
+      maxEntries: options.maxEntries ?? parseInt(process.env.API_KEY_CACHE_MAX_ENTRIES || '1000'),
+      ttlMs: options.ttlMs ?? parseInt(process.env.API_KEY_CACHE_TTL_MS || '60000'),
+    };
+  }
+
+  static getInstance(): ApiKeyCache {
+    if (!ApiKeyCache.instance) {
+      ApiKeyCache.instance = new ApiKeyCache();
+    }
+    return ApiKeyCache.instance;
+  }
+
+  /**
+   * Propagate invalidations to every task through Redis pub/sub
+   */
+  async attachRedis(publisher: RedisClient, subscriber: RedisClient): Promise<void> {
+    await subscriber.subscribe(ApiKeyCache.INVALIDATION_CHANNEL, (apiKeyId: string) => {
+      this.invalidateLocal(apiKeyId);
+    });
+    this.publisher = publisher;
+  }
+
+  digest(apiKey: string): string {
+    return crypto.createHmac('sha256', this.hmacSecret).update(apiKey).digest('hex');
+  }
+
+  getEpoch(): number {
+    return this.epoch;
+  }
+
+  get(digest: string): CachedApiKey | null {
+    const entry = this.entries.get(digest);
+    if (!entry) {
+      return null;
+    }
+
+    if (entry.expiresAt <= Date.now()) {
+      this.remove(digest, entry);
+      return null;
+    }
+
+    // Refresh recency
+    this.entries.delete(digest);
+    this.entries.set(digest, entry);
+    return entry;
+  }
+
+  /**
+   * Cache a verified key. `epoch` must be read before the key was looked up so that
+   * an invalidation racing the verification wins.
+   */
+  set(digest: string, apiKeyId: string, userId: string, keyExpiresAt: Date | null, epoch: number): void {
+    if (epoch !== this.epoch || this.options.maxEntries <= 0) {
+      return;
+    }
+
+    let expiresAt = Date.now() + this.options.ttlMs;
+    if (keyExpiresAt) {
+      expiresAt = Math.min(expiresAt, keyExpiresAt.getTime());
+    }
+
+    const existing = this.entries.get(digest);
+    if (existing) {
+      this.remove(digest, existing);
+    }
+
+    this.entries.set(digest, { apiKeyId, userId, expiresAt });
+    if (!this.digestsByKeyId.has(apiKeyId)) {
+      this.digestsByKeyId.set(apiKeyId, new Set());
+    }
+    this.digestsByKeyId.get(apiKeyId)!.add(digest);
+
+    // Evict least recently used entries
+    while (this.entries.size > this.options.maxEntries) {
+      const [oldestDigest, oldestEntry] = this.entries.entries().next().value as [string, CachedApiKey];
+      this.remove(oldestDigest, oldestEntry);
+    }
+  }
+
+  /**
+   * Drop a key on this task and, when Redis is attached, on every other task
+   */
+  async invalidate(apiKeyId: string): Promise<void> {
+    this.invalidateLocal(apiKeyId);
+
+    if (this.publisher) {
+      try {
+        await this.publisher.publish(ApiKeyCache.INVALIDATION_CHANNEL, apiKeyId);
+      } catch (error) {
+        // Other tasks fall back to the TTL
+        console.error('Failed to publish API key invalidation:', error);
+      }
+    }
+  }
+
+  invalidateLocal(apiKeyId: string): void {
+    this.epoch++;
+    const digests = this.digestsByKeyId.get(apiKeyId);
+    if (!digests) {
+      return;
+    }
+
+    digests.forEach(digest => this.entries.delete(digest));
+    this.digestsByKeyId.delete(apiKeyId);
+  }
+
+  clear(): void {
+    this.epoch++;
+    this.entries.clear();
+    this.digestsByKeyId.clear();
+  }
+
+  size(): number {
+    return this.entries.size;
+  }
+
+  private remove(digest: string, entry: CachedApiKey): void {
+    this.entries.delete(digest);
+    const digests = this.digestsByKeyId.get(entry.apiKeyId);
+    if (digests) {
+      digests.delete(digest);
+      if (digests.size === 0) {
+        this.digestsByKeyId.delete(entry.apiKeyId);
+      }
+    }
+  }
+}
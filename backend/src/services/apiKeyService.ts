@@ -1,7 +1,9 @@
-import bcrypt from 'bcrypt';
 import crypto from 'crypto';
+import { HashPool } from '../lib/hashPool';
 import { prisma } from '../lib/prisma';
 import { AppErrorClass } from '../utils/errors';
+import { ApiKeyCache } from './apiKeyCache';
+import { ApiKeyUsageTracker } from './apiKeyUsageTracker';
 
 export interface CreateApiKeyDto {
   name: string;
@@ -17,10 +19,25 @@ export interface ApiKeyInfo {
   createdAt: Date;
 }
 
+export interface ValidatedApiKey {
+  apiKeyId: string;
+  userId: string;
+}
+
 export class ApiKeyService {
   private static readonly SALT_ROUNDS = 12;
   private static readonly API_KEY_LENGTH = 32;
 
+  private apiKeyCache: ApiKeyCache;
+  private apiKeyUsageTracker: ApiKeyUsageTracker;
+  private hashPool: HashPool;
+
+  constructor() {
+    this.apiKeyCache = ApiKeyCache.getInstance();
+    this.apiKeyUsageTracker = ApiKeyUsageTracker.getInstance();
+    this.hashPool = HashPool.getInstance();
+  }
+
   /**
    * Generate a new API key
    */
@@ -32,7 +49,7 @@ export class ApiKeyService {
    * Hash an API key for storage
    */
   private async hashApiKey(apiKey: string): Promise<string> {
-    return bcrypt.hash(apiKey, ApiKeyService.SALT_ROUNDS);
+    return this.hashPool.hash(apiKey, ApiKeyService.SALT_ROUNDS);
   }
 
   /**
@@ -82,9 +99,26 @@ export class ApiKeyService {
   }
 
   /**
-   * Validate an API key and return user ID
+   * Validate an API key and return its id and owner's user ID.
+   * `beforeVerify` runs on a cache miss, ahead of the database lookup and bcrypt compare;
+   * throwing from it (e.g. a rate limit) skips that work.
    */
-  async validateApiKey(apiKey: string): Promise<string> {
+  async validateApiKey(apiKey: string, beforeVerify?: () => Promise<void>): Promise<ValidatedApiKey> {
+    // Keys verified recently skip the database lookup and bcrypt
+    const digest = this.apiKeyCache.digest(apiKey);
+    const cached = this.apiKeyCache.get(digest);
+    if (cached) {
+      this.apiKeyUsageTracker.record(cached.apiKeyId);
+      return { apiKeyId: cached.apiKeyId, userId: cached.userId };
+    }
+
+    if (beforeVerify) {
+      await beforeVerify();
+    }
+
+    // Read before the lookup so a revoke that lands mid-verification is not undone by caching
+    const epoch = this.apiKeyCache.getEpoch();
+
     // Extract prefix and lookup a single record
     const keyPrefix = apiKey.substring(0, 8);
     const apiKeyRecord = await prisma.apiKey.findFirst({
@@ -102,17 +136,16 @@ export class ApiKeyService {
       throw AppErrorClass.unauthorized('Invalid API key');
     }
 
-    const isValid = await bcrypt.compare(apiKey, apiKeyRecord.keyHash);
+    const isValid = await this.hashPool.compare(apiKey, apiKeyRecord.keyHash);
     if (!isValid) {
       throw AppErrorClass.unauthorized('Invalid API key');
     }
 
-    await prisma.apiKey.update({
-      where: { id: apiKeyRecord.id },
-      data: { lastUsedAt: new Date() }
-    });
+    this.apiKeyCache.set(digest, apiKeyRecord.id, apiKeyRecord.userId, apiKeyRecord.expiresAt, epoch);
+    // lastUsedAt is written behind in bulk rather than on the request path
+    this.apiKeyUsageTracker.record(apiKeyRecord.id);
 
-    return apiKeyRecord.userId;
+    return { apiKeyId: apiKeyRecord.id, userId: apiKeyRecord.userId };
   }
 
   /**
@@ -136,7 +169,8 @@ export class ApiKeyService {
       id: key.id,
       name: key.name,
       isActive: key.isActive,
-      lastUsedAt: key.lastUsedAt || undefined,
+      // Prefer usage recorded on this task that has not been flushed yet
+      lastUsedAt: this.apiKeyUsageTracker.getPendingUsage(key.id) || key.lastUsedAt || undefined,
       expiresAt: key.expiresAt || undefined,
       createdAt: key.createdAt
     }));
@@ -161,6 +195,8 @@ export class ApiKeyService {
       where: { id: apiKeyId },
       data: { isActive: false }
     });
+
+    await this.apiKeyCache.invalidate(apiKeyId);
   }
 
   /**
@@ -181,6 +217,8 @@ export class ApiKeyService {
     await prisma.apiKey.delete({
       where: { id: apiKeyId }
     });
+
+    await this.apiKeyCache.invalidate(apiKeyId);
   }
 
   /**
@@ -202,5 +240,7 @@ export class ApiKeyService {
       where: { id: apiKeyId },
       data: { isActive: true }
     });
+
+    await this.apiKeyCache.invalidate(apiKeyId);
   }
 }
@@ -0,0 +1,136 @@
+import { Prisma } from '@prisma/client';
+import { prisma } from '../lib/prisma';
+
+export interface ApiKeyUsageMetrics {
+  pending: number;
+  flushed: number;
+  flushes: number;
+  failedFlushes: number;
+  lastFlushAt: string | null;
+}
+
+/**
+ * Write-behind tracker for ApiKey.lastUsedAt.
+ * Requests record usage in memory; a background timer writes every pending key
+ * in one bulk UPDATE, so hot keys cost one row write per interval instead of one per request.
+ */
+export class ApiKeyUsageTracker {
+  private static instance: ApiKeyUsageTracker;
+  private static readonly MAX_ROWS_PER_STATEMENT = 1000;
+
+  private pending: Map<string, Date> = new Map();
+  private flushTimer: NodeJS.Timeout | null = null;
+  private flushing: Promise<void> | null = null;
+  private metrics = {
+    flushed: 0,
+    flushes: 0,
+    failedFlushes: 0,
+    lastFlushAt: null as Date | null,
+  };
+
+  static getInstance(): ApiKeyUsageTracker {
+    if (!ApiKeyUsageTracker.instance) {
+      ApiKeyUsageTracker.instance = new ApiKeyUsageTracker();
+    }
+    return ApiKeyUsageTracker.instance;
+  }
+
+  /**
+   * Remember that a key was used. Only the latest timestamp per key is kept.
+   */
+  record(apiKeyId: string, usedAt: Date = new Date()): void {
+    const previous = this.pending.get(apiKeyId);
+    if (!previous || previous < usedAt) {
+      this.pending.set(apiKeyId, usedAt);
+    }
+  }
+
+  /**
+   * Latest usage not yet written to the database, if any
+   */
+  getPendingUsage(apiKeyId: string): Date | undefined {
+    return this.pending.get(apiKeyId);
+  }
+
+  start(intervalMs: number = parseInt(process.env.API_KEY_USAGE_FLUSH_MS || '30000')): void {
+    if (this.flushTimer) {
+      return;
+    }
+
+    this.flushTimer = setInterval(() => {
+      void this.flush();
+    }, intervalMs);
+    // Never keep the process alive just to flush
+    this.flushTimer.unref();
+  }
+
+  /**
+   * Stop the timer and write whatever is still pending (used on shutdown)
+   */
+  async stop(): Promise<void> {
+    if (this.flushTimer) {
+      clearInterval(this.flushTimer);
+      this.flushTimer = null;
+    }
+    await this.flush();
+  }
+
+  async flush(): Promise<void> {
+    // Serialize flushes so a slow write is never overlapped by the next tick. Loop rather than
+    // wait once: every caller waiting on the same flush wakes together, and only the first may
+    // start the next one
+    while (this.flushing) {
+      await this.flushing;
+    }
+    if (this.pending.size === 0) {
+      return;
+    }
+
+    const batch = this.pending;
+    this.pending = new Map();
+
+    this.flushing = this.writeBatch(batch).finally(() => {
+      this.flushing = null;
+    });
+    await this.flushing;
+  }
+
+  getMetrics(): ApiKeyUsageMetrics {
+    return {
+      pending: this.pending.size,
+      flushed: this.metrics.flushed,
+      flushes: this.metrics.flushes,
+      failedFlushes: this.metrics.failedFlushes,
+      lastFlushAt: this.metrics.lastFlushAt ? this.metrics.lastFlushAt.toISOString() : null,
+    };
+  }
+
+  private async writeBatch(batch: Map<string, Date>): Promise<void> {
+    const entries = Array.from(batch.entries());
+
+    try {
+      for (let i = 0; i < entries.length; i += ApiKeyUsageTracker.MAX_ROWS_PER_STATEMENT) {
+        const chunk = entries.slice(i, i + ApiKeyUsageTracker.MAX_ROWS_PER_STATEMENT);
+        // lastUsedAt is timestamp(3) without time zone holding UTC; the zone suffix of the ISO string is ignored by the cast
+        const values = chunk.map(([id, usedAt]) => Prisma.sql`(${id}, CAST(${usedAt.toISOString()} AS timestamp(3)))`);
+
+        await prisma.$executeRaw`
+          UPDATE "api_keys" AS k
+          SET "lastUsedAt" = v."usedAt"
+          FROM (VALUES ${Prisma.join(values)}) AS v("id", "usedAt")
+          WHERE k."id" = v."id"
+            AND (k."lastUsedAt" IS NULL OR k."lastUsedAt" < v."usedAt")
+        `;
+      }
+
+      this.metrics.flushed += entries.length;
+      this.metrics.flushes++;
+      this.metrics.lastFlushAt = new Date();
+    } catch (error) {
+      console.error('Failed to flush API key usage:', error);
+      this.metrics.failedFlushes++;
+      // Put the batch back so the next tick retries it
+      entries.forEach(([id, usedAt]) => this.record(id, usedAt));
+    }
+  }
+}
@@ -1,15 +1,19 @@
-import bcrypt from 'bcryptjs';
 import { LoginRequestDto, UserSessionDto } from '../dtos/external/user.dto';
 import { InternalUserDto } from '../dtos/internal/user.dto';
+import { HashPool } from '../lib/hashPool';
 import { UserMapper } from '../dtos/mappers/user.mapper';
 import { UserRepository } from '../repositories/userRepository';
 import { AppErrorClass } from '../utils/errors';
 
 export class AuthService {
+  private static readonly SALT_ROUNDS = 10;
+
   private userRepository: UserRepository;
+  private hashPool: HashPool;
 
   constructor() {
     this.userRepository = new UserRepository();
+    this.hashPool = HashPool.getInstance();
   }
 
   async validateCredentials(credentials: LoginRequestDto): Promise<InternalUserDto | null> {
@@ -22,7 +26,7 @@ export class AuthService {
     }
 
     // Compare password
-    const isValidPassword = await bcrypt.compare(password, user.password);
+    const isValidPassword = await this.hashPool.compare(password, user.password);
     if (!isValidPassword) {
       return null;
     }
@@ -40,11 +44,11 @@ export class AuthService {
   }
 
   async hashPassword(password: string): Promise<string> {
-    return bcrypt.hash(password, 10);
+    return this.hashPool.hash(password, AuthService.SALT_ROUNDS);
   }
 
   async verifyPassword(password: string, hashedPassword: string): Promise<boolean> {
-    return bcrypt.compare(password, hashedPassword);
+    return this.hashPool.compare(password, hashedPassword);
   }
 
   async getUserById(userId: string): Promise<InternalUserDto | null> {
@@ -61,7 +65,7 @@ export class AuthService {
     firstName: string;
     lastName: string;
   }): Promise<InternalUserDto> {
-    // Check Global user limit (configurable)
+    // Global user limit (configurable); checked up front so a full system skips the hash
     const maxUsers = parseInt(process.env.MAX_USERS || '50');
     const userCount = await this.userRepository.getUserCount();
     if (userCount >= maxUsers) {
@@ -71,13 +75,16 @@ export class AuthService {
     // Hash the password
     const hashedPassword = await this.hashPassword(userData.password);
 
-    // Create user
-    const user = await this.userRepository.create({
+    // Create user; the limit is enforced again atomically with the insert
+    const user = await this.userRepository.createWithinLimit({
       email: userData.email,
       password: hashedPassword,
       firstName: userData.firstName,
       lastName: userData.lastName
-    });
+    }, maxUsers);
+    if (!user) {
+      throw AppErrorClass.userLimitReached(maxUsers);
+    }
 
     return user;
   }
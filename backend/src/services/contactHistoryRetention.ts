@@ -0,0 +1,253 @@
+import { Prisma, PrismaClient } from '@prisma/client';
+import { prisma } from '../lib/prisma';
+
+export interface ContactHistoryRetentionOptions {
+  retentionMonths: number; // 0 keeps history forever
+  partitionsAhead: number;
+  intervalMs: number;
+}
+
+export interface ContactHistoryMaintenanceResult {
+  skipped: boolean; // another task held the maintenance lock
+  partitionsCreated: number;
+  partitionsDropped: string[];
+}
+
+export interface ContactHistoryRetentionMetrics {
+  runs: number;
+  failedRuns: number;
+  partitionsCreated: number;
+  partitionsDropped: number;
+  lastRunAt: string | null;
+}
+
+// Arbitrary key for pg_try_advisory_xact_lock, so only one task maintains partitions at a time
+const MAINTENANCE_LOCK_KEY = 742031;
+const PARTITION_NAME = /^contact_history_entries_(\d{4})_(\d{2})$/;
+
+interface HistoryPartition {
+  name: string;
+  attached: boolean;
+  detachPending: boolean; // a DETACH ... CONCURRENTLY was interrupted
+}
+
+/**
+ * First instant of the UTC month `offset` months after the one holding `date`
+ */
+export const monthStart = (date: Date, offset: number = 0): Date =>
+  new Date(Date.UTC(date.getUTCFullYear(), date.getUTCMonth() + offset, 1));
+
+/**
+ * Month partitions of contact_history_entries (see migration compact_partitioned_contact_history).
+ * Keeps partitions created ahead of the current month and, when a retention period is set,
+ * detaches and drops whole partitions once every row in them has expired - no row-by-row DELETE
+ * or vacuum, and no lock that blocks history reads or writes.
+ * Runs on a timer in every task; a transaction-scoped advisory lock makes concurrent runs no-ops.
+ */
+export class ContactHistoryRetention {
+  private static instance: ContactHistoryRetention;
+
+  private readonly options: ContactHistoryRetentionOptions;
+  private timer: NodeJS.Timeout | null = null;
+  private running: Promise<ContactHistoryMaintenanceResult> | null = null;
+  private metrics = {
+    runs: 0,
+    failedRuns: 0,
+    partitionsCreated: 0,
+    partitionsDropped: 0,
+    lastRunAt: null as Date | null,
+  };
+
+  constructor(private readonly db: PrismaClient = prisma, options: Partial<ContactHistoryRetentionOptions> = {}) {
+    this.options = {
+      retentionMonths: options.retentionMonths ?? parseInt(process.env.CONTACT_HISTORY_RETENTION_MONTHS || '0'),
+      partitionsAhead: options.partitionsAhead ?? parseInt(process.env.CONTACT_HISTORY_PARTITIONS_AHEAD || '3'),
+      intervalMs: options.intervalMs ?? parseInt(process.env.CONTACT_HISTORY_MAINTENANCE_MS || String(6 * 60 * 60 * 1000)),
+    };
+  }
+
+  static getInstance(): ContactHistoryRetention {
+    if (!ContactHistoryRetention.instance) {
+      ContactHistoryRetention.instance = new ContactHistoryRetention();
+    }
+    return ContactHistoryRetention.instance;
+  }
+
+  /**
+   * Run maintenance now and then every `intervalMs`
+   */
+  start(): void {
+    if (this.timer) {
+      return;
+    }
+
+    const tick = () => {
+      this.run().catch(error => console.error('Contact history maintenance failed:', error));
+    };
+    this.timer = setInterval(tick, this.options.intervalMs);
+    // Never keep the process alive just for maintenance
+    this.timer.unref();
+    tick();
+  }
+
+  stop(): void {
+    if (this.timer) {
+      clearInterval(this.timer);
+      this.timer = null;
+    }
+  }
+
+  /**
+   * Create upcoming partitions and drop expired ones. Concurrent calls share one run.
+   */
+  async run(now: Date = new Date()): Promise<ContactHistoryMaintenanceResult> {
+    if (!this.running) {
+      this.running = this.maintain(now).finally(() => {
+        this.running = null;
+      });
+    }
+    return this.running;
+  }
+
+  /**
+   * Create the partition of every month from `from` through `to`; returns how many were new.
+   * Used to prepare the table before bulk-loading old history (see scripts/generate-data.ts).
+   */
+  async ensurePartitions(from: Date, to: Date, db: Prisma.TransactionClient = this.db): Promise<number> {
+    let created = 0;
+    for (let month = monthStart(from); month <= to; month = monthStart(month, 1)) {
+      const [row] = await db.$queryRaw<{ created: boolean }[]>`
+        SELECT "contact_history_create_partition"(CAST(${month.toISOString()} AS timestamp)) AS "created"
+      `;
+      if (row.created) {
+        created++;
+      }
+    }
+    return created;
+  }
+
+  /**
+   * Oldest instant still retained, or null when history is kept forever
+   */
+  getCutoff(now: Date = new Date()): Date | null {
+    return this.options.retentionMonths > 0 ? monthStart(now, -this.options.retentionMonths) : null;
+  }
+
+  getMetrics(): ContactHistoryRetentionMetrics {
+    return {
+      runs: this.metrics.runs,
+      failedRuns: this.metrics.failedRuns,
+      partitionsCreated: this.metrics.partitionsCreated,
+      partitionsDropped: this.metrics.partitionsDropped,
+      lastRunAt: this.metrics.lastRunAt ? this.metrics.lastRunAt.toISOString() : null,
+    };
+  }
+
+  private async maintain(now: Date): Promise<ContactHistoryMaintenanceResult> {
+    try {
+      // A short transaction decides which task maintains. Creating partitions only takes
+      // SHARE UPDATE EXCLUSIVE on contact_history_entries, so reads and writes carry on meanwhile.
+      const prepared = await this.db.$transaction(async tx => {
+        const [lock] = await tx.$queryRaw<{ locked: boolean }[]>`
+          SELECT pg_try_advisory_xact_lock(${MAINTENANCE_LOCK_KEY}) AS "locked"
+        `;
+        if (!lock.locked) {
+          return null;
+        }
+
+        const partitionsCreated = await this.ensurePartitions(now, monthStart(now, this.options.partitionsAhead), tx);
+        const cutoff = this.getCutoff(now);
+        const expired = cutoff ? await this.findPartitionsBefore(tx, cutoff) : [];
+        return { partitionsCreated, expired };
+      });
+      if (!prepared) {
+        return { skipped: true, partitionsCreated: 0, partitionsDropped: [] };
+      }
+
+      // One partition at a time, each outside any long transaction
+      const partitionsDropped: string[] = [];
+      for (const partition of prepared.expired) {
+        if (await this.dropPartition(partition)) {
+          partitionsDropped.push(partition.name);
+        }
+      }
+
+      this.metrics.runs++;
+      this.metrics.partitionsCreated += prepared.partitionsCreated;
+      this.metrics.partitionsDropped += partitionsDropped.length;
+      this.metrics.lastRunAt = now;
+      return { skipped: false, partitionsCreated: prepared.partitionsCreated, partitionsDropped };
+    } catch (error) {
+      this.metrics.failedRuns++;
+      throw error;
+    }
+  }
+
+  /**
+   * Monthly partitions that end on or before `cutoff`, oldest first. Includes tables a previous
+   * run detached (or began detaching) but did not drop.
+   */
+  private async findPartitionsBefore(tx: Prisma.TransactionClient, cutoff: Date): Promise<HistoryPartition[]> {
+    const tables = await tx.$queryRaw<HistoryPartition[]>`
+      SELECT c."relname" AS "name",
+        i."inhrelid" IS NOT NULL AS "attached",
+        COALESCE(i."inhdetachpending", false) AS "detachPending"
+      FROM pg_class c
+      LEFT JOIN pg_inherits i ON i."inhrelid" = c."oid" AND i."inhparent" = '"contact_history_entries"'::regclass
+      WHERE c."relkind" = 'r'
+        AND c."relnamespace" = current_schema()::regnamespace
+        AND c."relname" LIKE 'contact_history_entries_%'
+    `;
+
+    return tables
+      .map(table => ({ table, match: PARTITION_NAME.exec(table.name) }))
+      .filter(({ match }) => match && Date.UTC(Number(match[1]), Number(match[2]), 1) <= cutoff.getTime())
+      .map(({ table }) => table)
+      .sort((a, b) => a.name.localeCompare(b.name));
+  }
+
+  /**
+   * Detach one expired partition without blocking contact_history_entries, then subtract its rows from
+   * the contacts' maintained history counts and drop it in one short transaction. Detaching and
+   * dropping fire no delete trigger, hence the explicit count update. Returns false when another
+   * task got there first; a later run finishes whatever is left.
+   */
+  private async dropPartition(partition: HistoryPartition): Promise<boolean> {
+    // Identifiers cannot be bound; `name` matched PARTITION_NAME, so it is safe to quote
+    const { name } = partition;
+    if (partition.attached) {
+      try {
+        // CONCURRENTLY waits out running queries instead of locking them out; FINALIZE completes
+        // a concurrent detach that was interrupted
+        await this.db.$executeRawUnsafe(partition.detachPending
+          ? `ALTER TABLE "contact_history_entries" DETACH PARTITION "${name}" FINALIZE`
+          : `ALTER TABLE "contact_history_entries" DETACH PARTITION "${name}" CONCURRENTLY`);
+      } catch (error) {
+        console.error(`Contact history: could not detach partition ${name}:`, error);
+        return false;
+      }
+    }
+
+    return this.db.$transaction(async tx => {
+      // Serializes with other tasks' runs so the counts are reduced exactly once
+      await tx.$executeRaw`SELECT pg_advisory_xact_lock(${MAINTENANCE_LOCK_KEY})`;
+      const [table] = await tx.$queryRaw<{ detached: boolean }[]>`
+        SELECT to_regclass(quote_ident(${name})) IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM pg_inherits WHERE "inhrelid" = to_regclass(quote_ident(${name}))) AS "detached"
+      `;
+      if (!table.detached) {
+        return false;
+      }
+
+      await tx.$executeRawUnsafe(`
+        UPDATE "contacts" c
+        SET "historyCount" = c."historyCount" - h."count"
+        FROM (SELECT "contactId", COUNT(*)::int AS "count" FROM "${name}" GROUP BY "contactId") h
+        WHERE c."id" = h."contactId"
+      `);
+      await tx.$executeRawUnsafe(`DROP TABLE "${name}"`);
+      console.log(`Contact history: dropped expired partition ${name}`);
+      return true;
+    });
+  }
+}
@@ -1,6 +1,10 @@
-import { ContactHistoryDto } from '../dtos/external/contact.dto';
-import { ContactMapper } from '../dtos/mappers/contact.mapper';
-import { PaginationOptionsDto, PaginationResultDto } from '../dtos/shared/pagination.dto';
+import { InternalContactHistoryDto } from '../dtos/internal/contact.dto';
+import {
+  CursorPaginationOptionsDto,
+  CursorPaginationResultDto,
+  PaginationOptionsDto,
+  PaginationResultDto
+} from '../dtos/shared/pagination.dto';
 import { ContactHistoryRepository } from '../repositories/contactHistoryRepository';
 import { ContactRepository } from '../repositories/contactRepository';
 
@@ -19,9 +23,9 @@ export class ContactHistoryService {
     page: number,
     pageSize: number,
     order: 'asc' | 'desc' = 'desc'
-  ): Promise<PaginationResultDto<ContactHistoryDto>> {
+  ): Promise<PaginationResultDto<InternalContactHistoryDto>> {
     // Verify the contact belongs to the user
-    const contact = await this.contactRepository.findById(contactId, ownerId);
+    const contact = await this.contactRepository.findById(contactId, ownerId, ['id']);
     if (!contact) {
       throw new Error('Contact not found');
     }
@@ -32,15 +36,23 @@ export class ContactHistoryService {
       skip: (page - 1) * pageSize
     };
 
-    const internalResult = await this.contactHistoryRepository.findByContactId(contactId, options, order);
-    
-    // Transform internal DTOs to external DTOs
-    const externalData = internalResult.data.map(history => ContactMapper.toContactHistoryDto(history));
-    
-    return {
-      data: externalData,
-      total: internalResult.total,
-      pagination: internalResult.pagination
-    };
+    // Rows stay internal: the controller writes them with ContactSerializer, which decodes the
+    // changed-field bitmask straight into the response JSON
+    return this.contactHistoryRepository.findByContactId(contactId, ownerId, options, order);
+  }
+
+  async getContactHistoryByCursor(
+    contactId: string,
+    ownerId: string,
+    options: CursorPaginationOptionsDto,
+    order: 'asc' | 'desc' = 'desc'
+  ): Promise<CursorPaginationResultDto<InternalContactHistoryDto>> {
+    // Verify the contact belongs to the user
+    const contact = await this.contactRepository.findById(contactId, ownerId, ['id']);
+    if (!contact) {
+      throw new Error('Contact not found');
+    }
+
+    return this.contactHistoryRepository.findByContactIdAfterCursor(contactId, ownerId, options, order);
   }
 }
@@ -0,0 +1,165 @@
+import crypto from 'crypto';
+
+export interface CachedResponse {
+  version: number;
+  etag: string;
+  body: string; // Serialized JSON response
+  expiresAt: number;
+}
+
+export interface ContactListCacheOptions {
+  maxEntries: number;
+  maxBytes: number;
+  ttlMs: number;
+}
+
+export interface ContactListCacheMetrics {
+  entries: number;
+  bytes: number;
+  versions: number;
+  hits: number;
+  misses: number;
+}
+
+/**
+ * Bounded LRU of serialized contact-list responses per owner, capped by entry count and by
+ * the total length of the cached bodies (one large owner's pages can outweigh thousands of
+ * small ones).
+ * Every owner has a version that is bumped whenever one of their contacts changes; entries
+ * stored under an older version are never served. Because the bump happens where contact SSE
+ * events are delivered, it reaches every task through the SSE bus.
+ * Versions come from one task-wide clock and are kept for at most `maxEntries` owners. Owners
+ * without a kept version read `forgottenVersion`, the clock when a version was last evicted, so
+ * a version can never go back to a value read before a bump.
+ */
+export class ContactListCache {
+  private static instance: ContactListCache;
+
+  private readonly options: ContactListCacheOptions;
+  private entries: Map<string, CachedResponse> = new Map();
+  private versions: Map<string, number> = new Map();
+  private bytes = 0;
+  private clock = 0;
+  private forgottenVersion = 0;
+  private metrics = {
+    hits: 0,
+    misses: 0,
+  };
+
+  constructor(options: Partial<ContactListCacheOptions> = {}) {
+    this.options = {
+      maxEntries: options.maxEntries ?? parseInt(process.env.CONTACT_LIST_CACHE_MAX_ENTRIES || '5000'),
+      maxBytes: options.maxBytes ?? parseInt(process.env.CONTACT_LIST_CACHE_MAX_BYTES || String(64 * 1024 * 1024)),
+      ttlMs: options.ttlMs ?? parseInt(process.env.CONTACT_LIST_CACHE_TTL_MS || '60000'),
+    };
+  }
+
+  static getInstance(): ContactListCache {
+    if (!ContactListCache.instance) {
+      ContactListCache.instance = new ContactListCache();
+    }
+    return ContactListCache.instance;
+  }
+
+  /**
+   * Weak ETag over the response body, so it agrees across tasks that rendered the same data
+   */
+  static etag(body: string): string {
+    return `W/"${crypto.createHash('sha1').update(body).digest('base64url')}"`;
+  }
+
+  getVersion(ownerId: string): number {
+    return this.versions.get(ownerId) ?? this.forgottenVersion;
+  }
+
+  get(ownerId: string, key: string): CachedResponse | null {
+    const cacheKey = this.cacheKey(ownerId, key);
+    const entry = this.entries.get(cacheKey);
+    if (!entry || entry.version !== this.getVersion(ownerId) || entry.expiresAt <= Date.now()) {
+      if (entry) {
+        this.remove(cacheKey);
+      }
+      this.metrics.misses++;
+      return null;
+    }
+
+    // Refresh recency
+    this.entries.delete(cacheKey);
+    this.entries.set(cacheKey, entry);
+    this.metrics.hits++;
+    return entry;
+  }
+
+  /**
+   * Store a response. `version` must be read before the data was queried so that a write
+   * racing the query leaves the entry already stale.
+   */
+  set(ownerId: string, key: string, version: number, body: string): CachedResponse {
+    const entry: CachedResponse = {
+      version,
+      etag: ContactListCache.etag(body),
+      body,
+      expiresAt: Date.now() + this.options.ttlMs,
+    };
+
+    if (this.options.maxEntries <= 0 || body.length > this.options.maxBytes || version !== this.getVersion(ownerId)) {
+      return entry;
+    }
+
+    const cacheKey = this.cacheKey(ownerId, key);
+    this.remove(cacheKey);
+    this.entries.set(cacheKey, entry);
+    this.bytes += body.length;
+
+    // Evict least recently used entries
+    while (this.entries.size > this.options.maxEntries || this.bytes > this.options.maxBytes) {
+      this.remove(this.entries.keys().next().value as string);
+    }
+    return entry;
+  }
+
+  /**
+   * Invalidate every cached response for an owner (their contacts changed)
+   */
+  bumpVersion(ownerId: string): void {
+    this.versions.delete(ownerId);
+    this.versions.set(ownerId, ++this.clock);
+
+    // Forget the least recently bumped owners; they fall back to the newest clock value
+    while (this.versions.size > Math.max(this.options.maxEntries, 0)) {
+      const oldestOwner = this.versions.keys().next().value as string;
+      this.versions.delete(oldestOwner);
+      this.forgottenVersion = this.clock;
+    }
+  }
+
+  clear(): void {
+    this.entries.clear();
+    this.bytes = 0;
+    this.versions.clear();
+    // Versions read before the clear must stay stale
+    this.forgottenVersion = ++this.clock;
+  }
+
+  getMetrics(): ContactListCacheMetrics {
+    return {
+      entries: this.entries.size,
+      bytes: this.bytes,
+      versions: this.versions.size,
+      hits: this.metrics.hits,
+      misses: this.metrics.misses,
+    };
+  }
+
+  private remove(cacheKey: string): void {
+    const entry = this.entries.get(cacheKey);
+    if (entry) {
+      this.entries.delete(cacheKey);
+      this.bytes -= entry.body.length;
+    }
+  }
+
+  private cacheKey(ownerId: string, key: string): string {
+    return `${ownerId}\u0000${key}`;
+  }
+}
@@ -1,16 +1,30 @@
 import {
+  BulkContactRowDto,
+  BulkContactRowResultDto,
   ContactDto,
+  ContactExportDto,
+  ContactField,
+  ContactProjectionDto,
   CreateContactDto,
   UpdateContactDto
 } from '../dtos/external/contact.dto';
 import {
+  InternalBulkContactUpdateDto,
+  InternalContactDto,
+  InternalContactHistoryDto,
+  InternalContactProjectionDto,
   InternalCreateContactDto,
-  InternalCreateContactHistoryDto,
-  InternalUpdateContactDto
+  InternalCreateContactHistoryDto
 } from '../dtos/internal/contact.dto';
 import { ContactMapper } from '../dtos/mappers/contact.mapper';
 import { ValidationErrorDto } from '../dtos/shared/common.dto';
-import { PaginationOptionsDto, PaginationResultDto } from '../dtos/shared/pagination.dto';
+import {
+  CursorPaginationOptionsDto,
+  CursorPaginationResultDto,
+  PaginationOptionsDto,
+  PaginationResultDto
+} from '../dtos/shared/pagination.dto';
+import { isUniqueViolation } from '../lib/prisma';
 import { ContactHistoryRepository } from '../repositories/contactHistoryRepository';
 import { ContactRepository } from '../repositories/contactRepository';
 import { AppErrorClass } from '../utils/errors';
@@ -21,6 +35,16 @@ export interface ContactValidationResult {
   errors: ValidationErrorDto[];
 }
 
+export interface IndexedBulkContactRow {
+  index: number;
+  contact: BulkContactRowDto;
+}
+
+export interface ContactExportOptions {
+  includeHistory: boolean;
+  batchSize: number;
+}
+
 export class ContactService {
   private contactRepository: ContactRepository;
   private contactHistoryRepository: ContactHistoryRepository;
@@ -30,33 +54,82 @@ export class ContactService {
     this.contactHistoryRepository = new ContactHistoryRepository();
   }
 
-  async getContacts(ownerId: string, page: number, pageSize: number, filter?: string): Promise<PaginationResultDto<ContactDto>> {
+  async getContacts(
+    ownerId: string,
+    page: number,
+    pageSize: number,
+    filter?: string,
+    fields?: ContactField[]
+  ): Promise<PaginationResultDto<InternalContactProjectionDto>> {
     const options: PaginationOptionsDto = {
       page,
       pageSize,
       skip: (page - 1) * pageSize
     };
 
-    const internalResult = await this.contactRepository.findByOwnerId(ownerId, options, filter);
-    
-    // Transform internal DTOs to external DTOs
-    const externalData = internalResult.data.map(contact => ContactMapper.toContactWithOwnerDto(contact));
-    
-    return {
-      data: externalData,
-      total: internalResult.total,
-      pagination: internalResult.pagination
-    };
+    // List rows stay internal: the controller writes them with ContactSerializer, which maps
+    // to the external shape and serializes in one pass
+    return this.contactRepository.findByOwnerId(ownerId, options, filter, fields);
+  }
+
+  async getContactsByCursor(
+    ownerId: string,
+    options: CursorPaginationOptionsDto,
+    filter?: string,
+    fields?: ContactField[]
+  ): Promise<CursorPaginationResultDto<InternalContactProjectionDto>> {
+    // Serialized by the controller with ContactSerializer, as in getContacts
+    return this.contactRepository.findByOwnerIdAfterCursor(ownerId, options, filter, fields);
   }
 
-  async getContact(id: string, ownerId: string): Promise<ContactDto | null> {
-    const internalContact = await this.contactRepository.findById(id, ownerId);
-    return internalContact ? ContactMapper.toContactWithOwnerDto(internalContact) : null;
+  async getContactCount(ownerId: string): Promise<number> {
+    return this.contactRepository.getContactCount(ownerId);
   }
 
-  async getContactByExternalId(externalId: string, ownerId: string): Promise<ContactDto | null> {
-    const internalContact = await this.contactRepository.findByExternalId(externalId, ownerId);
-    return internalContact ? ContactMapper.toContactWithOwnerDto(internalContact) : null;
+  async searchContacts(
+    ownerId: string,
+    query: string,
+    options: CursorPaginationOptionsDto
+  ): Promise<CursorPaginationResultDto<InternalContactDto>> {
+    // Serialized by the controller with ContactSerializer, which applies any ?fields=
+    return this.contactRepository.searchByOwnerId(ownerId, query, options);
+  }
+
+  /**
+   * Every contact the owner has, in list order, one keyset batch at a time. Rows are pulled
+   * on demand, so a slow consumer pauses the queries and memory stays at one batch.
+   */
+  async *exportContacts(ownerId: string, options: ContactExportOptions): AsyncGenerator<ContactExportDto> {
+    let cursor: string | undefined;
+    do {
+      const batch = await this.contactRepository.findByOwnerIdAfterCursor(ownerId, { cursor, pageSize: options.batchSize });
+      const contacts = batch.data as InternalContactDto[];
+
+      const historyByContactId = new Map<string, InternalContactHistoryDto[]>();
+      if (options.includeHistory) {
+        const history = await this.contactHistoryRepository.findByContactIds(contacts.map(contact => contact.id), ownerId);
+        history.forEach(entry => {
+          const entries = historyByContactId.get(entry.contactId) ?? [];
+          entries.push(entry);
+          historyByContactId.set(entry.contactId, entries);
+        });
+      }
+
+      for (const contact of contacts) {
+        yield ContactMapper.toContactExportDto(contact, options.includeHistory ? historyByContactId.get(contact.id) ?? [] : undefined);
+      }
+      cursor = batch.pagination.nextCursor ?? undefined;
+    } while (cursor);
+  }
+
+  async getContact(id: string, ownerId: string, fields?: ContactField[]): Promise<ContactProjectionDto | null> {
+    const internalContact = await this.contactRepository.findById(id, ownerId, fields);
+    return internalContact ? ContactMapper.toContactProjectionDto(internalContact, fields) : null;
+  }
+
+  async getContactByExternalId(externalId: string, ownerId: string, fields?: ContactField[]): Promise<ContactProjectionDto | null> {
+    const internalContact = await this.contactRepository.findByExternalId(externalId, ownerId, fields);
+    return internalContact ? ContactMapper.toContactProjectionDto(internalContact, fields) : null;
   }
 
   async createContact(externalData: CreateContactDto, ownerId: string): Promise<ContactDto> {
@@ -77,18 +150,23 @@ export class ContactService {
       throw AppErrorClass.duplicateEmail();
     }
 
-    // Check contact limit (configurable via environment variable)
+    // Contact limit (configurable via environment variable) is enforced atomically with the insert
     const maxContacts = parseInt(process.env.MAX_CONTACTS_PER_USER || '50');
-    const contactCount = await this.contactRepository.getContactCount(ownerId);
-    if (contactCount >= maxContacts) {
+    let internalContact;
+    try {
+      internalContact = await this.contactRepository.createWithinLimit(internalData, maxContacts);
+    } catch (error) {
+      // A concurrent create with the same email won the race past the pre-check
+      if (isUniqueViolation(error)) {
+        throw AppErrorClass.duplicateEmail();
+      }
+      throw error;
+    }
+    if (!internalContact) {
       throw AppErrorClass.contactLimitReached(maxContacts);
     }
 
-    // Simulate 20-second delay as requested
-    await new Promise(resolve => setTimeout(resolve, 20000));
-
-    const internalContact = await this.contactRepository.create(internalData);
-    const externalContact = ContactMapper.toContactWithOwnerDto(internalContact);
+    const externalContact = ContactMapper.toContactDto(internalContact);
     
     // Emit SSE event for real-time updates
     const sseEventManager = SSEEventManager.getInstance();
@@ -124,15 +202,26 @@ export class ContactService {
       throw AppErrorClass.duplicateEmail();
     }
 
-    // Check contact limit
+    // Check contact limit atomically with the insert
     const maxContacts = parseInt(process.env.MAX_CONTACTS_PER_USER || '50');
-    const contactCount = await this.contactRepository.getContactCount(ownerId);
-    if (contactCount >= maxContacts) {
+    let internalContact;
+    try {
+      internalContact = await this.contactRepository.createWithinLimit(internalData, maxContacts);
+    } catch (error) {
+      // A concurrent create with the same email or external ID won the race past the pre-checks
+      if (isUniqueViolation(error)) {
+        if (internalData.externalId && await this.contactRepository.existsByExternalId(internalData.externalId)) {
+          throw AppErrorClass.validationError('Contact with this external ID already exists', 'externalId');
+        }
+        throw AppErrorClass.duplicateEmail();
+      }
+      throw error;
+    }
+    if (!internalContact) {
       throw AppErrorClass.contactLimitReached(maxContacts);
     }
 
-    const internalContact = await this.contactRepository.create(internalData);
-    const externalContact = ContactMapper.toContactWithOwnerDto(internalContact);
+    const externalContact = ContactMapper.toContactDto(internalContact);
     
     // Emit SSE event for real-time updates
     const sseEventManager = SSEEventManager.getInstance();
@@ -141,138 +230,209 @@ export class ContactService {
     return externalContact;
   }
 
-  async updateContact(id: string, ownerId: string, externalUpdateData: UpdateContactDto): Promise<ContactDto> {
-    // Get current contact
-    const currentContact = await this.contactRepository.findByIdForUpdate(id, ownerId);
-    if (!currentContact) {
-      throw new Error('Contact not found');
-    }
-
-    // Transform external DTO to internal DTO
-    const internalUpdateData = ContactMapper.toInternalUpdateDto(externalUpdateData);
-
-    // Prepare update data and history changes
-    const finalUpdateData: InternalUpdateContactDto = {};
-    const historyChanges: InternalCreateContactHistoryDto = {
-      contactId: id
+  /**
+   * Create or update many contacts keyed by external ID.
+   * Existing externalIds and emails are looked up with one IN query each, the contact limit is
+   * claimed per insert chunk under the owner's row lock, and writes go out in multi-row statements.
+   * Rows are expected to be schema-validated.
+   */
+  async bulkUpsertContactsByExternalId(rows: IndexedBulkContactRow[], ownerId: string): Promise<BulkContactRowResultDto[]> {
+    const results: BulkContactRowResultDto[] = [];
+    const fail = (row: IndexedBulkContactRow, message: string, field?: string) => {
+      results.push({ index: row.index, externalId: row.contact.externalId, status: 'error', errors: [{ message, field }] });
     };
 
-    if (internalUpdateData.firstName && internalUpdateData.firstName !== currentContact.firstName) {
-      finalUpdateData.firstName = internalUpdateData.firstName;
-      historyChanges.firstName = { before: currentContact.firstName, after: internalUpdateData.firstName };
-    }
+    // Later occurrences of an externalId or email within the request are rejected
+    const seenExternalIds = new Set<string>();
+    const seenEmails = new Set<string>();
+    const candidates: IndexedBulkContactRow[] = [];
+    rows.forEach(row => {
+      if (seenExternalIds.has(row.contact.externalId)) {
+        fail(row, 'Duplicate external ID in request', 'externalId');
+      } else if (seenEmails.has(row.contact.email)) {
+        fail(row, 'Duplicate email in request', 'email');
+      } else {
+        seenExternalIds.add(row.contact.externalId);
+        seenEmails.add(row.contact.email);
+        candidates.push(row);
+      }
+    });
 
-    if (internalUpdateData.lastName && internalUpdateData.lastName !== currentContact.lastName) {
-      finalUpdateData.lastName = internalUpdateData.lastName;
-      historyChanges.lastName = { before: currentContact.lastName, after: internalUpdateData.lastName };
-    }
+    const [existingContacts, emailHolders] = await Promise.all([
+      this.contactRepository.findByExternalIds(candidates.map(row => row.contact.externalId)),
+      this.contactRepository.findIdsByOwnerAndEmails(ownerId, candidates.map(row => row.contact.email))
+    ]);
+    const existingByExternalId = new Map(existingContacts.map(contact => [contact.externalId!, contact]));
+    const contactIdByEmail = new Map(emailHolders.map(contact => [contact.email, contact.id]));
+
+    const inserts: IndexedBulkContactRow[] = [];
+    const updates: { row: IndexedBulkContactRow; update: InternalBulkContactUpdateDto }[] = [];
+
+    candidates.forEach(row => {
+      const { contact } = row;
+      const existing = existingByExternalId.get(contact.externalId);
+
+      const emailHolderId = contactIdByEmail.get(contact.email);
+
+      if (existing && existing.ownerId !== ownerId) {
+        fail(row, 'Contact with this external ID already exists', 'externalId');
+      } else if (emailHolderId && emailHolderId !== existing?.id) {
+        fail(row, AppErrorClass.duplicateEmail().message, 'email');
+      } else if (!existing) {
+        inserts.push(row);
+      } else {
+        const update = this.buildBulkUpdate(existing, contact);
+        if (update) {
+          updates.push({ row, update });
+        } else {
+          results.push({ index: row.index, externalId: contact.externalId, status: 'unchanged', id: existing.id });
+        }
+      }
+    });
 
-    if (internalUpdateData.email && internalUpdateData.email !== currentContact.email) {
-      // Validate email format if it's being updated
-      if (!this.isValidEmail(internalUpdateData.email)) {
-        throw AppErrorClass.validationError(
-          'Please enter a valid email address (e.g., john.doe@example.com)', 
-          'email'
+    const maxContacts = parseInt(process.env.MAX_CONTACTS_PER_USER || '50');
+    const chunkSize = parseInt(process.env.BULK_IMPORT_CHUNK_SIZE || '500');
+    const created: ContactDto[] = [];
+    const updated: ContactDto[] = [];
+
+    for (let i = 0; i < inserts.length; i += chunkSize) {
+      const chunk = inserts.slice(i, i + chunkSize);
+      try {
+        // Each chunk claims what is left of the contact limit; rows past it are not inserted
+        const { contacts: inserted, capacity } = await this.contactRepository.createManyWithinLimit(
+          ownerId,
+          chunk.map(row => ({ ...ContactMapper.toInternalCreateDto(row.contact, ownerId), externalId: row.contact.externalId })),
+          maxContacts
         );
+        const insertedByExternalId = new Map(inserted.map(contact => [contact.externalId!, contact]));
+
+        chunk.forEach((row, position) => {
+          if (position >= capacity) {
+            fail(row, AppErrorClass.contactLimitReached(maxContacts).message);
+            return;
+          }
+          const contact = insertedByExternalId.get(row.contact.externalId);
+          if (!contact) {
+            // Lost a race with a concurrent write of the same externalId or email
+            fail(row, 'Contact conflicts with an existing contact');
+            return;
+          }
+          created.push(ContactMapper.toContactDto(contact));
+          results.push({ index: row.index, externalId: row.contact.externalId, status: 'created', id: contact.id });
+        });
+      } catch (error) {
+        console.error('Bulk contact insert failed:', error);
+        chunk.forEach(row => fail(row, 'Failed to create contact'));
       }
-      finalUpdateData.email = internalUpdateData.email;
-      historyChanges.email = { before: currentContact.email, after: internalUpdateData.email };
     }
 
-    if (internalUpdateData.phone && internalUpdateData.phone !== currentContact.phone) {
-      finalUpdateData.phone = internalUpdateData.phone;
-      historyChanges.phone = { before: currentContact.phone, after: internalUpdateData.phone };
+    for (let i = 0; i < updates.length; i += chunkSize) {
+      const chunk = updates.slice(i, i + chunkSize);
+      try {
+        const rowsUpdated = await this.contactRepository.updateManyWithHistory(ownerId, chunk.map(({ update }) => update));
+        const updatedById = new Map(rowsUpdated.map(contact => [contact.id, contact]));
+
+        chunk.forEach(({ row, update }) => {
+          const contact = updatedById.get(update.id);
+          if (!contact) {
+            // Deleted between the lookup and the write
+            fail(row, 'Contact not found');
+            return;
+          }
+          updated.push(ContactMapper.toContactDto(contact));
+          results.push({ index: row.index, externalId: row.contact.externalId, status: 'updated', id: contact.id });
+        });
+      } catch (error) {
+        console.error('Bulk contact update failed:', error);
+        chunk.forEach(({ row }) => fail(row, 'Failed to update contact'));
+      }
     }
 
-    if (Object.keys(finalUpdateData).length === 0) {
-      throw AppErrorClass.validationError('No changes provided');
+    if (created.length > 0 || updated.length > 0) {
+      SSEEventManager.getInstance().emitContactsBulkUpserted(ownerId, created, updated);
     }
 
-    // Check for email conflicts if email is being updated
-    if (finalUpdateData.email) {
-      const exists = await this.contactRepository.existsByEmailAndOwner(finalUpdateData.email, ownerId, id);
-      if (exists) {
-        throw AppErrorClass.duplicateEmail();
-      }
-    }
+    return results.sort((a, b) => a.index - b.index);
+  }
 
-    // Update contact and create history
-    const [updatedContact] = await Promise.all([
-      this.contactRepository.update(id, finalUpdateData),
-      this.contactHistoryRepository.create(historyChanges)
-    ]);
+  async updateContact(id: string, ownerId: string, externalUpdateData: UpdateContactDto): Promise<ContactDto> {
+    return this.applyUpdate({ id }, ownerId, externalUpdateData);
+  }
+
+  async updateContactByExternalId(externalId: string, ownerId: string, externalUpdateData: UpdateContactDto): Promise<ContactDto> {
+    return this.applyUpdate({ externalId }, ownerId, externalUpdateData);
+  }
 
-    const externalContact = ContactMapper.toContactWithOwnerDto(updatedContact);
+  async deleteContact(id: string, ownerId: string): Promise<ContactDto> {
+    const contact = await this.contactRepository.findById(id, ownerId, ['id']);
+    if (!contact) {
+      throw AppErrorClass.validationError('Contact not found');
+    }
+
+    const deletedContact = await this.contactRepository.delete(id);
+    const externalContact = ContactMapper.toContactDto(deletedContact);
     
     // Emit SSE event for real-time updates
     const sseEventManager = SSEEventManager.getInstance();
-    sseEventManager.emitContactUpdated(ownerId, externalContact);
+    sseEventManager.emitContactDeleted(ownerId, id);
     
     return externalContact;
   }
 
-  async updateContactByExternalId(externalId: string, ownerId: string, externalUpdateData: UpdateContactDto): Promise<ContactDto> {
-    // Get current contact by external ID
-    const currentContact = await this.contactRepository.findByExternalIdForUpdate(externalId, ownerId);
-    if (!currentContact) {
+  async deleteContactByExternalId(externalId: string, ownerId: string): Promise<ContactDto> {
+    const contactExists = await this.contactRepository.existsByExternalIdAndOwner(externalId, ownerId);
+    if (!contactExists) {
       throw AppErrorClass.notFound('Contact not found');
     }
 
+    const deletedContact = await this.contactRepository.deleteByExternalId(externalId, ownerId);
+    const externalContact = ContactMapper.toContactDto(deletedContact);
+    
+    // Emit SSE event for real-time updates
+    const sseEventManager = SSEEventManager.getInstance();
+    sseEventManager.emitContactDeleted(ownerId, deletedContact.id);
+    
+    return externalContact;
+  }
+
+  /**
+   * Update a contact and write its history row in one round trip (see ContactRepository.updateWithHistory)
+   */
+  private async applyUpdate(
+    target: { id: string } | { externalId: string },
+    ownerId: string,
+    externalUpdateData: UpdateContactDto
+  ): Promise<ContactDto> {
     // Transform external DTO to internal DTO
     const internalUpdateData = ContactMapper.toInternalUpdateDto(externalUpdateData);
 
-    // Prepare update data and history changes
-    const finalUpdateData: InternalUpdateContactDto = {};
-    const historyChanges: InternalCreateContactHistoryDto = {
-      contactId: currentContact.id
-    };
-
-    if (internalUpdateData.firstName && internalUpdateData.firstName !== currentContact.firstName) {
-      finalUpdateData.firstName = internalUpdateData.firstName;
-      historyChanges.firstName = { before: currentContact.firstName, after: internalUpdateData.firstName };
+    // Validate email format if it's being updated
+    if (internalUpdateData.email && !this.isValidEmail(internalUpdateData.email)) {
+      throw AppErrorClass.validationError(
+        'Please enter a valid email address (e.g., john.doe@example.com)', 
+        'email'
+      );
     }
 
-    if (internalUpdateData.lastName && internalUpdateData.lastName !== currentContact.lastName) {
-      finalUpdateData.lastName = internalUpdateData.lastName;
-      historyChanges.lastName = { before: currentContact.lastName, after: internalUpdateData.lastName };
-    }
-
-    if (internalUpdateData.email && internalUpdateData.email !== currentContact.email) {
-      // Validate email format if it's being updated
-      if (!this.isValidEmail(internalUpdateData.email)) {
-        throw AppErrorClass.validationError(
-          'Please enter a valid email address (e.g., john.doe@example.com)', 
-          'email'
-        );
+    let result;
+    try {
+      result = await this.contactRepository.updateWithHistory(target, ownerId, internalUpdateData);
+    } catch (error) {
+      // (ownerId, email) is unique, so a conflicting email surfaces here rather than in a pre-check
+      if (isUniqueViolation(error)) {
+        throw AppErrorClass.duplicateEmail();
       }
-      finalUpdateData.email = internalUpdateData.email;
-      historyChanges.email = { before: currentContact.email, after: internalUpdateData.email };
+      throw error;
     }
 
-    if (internalUpdateData.phone && internalUpdateData.phone !== currentContact.phone) {
-      finalUpdateData.phone = internalUpdateData.phone;
-      historyChanges.phone = { before: currentContact.phone, after: internalUpdateData.phone };
+    if (result.status === 'not_found') {
+      throw AppErrorClass.notFound('Contact not found');
     }
-
-    if (Object.keys(finalUpdateData).length === 0) {
+    if (result.status === 'unchanged') {
       throw AppErrorClass.validationError('No changes provided');
     }
 
-    // Check for email conflicts if email is being updated
-    if (finalUpdateData.email) {
-      const exists = await this.contactRepository.existsByEmailAndOwner(finalUpdateData.email, ownerId, currentContact.id);
-      if (exists) {
-        throw AppErrorClass.duplicateEmail();
-      }
-    }
-
-    // Update contact and create history
-    const [updatedContact] = await Promise.all([
-      this.contactRepository.updateByExternalId(externalId, ownerId, finalUpdateData),
-      this.contactHistoryRepository.create(historyChanges)
-    ]);
-
-    const externalContact = ContactMapper.toContactWithOwnerDto(updatedContact);
+    const externalContact = ContactMapper.toContactDto(result.contact!);
     
     // Emit SSE event for real-time updates
     const sseEventManager = SSEEventManager.getInstance();
@@ -281,36 +441,31 @@ export class ContactService {
     return externalContact;
   }
 
-  async deleteContact(id: string, ownerId: string): Promise<ContactDto> {
-    const contact = await this.contactRepository.findById(id, ownerId);
-    if (!contact) {
-      throw AppErrorClass.validationError('Contact not found');
-    }
-
-    const deletedContact = await this.contactRepository.delete(id);
-    const externalContact = ContactMapper.toContactWithOwnerDto(deletedContact);
-    
-    // Emit SSE event for real-time updates
-    const sseEventManager = SSEEventManager.getInstance();
-    sseEventManager.emitContactDeleted(ownerId, id);
-    
-    return externalContact;
-  }
+  /**
+   * Full-row update plus history for a bulk row, or null when nothing changed
+   */
+  private buildBulkUpdate(current: InternalContactDto, incoming: BulkContactRowDto): InternalBulkContactUpdateDto | null {
+    const history: InternalCreateContactHistoryDto = { contactId: current.id };
+    (['firstName', 'lastName', 'email', 'phone'] as const).forEach(field => {
+      if (incoming[field] !== current[field]) {
+        history[field] = { before: current[field], after: incoming[field] };
+      }
+    });
 
-  async deleteContactByExternalId(externalId: string, ownerId: string): Promise<ContactDto> {
-    const contactExists = await this.contactRepository.existsByExternalIdAndOwner(externalId, ownerId);
-    if (!contactExists) {
-      throw AppErrorClass.notFound('Contact not found');
+    if (Object.keys(history).length === 1) {
+      return null;
     }
 
-    const deletedContact = await this.contactRepository.deleteByExternalId(externalId, ownerId);
-    const externalContact = ContactMapper.toContactWithOwnerDto(deletedContact);
-    
-    // Emit SSE event for real-time updates
-    const sseEventManager = SSEEventManager.getInstance();
-    sseEventManager.emitContactDeleted(ownerId, deletedContact.id);
-    
-    return externalContact;
+    return {
+      id: current.id,
+      data: {
+        firstName: incoming.firstName,
+        lastName: incoming.lastName,
+        email: incoming.email,
+        phone: incoming.phone
+      },
+      history
+    };
   }
 
   private validateContactData(data: InternalCreateContactDto): ContactValidationResult {
@@ -0,0 +1,201 @@
+import { RedisClient } from '../lib/redis';
+
+// What a quota is keyed by: unauthenticated traffic by IP, sessions by user, integrations by API key
+export type RateLimitScope = 'ip' | 'user' | 'apiKey';
+
+export interface RateLimitResult {
+  allowed: boolean;
+  limit: number;
+  remaining: number;
+  resetMs: number; // until the current window ends
+}
+
+export interface RateLimitStore {
+  consume(key: string, limit: number, windowMs: number): Promise<RateLimitResult>;
+}
+
+export interface RateLimiterOptions {
+  windowMs: number;
+  limits: Record<RateLimitScope, number>;
+}
+
+export interface RateLimiterMetrics {
+  allowed: number;
+  limited: number;
+  fallbacks: number; // decisions made by the in-process store while Redis was unavailable
+  usingFallback: boolean;
+}
+
+/**
+ * Sliding-window counter: the previous fixed window's count, weighted by how much of it still
+ * overlaps the sliding window, plus the current window's count. Shared by both stores so they
+ * agree exactly; `now` is ms since the epoch.
+ */
+export const slidingWindow = (previous: number, current: number, limit: number, windowMs: number, now: number) => {
+  const elapsed = now % windowMs;
+  const estimated = previous * ((windowMs - elapsed) / windowMs) + current;
+  const allowed = estimated + 1 <= limit;
+  return {
+    allowed,
+    limit,
+    remaining: Math.max(0, Math.floor(limit - estimated - (allowed ? 1 : 0))),
+    resetMs: windowMs - elapsed,
+  };
+};
+
+/**
+ * Per-task counters, used when Redis is not configured or unreachable. Each task then enforces
+ * the full quota on its own, so the cluster-wide limit is loose until Redis is back.
+ */
+export class MemoryRateLimitStore implements RateLimitStore {
+  private windows: Map<string, { window: number; previous: number; current: number }> = new Map();
+
+  constructor(private readonly maxKeys: number = 10000) {}
+
+  async consume(key: string, limit: number, windowMs: number, now: number = Date.now()): Promise<RateLimitResult> {
+    const window = Math.floor(now / windowMs);
+    let entry = this.windows.get(key);
+    if (!entry || entry.window < window - 1) {
+      entry = { window, previous: 0, current: 0 };
+    } else if (entry.window === window - 1) {
+      entry = { window, previous: entry.current, current: 0 };
+    }
+
+    const result = slidingWindow(entry.previous, entry.current, limit, windowMs, now);
+    if (result.allowed) {
+      entry.current++;
+    }
+    // Re-insert so the Map stays ordered by last use and the oldest keys are dropped first
+    this.windows.delete(key);
+    this.windows.set(key, entry);
+    while (this.windows.size > this.maxKeys) {
+      this.windows.delete(this.windows.keys().next().value as string);
+    }
+    return result;
+  }
+}
+
+/**
+ * Counters in Redis, shared by every task. One script call per request reads both windows,
+ * decides and increments atomically, using the Redis clock so task clock skew does not matter.
+ */
+export class RedisRateLimitStore implements RateLimitStore {
+  // KEYS[1] key prefix; ARGV limit, windowMs. Returns {allowed, remaining, resetMs}
+  private static readonly CONSUME_SCRIPT = `
+    local time = redis.call('TIME')
+    local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+    local limit = tonumber(ARGV[1])
+    local window_ms = tonumber(ARGV[2])
+    local window = math.floor(now / window_ms)
+    local current_key = KEYS[1] .. ':' .. window
+    local previous = tonumber(redis.call('GET', KEYS[1] .. ':' .. (window - 1)) or '0')
+    local current = tonumber(redis.call('GET', current_key) or '0')
+    local elapsed = now % window_ms
+    local estimated = previous * ((window_ms - elapsed) / window_ms) + current
+    local allowed = 0
+    if estimated + 1 <= limit then
+      allowed = 1
+      redis.call('INCR', current_key)
+      redis.call('PEXPIRE', current_key, window_ms * 2)
+    end
+    return {allowed, math.max(0, math.floor(limit - estimated - allowed)), window_ms - elapsed}
+  `;
+
+  constructor(private readonly redis: RedisClient) {}
+
+  async consume(key: string, limit: number, windowMs: number): Promise<RateLimitResult> {
+    // Both window keys share the {hash tag}, so the script stays valid on a clustered Redis
+    const [allowed, remaining, resetMs] = await this.redis.eval(RedisRateLimitStore.CONSUME_SCRIPT, {
+      keys: [`ratelimit:{${key}}`],
+      arguments: [String(limit), String(windowMs)],
+    }) as number[];
+    return { allowed: allowed === 1, limit, remaining, resetMs };
+  }
+}
+
+/**
+ * Cluster-wide request quotas per IP, session user and API key. Decisions are made in Redis when
+ * attached; if Redis is not ready or a call fails, the in-process store decides instead so an
+ * ElastiCache outage degrades to per-task limits rather than failing requests.
+ */
+export class RateLimiter {
+  private static instance: RateLimiter;
+
+  private readonly options: RateLimiterOptions;
+  private readonly fallback = new MemoryRateLimitStore();
+  private redis: RedisClient | null = null;
+  private redisStore: RedisRateLimitStore | null = null;
+  private usingFallback = false;
+  private metrics = { allowed: 0, limited: 0, fallbacks: 0 };
+
+  constructor(options: Partial<RateLimiterOptions> = {}) {
+    this.options = {
+      windowMs: options.windowMs ?? parseInt(process.env.RATE_LIMIT_WINDOW_MS || String(10 * 60 * 1000)),
+      limits: options.limits ?? {
+        ip: parseInt(process.env.RATE_LIMIT_MAX || '1000'),
+        user: parseInt(process.env.RATE_LIMIT_USER_MAX || '2000'),
+        apiKey: parseInt(process.env.RATE_LIMIT_API_KEY_MAX || '5000'),
+      },
+    };
+  }
+
+  static getInstance(): RateLimiter {
+    if (!RateLimiter.instance) {
+      RateLimiter.instance = new RateLimiter();
+    }
+    return RateLimiter.instance;
+  }
+
+  attachRedis(redis: RedisClient): void {
+    this.redis = redis;
+    this.redisStore = new RedisRateLimitStore(redis);
+  }
+
+  getWindowMs(): number {
+    return this.options.windowMs;
+  }
+
+  /**
+   * Count one request against the scope's quota for `id`
+   */
+  async consume(scope: RateLimitScope, id: string): Promise<RateLimitResult> {
+    const key = `${scope}:${id}`;
+    const limit = this.options.limits[scope];
+    const result = await this.consumeFromStore(key, limit);
+
+    if (result.allowed) {
+      this.metrics.allowed++;
+    } else {
+      this.metrics.limited++;
+    }
+    return result;
+  }
+
+  getMetrics(): RateLimiterMetrics {
+    return { ...this.metrics, usingFallback: this.usingFallback };
+  }
+
+  private async consumeFromStore(key: string, limit: number): Promise<RateLimitResult> {
+    if (this.redis && this.redisStore && this.redis.isReady) {
+      try {
+        const result = await this.redisStore.consume(key, limit, this.options.windowMs);
+        if (this.usingFallback) {
+          console.log('Rate limiter: Redis available again, using shared counters');
+          this.usingFallback = false;
+        }
+        return result;
+      } catch (error) {
+        console.error('Rate limiter: Redis call failed, using per-task counters:', error);
+      }
+    }
+
+    if (this.redis && !this.usingFallback) {
+      console.warn('Rate limiter: Redis unavailable, limits are enforced per task until it returns');
+      this.usingFallback = true;
+    }
+    if (this.redis) {
+      this.metrics.fallbacks++;
+    }
+    return this.fallback.consume(key, limit, this.options.windowMs);
+  }
+}
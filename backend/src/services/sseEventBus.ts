@@ -0,0 +1,125 @@
+import crypto from 'crypto';
+import { RedisClient } from '../lib/redis';
+
+// A single event travelling over the bus. `payload` is the already-serialized
+// SSE message so every task can write it to its clients without re-stringifying.
+export interface SSEBusEvent {
+  userId: string;
+  payload: string;
+  // Per-user event ID from the shared event log; absent if recording the event failed
+  id?: number;
+  // Lets backed-up clients keep only the latest event for the same contact
+  coalesceKey?: string;
+}
+
+interface SSEBusMessage {
+  origin: string;
+  events: SSEBusEvent[];
+}
+
+export interface SSEEventBusOptions {
+  batchWindowMs: number;
+  maxBatchSize: number;
+}
+
+export class SSEEventBus {
+  static readonly CHANNEL = 'sse:events';
+
+  // Identifies this task so it can ignore its own batches (they are delivered locally on emit)
+  private readonly origin = crypto.randomUUID();
+  private readonly options: SSEEventBusOptions;
+  private queue: SSEBusEvent[] = [];
+  private flushTimer: NodeJS.Timeout | null = null;
+  private started = false;
+
+  constructor(
+    private publisher: RedisClient,
+    private subscriber: RedisClient,
+    options: Partial<SSEEventBusOptions> = {}
+  ) {
+    this.options = {
+      batchWindowMs: options.batchWindowMs ?? parseInt(process.env.SSE_BUS_BATCH_MS || '10'),
+      maxBatchSize: options.maxBatchSize ?? parseInt(process.env.SSE_BUS_MAX_BATCH || '100'),
+    };
+  }
+
+  /**
+   * Subscribe to the cluster channel and hand every remote batch to `onEvents`
+   */
+  async start(onEvents: (events: SSEBusEvent[]) => void): Promise<void> {
+    await this.subscriber.subscribe(SSEEventBus.CHANNEL, (message: string) => {
+      let parsed: SSEBusMessage;
+      try {
+        parsed = JSON.parse(message);
+      } catch (error) {
+        console.error('Discarding malformed SSE bus message:', error);
+        return;
+      }
+
+      if (parsed.origin === this.origin || !Array.isArray(parsed.events)) {
+        return;
+      }
+
+      onEvents(parsed.events);
+    });
+    this.started = true;
+  }
+
+  /**
+   * Queue an event for publishing. Events are batched into one Redis PUBLISH per window.
+   */
+  publish(event: SSEBusEvent): void {
+    this.queue.push(event);
+
+    if (this.queue.length >= this.options.maxBatchSize) {
+      void this.flush();
+      return;
+    }
+
+    if (!this.flushTimer) {
+      this.flushTimer = setTimeout(() => {
+        void this.flush();
+      }, this.options.batchWindowMs);
+    }
+  }
+
+  /**
+   * Publish everything queued so far as a single message
+   */
+  async flush(): Promise<void> {
+    if (this.flushTimer) {
+      clearTimeout(this.flushTimer);
+      this.flushTimer = null;
+    }
+
+    if (this.queue.length === 0) {
+      return;
+    }
+
+    const events = this.queue;
+    this.queue = [];
+
+    const message: SSEBusMessage = { origin: this.origin, events };
+    try {
+      await this.publisher.publish(SSEEventBus.CHANNEL, JSON.stringify(message));
+    } catch (error) {
+      // Other tasks miss these events; local clients were already served on emit
+      console.error('Failed to publish SSE events to Redis:', error);
+    }
+  }
+
+  /**
+   * Flush pending events and stop listening
+   */
+  async stop(): Promise<void> {
+    await this.flush();
+    if (this.started) {
+      await this.subscriber.unsubscribe(SSEEventBus.CHANNEL);
+      this.started = false;
+    }
+  }
+
+  getPendingCount(): number {
+    return this.queue.length;
+  }
+}
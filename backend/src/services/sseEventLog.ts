@@ -0,0 +1,132 @@
+import { RedisClient } from '../lib/redis';
+
+export interface SSELoggedEvent {
+  id: number;
+  payload: string;
+}
+
+// What a reconnecting client needs: the events it missed, or a resync when they are gone
+export type SSEReplay =
+  | { resync: false; events: SSELoggedEvent[] }
+  | { resync: true; latestId: number };
+
+export interface SSEEventLogOptions {
+  bufferSize: number;
+  ttlSeconds: number;
+}
+
+/**
+ * Per-user numbered event history used to replay what a client missed while disconnected.
+ * IDs are monotonically increasing per user; only the last `bufferSize` events are kept.
+ */
+export interface SSEEventLog {
+  append(userId: string, payload: string): Promise<number>;
+  since(userId: string, lastEventId: number): Promise<SSEReplay>;
+}
+
+const defaultOptions = (options: Partial<SSEEventLogOptions>): SSEEventLogOptions => ({
+  bufferSize: options.bufferSize ?? parseInt(process.env.SSE_REPLAY_BUFFER_SIZE || '200'),
+  ttlSeconds: options.ttlSeconds ?? parseInt(process.env.SSE_REPLAY_TTL_SECONDS || '3600'),
+});
+
+/**
+ * Replay plan for a client that last saw `lastEventId`, given the retained events (oldest first)
+ * and the newest ID issued. Any gap between the two means events were evicted - resync.
+ */
+export const planReplay = (retained: SSELoggedEvent[], latestId: number, lastEventId: number): SSEReplay => {
+  // An ID from the future means the sequence was reset (e.g. Redis was flushed); the client must resync
+  if (lastEventId > latestId) {
+    return { resync: true, latestId };
+  }
+
+  const missed = retained.filter(event => event.id > lastEventId);
+  const expected = latestId - lastEventId;
+  if (missed.length < expected) {
+    return { resync: true, latestId };
+  }
+  return { resync: false, events: missed };
+};
+
+/**
+ * In-process ring buffer per user, for single-task deployments without Redis
+ */
+export class MemorySSEEventLog implements SSEEventLog {
+  private readonly options: SSEEventLogOptions;
+  private logs: Map<string, { latestId: number; events: SSELoggedEvent[] }> = new Map();
+
+  constructor(options: Partial<SSEEventLogOptions> = {}) {
+    this.options = defaultOptions(options);
+  }
+
+  async append(userId: string, payload: string): Promise<number> {
+    let log = this.logs.get(userId);
+    if (!log) {
+      log = { latestId: 0, events: [] };
+      this.logs.set(userId, log);
+    }
+
+    const id = ++log.latestId;
+    log.events.push({ id, payload });
+    if (log.events.length > this.options.bufferSize) {
+      log.events.shift();
+    }
+    return id;
+  }
+
+  async since(userId: string, lastEventId: number): Promise<SSEReplay> {
+    const log = this.logs.get(userId);
+    return planReplay(log?.events ?? [], log?.latestId ?? 0, lastEventId);
+  }
+}
+
+/**
+ * Per-user sequence and capped list in Redis, shared by every task so a client can
+ * resume on whichever task the load balancer picks
+ */
+export class RedisSSEEventLog implements SSEEventLog {
+  // INCR the sequence, push "<id> <payload>", trim to the buffer size and refresh the list TTL atomically.
+  // The sequence never expires: restarting it at 1 would make connected clients drop every later
+  // event as already sent. Once the list expires, reconnecting clients are asked to resync.
+  private static readonly APPEND_SCRIPT = `
+    local id = redis.call('INCR', KEYS[1])
+    redis.call('RPUSH', KEYS[2], id .. ' ' .. ARGV[1])
+    redis.call('LTRIM', KEYS[2], -tonumber(ARGV[2]), -1)
+    redis.call('EXPIRE', KEYS[2], ARGV[3])
+    return id
+  `;
+
+  private readonly options: SSEEventLogOptions;
+
+  constructor(private readonly redis: RedisClient, options: Partial<SSEEventLogOptions> = {}) {
+    this.options = defaultOptions(options);
+  }
+
+  async append(userId: string, payload: string): Promise<number> {
+    const id = await this.redis.eval(RedisSSEEventLog.APPEND_SCRIPT, {
+      keys: [this.sequenceKey(userId), this.eventsKey(userId)],
+      arguments: [payload, String(this.options.bufferSize), String(this.options.ttlSeconds)],
+    });
+    return Number(id);
+  }
+
+  async since(userId: string, lastEventId: number): Promise<SSEReplay> {
+    const [latest, entries] = await Promise.all([
+      this.redis.get(this.sequenceKey(userId)),
+      this.redis.lRange(this.eventsKey(userId), 0, -1),
+    ]);
+
+    const retained = entries.map(entry => {
+      const separator = entry.indexOf(' ');
+      return { id: Number(entry.slice(0, separator)), payload: entry.slice(separator + 1) };
+    });
+    return planReplay(retained, Number(latest ?? 0), lastEventId);
+  }
+
+  private sequenceKey(userId: string): string {
+    return `sse:seq:${userId}`;
+  }
+
+  private eventsKey(userId: string): string {
+    return `sse:log:${userId}`;
+  }
+}
@@ -1,15 +1,71 @@
 import { Response } from 'express';
+import { AppErrorClass } from '../utils/errors';
+import { ContactListCache } from './contactListCache';
+import { SSEBusEvent, SSEEventBus } from './sseEventBus';
+import { MemorySSEEventLog, SSEEventLog } from './sseEventLog';
+
+interface SSEFrame {
+  id?: number;
+  payload: string;
+  // Frames with the same key supersede each other while a client is backed up
+  coalesceKey?: string;
+}
 
 interface SSEClient {
   userId: string;
   response: Response;
+  // While a reconnecting client is being replayed, live events wait here so they follow the replay
+  pending: SSEFrame[] | null;
+  // Set when the socket buffer is full; frames queue in `backlog` until 'drain'
+  blocked: boolean;
+  backlog: Map<string, { frame: string; bytes: number }>;
+  backlogBytes: number;
+  nextBacklogKey: number;
+}
+
+export interface SSEEventManagerOptions {
+  heartbeatMs: number;
+  maxBufferedBytes: number;
+  maxConnectionsPerUser: number;
+  maxConnections: number;
+  retryAfterSeconds: number;
+}
+
+export interface SSEMetrics {
+  clients: number;
+  users: number;
+  blockedClients: number;
+  bufferedBytes: number;
+  coalesced: number;
+  evicted: number;
+  displaced: number;
+  rejected: number;
 }
 
 export class SSEEventManager {
   private static instance: SSEEventManager;
   private clients: Map<string, SSEClient[]> = new Map();
+  private clientCount = 0;
+  private bus: SSEEventBus | null = null;
+  private eventLog: SSEEventLog = new MemorySSEEventLog();
+  private heartbeatTimer: NodeJS.Timeout | null = null;
+  private readonly options: SSEEventManagerOptions;
+  private metrics = {
+    coalesced: 0,
+    evicted: 0,
+    displaced: 0,
+    rejected: 0,
+  };
 
-  private constructor() {}
+  constructor(options: Partial<SSEEventManagerOptions> = {}) {
+    this.options = {
+      heartbeatMs: options.heartbeatMs ?? parseInt(process.env.SSE_HEARTBEAT_MS || '15000'),
+      maxBufferedBytes: options.maxBufferedBytes ?? parseInt(process.env.SSE_MAX_BUFFERED_BYTES || '262144'),
+      maxConnectionsPerUser: options.maxConnectionsPerUser ?? parseInt(process.env.SSE_MAX_CONNECTIONS_PER_USER || '5'),
+      maxConnections: options.maxConnections ?? parseInt(process.env.SSE_MAX_CONNECTIONS || '2000'),
+      retryAfterSeconds: options.retryAfterSeconds ?? parseInt(process.env.SSE_RETRY_AFTER_SECONDS || '5'),
+    };
+  }
 
   static getInstance(): SSEEventManager {
     if (!SSEEventManager.instance) {
@@ -18,7 +74,55 @@ export class SSEEventManager {
     return SSEEventManager.instance;
   }
 
-  addClient(userId: string, response: Response): void {
+  /**
+   * Fan events out to every task through a shared bus. Without a bus, events only
+   * reach clients connected to this process.
+   */
+  async attachBus(bus: SSEEventBus): Promise<void> {
+    await bus.start((events: SSEBusEvent[]) => {
+      events.forEach(event => {
+        // Writes on other tasks invalidate this task's cached contact lists too
+        ContactListCache.getInstance().bumpVersion(event.userId);
+        this.deliverLocal(event.userId, { id: event.id, payload: event.payload, coalesceKey: event.coalesceKey });
+      });
+    });
+    this.bus = bus;
+  }
+
+  async detachBus(): Promise<void> {
+    if (this.bus) {
+      const bus = this.bus;
+      this.bus = null;
+      await bus.stop();
+    }
+  }
+
+  /**
+   * Replace the event history used for IDs and reconnect replay. With more than one task
+   * this must be shared (Redis) so IDs stay consistent whichever task a client lands on.
+   */
+  useEventLog(eventLog: SSEEventLog): void {
+    this.eventLog = eventLog;
+  }
+
+  /**
+   * Register an SSE stream. Returns false (after answering 503) when this task is at its connection cap.
+   */
+  addClient(userId: string, response: Response, lastEventId?: number): boolean {
+    // A full task turns new streams away so the client retries, possibly on another task
+    if (this.clientCount >= this.options.maxConnections) {
+      this.metrics.rejected++;
+      response.appError(AppErrorClass.overloaded(this.options.retryAfterSeconds));
+      return false;
+    }
+
+    // Past the per-user cap the oldest stream goes - usually a forgotten tab
+    const existing = this.clients.get(userId) ?? [];
+    while (existing.length > 0 && existing.length >= this.options.maxConnectionsPerUser) {
+      this.metrics.displaced++;
+      this.disconnect(existing[0]);
+    }
+
     // Set SSE headers
     response.writeHead(200, {
       'Content-Type': 'text/event-stream',
@@ -32,10 +136,21 @@ export class SSEEventManager {
     response.write(`data: ${JSON.stringify({ type: 'connected', message: 'SSE connection established' })}\n\n`);
 
     // Store client
+    const client: SSEClient = {
+      userId,
+      response,
+      pending: lastEventId !== undefined ? [] : null,
+      blocked: false,
+      backlog: new Map(),
+      backlogBytes: 0,
+      nextBacklogKey: 0,
+    };
     if (!this.clients.has(userId)) {
       this.clients.set(userId, []);
     }
-    this.clients.get(userId)!.push({ userId, response });
+    this.clients.get(userId)!.push(client);
+    this.clientCount++;
+    this.startHeartbeat();
 
     // Handle client disconnect
     response.on('close', () => {
@@ -45,6 +160,11 @@ export class SSEEventManager {
     response.on('error', () => {
       this.removeClient(userId, response);
     });
+
+    if (lastEventId !== undefined) {
+      void this.replay(client, lastEventId);
+    }
+    return true;
   }
 
   removeClient(userId: string, response: Response): void {
@@ -52,26 +172,201 @@ export class SSEEventManager {
     if (userClients) {
       const index = userClients.findIndex(client => client.response === response);
       if (index > -1) {
-        userClients.splice(index, 1);
+        const [client] = userClients.splice(index, 1);
+        // Release anything still queued for this client
+        client.backlog.clear();
+        client.backlogBytes = 0;
+        this.clientCount--;
         if (userClients.length === 0) {
           this.clients.delete(userId);
         }
       }
     }
+
+    if (this.clients.size === 0) {
+      this.stopHeartbeat();
+    }
   }
 
   emitToUser(userId: string, eventType: string, data: any): void {
-    const userClients = this.clients.get(userId);
-    if (userClients) {
-      const message = JSON.stringify({ type: eventType, data });
+    // Serialize once; the same payload is written locally and shipped to other tasks
+    const payload = JSON.stringify({ type: eventType, data });
+    // Every event reports a change to the user's contacts, so cached lists are now stale
+    ContactListCache.getInstance().bumpVersion(userId);
+    // Only the latest update of a contact matters to a client that has fallen behind
+    const coalesceKey = eventType === 'contact:updated' && data?.id ? `contact:${data.id}` : undefined;
+
+    // Appends resolve in call order (one Redis connection pipelines them), so IDs go out in order
+    this.eventLog.append(userId, payload).then(
+      id => {
+        this.deliverLocal(userId, { id, payload, coalesceKey });
+        this.bus?.publish({ userId, payload, id, coalesceKey });
+      },
+      error => {
+        // Still deliver live; only replay for this event is lost
+        console.error('Failed to record SSE event:', error);
+        this.deliverLocal(userId, { payload, coalesceKey });
+        this.bus?.publish({ userId, payload, coalesceKey });
+      }
+    );
+  }
+
+  getMetrics(): SSEMetrics {
+    let blockedClients = 0;
+    let bufferedBytes = 0;
+    this.clients.forEach(userClients => {
       userClients.forEach(client => {
-        try {
-          client.response.write(`data: ${message}\n\n`);
-        } catch (error) {
-          // Remove disconnected client
-          this.removeClient(userId, client.response);
+        if (client.blocked) {
+          blockedClients++;
         }
+        bufferedBytes += this.bufferedBytes(client);
+      });
+    });
+
+    return {
+      clients: this.clientCount,
+      users: this.clients.size,
+      blockedClients,
+      bufferedBytes,
+      ...this.metrics,
+    };
+  }
+
+  /**
+   * Send a reconnecting client what it missed since `lastEventId`, or a single `resync`
+   * event when that history is no longer retained, then release any live events held meanwhile
+   */
+  private async replay(client: SSEClient, lastEventId: number): Promise<void> {
+    // Held live events the client already has: seen before it disconnected, replayed, or covered by a resync.
+    // Only held events are checked; once replay ends, live events are never dropped by ID, since
+    // events from other tasks arrive through the batched bus out of ID order.
+    let covered = (id: number) => id <= lastEventId;
+    try {
+      const replay = await this.eventLog.since(client.userId, lastEventId);
+      if (replay.resync) {
+        const payload = JSON.stringify({ type: 'resync', data: { latestId: replay.latestId } });
+        this.write(client, { id: replay.latestId, payload });
+        covered = id => id <= replay.latestId;
+      } else {
+        const replayed = new Set(replay.events.map(event => event.id));
+        replay.events.forEach(event => this.write(client, event));
+        covered = id => id <= lastEventId || replayed.has(id);
+      }
+    } catch (error) {
+      console.error('Failed to replay SSE events:', error);
+      this.write(client, { payload: JSON.stringify({ type: 'resync', data: {} }) });
+    }
+
+    const held = client.pending ?? [];
+    client.pending = null;
+    held
+      .filter(event => event.id === undefined || !covered(event.id))
+      .forEach(event => this.write(client, event));
+  }
+
+  private deliverLocal(userId: string, event: SSEFrame): void {
+    const userClients = this.clients.get(userId);
+    if (!userClients) {
+      return;
+    }
+
+    // Iterate over a copy since removeClient mutates the array
+    [...userClients].forEach(client => {
+      if (client.pending) {
+        client.pending.push(event);
+      } else {
+        this.write(client, event);
+      }
+    });
+  }
+
+  private write(client: SSEClient, event: SSEFrame): void {
+    const frame = event.id !== undefined ? `id: ${event.id}\ndata: ${event.payload}\n\n` : `data: ${event.payload}\n\n`;
+    if (client.blocked) {
+      this.enqueue(client, frame, event.coalesceKey);
+    } else {
+      this.send(client, frame);
+    }
+
+    if (this.bufferedBytes(client) > this.options.maxBufferedBytes) {
+      // Too far behind to catch up; it will reconnect and replay from its last event ID
+      this.metrics.evicted++;
+      this.disconnect(client);
+    }
+  }
+
+  /**
+   * Write straight to the socket; once it reports backpressure, hold further frames until 'drain'
+   */
+  private send(client: SSEClient, frame: string): void {
+    try {
+      if (!client.response.write(frame)) {
+        client.blocked = true;
+        client.response.once('drain', () => this.flushBacklog(client));
+      }
+    } catch (error) {
+      // Remove disconnected client
+      this.removeClient(client.userId, client.response);
+    }
+  }
+
+  private enqueue(client: SSEClient, frame: string, coalesceKey?: string): void {
+    const key = coalesceKey ?? `#${client.nextBacklogKey++}`;
+    const superseded = client.backlog.get(key);
+    if (superseded) {
+      // Re-insert at the end so the newer frame keeps its place after everything queued before it
+      client.backlog.delete(key);
+      client.backlogBytes -= superseded.bytes;
+      this.metrics.coalesced++;
+    }
+
+    const bytes = Buffer.byteLength(frame);
+    client.backlog.set(key, { frame, bytes });
+    client.backlogBytes += bytes;
+  }
+
+  private flushBacklog(client: SSEClient): void {
+    client.blocked = false;
+    for (const [key, entry] of client.backlog) {
+      client.backlog.delete(key);
+      client.backlogBytes -= entry.bytes;
+      this.send(client, entry.frame);
+      if (client.blocked) {
+        return;
+      }
+    }
+  }
+
+  private bufferedBytes(client: SSEClient): number {
+    return (client.response.writableLength ?? 0) + client.backlogBytes;
+  }
+
+  private disconnect(client: SSEClient): void {
+    this.removeClient(client.userId, client.response);
+    client.response.destroy();
+  }
+
+  /**
+   * Comment lines keep idle streams under the load balancer's idle timeout; EventSource ignores them
+   */
+  private startHeartbeat(): void {
+    if (this.heartbeatTimer || this.options.heartbeatMs <= 0) {
+      return;
+    }
+
+    this.heartbeatTimer = setInterval(() => {
+      this.clients.forEach(userClients => {
+        // Backed-up clients are not idle, and the comment would only add to their buffer
+        [...userClients].filter(client => !client.blocked).forEach(client => this.send(client, ': heartbeat\n\n'));
       });
+    }, this.options.heartbeatMs);
+    this.heartbeatTimer.unref();
+  }
+
+  private stopHeartbeat(): void {
+    if (this.heartbeatTimer) {
+      clearInterval(this.heartbeatTimer);
+      this.heartbeatTimer = null;
     }
   }
 
@@ -87,6 +382,13 @@ export class SSEEventManager {
     this.emitToUser(userId, 'contact:deleted', { id: contactId });
   }
 
+  /**
+   * One event for a whole bulk import instead of one per contact
+   */
+  emitContactsBulkUpserted(userId: string, created: any[], updated: any[]): void {
+    this.emitToUser(userId, 'contacts:bulk', { created, updated });
+  }
+
   getConnectedUsers(): string[] {
     return Array.from(this.clients.keys());
   }
@@ -30,6 +30,8 @@ export enum ErrorType {
   TIMEOUT_ERROR = 'TIMEOUT_ERROR',
   UNAUTHORIZED = 'UNAUTHORIZED',
   NOT_FOUND = 'NOT_FOUND',
+  SERVICE_UNAVAILABLE = 'SERVICE_UNAVAILABLE',
+  RATE_LIMITED = 'RATE_LIMITED',
   INTERNAL_ERROR = 'INTERNAL_ERROR'
 }
 
@@ -38,4 +40,5 @@ export interface AppError {
   message: string;
   field?: string;
   code?: string;
+  retryAfter?: number; // Seconds, sent as Retry-After
 }
@@ -0,0 +1,83 @@
+import { Request, Response } from 'express';
+import { Readable, Transform } from 'stream';
+import { pipeline } from 'stream/promises';
+import zlib from 'zlib';
+import { ContactExportDto, ContactExportFormat } from '../dtos/external/contact.dto';
+
+// Column order of CSV exports; history (when included) is a JSON array in the last column
+const CSV_COLUMNS = ['id', 'externalId', 'firstName', 'lastName', 'email', 'phone', 'createdAt', 'updatedAt'] as const;
+
+const CONTENT_TYPES: Record<ContactExportFormat, string> = {
+  csv: 'text/csv; charset=utf-8',
+  ndjson: 'application/x-ndjson',
+};
+
+/**
+ * Quote a CSV field when it contains a delimiter, quote or line break (RFC 4180)
+ */
+export const csvField = (value: unknown): string => {
+  if (value === null || value === undefined) {
+    return '';
+  }
+
+  const text = typeof value === 'string' ? value : JSON.stringify(value);
+  return /[",\r\n]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+};
+
+/**
+ * Object-mode transform turning export rows into CSV (with a header row) or NDJSON lines
+ */
+export const createExportFormatter = (format: ContactExportFormat, includeHistory: boolean): Transform => {
+  const formatter = new Transform({
+    writableObjectMode: true,
+    transform(row: ContactExportDto, _encoding, callback) {
+      if (format === 'ndjson') {
+        callback(null, `${JSON.stringify(row)}\n`);
+        return;
+      }
+
+      const columns: unknown[] = CSV_COLUMNS.map(column => row[column]);
+      if (includeHistory) {
+        columns.push(row.history);
+      }
+      callback(null, `${columns.map(csvField).join(',')}\r\n`);
+    },
+  });
+
+  if (format === 'csv') {
+    formatter.push(`${[...CSV_COLUMNS, ...(includeHistory ? ['history'] : [])].join(',')}\r\n`);
+  }
+  return formatter;
+};
+
+/**
+ * Stream export rows to the response, gzip-compressed when the client accepts it.
+ * pipeline() propagates backpressure from the socket back to the row source and tears
+ * everything down if the client disconnects.
+ */
+export const streamContactExport = async (
+  req: Request,
+  res: Response,
+  rows: AsyncIterable<ContactExportDto>,
+  format: ContactExportFormat,
+  includeHistory: boolean
+): Promise<void> => {
+  const gzip = Boolean(req.acceptsEncodings('gzip'));
+
+  res.status(200);
+  res.setHeader('Content-Type', CONTENT_TYPES[format]);
+  res.setHeader('Content-Disposition', `attachment; filename="contacts.${format}${gzip ? '.gz' : ''}"`);
+  res.setHeader('Cache-Control', 'no-store');
+  res.setHeader('Vary', 'Accept-Encoding');
+  if (gzip) {
+    // Also stops the global compression middleware from compressing a second time
+    res.setHeader('Content-Encoding', 'gzip');
+  }
+
+  const formatter = createExportFormatter(format, includeHistory);
+  if (gzip) {
+    await pipeline(Readable.from(rows), formatter, zlib.createGzip(), res);
+  } else {
+    await pipeline(Readable.from(rows), formatter, res);
+  }
+};
@@ -4,6 +4,7 @@ export class AppErrorClass extends Error {
   public type: ErrorType;
   public field?: string;
   public code?: string;
+  public retryAfter?: number;
 
   constructor(error: AppError) {
     super(error.message);
@@ -11,6 +12,7 @@ export class AppErrorClass extends Error {
     this.type = error.type;
     this.field = error.field;
     this.code = error.code;
+    this.retryAfter = error.retryAfter;
   }
 
   static userLimitReached(maxUsers: number = 50): AppErrorClass {
@@ -56,4 +58,20 @@ export class AppErrorClass extends Error {
       message
     });
   }
+
+  static rateLimited(retryAfter: number): AppErrorClass {
+    return new AppErrorClass({
+      type: ErrorType.RATE_LIMITED,
+      message: 'Too many requests, please try again later.',
+      retryAfter
+    });
+  }
+
+  static overloaded(retryAfter: number = 1): AppErrorClass {
+    return new AppErrorClass({
+      type: ErrorType.SERVICE_UNAVAILABLE,
+      message: 'Server is busy, please retry shortly',
+      retryAfter
+    });
+  }
 }
@@ -0,0 +1,32 @@
+// Newline-delimited JSON (application/x-ndjson) parsing
+
+export const NDJSON_CONTENT_TYPES = ['application/x-ndjson', 'application/ndjson'];
+
+/**
+ * A line that could not be parsed; kept in place so row numbers stay aligned
+ */
+export class NdjsonLineError {
+  constructor(public readonly line: number, public readonly message: string) {}
+}
+
+/**
+ * Parse one JSON value per non-blank line
+ */
+export const parseNdjson = (text: string): Array<unknown | NdjsonLineError> => {
+  const values: Array<unknown | NdjsonLineError> = [];
+
+  text.split('\n').forEach((raw, i) => {
+    const line = raw.trim();
+    if (!line) {
+      return;
+    }
+
+    try {
+      values.push(JSON.parse(line));
+    } catch {
+      values.push(new NdjsonLineError(i + 1, `Invalid JSON on line ${i + 1}`));
+    }
+  });
+
+  return values;
+};
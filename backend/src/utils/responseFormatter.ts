@@ -1,3 +1,4 @@
+import { JsonSchema, Serializer, compileSerializer } from '../lib/jsonSerializer';
 import { ErrorType } from '../types';
 
 export interface ApiResponse<T = any> {
@@ -30,7 +31,92 @@ export interface PaginatedApiResponse<T = any> {
   }>;
 }
 
+export interface CursorPaginatedApiResponse<T = any> {
+  status: number;
+  data: {
+    items: T[];
+    pagination: {
+      pageSize: number;
+      nextCursor: string | null;
+      hasMore: boolean;
+      total?: number;
+    };
+  } | null;
+  errors: Array<{
+    type?: ErrorType;
+    message: string;
+    field?: string;
+    code?: string;
+  }>;
+}
+
+// Writes a whole response envelope; see ResponseFormatter.compile*Serializer
+export type ResponseSerializer = Serializer<ApiResponse<any>>;
+
+const ERRORS_SCHEMA: JsonSchema = {
+  type: 'array',
+  items: {
+    type: 'object',
+    properties: {
+      type: { type: 'string' },
+      message: { type: 'string' },
+      field: { type: 'string' },
+      code: { type: 'string' },
+    },
+  },
+};
+
+const PAGINATION_SCHEMA: JsonSchema = {
+  type: 'object',
+  properties: {
+    page: { type: 'integer' },
+    pageSize: { type: 'integer' },
+    total: { type: 'integer' },
+    totalPages: { type: 'integer' },
+  },
+};
+
+const CURSOR_PAGINATION_SCHEMA: JsonSchema = {
+  type: 'object',
+  properties: {
+    pageSize: { type: 'integer' },
+    nextCursor: { type: 'string' },
+    hasMore: { type: 'boolean' },
+    total: { type: 'integer' },
+  },
+};
+
 export class ResponseFormatter {
+  /**
+   * Serializer for success() responses whose data has the given shape
+   */
+  static compileSerializer(data: JsonSchema): ResponseSerializer {
+    return compileSerializer({
+      type: 'object',
+      properties: { status: { type: 'integer' }, data, errors: ERRORS_SCHEMA },
+    });
+  }
+
+  /**
+   * Serializer for paginated() responses of items with the given shape
+   */
+  static compilePaginatedSerializer(item: JsonSchema): ResponseSerializer {
+    return ResponseFormatter.compileSerializer({
+      type: 'object',
+      properties: { items: { type: 'array', items: item }, pagination: PAGINATION_SCHEMA },
+    });
+  }
+
+  /**
+   * Serializer for cursorPaginated() responses of items with the given shape
+   */
+  static compileCursorPaginatedSerializer(item: JsonSchema): ResponseSerializer {
+    return ResponseFormatter.compileSerializer({
+      type: 'object',
+      properties: { items: { type: 'array', items: item }, pagination: CURSOR_PAGINATION_SCHEMA },
+    });
+  }
+
   static success<T>(data: T, status: number = 200): ApiResponse<T> {
     return {
       status,
@@ -91,6 +177,7 @@ export class ResponseFormatter {
     switch (type) {
       case ErrorType.USER_LIMIT_REACHED:
       case ErrorType.CONTACT_LIMIT_REACHED:
+      case ErrorType.RATE_LIMITED:
         return 429; // Too Many Requests
       case ErrorType.DUPLICATE_EMAIL:
         return 409; // Conflict
@@ -102,6 +189,8 @@ export class ResponseFormatter {
         return 404; // Not Found
       case ErrorType.TIMEOUT_ERROR:
         return 408; // Request Timeout
+      case ErrorType.SERVICE_UNAVAILABLE:
+        return 503; // Service Unavailable
       default:
         return 500; // Internal Server Error
     }
@@ -126,4 +215,24 @@ export class ResponseFormatter {
       errors: []
     };
   }
+
+  static cursorPaginated<T>(
+    items: T[],
+    pagination: {
+      pageSize: number;
+      nextCursor: string | null;
+      hasMore: boolean;
+      total?: number;
+    },
+    status: number = 200
+  ): CursorPaginatedApiResponse<T> {
+    return {
+      status,
+      data: {
+        items,
+        pagination
+      },
+      errors: []
+    };
+  }
 }
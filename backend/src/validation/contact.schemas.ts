@@ -1,4 +1,16 @@
 import Joi from 'joi';
+import { CONTACT_EXPORT_FORMATS, CONTACT_FIELDS } from '../dtos/external/contact.dto';
+import { fieldListPattern } from '../dtos/shared/fields.dto';
+
+const fieldsSchema = Joi.string().optional().pattern(fieldListPattern(CONTACT_FIELDS)).messages({
+  'string.pattern.base': `Fields must be a comma-separated list of: ${CONTACT_FIELDS.join(', ')}`
+});
+
+// Search reads the contact row alone, so the owner join is not offered there
+const SEARCH_FIELDS = CONTACT_FIELDS.filter(field => field !== 'owner');
+const searchFieldsSchema = Joi.string().optional().pattern(fieldListPattern(SEARCH_FIELDS)).messages({
+  'string.pattern.base': `Fields must be a comma-separated list of: ${SEARCH_FIELDS.join(', ')}`
+});
 
 export const contactSchemas = {
   getContacts: {
@@ -14,17 +26,60 @@ export const contactSchemas = {
         'number.min': 'Page size must be at least 1',
         'number.max': 'Page size must be at most 100'
       }),
+      cursor: Joi.string().optional().allow('').max(1000).messages({
+        'string.max': 'Cursor must be less than 1000 characters'
+      }),
+      includeTotal: Joi.boolean().optional().messages({
+        'boolean.base': 'includeTotal must be true or false'
+      }),
       filter: Joi.string().optional().allow('').max(100).messages({
         'string.max': 'Filter must be less than 100 characters'
+      }),
+      fields: fieldsSchema
+    })
+  },
+  exportContacts: {
+    query: Joi.object({
+      format: Joi.string().valid(...CONTACT_EXPORT_FORMATS).optional().messages({
+        'any.only': `Format must be one of: ${CONTACT_EXPORT_FORMATS.join(', ')}`
+      }),
+      includeHistory: Joi.boolean().optional().messages({
+        'boolean.base': 'includeHistory must be true or false'
       })
     })
   },
+  searchContacts: {
+    query: Joi.object({
+      q: Joi.string().trim().min(1).max(100).required().messages({
+        'string.empty': 'Search query is required',
+        'string.min': 'Search query is required',
+        'string.max': 'Search query must be less than 100 characters',
+        'any.required': 'Search query is required'
+      }),
+      pageSize: Joi.number().integer().min(1).max(100).default(20).messages({
+        'number.base': 'Page size must be a number',
+        'number.integer': 'Page size must be an integer',
+        'number.min': 'Page size must be at least 1',
+        'number.max': 'Page size must be at most 100'
+      }),
+      cursor: Joi.string().optional().allow('').max(1000).messages({
+        'string.max': 'Cursor must be less than 1000 characters'
+      }),
+      includeTotal: Joi.boolean().optional().messages({
+        'boolean.base': 'includeTotal must be true or false'
+      }),
+      fields: searchFieldsSchema
+    })
+  },
   getContact: {
     params: Joi.object({
       id: Joi.string().uuid().required().messages({
         'string.guid': 'Contact ID must be a valid UUID',
         'any.required': 'Contact ID is required'
       })
+    }),
+    query: Joi.object({
+      fields: fieldsSchema
     })
   },
   createContact: {
@@ -20,6 +20,12 @@ export const contactHistorySchemas = {
         'number.min': 'Page size must be at least 1',
         'number.max': 'Page size must be at most 100'
       }),
+      cursor: Joi.string().optional().allow('').max(1000).messages({
+        'string.max': 'Cursor must be less than 1000 characters'
+      }),
+      includeTotal: Joi.boolean().optional().messages({
+        'boolean.base': 'includeTotal must be true or false'
+      }),
       order: Joi.string().valid('asc', 'desc').default('desc').messages({
         'string.valid': 'Order must be either "asc" or "desc"'
       })
@@ -1,6 +1,19 @@
 import Joi from 'joi';
+import { CONTACT_EXPORT_FORMATS, CONTACT_FIELDS } from '../dtos/external/contact.dto';
+import { fieldListPattern } from '../dtos/shared/fields.dto';
 
 export const externalContactSchemas = {
+  exportContacts: {
+    query: Joi.object({
+      format: Joi.string().valid(...CONTACT_EXPORT_FORMATS).optional().messages({
+        'any.only': `Format must be one of: ${CONTACT_EXPORT_FORMATS.join(', ')}`
+      }),
+      includeHistory: Joi.boolean().optional().messages({
+        'boolean.base': 'includeHistory must be true or false'
+      })
+    })
+  },
+
   getContactByExternalId: {
     params: Joi.object({
       externalId: Joi.string().min(1).max(100).required().messages({
@@ -8,6 +21,11 @@ export const externalContactSchemas = {
         'string.max': 'External ID must be less than 100 characters',
         'any.required': 'External ID is required'
       })
+    }),
+    query: Joi.object({
+      fields: Joi.string().optional().pattern(fieldListPattern(CONTACT_FIELDS)).messages({
+        'string.pattern.base': `Fields must be a comma-separated list of: ${CONTACT_FIELDS.join(', ')}`
+      })
     })
   },
 
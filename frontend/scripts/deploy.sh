@@ -0,0 +1,48 @@
+#!/bin/bash
+# Upload the static export (out/) with per-object Cache-Control and invalidate only the HTML.
+#
+#   ./scripts/deploy.sh <bucket-name> <cloudfront-distribution-id>
+#
+# - /_next/static/* is content-hashed: cached for a year as immutable, and never deleted here so
+#   browsers still holding the previous HTML can load its assets
+# - HTML is revalidated by browsers and cached at the edge for at most a minute
+# - everything else (favicon, public/ files) gets an hour
+set -e
+
+BUCKET_NAME="$1"
+DISTRIBUTION_ID="$2"
+OUT_DIR="${OUT_DIR:-out}"
+
+if [ -z "$BUCKET_NAME" ] || [ -z "$DISTRIBUTION_ID" ]; then
+    echo "Usage: $0 <bucket-name> <cloudfront-distribution-id>"
+    exit 1
+fi
+
+cd "$(dirname "$0")/.."
+
+echo "📦 Uploading hashed assets..."
+aws s3 sync "$OUT_DIR/_next/static" "s3://$BUCKET_NAME/_next/static" \
+    --cache-control "public, max-age=31536000, immutable"
+
+echo "📦 Uploading other static files..."
+aws s3 sync "$OUT_DIR" "s3://$BUCKET_NAME" \
+    --exclude "_next/static/*" --exclude "*.html" \
+    --cache-control "public, max-age=3600"
+
+echo "📄 Uploading HTML..."
+aws s3 sync "$OUT_DIR" "s3://$BUCKET_NAME" \
+    --exclude "*" --include "*.html" \
+    --cache-control "public, max-age=0, s-maxage=60, must-revalidate" \
+    --content-type "text/html; charset=utf-8"
+
+echo "🧹 Removing files no longer in the build (hashed assets are kept)..."
+aws s3 sync "$OUT_DIR" "s3://$BUCKET_NAME" --delete --exclude "_next/static/*"
+
+# The edge caches pages under their .html key (the viewer-request function rewrites clean URLs),
+# so one path per exported page covers every URL that maps to it
+INVALIDATION_PATHS=$(cd "$OUT_DIR" && find . -name '*.html' | sed -e 's|^\.||' -e 's|\[|%5B|g' -e 's|\]|%5D|g' | sort)
+echo "🔄 Invalidating $(echo "$INVALIDATION_PATHS" | wc -l | tr -d ' ') HTML paths..."
+# shellcheck disable=SC2086
+aws cloudfront create-invalidation --distribution-id "$DISTRIBUTION_ID" --paths "/" $INVALIDATION_PATHS > /dev/null
+
+echo "✅ Frontend deployed"
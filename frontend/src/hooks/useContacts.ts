@@ -17,28 +17,24 @@ export const useContacts = (filter?: string) => {
     refetch
   } = useInfiniteQuery(
     ['contacts', filter],
-    ({ pageParam = 1 }) => contactService.getContacts(pageParam, 20, filter),
+    ({ pageParam }) => contactService.getContactsByCursor(pageParam, 20, filter),
     {
-      getNextPageParam: (lastPage) => {
-        if (lastPage.data.pagination.page < lastPage.data.pagination.totalPages) {
-          return lastPage.data.pagination.page + 1;
-        }
-        return undefined;
-      },
+      // Keyset pagination: each page seeks past the previous one instead of re-scanning it
+      getNextPageParam: (lastPage) => lastPage.data.pagination.nextCursor ?? undefined,
     }
   );
 
-  // Get total count of all contacts (unfiltered) for display purposes
+  // Total count of all contacts (unfiltered) for display purposes
   const { data: totalCountData } = useQuery(
     ['contacts', 'total'],
-    () => contactService.getContacts(1, 1), // Just get first page to get total count
+    () => contactService.getContactCount(),
     {
       staleTime: 5 * 60 * 1000, // 5 minutes
       cacheTime: 10 * 60 * 1000, // 10 minutes
     }
   );
 
-  const totalAllContacts = totalCountData?.data?.pagination?.total || 0;
+  const totalAllContacts = totalCountData?.data?.count || 0;
 
   const createContactMutation = useMutation(
     (contactData: CreateContactRequest) => contactService.createContact(contactData),
@@ -86,6 +82,12 @@ export const useContacts = (filter?: string) => {
             if (!oldData) return oldData;
             
             const newContact = event.data;
+            // A replayed event may describe a contact the list already holds
+            const alreadyListed = oldData.pages.some((page: any) =>
+              page.data.items.some((contact: Contact) => contact.id === newContact.id)
+            );
+            if (alreadyListed) return oldData;
+
             const updatedPages = oldData.pages.map((page: any, index: number) => {
               if (index === 0) {
                 // Add to first page
@@ -151,6 +153,16 @@ export const useContacts = (filter?: string) => {
           });
           break;
 
+        case 'contacts:bulk':
+          // A bulk import can touch any page; refetch rather than splice every row in
+          queryClient.invalidateQueries(['contacts']);
+          break;
+
+        case 'resync':
+          // Missed too many events while disconnected to replay them; reload from the server
+          queryClient.invalidateQueries(['contacts']);
+          break;
+
         case 'connected':
           console.log('SSE connected:', event.message);
           break;
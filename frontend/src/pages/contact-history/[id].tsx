@@ -30,6 +30,7 @@ const ContactHistoryPage: React.FC = () => {
   const [pageSize] = useState(20); // Show 20 entries per page
   const [totalPages, setTotalPages] = useState(1);
   const [totalItems, setTotalItems] = useState(0);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loadingMore, setLoadingMore] = useState(false);
 
   const { user } = useAuth();
@@ -47,14 +48,17 @@ const ContactHistoryPage: React.FC = () => {
       setLoading(true);
       const [contactData, historyData] = await Promise.all([
         contactService.getContact(contactId),
-        contactService.getContactHistory(contactId, 1, pageSize, 'desc'),
+        // Only the first page asks for the total; later pages seek by cursor
+        contactService.getContactHistoryByCursor(contactId, undefined, pageSize, 'desc', true),
       ]);
       setContact(contactData);
 
       // Extract items from paginated response
+      const total = historyData?.data?.pagination?.total || 0;
       setHistory(historyData?.data?.items || []);
-      setTotalPages(historyData?.data?.pagination?.totalPages || 1);
-      setTotalItems(historyData?.data?.pagination?.total || 0);
+      setTotalPages(Math.max(1, Math.ceil(total / pageSize)));
+      setTotalItems(total);
+      setNextCursor(historyData?.data?.pagination?.nextCursor || null);
       setCurrentPage(1);
     } catch (error: any) {
       setError(error.message || 'Failed to load contact history');
@@ -65,17 +69,18 @@ const ContactHistoryPage: React.FC = () => {
   };
 
   const loadMoreHistory = async () => {
-    if (!id || typeof id !== 'string' || currentPage >= totalPages || loadingMore) {
+    if (!id || typeof id !== 'string' || !nextCursor || loadingMore) {
       return;
     }
 
     try {
       setLoadingMore(true);
       const nextPage = currentPage + 1;
-      const historyData = await contactService.getContactHistory(id, nextPage, pageSize, 'desc');
+      const historyData = await contactService.getContactHistoryByCursor(id, nextCursor, pageSize, 'desc');
 
       // Append new items to existing history
       setHistory(prev => [...prev, ...(historyData?.data?.items || [])]);
+      setNextCursor(historyData?.data?.pagination?.nextCursor || null);
       setCurrentPage(nextPage);
     } catch (error: any) {
       toast.error(error.message || 'Failed to load more history');
@@ -227,7 +232,7 @@ const ContactHistoryPage: React.FC = () => {
                     Showing {history.length} of {totalItems} entries
                   </Typography>
 
-                  {currentPage < totalPages && (
+                  {nextCursor && (
                     <Button
                       variant="outlined"
                       onClick={loadMoreHistory}
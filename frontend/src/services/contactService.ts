@@ -1,4 +1,12 @@
-import { Contact, ContactListResponse, CreateContactRequest, UpdateContactRequest } from '@/types/contact';
+import {
+  Contact,
+  ContactCountResponse,
+  ContactCursorListResponse,
+  ContactHistoryCursorListResponse,
+  ContactListResponse,
+  CreateContactRequest,
+  UpdateContactRequest
+} from '@/types/contact';
 import api from './api';
 import { ApiErrorHandler } from '@/utils/apiErrorHandler';
 
@@ -17,6 +25,30 @@ export const contactService = {
     return response.data;
   },
 
+  // Keyset pagination: pass the previous page's nextCursor, or nothing for the first page
+  async getContactsByCursor(cursor?: string, pageSize = 20, filter?: string, includeTotal = false): Promise<ContactCursorListResponse> {
+    const params = new URLSearchParams({
+      cursor: cursor || '',
+      pageSize: pageSize.toString(),
+    });
+
+    if (filter) {
+      params.append('filter', filter);
+    }
+
+    if (includeTotal) {
+      params.append('includeTotal', 'true');
+    }
+
+    const response = await api.get(`/contacts?${params.toString()}`);
+    return response.data;
+  },
+
+  async getContactCount(): Promise<ContactCountResponse> {
+    const response = await api.get('/contacts/count');
+    return response.data;
+  },
+
   async getContact(id: string): Promise<Contact> {
     const response = await api.get(`/contact/${id}`);
     console.log('API response for contact:', response.data);
@@ -25,9 +57,7 @@ export const contactService = {
 
   async createContact(contactData: CreateContactRequest): Promise<Contact> {
     try {
-      const response = await api.post('/contact', contactData, {
-        timeout: 30000, // 30 second timeout for contact creation (20s delay + buffer)
-      });
+      const response = await api.post('/contact', contactData);
       return response.data;
     } catch (error: any) {
       const customMessages = {
@@ -77,4 +107,34 @@ export const contactService = {
       throw ApiErrorHandler.createError(error, customMessages);
     }
   },
+
+  async getContactHistoryByCursor(
+    id: string,
+    cursor?: string,
+    pageSize = 20,
+    order: 'asc' | 'desc' = 'desc',
+    includeTotal = false
+  ): Promise<ContactHistoryCursorListResponse> {
+    try {
+      const params = new URLSearchParams({
+        cursor: cursor || '',
+        pageSize: pageSize.toString(),
+        order: order
+      });
+
+      if (includeTotal) {
+        params.append('includeTotal', 'true');
+      }
+
+      const response = await api.get(`/contact-history/${id}?${params.toString()}`);
+      return response.data;
+    } catch (error: any) {
+      const customMessages = {
+        404: 'Contact not found',
+        422: 'Please check your pagination parameters and try again'
+      };
+
+      throw ApiErrorHandler.createError(error, customMessages);
+    }
+  },
 };
\ No newline at end of file
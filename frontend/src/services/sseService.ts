@@ -7,8 +7,11 @@ export interface SSEEvent {
 export class SSEService {
   private eventSource: EventSource | null = null;
   private reconnectAttempts = 0;
-  private maxReconnectAttempts = 5;
   private reconnectDelay = 1000; // Start with 1 second
+  private maxReconnectDelay = 30000;
+  private reconnectTimer: ReturnType<typeof setTimeout> | null = null;
+  // Last event ID seen, so a reconnect only receives what was missed
+  private lastEventId: string | null = null;
 
   connect(onEvent: (event: SSEEvent) => void, onError?: (error: Event) => void): void {
     if (this.eventSource) {
@@ -16,11 +19,16 @@ export class SSEService {
     }
 
     const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:3000';
-    this.eventSource = new EventSource(`${apiUrl}/api/events`, {
+    // A new EventSource does not carry Last-Event-ID over, so pass it explicitly
+    const query = this.lastEventId ? `?lastEventId=${encodeURIComponent(this.lastEventId)}` : '';
+    this.eventSource = new EventSource(`${apiUrl}/api/events${query}`, {
       withCredentials: true
     });
 
     this.eventSource.onmessage = (event) => {
+      if (event.lastEventId) {
+        this.lastEventId = event.lastEventId;
+      }
       try {
         const sseEvent: SSEEvent = JSON.parse(event.data);
         onEvent(sseEvent);
@@ -47,22 +55,27 @@ export class SSEService {
   }
 
   private attemptReconnect(onEvent: (event: SSEEvent) => void, onError?: (error: Event) => void): void {
-    if (this.reconnectAttempts >= this.maxReconnectAttempts) {
-      console.error('Max SSE reconnection attempts reached');
-      return;
-    }
+    // Keep retrying for as long as the page is open; missed events are replayed on reconnect
+    this.disconnect();
 
     this.reconnectAttempts++;
-    const delay = this.reconnectDelay * Math.pow(2, this.reconnectAttempts - 1); // Exponential backoff
+    // Exponential backoff, capped, with jitter so clients do not reconnect in lockstep after a deploy
+    const backoff = Math.min(this.reconnectDelay * Math.pow(2, this.reconnectAttempts - 1), this.maxReconnectDelay);
+    const delay = Math.round(backoff / 2 + Math.random() * backoff / 2);
 
-    console.log(`Attempting SSE reconnection in ${delay}ms (attempt ${this.reconnectAttempts}/${this.maxReconnectAttempts})`);
+    console.log(`Attempting SSE reconnection in ${delay}ms (attempt ${this.reconnectAttempts})`);
 
-    setTimeout(() => {
+    this.reconnectTimer = setTimeout(() => {
+      this.reconnectTimer = null;
       this.connect(onEvent, onError);
     }, delay);
   }
 
   disconnect(): void {
+    if (this.reconnectTimer) {
+      clearTimeout(this.reconnectTimer);
+      this.reconnectTimer = null;
+    }
     if (this.eventSource) {
       this.eventSource.close();
       this.eventSource = null;
@@ -6,7 +6,7 @@ export interface Contact {
   phone: string;
   createdAt: string;
   updatedAt: string;
-  owner: {
+  owner?: {
     id: string;
     firstName: string;
     lastName: string;
@@ -42,6 +42,30 @@ export interface ContactListResponse {
   errors: any[];
 }
 
+export interface ContactCountResponse {
+  status: number;
+  data: {
+    count: number;
+  };
+  errors: any[];
+}
+
+export interface CursorPagination {
+  pageSize: number;
+  nextCursor: string | null;
+  hasMore: boolean;
+  total?: number;
+}
+
+export interface ContactCursorListResponse {
+  status: number;
+  data: {
+    items: Contact[];
+    pagination: CursorPagination;
+  };
+  errors: any[];
+}
+
 export interface ContactHistoryChange {
   before: string;
   after: string;
@@ -55,4 +79,13 @@ export interface ContactHistory {
   phone?: ContactHistoryChange;
   createdAt: string;
   updatedAt: string;
-}
\ No newline at end of file
+}
+
+export interface ContactHistoryCursorListResponse {
+  status: number;
+  data: {
+    items: ContactHistory[];
+    pagination: CursorPagination;
+  };
+  errors: any[];
+}
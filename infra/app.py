@@ -8,6 +8,7 @@ import os
 from aws_cdk import App, Environment
 from contacts_infra.backend_stack import BackendStack
 from contacts_infra.frontend_stack import FrontendStack
+from contacts_infra.profiles import resolve_profile
 
 
 def main():
@@ -27,6 +28,9 @@ def main():
     
     # Create CDK app
     app = App()
+
+    # Sizing preset shared by both stacks: `cdk deploy -c profile=dev|standard|high-throughput`
+    profile = resolve_profile(app)
     
     # Deploy backend stack
     backend_stack = BackendStack(
@@ -34,6 +38,7 @@ def main():
         f"{app_name}BackendStack",
         app_name=app_name,
         root_domain=root_domain,
+        profile=profile,
         # env=env
     )
     
@@ -44,6 +49,7 @@ def main():
         app_name=app_name,
         root_domain=root_domain,
         frontend_subdomain=frontend_subdomain,
+        profile=profile,
         # env=env
     )
     
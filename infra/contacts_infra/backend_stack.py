@@ -6,7 +6,7 @@ AWS CDK Python implementation for backend services
 import os
 from typing import Optional
 from aws_cdk import (
-    Stack, Duration, RemovalPolicy, CfnOutput, SecretValue,
+    Stack, Duration, RemovalPolicy, CfnOutput, SecretValue, CustomResource,
     aws_ec2 as ec2,
     aws_rds as rds,
     aws_ecs as ecs,
@@ -15,10 +15,18 @@ from aws_cdk import (
     aws_secretsmanager as secretsmanager,
     aws_route53 as route53,
     aws_certificatemanager as acm,
-    aws_elasticloadbalancingv2 as elbv2
+    aws_elasticloadbalancingv2 as elbv2,
+    aws_applicationautoscaling as appscaling,
+    aws_cloudwatch as cloudwatch,
+    aws_iam as iam,
+    aws_lambda as lambda_,
+    aws_logs as logs,
+    custom_resources as cr,
 )
 from constructs import Construct
 
+from contacts_infra.profiles import PerformanceProfile, resolve_profile
+
 
 class BackendStack(Stack):
     """Backend infrastructure stack for contacts application"""
@@ -29,12 +37,25 @@ class BackendStack(Stack):
         construct_id: str, 
         app_name: str,
         root_domain: Optional[str] = None,
+        profile: Optional[PerformanceProfile] = None,
         **kwargs
     ) -> None:
         super().__init__(scope, construct_id, **kwargs)
         
         self.app_name = app_name
         self.root_domain = root_domain
+        # Task size, ACU range, cache and scaling bounds (see contacts_infra/profiles.py)
+        self.profile = profile or resolve_profile(self)
+        # Opt-in Aurora reader: `cdk deploy -c enableReadReplica=true` or ENABLE_READ_REPLICA=true
+        self.enable_read_replica = str(
+            self.node.try_get_context("enableReadReplica") or os.getenv("ENABLE_READ_REPLICA", "false")
+        ).lower() == "true"
+        # CloudWatch namespace for metrics the backend publishes itself (EMF)
+        self.metrics_namespace = f"{app_name}/Backend"
+        # Optional pooler between tasks and Aurora: `-c dbPooler=rds-proxy|pgbouncer` or DB_POOLER
+        self.db_pooler = str(self.node.try_get_context("dbPooler") or os.getenv("DB_POOLER") or "none").lower()
+        if self.db_pooler not in ("none", "rds-proxy", "pgbouncer"):
+            raise ValueError(f"dbPooler must be none, rds-proxy or pgbouncer, got {self.db_pooler!r}")
         
         # VPC for backend resources
         self.vpc = self._create_vpc()
@@ -42,6 +63,9 @@ class BackendStack(Stack):
         # Database cluster
         db_cluster = self._create_database()
         
+        # RDS Proxy in front of the writer (when selected)
+        db_proxy = self._create_db_proxy(db_cluster) if self.db_pooler == "rds-proxy" else None
+
         # Redis for session storage
         redis_replication_group, redis_sg = self._create_redis()
         
@@ -71,6 +95,7 @@ class BackendStack(Stack):
         # ECS Fargate service
         fargate_service = self._create_fargate_service(
             db_cluster=db_cluster,
+            db_proxy=db_proxy,
             redis_replication_group=redis_replication_group,
             session_secret=session_secret,
             cert=cert,
@@ -80,6 +105,12 @@ class BackendStack(Stack):
 
         # Allow ECS -> DB
         db_cluster.connections.allow_default_port_from(fargate_service.service, "ECS tasks to Aurora")
+        if db_proxy:
+            db_proxy.connections.allow_default_port_from(fargate_service.service, "ECS tasks to RDS Proxy")
+
+        # Migrations run once per deploy as a one-off task; the service only rolls after it succeeds
+        migration = self._create_migration_runner(fargate_service, db_cluster)
+        fargate_service.service.node.add_dependency(migration)
 
         # Allow ECS -> Redis 6379
         redis_sg.add_ingress_rule(
@@ -131,10 +162,12 @@ class BackendStack(Stack):
                 version=rds.AuroraPostgresEngineVersion.VER_15_4
             ),
             writer=rds.ClusterInstance.serverless_v2("writer"),
-            # NOTE: Commented out to save on cost
-            # readers=[rds.ClusterInstance.serverless_v2("reader")],
-            serverless_v2_min_capacity=0.5,
-            serverless_v2_max_capacity=2,
+            # NOTE: Off by default to save on cost
+            readers=[
+                rds.ClusterInstance.serverless_v2("reader", scale_with_writer=False)
+            ] if self.enable_read_replica else None,
+            serverless_v2_min_capacity=self.profile.db_min_acu,
+            serverless_v2_max_capacity=self.profile.db_max_acu,
             vpc=self.vpc,
             vpc_subnets=ec2.SubnetSelection(subnet_type=ec2.SubnetType.PRIVATE_ISOLATED),
             storage_encrypted=True,
@@ -145,6 +178,30 @@ class BackendStack(Stack):
             enable_data_api=True
         )
 
+    def _create_db_proxy(self, db_cluster: rds.DatabaseCluster) -> rds.DatabaseProxy:
+        """RDS Proxy for the writer: multiplexes task connections so scale-out does not exhaust max_connections"""
+        proxy_security_group = ec2.SecurityGroup(
+            self,
+            f"{self.app_name}DbProxySecurityGroup",
+            vpc=self.vpc,
+            description="Security group for the RDS Proxy",
+            allow_all_outbound=True,
+        )
+        proxy = db_cluster.add_proxy(
+            f"{self.app_name}DbProxy",
+            secrets=[db_cluster.secret],
+            vpc=self.vpc,
+            vpc_subnets=ec2.SubnetSelection(subnet_type=ec2.SubnetType.PRIVATE_ISOLATED),
+            security_groups=[proxy_security_group],
+            # Matches the direct connection, which does not negotiate TLS either
+            require_tls=False,
+            # Leave writer connections for the migration task and direct admin sessions
+            max_connections_percent=80,
+            idle_client_timeout=Duration.minutes(30),
+        )
+        db_cluster.connections.allow_default_port_from(proxy_security_group, "RDS Proxy to Aurora")
+        return proxy
+
     def _create_redis(self) -> tuple[elasticache.CfnReplicationGroup, ec2.SecurityGroup]:
         """Create ElastiCache Redis cluster + SG and return both"""
         redis_security_group = ec2.SecurityGroup(
@@ -166,15 +223,17 @@ class BackendStack(Stack):
             self,
             f"{self.app_name}Redis",
             replication_group_description="Redis cluster for session storage",
-            num_cache_clusters=1,
-            cache_node_type="cache.t3.micro",
+            num_cache_clusters=1 + self.profile.redis_replicas,
+            cache_node_type=self.profile.redis_node_type,
             engine="redis",
             port=6379,
             cache_subnet_group_name=redis_subnet_group.ref,
             security_group_ids=[redis_security_group.security_group_id],
             at_rest_encryption_enabled=True,
             transit_encryption_enabled=True,
-            automatic_failover_enabled=False,
+            # A replica can only take over automatically when failover is on
+            automatic_failover_enabled=self.profile.redis_replicas > 0,
+            multi_az_enabled=self.profile.redis_replicas > 0,
         )
         return rg, redis_security_group
 
@@ -193,6 +252,7 @@ class BackendStack(Stack):
     def _create_fargate_service(
         self,
         db_cluster: rds.DatabaseCluster,
+        db_proxy: Optional[rds.DatabaseProxy],
         redis_replication_group: elasticache.CfnReplicationGroup,
         session_secret: secretsmanager.Secret,
         cert: Optional[acm.ICertificate],
@@ -207,7 +267,22 @@ class BackendStack(Stack):
             "MAX_USERS": os.getenv("MAX_USERS", "50"),
             "MAX_CONTACTS_PER_USER": os.getenv("MAX_CONTACTS_PER_USER", "50"),
             "PGDATABASE": "postgres",  # Aurora PostgreSQL default database
+            # Prisma pool per client per task (see backend/src/lib/prisma.ts); tasks x limit < max_connections
+            "DB_CONNECTION_LIMIT": os.getenv("DB_CONNECTION_LIMIT", "5"),
+            "DB_POOL_TIMEOUT": os.getenv("DB_POOL_TIMEOUT", "10"),
         }
+        if self.profile.sse_connections_per_task:
+            # Turns on the backend's EMF publisher that feeds SSE-based scaling
+            environment["CLOUDWATCH_METRICS_NAMESPACE"] = self.metrics_namespace
+            environment["CLOUDWATCH_METRICS_SERVICE"] = self.app_name
+        if db_proxy:
+            environment["PGPROXYHOST"] = db_proxy.endpoint
+            environment["DB_PGBOUNCER"] = "true"
+        elif self.db_pooler == "pgbouncer":
+            # The sidecar shares the task's network namespace
+            environment["PGPROXYHOST"] = "127.0.0.1"
+            environment["PGPROXYPORT"] = "6432"
+            environment["DB_PGBOUNCER"] = "true"
 
         secrets = {
             "PGHOST": ecs.Secret.from_secrets_manager(db_cluster.secret, "host"),
@@ -227,6 +302,19 @@ class BackendStack(Stack):
             ),
         }
 
+        if self.enable_read_replica:
+            # List and history reads go to the reader endpoint (see backend/src/lib/readReplicaRouter.ts)
+            secrets["PGREADHOST"] = ecs.Secret.from_secrets_manager(
+                secretsmanager.Secret(
+                    self,
+                    f"{self.app_name}DbReadHost",
+                    secret_name=f"{self.app_name.lower()}-db-read-host",
+                    secret_string_value=SecretValue.unsafe_plain_text(
+                        db_cluster.cluster_read_endpoint.hostname
+                    ),
+                )
+            )
+
         task_image_options = ecs_patterns.ApplicationLoadBalancedTaskImageOptions(
             image=ecs.ContainerImage.from_asset("../backend"),
             container_port=3000,
@@ -251,9 +339,9 @@ class BackendStack(Stack):
                 domain_zone=zone,
                 redirect_http=True,
                 protocol=elbv2.ApplicationProtocol.HTTPS,
-                desired_count=1,  # Initial count
-                cpu=256,
-                memory_limit_mib=512,
+                desired_count=self.profile.min_tasks,  # Initial count
+                cpu=self.profile.task_cpu,
+                memory_limit_mib=self.profile.task_memory_mib,
             )
         else:
             # HTTP only (for development/testing)
@@ -264,16 +352,20 @@ class BackendStack(Stack):
                 public_load_balancer=True,
                 task_image_options=task_image_options,
                 protocol=elbv2.ApplicationProtocol.HTTP,
-                desired_count=1,  # Initial count
-                cpu=256,
-                memory_limit_mib=512,
+                desired_count=self.profile.min_tasks,  # Initial count
+                cpu=self.profile.task_cpu,
+                memory_limit_mib=self.profile.task_memory_mib,
             )
 
-        # Configure health check
+        if self.db_pooler == "pgbouncer":
+            self._add_pgbouncer_sidecar(fargate.task_definition, db_cluster)
+
+        # Configure health check; /health answers 503 until the task has warmed its DB pool,
+        # so a short interval puts new tasks into service soon after they are ready
         fargate.target_group.configure_health_check(
             path="/health", 
             healthy_http_codes="200",
-            interval=Duration.seconds(30),
+            interval=Duration.seconds(10),
             timeout=Duration.seconds(5),
             healthy_threshold_count=2,
             unhealthy_threshold_count=3
@@ -281,14 +373,14 @@ class BackendStack(Stack):
 
         # Configure Auto Scaling
         scalable_target = fargate.service.auto_scale_task_count(
-            min_capacity=1,      # Minimum number of tasks (always running)
-            max_capacity=5       # Maximum number of tasks (prevents runaway scaling)
+            min_capacity=self.profile.min_tasks,  # Minimum number of tasks (always running)
+            max_capacity=self.profile.max_tasks   # Maximum number of tasks (prevents runaway scaling)
         )
 
         # Scale up when CPU usage is high
         scalable_target.scale_on_cpu_utilization(
             "CpuScaling",
-            target_utilization_percent=70,  # Scale up when CPU > 70%
+            target_utilization_percent=self.profile.cpu_target_percent,
             scale_in_cooldown=Duration.minutes(5),   # Wait 5 min before scaling in
             scale_out_cooldown=Duration.minutes(2)   # Wait 2 min before scaling out
         )
@@ -296,7 +388,7 @@ class BackendStack(Stack):
         # Scale up when memory usage is high
         scalable_target.scale_on_memory_utilization(
             "MemoryScaling",
-            target_utilization_percent=80,  # Scale up when memory > 80%
+            target_utilization_percent=self.profile.memory_target_percent,
             scale_in_cooldown=Duration.minutes(5),
             scale_out_cooldown=Duration.minutes(2)
         )
@@ -304,12 +396,46 @@ class BackendStack(Stack):
         # Scale based on ALB request count
         scalable_target.scale_on_request_count(
             "RequestScaling",
-            requests_per_target=1000,       # Scale up when > 1000 requests per target
+            requests_per_target=self.profile.requests_per_target,
             target_group=fargate.target_group,
             scale_in_cooldown=Duration.minutes(5),
             scale_out_cooldown=Duration.minutes(2)
         )
 
+        # Scale on open SSE streams per task; the backend publishes them as CloudWatch EMF log lines
+        if self.profile.sse_connections_per_task:
+            scalable_target.scale_to_track_custom_metric(
+                "SseConnectionScaling",
+                metric=cloudwatch.Metric(
+                    namespace=self.metrics_namespace,
+                    metric_name="SSEConnections",
+                    dimensions_map={"Service": self.app_name},
+                    statistic="Average",
+                    period=Duration.minutes(1),
+                ),
+                target_value=self.profile.sse_connections_per_task,
+                scale_in_cooldown=Duration.minutes(5),
+                scale_out_cooldown=Duration.minutes(2),
+            )
+
+        # Step out when ALB p99 latency passes the target; scale-in is left to the tracking policies
+        if self.profile.p99_latency_seconds:
+            scalable_target.scale_on_metric(
+                "LatencyScaling",
+                metric=fargate.target_group.metrics.target_response_time(
+                    statistic="p99",
+                    period=Duration.minutes(1),
+                ),
+                scaling_steps=[
+                    appscaling.ScalingInterval(upper=self.profile.p99_latency_seconds, change=0),
+                    appscaling.ScalingInterval(lower=self.profile.p99_latency_seconds, change=1),
+                    appscaling.ScalingInterval(lower=self.profile.p99_latency_seconds * 2, change=3),
+                ],
+                adjustment_type=appscaling.AdjustmentType.CHANGE_IN_CAPACITY,
+                evaluation_periods=3,
+                cooldown=Duration.minutes(2),
+            )
+
         # Grant secrets access
         db_cluster.secret.grant_read(fargate.task_definition.task_role)
         db_cluster.secret.grant_read(fargate.task_definition.execution_role)
@@ -318,6 +444,160 @@ class BackendStack(Stack):
 
         return fargate
 
+    def _add_pgbouncer_sidecar(self, task_definition: ecs.TaskDefinition, db_cluster: rds.DatabaseCluster) -> None:
+        """PgBouncer in transaction mode next to the app: many Prisma connections share a few server connections"""
+        pgbouncer = task_definition.add_container(
+            "pgbouncer",
+            image=ecs.ContainerImage.from_registry(os.getenv("PGBOUNCER_IMAGE", "edoburu/pgbouncer:latest")),
+            essential=True,
+            memory_reservation_mib=32,
+            port_mappings=[ecs.PortMapping(container_port=6432)],
+            environment={
+                "LISTEN_PORT": "6432",
+                "DB_NAME": "postgres",
+                "POOL_MODE": "transaction",
+                "AUTH_TYPE": "scram-sha-256",
+                "MAX_CLIENT_CONN": os.getenv("PGBOUNCER_MAX_CLIENT_CONN", "200"),
+                # Server connections per task; tasks x this must stay under the writer's max_connections
+                "DEFAULT_POOL_SIZE": os.getenv("PGBOUNCER_POOL_SIZE", "10"),
+            },
+            secrets={
+                "DB_HOST": ecs.Secret.from_secrets_manager(db_cluster.secret, "host"),
+                "DB_PORT": ecs.Secret.from_secrets_manager(db_cluster.secret, "port"),
+                "DB_USER": ecs.Secret.from_secrets_manager(db_cluster.secret, "username"),
+                "DB_PASSWORD": ecs.Secret.from_secrets_manager(db_cluster.secret, "password"),
+            },
+            logging=ecs.LogDrivers.aws_logs(stream_prefix="pgbouncer"),
+        )
+        task_definition.default_container.add_container_dependencies(
+            ecs.ContainerDependency(container=pgbouncer, condition=ecs.ContainerDependencyCondition.START)
+        )
+
+    def _create_migration_runner(
+        self,
+        fargate_service: ecs_patterns.ApplicationLoadBalancedFargateService,
+        db_cluster: rds.DatabaseCluster,
+    ) -> CustomResource:
+        """Run scripts/migrate.sh as a one-off Fargate task on every deploy and wait for it to exit 0."""
+        task_definition = ecs.FargateTaskDefinition(
+            self,
+            f"{self.app_name}MigrationTask",
+            cpu=256,
+            memory_limit_mib=512,
+        )
+        task_definition.add_container(
+            "migrate",
+            # Same asset as the service, so both always run the same build
+            image=ecs.ContainerImage.from_asset("../backend"),
+            command=["./scripts/migrate.sh"],
+            environment={"PGDATABASE": "postgres"},
+            secrets={
+                "PGHOST": ecs.Secret.from_secrets_manager(db_cluster.secret, "host"),
+                "PGPORT": ecs.Secret.from_secrets_manager(db_cluster.secret, "port"),
+                "PGUSER": ecs.Secret.from_secrets_manager(db_cluster.secret, "username"),
+                "PGPASSWORD": ecs.Secret.from_secrets_manager(db_cluster.secret, "password"),
+            },
+            logging=ecs.LogDrivers.aws_logs(stream_prefix="migrate"),
+        )
+
+        migration_sg = ec2.SecurityGroup(
+            self,
+            f"{self.app_name}MigrationSg",
+            vpc=self.vpc,
+            description="One-off migration task",
+        )
+        db_cluster.connections.allow_default_port_from(migration_sg, "Migration task to Aurora")
+
+        # on_event starts the task; is_complete polls until it stops and fails the deploy on a non-zero exit
+        handler_code = lambda_.Code.from_inline(
+            "import boto3\n"
+            "ecs = boto3.client('ecs')\n"
+            "\n"
+            "def on_event(event, context):\n"
+            "    if event['RequestType'] == 'Delete':\n"
+            "        return {'PhysicalResourceId': event['PhysicalResourceId']}\n"
+            "    props = event['ResourceProperties']\n"
+            "    response = ecs.run_task(\n"
+            "        cluster=props['Cluster'],\n"
+            "        taskDefinition=props['TaskDefinition'],\n"
+            "        launchType='FARGATE',\n"
+            "        networkConfiguration={'awsvpcConfiguration': {\n"
+            "            'subnets': props['Subnets'],\n"
+            "            'securityGroups': props['SecurityGroups'],\n"
+            "            'assignPublicIp': 'DISABLED',\n"
+            "        }},\n"
+            "    )\n"
+            "    if response['failures']:\n"
+            "        raise Exception(f\"Migration task did not start: {response['failures']}\")\n"
+            "    return {'PhysicalResourceId': response['tasks'][0]['taskArn']}\n"
+            "\n"
+            "def is_complete(event, context):\n"
+            "    if event['RequestType'] == 'Delete':\n"
+            "        return {'IsComplete': True}\n"
+            "    props = event['ResourceProperties']\n"
+            "    task = ecs.describe_tasks(cluster=props['Cluster'], tasks=[event['PhysicalResourceId']])['tasks'][0]\n"
+            "    if task['lastStatus'] != 'STOPPED':\n"
+            "        return {'IsComplete': False}\n"
+            "    exit_code = task['containers'][0].get('exitCode')\n"
+            "    if exit_code != 0:\n"
+            "        raise Exception(f\"Migration task failed (exit {exit_code}): {task.get('stoppedReason')}\")\n"
+            "    return {'IsComplete': True}\n"
+        )
+        on_event = lambda_.Function(
+            self,
+            f"{self.app_name}MigrationStart",
+            runtime=lambda_.Runtime.PYTHON_3_12,
+            handler="index.on_event",
+            code=handler_code,
+            timeout=Duration.minutes(1),
+        )
+        is_complete = lambda_.Function(
+            self,
+            f"{self.app_name}MigrationWait",
+            runtime=lambda_.Runtime.PYTHON_3_12,
+            handler="index.is_complete",
+            code=handler_code,
+            timeout=Duration.minutes(1),
+        )
+        on_event.add_to_role_policy(iam.PolicyStatement(
+            actions=["ecs:RunTask"],
+            resources=[task_definition.task_definition_arn],
+        ))
+        on_event.add_to_role_policy(iam.PolicyStatement(
+            actions=["iam:PassRole"],
+            resources=[task_definition.task_role.role_arn, task_definition.obtain_execution_role().role_arn],
+        ))
+        is_complete.add_to_role_policy(iam.PolicyStatement(
+            actions=["ecs:DescribeTasks"],
+            resources=["*"],
+        ))
+
+        provider = cr.Provider(
+            self,
+            f"{self.app_name}MigrationProvider",
+            on_event_handler=on_event,
+            is_complete_handler=is_complete,
+            query_interval=Duration.seconds(10),
+            total_timeout=Duration.minutes(30),
+            log_retention=logs.RetentionDays.ONE_WEEK,
+        )
+
+        migration = CustomResource(
+            self,
+            f"{self.app_name}Migration",
+            service_token=provider.service_token,
+            properties={
+                "Cluster": fargate_service.cluster.cluster_arn,
+                # A new image means a new task definition revision, so every deploy re-runs migrations
+                "TaskDefinition": task_definition.task_definition_arn,
+                "Subnets": self.vpc.select_subnets(subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS).subnet_ids,
+                "SecurityGroups": [migration_sg.security_group_id],
+            },
+        )
+        # The DB ingress rule must exist before the task connects
+        migration.node.add_dependency(db_cluster)
+        return migration
+
     def _create_outputs(
         self,
         fargate_service: ecs_patterns.ApplicationLoadBalancedFargateService,
@@ -350,6 +630,14 @@ class BackendStack(Stack):
             description="Aurora PostgreSQL Cluster Endpoint"
         )
         
+        if self.enable_read_replica:
+            CfnOutput(
+                self,
+                "DatabaseReaderEndpoint",
+                value=db_cluster.cluster_read_endpoint.hostname,
+                description="Aurora PostgreSQL Reader Endpoint"
+            )
+
         CfnOutput(
             self, 
             "RedisEndpoint",
@@ -3,9 +3,10 @@ Frontend Infrastructure Stack
 AWS CDK Python implementation for frontend hosting
 """
 
+import json
 from typing import Optional
 from aws_cdk import (
-    Stack, RemovalPolicy, CfnOutput,
+    Stack, Duration, RemovalPolicy, CfnOutput,
     aws_s3 as s3,
     aws_cloudfront as cloudfront,
     aws_cloudfront_origins as origins,
@@ -15,6 +16,40 @@ from aws_cdk import (
 )
 from constructs import Construct
 
+from contacts_infra.profiles import PerformanceProfile, resolve_profile
+
+
+# Next.js dynamic pages are exported once as `[param].html`; requests under these prefixes are served by them
+DYNAMIC_ROUTES = {
+    "/contact-history/": "/contact-history/%5Bid%5D.html",
+}
+
+# Viewer-request rewrite from clean URLs to the exported files: `/` -> `/index.html`,
+# `/login` -> `/login.html`, `/contact-history/<id>` -> `/contact-history/[id].html`.
+# Runs before the cache lookup, so each page is cached (and invalidated) under its .html key.
+REWRITE_FUNCTION_CODE = """
+var DYNAMIC_ROUTES = %s;
+
+function handler(event) {
+    var request = event.request;
+    var uri = request.uri;
+
+    for (var prefix in DYNAMIC_ROUTES) {
+        if (uri.indexOf(prefix) === 0 && uri.length > prefix.length) {
+            request.uri = DYNAMIC_ROUTES[prefix];
+            return request;
+        }
+    }
+
+    if (uri.charAt(uri.length - 1) === '/') {
+        request.uri = uri + 'index.html';
+    } else if (uri.substring(uri.lastIndexOf('/') + 1).indexOf('.') === -1) {
+        request.uri = uri + '.html';
+    }
+    return request;
+}
+"""
+
 
 class FrontendStack(Stack):
     """Frontend infrastructure stack for contacts application"""
@@ -26,6 +61,7 @@ class FrontendStack(Stack):
         app_name: str,
         root_domain: Optional[str] = None,
         frontend_subdomain: str = "www",
+        profile: Optional[PerformanceProfile] = None,
         **kwargs
     ) -> None:
         super().__init__(scope, construct_id, **kwargs)
@@ -33,6 +69,7 @@ class FrontendStack(Stack):
         self.app_name = app_name
         self.root_domain = root_domain
         self.frontend_subdomain = frontend_subdomain
+        self.profile = profile or resolve_profile(self)
         
         # S3 bucket for static hosting
         self.bucket = self._create_s3_bucket()
@@ -106,34 +143,89 @@ class FrontendStack(Stack):
             certificate = cf_cert
             domain_names = [frontend_domain, self.root_domain]
         
+        origin = origins.S3Origin(
+            self.bucket, 
+            origin_access_identity=oai
+        )
+
+        # HTML: short edge TTL so a deploy is visible within a minute even before its invalidation lands.
+        # frontend/scripts/deploy.sh uploads HTML with a matching Cache-Control.
+        html_cache_policy = cloudfront.CachePolicy(
+            self,
+            f"{self.app_name}HtmlCachePolicy",
+            comment="Exported HTML pages: short TTL, invalidated on deploy",
+            min_ttl=Duration.seconds(0),
+            default_ttl=Duration.seconds(60),
+            max_ttl=Duration.minutes(5),
+            enable_accept_encoding_brotli=True,
+            enable_accept_encoding_gzip=True,
+        )
+
+        # Hashed build output never changes under the same name, so it is cached for a year
+        immutable_cache_policy = cloudfront.CachePolicy(
+            self,
+            f"{self.app_name}ImmutableAssetCachePolicy",
+            comment="Content-hashed /_next/static assets",
+            min_ttl=Duration.days(365),
+            default_ttl=Duration.days(365),
+            max_ttl=Duration.days(365),
+            enable_accept_encoding_brotli=True,
+            enable_accept_encoding_gzip=True,
+        )
+
+        rewrite_function = cloudfront.Function(
+            self,
+            f"{self.app_name}FrontendRewrite",
+            comment="Map clean URLs to exported .html files",
+            code=cloudfront.FunctionCode.from_inline(REWRITE_FUNCTION_CODE % json.dumps(DYNAMIC_ROUTES)),
+        )
+
         # Create distribution
         distribution = cloudfront.Distribution(
             self, 
             f"{self.app_name}FrontendDistribution",
             default_behavior=cloudfront.BehaviorOptions(
-                origin=origins.S3Origin(
-                    self.bucket, 
-                    origin_access_identity=oai
-                ),
+                origin=origin,
                 viewer_protocol_policy=cloudfront.ViewerProtocolPolicy.REDIRECT_TO_HTTPS,
-                cache_policy=cloudfront.CachePolicy.CACHING_OPTIMIZED,
-                origin_request_policy=cloudfront.OriginRequestPolicy.CORS_S3_ORIGIN
+                cache_policy=html_cache_policy,
+                origin_request_policy=cloudfront.OriginRequestPolicy.CORS_S3_ORIGIN,
+                compress=True,
+                function_associations=[
+                    cloudfront.FunctionAssociation(
+                        function=rewrite_function,
+                        event_type=cloudfront.FunctionEventType.VIEWER_REQUEST,
+                    )
+                ],
             ),
+            additional_behaviors={
+                "/_next/static/*": cloudfront.BehaviorOptions(
+                    origin=origin,
+                    viewer_protocol_policy=cloudfront.ViewerProtocolPolicy.REDIRECT_TO_HTTPS,
+                    cache_policy=immutable_cache_policy,
+                    origin_request_policy=cloudfront.OriginRequestPolicy.CORS_S3_ORIGIN,
+                    compress=True,
+                ),
+            },
             default_root_object="index.html",
+            # Unknown paths get the exported 404 page with a real 404 (S3 answers 403 without ListBucket)
             error_responses=[
                 cloudfront.ErrorResponse(
                     http_status=404,
-                    response_http_status=200,
-                    response_page_path="/index.html"
+                    response_http_status=404,
+                    response_page_path="/404.html",
+                    ttl=Duration.seconds(10)
                 ),
                 cloudfront.ErrorResponse(
                     http_status=403,
-                    response_http_status=200,
-                    response_page_path="/index.html"
+                    response_http_status=404,
+                    response_page_path="/404.html",
+                    ttl=Duration.seconds(10)
                 )
             ],
             domain_names=domain_names,
-            certificate=certificate
+            certificate=certificate,
+            # Edge locations served; wider classes cost more but cut latency for distant users
+            price_class=self.profile.cdn_price_class
         )
         
         return distribution
@@ -0,0 +1,101 @@
+"""
+Performance Profiles
+Named sizing presets for the backend and frontend stacks
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from aws_cdk import aws_cloudfront as cloudfront
+from constructs import Construct
+
+
+@dataclass(frozen=True)
+class PerformanceProfile:
+    """Task size, database, cache, autoscaling and CDN settings for one environment"""
+
+    name: str
+    # Fargate task
+    task_cpu: int
+    task_memory_mib: int
+    # Aurora Serverless v2 capacity range (ACUs)
+    db_min_acu: float
+    db_max_acu: float
+    # ElastiCache; replicas > 0 also turns on Multi-AZ automatic failover
+    redis_node_type: str
+    redis_replicas: int
+    # Autoscaling bounds and built-in targets
+    min_tasks: int
+    max_tasks: int
+    cpu_target_percent: int
+    memory_target_percent: int
+    requests_per_target: int
+    # Optional scaling on custom metrics: average open SSE streams per task (published by the
+    # backend as CloudWatch EMF) and ALB p99 target response time
+    sse_connections_per_task: Optional[int] = None
+    p99_latency_seconds: Optional[float] = None
+    # Frontend CDN edge locations
+    cdn_price_class: cloudfront.PriceClass = cloudfront.PriceClass.PRICE_CLASS_ALL
+
+
+PROFILES = {
+    # Smallest footprint for personal or review environments
+    "dev": PerformanceProfile(
+        name="dev",
+        task_cpu=256,
+        task_memory_mib=512,
+        db_min_acu=0.5,
+        db_max_acu=1,
+        redis_node_type="cache.t3.micro",
+        redis_replicas=0,
+        min_tasks=1,
+        max_tasks=2,
+        cpu_target_percent=70,
+        memory_target_percent=80,
+        requests_per_target=1000,
+        cdn_price_class=cloudfront.PriceClass.PRICE_CLASS_100,
+    ),
+    # The long-standing defaults
+    "standard": PerformanceProfile(
+        name="standard",
+        task_cpu=256,
+        task_memory_mib=512,
+        db_min_acu=0.5,
+        db_max_acu=2,
+        redis_node_type="cache.t3.micro",
+        redis_replicas=0,
+        min_tasks=1,
+        max_tasks=5,
+        cpu_target_percent=70,
+        memory_target_percent=80,
+        requests_per_target=1000,
+    ),
+    # Larger tasks, a wider ACU range, a replicated cache and latency/SSE-aware scaling
+    "high-throughput": PerformanceProfile(
+        name="high-throughput",
+        task_cpu=1024,
+        task_memory_mib=2048,
+        db_min_acu=2,
+        db_max_acu=16,
+        redis_node_type="cache.r7g.large",
+        redis_replicas=1,
+        min_tasks=2,
+        max_tasks=20,
+        cpu_target_percent=60,
+        memory_target_percent=75,
+        requests_per_target=3000,
+        sse_connections_per_task=1500,
+        p99_latency_seconds=0.5,
+    ),
+}
+
+DEFAULT_PROFILE = "standard"
+
+
+def resolve_profile(scope: Construct) -> PerformanceProfile:
+    """Profile named by `cdk deploy -c profile=<name>` or PERFORMANCE_PROFILE, else standard"""
+    name = str(scope.node.try_get_context("profile") or os.getenv("PERFORMANCE_PROFILE") or DEFAULT_PROFILE).lower()
+    if name not in PROFILES:
+        raise ValueError(f"profile must be one of {', '.join(PROFILES)}, got {name!r}")
+    return PROFILES[name]
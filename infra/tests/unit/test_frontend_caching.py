@@ -0,0 +1,80 @@
+"""
+Synth-time checks for the frontend distribution's cache behaviours.
+"""
+
+from aws_cdk import App, assertions
+
+from contacts_infra.frontend_stack import FrontendStack
+
+Match = assertions.Match
+
+
+def synth_frontend() -> assertions.Template:
+    app = App()
+    stack = FrontendStack(app, "TestFrontendStack", app_name="Test")
+    return assertions.Template.from_stack(stack)
+
+
+def test_hashed_assets_are_cached_for_a_year_and_compressed():
+    template = synth_frontend()
+
+    template.has_resource_properties("AWS::CloudFront::CachePolicy", {
+        "CachePolicyConfig": Match.object_like({
+            "MinTTL": 31536000,
+            "DefaultTTL": 31536000,
+            "ParametersInCacheKeyAndForwardedToOrigin": Match.object_like({
+                "EnableAcceptEncodingBrotli": True,
+                "EnableAcceptEncodingGzip": True,
+            }),
+        }),
+    })
+    template.has_resource_properties("AWS::CloudFront::Distribution", {
+        "DistributionConfig": Match.object_like({
+            "CacheBehaviors": [
+                Match.object_like({
+                    "PathPattern": "/_next/static/*",
+                    "Compress": True,
+                }),
+            ],
+        }),
+    })
+
+
+def test_html_uses_a_short_ttl_and_clean_url_rewrite():
+    template = synth_frontend()
+
+    template.has_resource_properties("AWS::CloudFront::CachePolicy", {
+        "CachePolicyConfig": Match.object_like({
+            "MinTTL": 0,
+            "DefaultTTL": 60,
+            "MaxTTL": 300,
+            "ParametersInCacheKeyAndForwardedToOrigin": Match.object_like({
+                "EnableAcceptEncodingBrotli": True,
+                "EnableAcceptEncodingGzip": True,
+            }),
+        }),
+    })
+    template.has_resource_properties("AWS::CloudFront::Distribution", {
+        "DistributionConfig": Match.object_like({
+            "DefaultCacheBehavior": Match.object_like({
+                "Compress": True,
+                "FunctionAssociations": [
+                    Match.object_like({"EventType": "viewer-request"}),
+                ],
+            }),
+        }),
+    })
+    template.resource_count_is("AWS::CloudFront::Function", 1)
+
+
+def test_missing_paths_return_the_404_page_instead_of_index():
+    template = synth_frontend()
+
+    template.has_resource_properties("AWS::CloudFront::Distribution", {
+        "DistributionConfig": Match.object_like({
+            "CustomErrorResponses": Match.array_with([
+                Match.object_like({"ErrorCode": 404, "ResponseCode": 404, "ResponsePagePath": "/404.html"}),
+                Match.object_like({"ErrorCode": 403, "ResponseCode": 404, "ResponsePagePath": "/404.html"}),
+            ]),
+        }),
+    })
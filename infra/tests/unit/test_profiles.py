@@ -0,0 +1,121 @@
+"""
+Synth-time checks that each performance profile reaches the generated templates.
+Runs offline: no domain is set, so no hosted-zone lookups happen.
+"""
+
+import pytest
+from aws_cdk import App, assertions
+
+from contacts_infra.backend_stack import BackendStack
+from contacts_infra.frontend_stack import FrontendStack
+from contacts_infra.profiles import PROFILES, resolve_profile
+
+
+def synth_backend(profile_name: str) -> assertions.Template:
+    app = App(context={"profile": profile_name})
+    stack = BackendStack(app, "TestBackendStack", app_name="Test")
+    return assertions.Template.from_stack(stack)
+
+
+def synth_frontend(profile_name: str) -> assertions.Template:
+    app = App(context={"profile": profile_name})
+    stack = FrontendStack(app, "TestFrontendStack", app_name="Test")
+    return assertions.Template.from_stack(stack)
+
+
+def test_resolve_profile_defaults_to_standard(monkeypatch):
+    monkeypatch.delenv("PERFORMANCE_PROFILE", raising=False)
+    assert resolve_profile(App()).name == "standard"
+
+
+def test_resolve_profile_rejects_unknown_names():
+    with pytest.raises(ValueError, match="profile must be one of"):
+        resolve_profile(App(context={"profile": "huge"}))
+
+
+@pytest.mark.parametrize("profile_name", list(PROFILES))
+def test_backend_sizing_follows_profile(profile_name):
+    profile = PROFILES[profile_name]
+    template = synth_backend(profile_name)
+
+    template.has_resource_properties("AWS::ECS::TaskDefinition", {
+        "Cpu": str(profile.task_cpu),
+        "Memory": str(profile.task_memory_mib),
+    })
+    template.has_resource_properties("AWS::RDS::DBCluster", {
+        "ServerlessV2ScalingConfiguration": {
+            "MinCapacity": profile.db_min_acu,
+            "MaxCapacity": profile.db_max_acu,
+        },
+    })
+    template.has_resource_properties("AWS::ElastiCache::ReplicationGroup", {
+        "CacheNodeType": profile.redis_node_type,
+        "NumCacheClusters": 1 + profile.redis_replicas,
+        "AutomaticFailoverEnabled": profile.redis_replicas > 0,
+    })
+    template.has_resource_properties("AWS::ApplicationAutoScaling::ScalableTarget", {
+        "MinCapacity": profile.min_tasks,
+        "MaxCapacity": profile.max_tasks,
+    })
+
+
+def test_standard_profile_scales_on_built_in_metrics_only():
+    template = synth_backend("standard")
+
+    # CPU, memory and ALB request count
+    template.resource_count_is("AWS::ApplicationAutoScaling::ScalingPolicy", 3)
+    template.resource_properties_count_is("AWS::ECS::TaskDefinition", {
+        "ContainerDefinitions": assertions.Match.array_with([
+            assertions.Match.object_like({
+                "Environment": assertions.Match.array_with([
+                    {"Name": "CLOUDWATCH_METRICS_NAMESPACE", "Value": assertions.Match.any_value()},
+                ]),
+            }),
+        ]),
+    }, 0)
+
+
+def test_high_throughput_profile_scales_on_sse_connections_and_p99_latency():
+    profile = PROFILES["high-throughput"]
+    template = synth_backend("high-throughput")
+
+    template.has_resource_properties("AWS::ApplicationAutoScaling::ScalingPolicy", {
+        "PolicyType": "TargetTrackingScaling",
+        "TargetTrackingScalingPolicyConfiguration": assertions.Match.object_like({
+            "TargetValue": profile.sse_connections_per_task,
+            "CustomizedMetricSpecification": assertions.Match.object_like({
+                "MetricName": "SSEConnections",
+                "Namespace": "Test/Backend",
+                "Statistic": "Average",
+            }),
+        }),
+    })
+    template.has_resource_properties("AWS::ApplicationAutoScaling::ScalingPolicy", {
+        "PolicyType": "StepScaling",
+    })
+    template.has_resource_properties("AWS::CloudWatch::Alarm", {
+        "MetricName": "TargetResponseTime",
+        "ExtendedStatistic": "p99",
+        "Threshold": profile.p99_latency_seconds,
+    })
+    # The backend only publishes the SSE gauge when told where to
+    template.has_resource_properties("AWS::ECS::TaskDefinition", {
+        "ContainerDefinitions": assertions.Match.array_with([
+            assertions.Match.object_like({
+                "Environment": assertions.Match.array_with([
+                    {"Name": "CLOUDWATCH_METRICS_NAMESPACE", "Value": "Test/Backend"},
+                ]),
+            }),
+        ]),
+    })
+
+
+@pytest.mark.parametrize("profile_name", list(PROFILES))
+def test_frontend_price_class_follows_profile(profile_name):
+    template = synth_frontend(profile_name)
+
+    template.has_resource_properties("AWS::CloudFront::Distribution", {
+        "DistributionConfig": assertions.Match.object_like({
+            "PriceClass": PROFILES[profile_name].cdn_price_class.value,
+        }),
+    })